@@ -0,0 +1,122 @@
+"""Benchmark aggregation requests: with hits vs hit-free and shard-cacheable.
+
+Sends the same aggregations to a running Elasticsearch or OpenSearch cluster,
+first the way `DatabaseLogic.aggregate` used to (default top-10 hits with their
+`_source`, `total_count` as a `value_count` over `id`), then as built by
+`build_aggregation_body_shared` (`size: 0`, `track_total_hits`,
+`request_cache` and an optional fingerprint `preference`). Prints the latency
+and response size of both, and checks that the counts are identical.
+
+Usage:
+    BACKEND=elasticsearch python scripts/benchmark_aggregations.py \
+        --collection my-collection --repeat 50 \
+        --aggregations total_count,datetime_frequency,platform_frequency
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import time
+from copy import deepcopy
+from typing import Any
+
+from stac_fastapi.sfeos_helpers.database import (
+    add_total_count_shared,
+    aggregation_search_params_shared,
+    build_aggregation_body_shared,
+    index_alias_by_collection_id,
+)
+from stac_fastapi.sfeos_helpers.mappings import AGGREGATION_MAPPING, ITEM_INDICES
+
+
+def _create_database_logic(backend: str):  # type: ignore[no-untyped-def]
+    """Create the DatabaseLogic of the configured backend."""
+    if backend == "elasticsearch":
+        from stac_fastapi.elasticsearch.database_logic import DatabaseLogic
+    else:
+        from stac_fastapi.opensearch.database_logic import DatabaseLogic
+    return DatabaseLogic()
+
+
+async def time_requests(
+    client: Any, index: str, body: dict, params: dict, repeat: int
+) -> tuple[list[float], int, dict]:
+    """Return the latencies, the response size and the last response."""
+    latencies = []
+    size = 0
+    response: dict = {}
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = await client.search(
+            index=index, ignore_unavailable=True, body=body, **params
+        )
+        latencies.append(time.perf_counter() - started)
+        response = getattr(result, "body", result)
+        size = len(json.dumps(response))
+    return latencies, size, response
+
+
+def report(name: str, latencies: list[float], size: int) -> None:
+    """Print the latency percentiles and response size of a run."""
+    ordered = sorted(latencies)
+    p95 = ordered[max(0, int(len(ordered) * 0.95) - 1)]
+    print(
+        f"{name:<10} p50 {statistics.median(ordered) * 1000:8.2f} ms  "
+        f"p95 {p95 * 1000:8.2f} ms  response {size} bytes"
+    )
+
+
+async def run(args: argparse.Namespace) -> None:
+    """Run both request variants and print the comparison."""
+    db = _create_database_logic(os.getenv("BACKEND", "opensearch"))
+    index = (
+        index_alias_by_collection_id(args.collection)
+        if args.collection
+        else ITEM_INDICES
+    )
+    names = [name.strip() for name in args.aggregations.split(",") if name.strip()]
+    requested = {name: deepcopy(AGGREGATION_MAPPING[name]) for name in names}
+    try:
+        before_body = {"aggregations": requested}
+        before, before_size, before_response = await time_requests(
+            db.client, index, before_body, {"request_cache": False}, args.repeat
+        )
+        after_body = build_aggregation_body_shared(None, requested)
+        after_params = aggregation_search_params_shared(index, after_body)
+        after, after_size, after_response = await time_requests(
+            db.client, index, after_body, after_params, args.repeat
+        )
+    finally:
+        await db.client.close()
+
+    after_response = add_total_count_shared(after_response, requested)
+    if "total_count" in requested:
+        assert (
+            before_response["aggregations"]["total_count"]["value"]
+            == after_response["aggregations"]["total_count"]["value"]
+        ), "total_count differs"
+
+    print(f"{args.repeat} requests on {index}: {', '.join(names)}")
+    report("before", before, before_size)
+    report("after", after, after_size)
+    print(
+        f"p50 speedup {statistics.median(before) / statistics.median(after):.1f}x, "
+        f"{before_size / after_size:.1f}x smaller responses"
+    )
+
+
+def main() -> None:
+    """Parse arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--collection", default=None)
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument(
+        "--aggregations", default="total_count,datetime_frequency,collection_frequency"
+    )
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
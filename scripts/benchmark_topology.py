@@ -0,0 +1,88 @@
+"""Benchmark topology validation: vectorized NumPy vs pure Python.
+
+Generates a batch of items with dense polygon footprints (like satellite swaths)
+and times `batch_validate_topology` with and without NumPy. Both runs must
+return identical results.
+
+Usage:
+    python scripts/benchmark_topology.py --items 1000 --vertices 4000 --repeat 3
+"""
+
+import argparse
+import math
+import os
+import time
+
+from stac_fastapi.core import validate
+
+
+def make_items(count: int, vertices: int) -> list[dict]:
+    """Create items with a closed polygon ring of `vertices` positions each."""
+    items = []
+    for i in range(count):
+        center_lon = -170 + (i * 7) % 340
+        center_lat = -60 + (i * 3) % 120
+        ring = [
+            [
+                center_lon + 5 * math.cos(2 * math.pi * v / (vertices - 1)),
+                center_lat + 5 * math.sin(2 * math.pi * v / (vertices - 1)),
+            ]
+            for v in range(vertices - 1)
+        ]
+        ring.append(ring[0])
+        items.append(
+            {
+                "id": f"bench-{i}",
+                "type": "Feature",
+                "geometry": {"type": "Polygon", "coordinates": [ring]},
+            }
+        )
+    return items
+
+
+def time_run(items: list[dict], repeat: int) -> tuple[float, tuple]:
+    """Return the best wall time of `repeat` runs and the last result."""
+    best = math.inf
+    result: tuple = ()
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = validate.batch_validate_topology(items)
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def main() -> None:
+    """Run the benchmark and print timings."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=1000)
+    parser.add_argument("--vertices", type=int, default=4000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    if validate.np is None:
+        raise SystemExit(
+            "NumPy is not installed: pip install stac-fastapi-core[topology]"
+        )
+
+    # Make sure the vertex limit does not reject the generated rings
+    os.environ["MAX_TOPOLOGY_VERTICES"] = str(max(args.vertices, 5000))
+    items = make_items(args.items, args.vertices)
+
+    numpy_time, numpy_result = time_run(items, args.repeat)
+    numpy_module = validate.np
+    validate.np = None
+    try:
+        python_time, python_result = time_run(items, args.repeat)
+    finally:
+        validate.np = numpy_module
+
+    assert numpy_result == python_result, "NumPy and pure-Python results differ"
+
+    total_vertices = args.items * args.vertices
+    print(f"{args.items} items x {args.vertices} vertices ({total_vertices} vertices)")
+    print(f"pure Python: {python_time:.3f}s")
+    print(f"NumPy:       {numpy_time:.3f}s ({python_time / numpy_time:.1f}x speedup)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+"""Manage bulk-load sessions and backfill items with retuned index settings.
+
+A bulk-load session sets `refresh_interval=-1` and `number_of_replicas=0` on the
+item indexes of a collection and restores the original settings when it is
+finished (see `DatabaseLogic.start_bulk_load_session`). Sessions are leases:
+the `load` command renews its session while it runs, and sessions whose lease
+expired (e.g. after a crash) are reverted by `revert-stale` or when the API
+starts.
+
+Usage:
+    python scripts/bulk_load.py load my-collection items.ndjson \\
+        --batch-size 2000 --forcemerge
+    python scripts/bulk_load.py start my-collection --ttl 7200
+    python scripts/bulk_load.py status my-collection
+    python scripts/bulk_load.py finish my-collection --forcemerge
+    python scripts/bulk_load.py revert-stale
+
+`load` reads newline-delimited STAC Items and indexes them with `bulk_async`
+(op_type "index"), so set BULK_MAX_IN_FLIGHT_CHUNKS to send chunks in parallel.
+The backend is selected with BACKEND ("opensearch" or "elasticsearch").
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import time
+from typing import Any, Iterator
+
+from stac_fastapi.core.serializers import ItemSerializer
+from stac_fastapi.core.write_generations import write_generations
+from stac_fastapi.sfeos_helpers.database.bulk_load import get_bulk_load_session_ttl
+
+logger = logging.getLogger(__name__)
+
+
+def _create_database_logic(backend: str):  # type: ignore[no-untyped-def]
+    """Create the DatabaseLogic of the configured backend."""
+    if backend == "elasticsearch":
+        from stac_fastapi.elasticsearch.database_logic import DatabaseLogic
+    else:
+        from stac_fastapi.opensearch.database_logic import DatabaseLogic
+    return DatabaseLogic()
+
+
+def iter_item_batches(path: str, batch_size: int) -> Iterator[list[dict]]:
+    """Yield lists of at most `batch_size` items from an NDJSON file."""
+    batch: list[dict] = []
+    with open(path, "rb") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            batch.append(json.loads(line))
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+    if batch:
+        yield batch
+
+
+async def _renew_session(db: Any, collection_id: str, ttl: int) -> None:
+    """Renew the session lease (and retune new indexes) until cancelled."""
+    while True:
+        await asyncio.sleep(max(ttl // 3, 1))
+        await db.start_bulk_load_session(collection_id, ttl=ttl)
+
+
+async def load(db: Any, args: argparse.Namespace) -> dict[str, Any]:
+    """Load an NDJSON file into a collection inside a bulk-load session."""
+    ttl = args.ttl or get_bulk_load_session_ttl()
+    await db.start_bulk_load_session(args.collection_id, ttl=ttl)
+    renewer = asyncio.create_task(_renew_session(db, args.collection_id, ttl))
+
+    stats: dict[str, Any] = {"items": 0, "indexed": 0, "unchanged": 0, "errors": 0}
+    started = time.monotonic()
+    try:
+        for batch in iter_item_batches(args.path, args.batch_size):
+            for item in batch:
+                item["collection"] = args.collection_id
+            items = [ItemSerializer.stac_to_db(item, args.base_url) for item in batch]
+            # With ENABLE_CONTENT_HASH, items already stored unchanged are skipped
+            changed, unchanged_ids = await db.split_unchanged_items(
+                args.collection_id, items
+            )
+            success, errors = await db.bulk_async(
+                collection_id=args.collection_id,
+                processed_items=changed,
+                op_type="index",
+                refresh=False,
+            )
+            stats["items"] += len(items)
+            stats["indexed"] += success
+            stats["unchanged"] += len(unchanged_ids)
+            stats["errors"] += len(errors)
+            for error in errors[:5]:
+                logger.warning(f"Bulk error: {error}")
+            logger.info(
+                f"Loaded {stats['items']} items ({stats['unchanged']} unchanged, {stats['errors']} errors)"
+            )
+    finally:
+        renewer.cancel()
+        await asyncio.gather(renewer, return_exceptions=True)
+        await write_generations.bump([args.collection_id])
+        stats["session"] = await db.finish_bulk_load_session(
+            args.collection_id,
+            forcemerge=args.forcemerge,
+            wait_for_status=args.wait_for_status,
+            timeout=args.timeout,
+        )
+
+    elapsed = time.monotonic() - started
+    stats["elapsed_seconds"] = round(elapsed, 2)
+    stats["items_per_second"] = round(stats["items"] / elapsed, 1) if elapsed else 0.0
+    return stats
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--backend",
+        choices=("opensearch", "elasticsearch"),
+        default=os.getenv("BACKEND", "opensearch"),
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    def add_finish_arguments(command: argparse.ArgumentParser) -> None:
+        command.add_argument(
+            "--forcemerge",
+            action="store_true",
+            help="Force-merge closed datetime indexes after restoring settings.",
+        )
+        command.add_argument(
+            "--wait-for-status", choices=("green", "yellow"), default="green"
+        )
+        command.add_argument("--timeout", default="30s")
+
+    load_command = commands.add_parser("load", help="Load an NDJSON file of items.")
+    load_command.add_argument("collection_id")
+    load_command.add_argument("path")
+    load_command.add_argument("--batch-size", type=int, default=1000)
+    load_command.add_argument("--ttl", type=int, default=None)
+    load_command.add_argument("--base-url", default="http://localhost:8080/")
+    add_finish_arguments(load_command)
+
+    start_command = commands.add_parser("start", help="Start or renew a session.")
+    start_command.add_argument("collection_id")
+    start_command.add_argument("--ttl", type=int, default=None)
+
+    status_command = commands.add_parser("status", help="Show a session.")
+    status_command.add_argument("collection_id")
+
+    finish_command = commands.add_parser("finish", help="Finish a session.")
+    finish_command.add_argument("collection_id")
+    add_finish_arguments(finish_command)
+
+    commands.add_parser("revert-stale", help="Revert sessions whose lease expired.")
+    return parser.parse_args(argv)
+
+
+async def run(args: argparse.Namespace) -> Any:
+    """Run a bulk-load command with parsed CLI arguments."""
+    db = _create_database_logic(args.backend)
+    try:
+        if args.command == "load":
+            await db.start_rollups(refresh_loop=False)
+            return await load(db, args)
+        if args.command == "start":
+            return await db.start_bulk_load_session(args.collection_id, ttl=args.ttl)
+        if args.command == "status":
+            return await db.get_bulk_load_session(args.collection_id)
+        if args.command == "finish":
+            return await db.finish_bulk_load_session(
+                args.collection_id,
+                forcemerge=args.forcemerge,
+                wait_for_status=args.wait_for_status,
+                timeout=args.timeout,
+            )
+        return {"reverted": await db.revert_stale_bulk_load_sessions()}
+    finally:
+        await db.client.close()
+
+
+def main() -> None:
+    """Entry point for the bulk-load tool."""
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
+    )
+    print(json.dumps(asyncio.run(run(parse_args()))))
+
+
+if __name__ == "__main__":
+    main()
@@ -9,6 +9,13 @@ Configuration via environment variables (managed by ItemQueueSettings):
     QUEUE_FLUSH_INTERVAL (int): Seconds before flushing a partial batch (default: 30).
     WORKER_POLL_INTERVAL (float): Seconds between poll cycles (default: 1.0).
     WORKER_MAX_THREADS (int): Max concurrent collection flushes (default: 4).
+    QUEUE_MERGE_COLLECTIONS (bool): Merge small collection batches into shared
+        bulk requests (default: False).
+    QUEUE_MERGE_MAX_BYTES (int): Byte budget of a merged bulk request (default: 10 MiB).
+    WORKER_METRICS_PORT (int): Port of the Prometheus metrics listener. Metrics
+        are disabled when unset (requires the sfeos-helpers `metrics` extra).
+    WORKER_METRICS_REFRESH_INTERVAL (float): Seconds between queue-state gauge
+        refreshes from Redis (default: 15.0).
     BACKEND (str): "opensearch" or "elasticsearch" (default: "opensearch").
     LOG_LEVEL (str): Logging level (default: "INFO").
 """
@@ -16,16 +23,25 @@ Configuration via environment variables (managed by ItemQueueSettings):
 import asyncio
 import logging
 import time
+from typing import Any
 
+import orjson
 from redis.exceptions import ConnectionError as RedisConnectionError
 from redis.exceptions import LockError
 
-from stac_fastapi.core.redis_utils import AsyncRedisQueueManager, ItemQueueSettings
+from stac_fastapi.core.redis_utils import (
+    AsyncRedisQueueManager,
+    ItemQueueSettings,
+    close_redis,
+    failed_item_ids,
+    failed_item_ids_by_collection,
+)
 from stac_fastapi.core.utilities import get_bool_env
 from stac_fastapi.core.validate import (
     async_validate_batch_with_stac_validator,
     batch_validate_topology,
 )
+from stac_fastapi.core.write_generations import write_generations
 
 logger = logging.getLogger(__name__)
 
@@ -50,6 +66,9 @@ class ItemQueueWorker:
 
     _LOCK_TIMEOUT = 300
 
+    # Prometheus metrics, only set when WORKER_METRICS_PORT is configured
+    metrics: Any = None
+
     def __init__(self) -> None:
         self.settings = ItemQueueSettings()
         self.queue_manager: AsyncRedisQueueManager = None  # type: ignore[assignment]
@@ -71,32 +90,80 @@ class ItemQueueWorker:
             from stac_fastapi.opensearch.database_logic import DatabaseLogic
         return DatabaseLogic()
 
-    def _get_state(self, collection_id: str) -> CollectionFlushState:
-        if collection_id not in self._states:
-            self._states[collection_id] = CollectionFlushState()
-        return self._states[collection_id]
+    def _init_metrics(self) -> None:
+        """Start the Prometheus metrics listener if WORKER_METRICS_PORT is set."""
+        port = self.settings.WORKER_METRICS_PORT
+        if port is None:
+            return
 
-    @staticmethod
-    def _extract_failed_item_ids(errors: list[dict]) -> set[str]:
-        """Extract item IDs from bulk_async error responses.
+        try:
+            from stac_fastapi.sfeos_helpers.metrics import QueueWorkerMetrics
+        except ImportError:
+            logger.warning(
+                "prometheus-fastapi-instrumentator not installed; worker metrics disabled"
+            )
+            return
 
-        Each error dict has the shape:
-            {"<op_type>": {"_id": "item_id|collection_id", ...}}
-        where op_type is one of: index, create, update, delete.
+        self.metrics = QueueWorkerMetrics()
+        self.metrics.start_http_server(port)
+        logger.info(f"Worker metrics listening on port {port}")
 
-        Returns:
-            Set of failed item IDs.
+    async def _refresh_queue_metrics(self) -> None:
+        """Periodically refresh the queue-state gauges with pipelined Redis reads."""
+        while self.running:
+            try:
+                stats = await self.queue_manager.get_queue_stats()
+                self.metrics.update_queue_state(stats)
+            except Exception:
+                logger.warning("Failed to refresh queue metrics", exc_info=True)
+            await asyncio.sleep(self.settings.WORKER_METRICS_REFRESH_INTERVAL)
+
+    def _record_batch(self, mode: str, started: float, item_count: int) -> None:
+        """Record latency and size of a processed batch."""
+        if self.metrics is None:
+            return
+        self.metrics.batch_duration.labels(mode).observe(time.monotonic() - started)
+        self.metrics.batch_size.labels(mode).observe(item_count)
+
+    def _record_bulk(self, indexed: int, failed: int, ok: bool = True) -> None:
+        """Record the outcome of a bulk request."""
+        if self.metrics is None:
+            return
+        self.metrics.bulk_requests.labels("ok" if ok else "error").inc()
+        self.metrics.bulk_items.labels("indexed").inc(indexed)
+        self.metrics.bulk_items.labels("failed").inc(failed)
+
+    async def _skip_unchanged(
+        self, collection_id: str, items: list[dict]
+    ) -> list[dict]:
+        """Settle items whose stored content hash matches and return the rest.
+
+        Unchanged items are marked processed without being written. If the hash
+        lookup fails, all items are written as before.
         """
-        failed: set[str] = set()
-        for error in errors:
-            for op_type in ("index", "create", "update", "delete"):
-                info = error.get(op_type)
-                if info:
-                    doc_id = info.get("_id", "")
-                    if doc_id:
-                        failed.add(doc_id.split("|")[0])
-                    break
-        return failed
+        try:
+            changed, unchanged_ids = await self.db.split_unchanged_items(
+                collection_id, items
+            )
+        except Exception:
+            logger.warning(
+                f"Collection '{collection_id}': content hash lookup failed, writing all items",
+                exc_info=True,
+            )
+            return items
+        if unchanged_ids:
+            await self.queue_manager.mark_items_processed(collection_id, unchanged_ids)
+            if self.metrics is not None:
+                self.metrics.bulk_items.labels("unchanged").inc(len(unchanged_ids))
+            logger.info(
+                f"Collection '{collection_id}': skipped {len(unchanged_ids)} unchanged items"
+            )
+        return changed
+
+    def _get_state(self, collection_id: str) -> CollectionFlushState:
+        if collection_id not in self._states:
+            self._states[collection_id] = CollectionFlushState()
+        return self._states[collection_id]
 
     async def _should_flush(self, collection_id: str) -> bool:
         """Determine whether a collection's queue should be flushed.
@@ -163,6 +230,78 @@ class ItemQueueWorker:
                     lock_lost.set()
                 break
 
+    async def _validate_items(
+        self, collection_id: str, items: list[dict]
+    ) -> tuple[list[dict], set[str]]:
+        """Run the worker-side validation layer on a batch of queued items.
+
+        Validation only happens here when the web server skipped it
+        (`VALIDATE_BEFORE_QUEUE=false`); otherwise the items are returned as-is.
+
+        Returns:
+            Tuple of (valid_items, invalid_item_ids).
+        """
+        valid_items = items
+        invalid_item_ids: set[str] = set()
+        validation_errors: dict[str, list[str]] = {}
+
+        # Check if the web server already handled validation before queueing
+        if get_bool_env("VALIDATE_BEFORE_QUEUE", default=True):
+            return valid_items, invalid_item_ids
+
+        # STAC Schema Validation (if enabled)
+        if get_bool_env("ENABLE_STAC_VALIDATOR"):
+            (
+                valid_items,
+                validation_errors,
+            ) = await async_validate_batch_with_stac_validator(valid_items)
+
+        # Topology Validation (if enabled) - runs on items that passed STAC validation
+        if get_bool_env("ENABLE_TOPOLOGY_VALIDATION", default=False):
+            valid_items, topology_errors = await asyncio.to_thread(
+                batch_validate_topology, valid_items
+            )
+            # Merge topology errors into validation_errors
+            for msg, ids in topology_errors.items():
+                if msg not in validation_errors:
+                    validation_errors[msg] = []
+                validation_errors[msg].extend(ids)
+
+        # Extract invalid item IDs from grouped validation errors
+        for error_msg, item_ids in validation_errors.items():
+            for item_id in item_ids:
+                invalid_item_ids.add(item_id)
+                logger.error(
+                    f"Worker validation failed for '{item_id}' in collection '{collection_id}': {error_msg}"
+                )
+
+        if self.metrics is not None and invalid_item_ids:
+            self.metrics.validation_failures.labels(collection_id).inc(
+                len(invalid_item_ids)
+            )
+
+        return valid_items, invalid_item_ids
+
+    async def _dead_letter(
+        self, collection_id: str, item_ids: set[str], reason: str
+    ) -> None:
+        """Move items to the Dead Letter Queue and drop them from the pending queue.
+
+        Failures are logged and swallowed so the items stay pending and are
+        retried on the next flush.
+        """
+        try:
+            await self.queue_manager.save_failed_items(
+                collection_id, list(item_ids), reason=reason
+            )
+            await self.queue_manager.mark_items_processed(collection_id, list(item_ids))
+            if self.metrics is not None:
+                self.metrics.dlq_items.labels(collection_id, reason).inc(len(item_ids))
+        except Exception:
+            logger.exception(
+                f"Collection '{collection_id}': failed to save {len(item_ids)} {reason} to DLQ"
+            )
+
     async def _flush_collection(self, collection_id: str) -> None:
         """Flush pending items for a collection in sequential batches.
 
@@ -215,73 +354,32 @@ class ItemQueueWorker:
                     break
 
                 batch_num += 1
+                batch_started = time.monotonic()
 
                 logger.info(
                     f"Collection '{collection_id}' batch #{batch_num}: pulled {len(items)} items from queue"
                 )
 
-                # VALIDATION LAYER: Use batch validation for efficiency (if enabled)
-                # Check if the web server already handled validation before queueing
-                validate_before_queue = get_bool_env(
-                    "VALIDATE_BEFORE_QUEUE", default=True
+                valid_items, invalid_item_ids = await self._validate_items(
+                    collection_id, items
                 )
 
-                valid_items = items
-                invalid_item_ids = set()
-                validation_errors: dict[str, list[str]] = {}
-
-                # Only waste CPU cycles validating here if the web server skipped it
-                if not validate_before_queue:
-                    # STAC Schema Validation (if enabled)
-                    if get_bool_env("ENABLE_STAC_VALIDATOR"):
-                        (
-                            valid_items,
-                            validation_errors,
-                        ) = await async_validate_batch_with_stac_validator(valid_items)
-
-                    # Topology Validation (if enabled) - runs on items that passed STAC validation
-                    if get_bool_env("ENABLE_TOPOLOGY_VALIDATION", default=False):
-                        valid_items, topology_errors = await asyncio.to_thread(
-                            batch_validate_topology, valid_items
-                        )
-                        # Merge topology errors into validation_errors
-                        for msg, ids in topology_errors.items():
-                            if msg not in validation_errors:
-                                validation_errors[msg] = []
-                            validation_errors[msg].extend(ids)
-
-                    # Extract invalid item IDs from grouped validation errors
-                    for error_msg, item_ids in validation_errors.items():
-                        for item_id in item_ids:
-                            invalid_item_ids.add(item_id)
-                            logger.error(
-                                f"Worker validation failed for '{item_id}' in collection '{collection_id}': {error_msg}"
-                            )
-                else:
-                    # Bypass validation because VALIDATE_BEFORE_QUEUE=true
-                    # (data already pre-verified on API thread)
-                    pass
-
                 # Handle invalid items (Dead Letter Queue)
                 if invalid_item_ids:
-                    try:
-                        await self.queue_manager.save_failed_items(
-                            collection_id, list(invalid_item_ids)
-                        )
-                        await self.queue_manager.mark_items_processed(
-                            collection_id, list(invalid_item_ids)
-                        )
-                    except Exception:
-                        logger.exception(
-                            f"Collection '{collection_id}': failed to save {len(invalid_item_ids)} invalid items to DLQ"
-                        )
-
-                # If entire batch was invalid, skip database call
+                    await self._dead_letter(
+                        collection_id, invalid_item_ids, "invalid items"
+                    )
+
+                valid_items = await self._skip_unchanged(collection_id, valid_items)
+
+                # If entire batch was invalid or unchanged, skip database call
                 if not valid_items:
                     logger.warning(
-                        f"Collection '{collection_id}' batch #{batch_num}: All {len(items)} items failed STAC validation. Skipping DB insert."
+                        f"Collection '{collection_id}' batch #{batch_num}: None of the {len(items)} items need to be written "
+                        "(failed STAC validation or unchanged). Skipping DB insert."
                     )
                     state.last_flush_time = time.monotonic()
+                    self._record_batch("single", batch_started, len(items))
                     if len(items) < batch_size:
                         break
                     continue
@@ -297,12 +395,11 @@ class ItemQueueWorker:
                     logger.exception(
                         f"Collection '{collection_id}' batch #{batch_num}: bulk_async failed ({len(valid_items)} valid items)"
                     )
+                    self._record_bulk(0, 0, ok=False)
                     break
 
                 # Handle database errors
-                failed_db_ids = (
-                    self._extract_failed_item_ids(errors) if errors else set()
-                )
+                failed_db_ids = failed_item_ids(errors)
                 successful_db_ids = [
                     item["id"]
                     for item in valid_items
@@ -317,22 +414,13 @@ class ItemQueueWorker:
                     )
 
                 if successful_db_ids:
+                    await write_generations.bump([collection_id])
                     await self.queue_manager.mark_items_processed(
                         collection_id, successful_db_ids
                     )
 
                 if failed_db_ids:
-                    try:
-                        await self.queue_manager.save_failed_items(
-                            collection_id, list(failed_db_ids)
-                        )
-                        await self.queue_manager.mark_items_processed(
-                            collection_id, list(failed_db_ids)
-                        )
-                    except Exception:
-                        logger.exception(
-                            f"Collection '{collection_id}': failed to save {len(failed_db_ids)} DB failures to DLQ"
-                        )
+                    await self._dead_letter(collection_id, failed_db_ids, "DB failures")
 
                 logger.info(
                     f"Collection '{collection_id}' batch #{batch_num}: {success} succeeded DB insert, "
@@ -340,6 +428,8 @@ class ItemQueueWorker:
                 )
 
                 state.last_flush_time = time.monotonic()
+                self._record_bulk(len(successful_db_ids), len(failed_db_ids))
+                self._record_batch("single", batch_started, len(items))
 
                 if len(items) < batch_size:
                     break
@@ -366,14 +456,222 @@ class ItemQueueWorker:
         async with self._semaphore:
             await self._flush_collection(collection_id)
 
+    async def _flush_merged_with_semaphore(self, collection_ids: list[str]) -> None:
+        """Flush a group of small collections while respecting the concurrency limit."""
+        async with self._semaphore:
+            await self._flush_merged(collection_ids)
+
+    async def _flush_merged(self, collection_ids: list[str]) -> None:
+        """Flush several small collections through shared bulk requests.
+
+        Each collection still holds its own distributed lock and goes through
+        its own validation pass, but the valid items of all collections are
+        combined into bulk requests of at most `QUEUE_MERGE_MAX_BYTES`. The
+        per-document target index is still resolved by the index inserter of
+        each collection. Bulk results are split back by collection so that
+        `mark_items_processed` and `save_failed_items` run per collection.
+
+        Collections whose lock is held by another worker are skipped and will
+        be picked up on a later poll.
+        """
+        claimed: list[str] = []
+        async with self._lock:
+            for collection_id in collection_ids:
+                state = self._get_state(collection_id)
+                if not state.processing:
+                    state.processing = True
+                    claimed.append(collection_id)
+
+        locks: dict[str, Any] = {}
+        refresh_tasks: list[asyncio.Task] = []
+        lock_lost = asyncio.Event()
+        try:
+            for collection_id in claimed:
+                redis_lock = self.queue_manager.redis.lock(
+                    self._get_collection_lock_key(collection_id),
+                    timeout=self._LOCK_TIMEOUT,
+                )
+                if await redis_lock.acquire(blocking=False):
+                    locks[collection_id] = redis_lock
+                else:
+                    logger.info(
+                        f"Collection '{collection_id}': skipping merged flush, another worker holds the lock"
+                    )
+
+            if not locks:
+                return
+
+            refresh_tasks = [
+                asyncio.create_task(
+                    self._lock_refresh_task(lock, interval=60.0, lock_lost=lock_lost)
+                )
+                for lock in locks.values()
+            ]
+
+            max_bytes = self.settings.QUEUE_MERGE_MAX_BYTES
+            batch_started = time.monotonic()
+            pulled = 0
+            batch_actions: list[dict[str, Any]] = []
+            batch_items: dict[str, list[dict]] = {}
+            batch_bytes = 0
+
+            for collection_id in locks:
+                if not self.running or lock_lost.is_set():
+                    break
+
+                items = await self.queue_manager.get_pending_items(
+                    collection_id, limit=self.settings.QUEUE_BATCH_SIZE
+                )
+                if not items:
+                    continue
+                pulled += len(items)
+
+                valid_items, invalid_item_ids = await self._validate_items(
+                    collection_id, items
+                )
+                if invalid_item_ids:
+                    await self._dead_letter(
+                        collection_id, invalid_item_ids, "invalid items"
+                    )
+                valid_items = await self._skip_unchanged(collection_id, valid_items)
+                if not valid_items:
+                    self._get_state(collection_id).last_flush_time = time.monotonic()
+                    continue
+
+                actions = await self.db.async_index_inserter.prepare_bulk_actions(
+                    collection_id, valid_items, op_type="index"
+                )
+                actions_bytes = sum(
+                    len(orjson.dumps(a.get("_source", {}))) for a in actions
+                )
+
+                if batch_actions and batch_bytes + actions_bytes > max_bytes:
+                    await self._send_merged_batch(batch_actions, batch_items)
+                    batch_actions, batch_items, batch_bytes = [], {}, 0
+
+                batch_actions.extend(actions)
+                batch_items[collection_id] = valid_items
+                batch_bytes += actions_bytes
+
+            if batch_actions and not lock_lost.is_set():
+                await self._send_merged_batch(batch_actions, batch_items)
+
+            if pulled:
+                self._record_batch("merged", batch_started, pulled)
+
+        except Exception:
+            logger.exception(
+                f"Unexpected error in merged flush of collections {claimed}"
+            )
+        finally:
+            for task in refresh_tasks:
+                task.cancel()
+            if refresh_tasks:
+                await asyncio.gather(*refresh_tasks, return_exceptions=True)
+            for redis_lock in locks.values():
+                try:
+                    if await redis_lock.owned():
+                        await redis_lock.release()
+                except Exception:
+                    pass
+            async with self._lock:
+                for collection_id in claimed:
+                    self._get_state(collection_id).processing = False
+
+    async def _send_merged_batch(
+        self,
+        actions: list[dict[str, Any]],
+        items_by_collection: dict[str, list[dict]],
+    ) -> None:
+        """Send one merged bulk request and settle its results per collection.
+
+        If the bulk request itself fails, nothing is removed from the queues so
+        the items are retried on the next flush.
+        """
+        try:
+            success, errors = await self.db.bulk_async_actions(
+                actions, max_chunk_bytes=self.settings.QUEUE_MERGE_MAX_BYTES
+            )
+        except Exception:
+            logger.exception(
+                f"Merged bulk request failed ({len(actions)} items across "
+                f"{len(items_by_collection)} collections)"
+            )
+            self._record_bulk(0, 0, ok=False)
+            return
+
+        failed_by_collection = failed_item_ids_by_collection(errors)
+        if success:
+            await write_generations.bump(items_by_collection)
+        if errors:
+            logger.error(
+                f"Merged bulk request: {len(errors)} DB insert(s) failed, saving to DLQ. "
+                f"Bulk errors: {errors}"
+            )
+
+        for collection_id, items in items_by_collection.items():
+            failed_db_ids = failed_by_collection.get(collection_id, set())
+            successful_db_ids = [
+                item["id"] for item in items if item["id"] not in failed_db_ids
+            ]
+            if successful_db_ids:
+                await self.queue_manager.mark_items_processed(
+                    collection_id, successful_db_ids
+                )
+            if failed_db_ids:
+                await self._dead_letter(collection_id, failed_db_ids, "DB failures")
+            self._get_state(collection_id).last_flush_time = time.monotonic()
+
+        self._record_bulk(success, len(errors))
+        logger.info(
+            f"Merged bulk request: {success} succeeded DB insert across "
+            f"{len(items_by_collection)} collections, {len(errors)} failed DB insert."
+        )
+
+    async def _dispatch_merged(
+        self, collection_ids: list[str], active_tasks: dict[str, asyncio.Task]
+    ) -> None:
+        """Dispatch flushes for ready collections when merging is enabled.
+
+        Collections with at least a full batch pending are flushed on their own;
+        the remaining small collections share a single merged flush task, which
+        is registered under each of their IDs in `active_tasks`.
+        """
+        lengths = await self.queue_manager.get_queue_lengths(collection_ids)
+        small: list[str] = []
+        for collection_id in collection_ids:
+            if lengths.get(collection_id, 0) >= self.settings.QUEUE_BATCH_SIZE:
+                active_tasks[collection_id] = asyncio.create_task(
+                    self._flush_with_semaphore(collection_id)
+                )
+            else:
+                small.append(collection_id)
+
+        if len(small) == 1:
+            active_tasks[small[0]] = asyncio.create_task(
+                self._flush_with_semaphore(small[0])
+            )
+        elif small:
+            task = asyncio.create_task(self._flush_merged_with_semaphore(small))
+            for collection_id in small:
+                active_tasks[collection_id] = task
+
     async def run(self) -> None:
         """Main worker loop — polls Redis and dispatches collection flushes."""
         await self._init_queue_manager()
+        self._init_metrics()
+        # Items written here must invalidate the rollups the API answers from
+        await self.db.start_rollups(refresh_loop=False)
+
+        metrics_task = None
+        if self.metrics is not None:
+            metrics_task = asyncio.create_task(self._refresh_queue_metrics())
 
         logger.info(
             f"Starting item queue worker "
             f"(batch_size={self.settings.QUEUE_BATCH_SIZE}, flush_interval={self.settings.QUEUE_FLUSH_INTERVAL}s, "
-            f"poll_interval={self.settings.WORKER_POLL_INTERVAL:.1f}s, max_concurrent={self.settings.WORKER_MAX_THREADS})"
+            f"poll_interval={self.settings.WORKER_POLL_INTERVAL:.1f}s, max_concurrent={self.settings.WORKER_MAX_THREADS}, "
+            f"merge_collections={self.settings.QUEUE_MERGE_COLLECTIONS})"
         )
 
         active_tasks: dict[str, asyncio.Task] = {}
@@ -389,6 +687,7 @@ class ItemQueueWorker:
                 for cid in done_keys:
                     del active_tasks[cid]
 
+                ready: list[str] = []
                 for collection_id in collections:
                     if not self.running:
                         break
@@ -397,19 +696,30 @@ class ItemQueueWorker:
                         continue
 
                     if await self._should_flush(collection_id):
-                        active_tasks[collection_id] = asyncio.create_task(
-                            self._flush_with_semaphore(collection_id)
-                        )
+                        if self.settings.QUEUE_MERGE_COLLECTIONS:
+                            ready.append(collection_id)
+                        else:
+                            active_tasks[collection_id] = asyncio.create_task(
+                                self._flush_with_semaphore(collection_id)
+                            )
+
+                if ready:
+                    await self._dispatch_merged(ready, active_tasks)
 
             except Exception:
                 logger.exception("Error in worker poll loop")
 
             await asyncio.sleep(self.settings.WORKER_POLL_INTERVAL)
 
-        for task in active_tasks.values():
+        pending_tasks = set(active_tasks.values())
+        for task in pending_tasks:
             task.cancel()
-        if active_tasks:
-            await asyncio.gather(*active_tasks.values(), return_exceptions=True)
+        if pending_tasks:
+            await asyncio.gather(*pending_tasks, return_exceptions=True)
+
+        if metrics_task is not None:
+            metrics_task.cancel()
+            await asyncio.gather(metrics_task, return_exceptions=True)
 
         logger.info("Worker stopped.")
 
@@ -419,6 +729,7 @@ class ItemQueueWorker:
         self.running = False
         if self.queue_manager:
             await self.queue_manager.close()
+        await close_redis()
 
 
 def main() -> None:
@@ -0,0 +1,85 @@
+"""Rebuild the per-collection, per-day rollup summaries used by `/aggregate`.
+
+Rollups of a collection are only used while no write happened since they were
+built (see `stac_fastapi.sfeos_helpers.database.rollups`). Run `stale` from a
+scheduler, or set ROLLUP_REFRESH_INTERVAL on the API, to rebuild them after
+writes.
+
+Usage:
+    python scripts/refresh_rollups.py collection my-collection
+    python scripts/refresh_rollups.py stale
+    python scripts/refresh_rollups.py all
+
+The backend is selected with BACKEND ("opensearch" or "elasticsearch").
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+from typing import Any
+
+from stac_fastapi.sfeos_helpers.database import (
+    create_rollups_index_shared,
+    list_collection_ids_shared,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def _create_database_logic(backend: str):  # type: ignore[no-untyped-def]
+    """Create the DatabaseLogic of the configured backend."""
+    if backend == "elasticsearch":
+        from stac_fastapi.elasticsearch.database_logic import DatabaseLogic
+    else:
+        from stac_fastapi.opensearch.database_logic import DatabaseLogic
+    return DatabaseLogic()
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--backend",
+        choices=("opensearch", "elasticsearch"),
+        default=os.getenv("BACKEND", "opensearch"),
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+    collection_command = commands.add_parser(
+        "collection", help="Rebuild the rollups of one collection."
+    )
+    collection_command.add_argument("collection_id")
+    commands.add_parser("stale", help="Rebuild outdated rollups.")
+    commands.add_parser("all", help="Rebuild the rollups of every collection.")
+    return parser.parse_args(argv)
+
+
+async def run(args: argparse.Namespace) -> Any:
+    """Run a rollup command with parsed CLI arguments."""
+    db = _create_database_logic(args.backend)
+    try:
+        await create_rollups_index_shared(db.client)
+        if args.command == "collection":
+            return {args.collection_id: await db.refresh_rollups(args.collection_id)}
+        if args.command == "stale":
+            return {"refreshed": await db.refresh_stale_rollups()}
+        return {
+            collection_id: await db.refresh_rollups(collection_id)
+            for collection_id in await list_collection_ids_shared(db.client)
+        }
+    finally:
+        await db.client.close()
+
+
+def main() -> None:
+    """Entry point for the rollup tool."""
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
+    )
+    print(json.dumps(asyncio.run(run(parse_args()))))
+
+
+if __name__ == "__main__":
+    main()
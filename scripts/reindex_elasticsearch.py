@@ -1,84 +1,105 @@
+import argparse
 import asyncio
-import time
 
 from stac_fastapi.elasticsearch.config import AsyncElasticsearchSettings
 from stac_fastapi.elasticsearch.database_logic import create_index_templates
+from stac_fastapi.sfeos_helpers.database import ReindexTaskRunner, new_reindex_task
 from stac_fastapi.sfeos_helpers.mappings import COLLECTIONS_INDEX, ITEMS_INDEX_PREFIX
 
+ASSETS_SCRIPT = {
+    "source": "if (ctx._source.containsKey('assets')){List l = new ArrayList();for (key in ctx._source.assets.keySet()) {def item = ctx._source.assets[key]; item['es_key'] = key; l.add(item)}ctx._source.assets=l} if (ctx._source.containsKey('item_assets')){ List a = new ArrayList(); for (key in ctx._source.item_assets.keySet()) {def item = ctx._source.item_assets[key]; item['es_key'] = key; a.add(item)}ctx._source.item_assets=a}",
+    "lang": "painless",
+}
 
-async def reindex(client, index, new_index, aliases):
-    """Reindex STAC index"""
-    print(f"reindexing {index} to {new_index}")
 
-    await client.options(ignore_status=400).indices.create(index=new_index)
+def next_version(index):
+    """Return the index name with its version suffix incremented"""
+    index_name, version = index.rsplit("-", 1)
+    return f"{index_name}-{str(int(version) + 1).zfill(6)}"
 
-    reindex_resp = await client.reindex(
-        dest={"index": new_index},
-        source={"index": [index]},
-        wait_for_completion=False,
-        script={
-            "source": "if (ctx._source.containsKey('assets')){List l = new ArrayList();for (key in ctx._source.assets.keySet()) {def item = ctx._source.assets[key]; item['es_key'] = key; l.add(item)}ctx._source.assets=l} if (ctx._source.containsKey('item_assets')){ List a = new ArrayList(); for (key in ctx._source.item_assets.keySet()) {def item = ctx._source.item_assets[key]; item['es_key'] = key; a.add(item)}ctx._source.item_assets=a}",
-            "lang": "painless",
-        },
-    )
-
-    task_id = reindex_resp["task"]
-
-    reindex_complete = False
-    while not reindex_complete:
-        task_resp = await client.tasks.get(task_id=task_id)
 
-        if "completed" in task_resp and task_resp["completed"]:
-            reindex_complete = True
-
-        elif "error" in task_resp:
-            reindex_complete = True
-            print(f"Reindex failed for {index} with error: {task_resp['error']}")
-
-        else:
-            time.sleep(60)
-
-    actions = []
+def add_step(steps, alias_actions, index, aliases):
+    """Reindex `index` into its next version and move its aliases"""
+    new_index = next_version(index)
+    steps.append({"source": index, "dest": new_index, "script": ASSETS_SCRIPT})
     for alias in aliases["aliases"]:
-        actions.extend(
+        alias_actions.extend(
             [
                 {"add": {"index": new_index, "alias": alias}},
                 {"remove": {"index": index, "alias": alias}},
             ]
         )
 
-    await client.indices.update_aliases(actions=actions)
-
-
-async def run():
-    """Reindex all STAC indexes for mapping update"""
-    client = AsyncElasticsearchSettings().create_client
 
-    await create_index_templates()
+async def plan(client, requests_per_second, max_parallel):
+    """Build one task reindexing all STAC indexes for a mapping update"""
+    steps, alias_actions = [], []
 
     collection_response = await client.indices.get_alias(name=COLLECTIONS_INDEX)
-    collections = await client.search(index=COLLECTIONS_INDEX)
+    collections = await client.search(index=COLLECTIONS_INDEX, size=10000)
 
-    collection_index, collection_aliases = next(iter(collection_response.items()))
-    collection_index_name, version = collection_index.rsplit("-", 1)
-    new_collection_index = f"{collection_index_name}-{str(int(version) + 1).zfill(6)}"
-
-    await reindex(client, collection_index, new_collection_index, collection_aliases)
+    for collection_index, aliases in collection_response.items():
+        add_step(steps, alias_actions, collection_index, aliases)
 
     for collection in collections["hits"]["hits"]:
-
         item_indexes = await client.indices.get_alias(
             name=f"{ITEMS_INDEX_PREFIX}{collection['_id']}*"
         )
-
         for item_index, aliases in item_indexes.items():
-            item_index_name, version = item_index.rsplit("-", 1)
-            new_item_index = f"{item_index_name}-{str(int(version) + 1).zfill(6)}"
+            add_step(steps, alias_actions, item_index, aliases)
+
+    return new_reindex_task(
+        "reindex",
+        steps,
+        alias_actions=alias_actions,
+        requests_per_second=requests_per_second,
+        max_parallel=max_parallel,
+    )
 
-            await reindex(client, item_index, new_item_index, aliases)
 
-    await client.close()
+async def run(args):
+    """Reindex all STAC indexes for mapping update"""
+    client = AsyncElasticsearchSettings().create_client
+
+    try:
+        if args.resume:
+            runner = await ReindexTaskRunner.claim(client, args.resume)
+            if runner is None:
+                raise SystemExit(f"Task {args.resume} is finished or owned by a runner")
+        else:
+            await create_index_templates()
+            task = await plan(client, args.requests_per_second, args.max_parallel)
+            runner = await ReindexTaskRunner.create(client, task)
+            print(f"reindex task {task['id']}: {len(task['steps'])} indexes")
+
+        result = await runner.run()
+        for step in result["steps"]:
+            print(f"{step['source']} -> {step['dest']}: {step['status']}")
+        print(f"reindex task {result['id']} {result['status']}")
+    finally:
+        await client.close()
+
+
+def parse_args():
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(description=run.__doc__)
+    parser.add_argument(
+        "--resume", metavar="TASK_ID", help="Resume an interrupted reindex task."
+    )
+    parser.add_argument(
+        "--requests-per-second",
+        type=float,
+        default=None,
+        help="Reindex throttle (-1 disables it). Defaults to REINDEX_REQUESTS_PER_SECOND.",
+    )
+    parser.add_argument(
+        "--max-parallel",
+        type=int,
+        default=None,
+        help="Indexes reindexed concurrently. Defaults to REINDEX_MAX_PARALLEL.",
+    )
+    return parser.parse_args()
 
 
 if __name__ == "__main__":
-    asyncio.run(run())
+    asyncio.run(run(parse_args()))
@@ -0,0 +1,355 @@
+"""Replay items from the item queue Dead Letter Queue (DLQ).
+
+Failed items keep their compressed payload in Redis for QUEUE_DLQ_PAYLOAD_TTL
+seconds (see `AsyncRedisQueueManager.save_failed_items`). This tool drains those
+entries in large concurrent batches, either back into the pending queue
+(`--mode requeue`, picked up by the item queue worker) or straight into the
+search engine (`--mode index`).
+
+Successfully replayed items are removed from the DLQ. Items that fail again stay
+in the DLQ with their payload, so the tool can simply be re-run.
+
+Usage:
+    python scripts/replay_dlq.py --mode requeue
+    python scripts/replay_dlq.py --mode index --collection my-collection \\
+        --batch-size 2000 --concurrency 8 --rate-limit 5000
+
+Redis, queue and backend configuration are read from the same environment
+variables as the item queue worker (REDIS_*, QUEUE_KEY_PREFIX, BACKEND).
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Any, Literal
+
+from stac_fastapi.core.redis_utils import (
+    AsyncRedisQueueManager,
+    ItemQueueSettings,
+    close_redis,
+    failed_item_ids,
+)
+
+logger = logging.getLogger(__name__)
+
+ReplayMode = Literal["requeue", "index"]
+
+
+@dataclass
+class ReplayStats:
+    """Counters reported while replaying the DLQ."""
+
+    total: int = 0
+    replayed: int = 0
+    failed: int = 0
+    missing: int = 0
+    started_at: float = field(default_factory=time.monotonic)
+
+    @property
+    def processed(self) -> int:
+        """Number of DLQ entries handled so far."""
+        return self.replayed + self.failed + self.missing
+
+    def summary(self) -> dict[str, Any]:
+        """Return the counters with throughput and elapsed time."""
+        elapsed = time.monotonic() - self.started_at
+        data = asdict(self)
+        data.pop("started_at")
+        data["elapsed_seconds"] = round(elapsed, 2)
+        data["items_per_second"] = (
+            round(self.processed / elapsed, 1) if elapsed else 0.0
+        )
+        return data
+
+
+class RateLimiter:
+    """Token bucket limiting the number of items replayed per second."""
+
+    def __init__(self, rate: float | None, burst: int = 1) -> None:
+        """Create a limiter; a rate of None or 0 disables limiting."""
+        self.rate = rate or 0.0
+        self.capacity = max(float(burst), self.rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, amount: int) -> None:
+        """Wait until `amount` items may be sent."""
+        if not self.rate:
+            return
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.capacity, self._tokens + (now - self._updated) * self.rate
+                )
+                self._updated = now
+                if self._tokens >= amount:
+                    self._tokens -= amount
+                    return
+                await asyncio.sleep((amount - self._tokens) / self.rate)
+
+
+class DLQReplayer:
+    """Replay DLQ entries in concurrent batches."""
+
+    _LOCK_TIMEOUT = 300
+
+    def __init__(
+        self,
+        queue_manager: AsyncRedisQueueManager,
+        db: Any = None,
+        mode: ReplayMode = "requeue",
+        batch_size: int = 1000,
+        concurrency: int = 4,
+        rate_limit: float | None = None,
+        dry_run: bool = False,
+        drop_missing: bool = False,
+        progress_interval: float = 10.0,
+    ) -> None:
+        """Configure the replayer.
+
+        Args:
+            queue_manager: Connected queue manager.
+            db: DatabaseLogic instance, required for `mode="index"`.
+            mode: "requeue" to push items back into the pending queue, "index"
+                to bulk-index them directly.
+            batch_size: Number of DLQ entries per batch.
+            concurrency: Maximum number of batches in flight.
+            rate_limit: Maximum items per second, None for unlimited.
+            dry_run: Only count what would be replayed.
+            drop_missing: Remove DLQ entries whose payload expired.
+            progress_interval: Seconds between progress log lines.
+        """
+        if mode == "index" and db is None:
+            raise ValueError("A DatabaseLogic instance is required for mode='index'")
+        self.queue_manager = queue_manager
+        self.db = db
+        self.mode = mode
+        self.batch_size = batch_size
+        self.dry_run = dry_run
+        self.drop_missing = drop_missing
+        self.progress_interval = progress_interval
+        self.stats = ReplayStats()
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._limiter = RateLimiter(rate_limit, burst=batch_size)
+        self._collection_locks: dict[str, asyncio.Lock] = {}
+
+    async def _index_items(self, collection_id: str, items: list[dict]) -> set[str]:
+        """Bulk-index items while holding the worker's collection lock.
+
+        Batches of one collection are serialized (locally and against running
+        workers) because index insertion may create or re-alias indexes.
+
+        Returns:
+            IDs of items that failed to index.
+        """
+        local_lock = self._collection_locks.setdefault(collection_id, asyncio.Lock())
+        async with local_lock:
+            redis_lock = self.queue_manager.redis.lock(
+                f"{self.queue_manager.queue_settings.QUEUE_KEY_PREFIX}:lock:{collection_id}",
+                timeout=self._LOCK_TIMEOUT,
+                blocking_timeout=self._LOCK_TIMEOUT,
+            )
+            if not await redis_lock.acquire(blocking=True):
+                logger.warning(
+                    f"Collection '{collection_id}': could not acquire lock, leaving batch in DLQ"
+                )
+                return {item["id"] for item in items}
+            try:
+                _, errors = await self.db.bulk_async(
+                    collection_id=collection_id,
+                    processed_items=items,
+                    op_type="index",
+                    refresh=False,
+                )
+            finally:
+                try:
+                    if await redis_lock.owned():
+                        await redis_lock.release()
+                except Exception:
+                    pass
+        return failed_item_ids(errors)
+
+    async def _replay_batch(self, collection_id: str, item_ids: list[str]) -> None:
+        """Replay one batch of DLQ entries of a collection."""
+        async with self._semaphore:
+            await self._limiter.acquire(len(item_ids))
+            records = await self.queue_manager.get_failed_records(
+                collection_id, item_ids
+            )
+            missing = [item_id for item_id in item_ids if item_id not in records]
+            items = [record["item"] for record in records.values()]
+
+            if self.dry_run:
+                self.stats.replayed += len(items)
+                self.stats.missing += len(missing)
+                return
+
+            failed: set[str] = set()
+            try:
+                if items and self.mode == "requeue":
+                    await self.queue_manager.queue_items(collection_id, items)
+                elif items:
+                    failed = await self._index_items(collection_id, items)
+            except Exception:
+                logger.exception(
+                    f"Collection '{collection_id}': replay of {len(items)} items failed"
+                )
+                self.stats.failed += len(items)
+                self.stats.missing += len(missing)
+                return
+
+            done = [item["id"] for item in items if item["id"] not in failed]
+            if self.drop_missing:
+                done.extend(missing)
+            await self.queue_manager.remove_failed_items(collection_id, done)
+
+            self.stats.replayed += len(items) - len(failed)
+            self.stats.failed += len(failed)
+            self.stats.missing += len(missing)
+
+    async def _collect_ids(self, collection_id: str) -> list[list[str]]:
+        """Snapshot the failed IDs of a collection into batches."""
+        item_ids: list[str] = []
+        async for chunk in self.queue_manager.scan_failed_item_ids(
+            collection_id, count=self.batch_size
+        ):
+            item_ids.extend(chunk)
+        # SSCAN may return duplicates; keep the first occurrence
+        item_ids = list(dict.fromkeys(item_ids))
+        return [
+            item_ids[i : i + self.batch_size]
+            for i in range(0, len(item_ids), self.batch_size)
+        ]
+
+    async def _report_progress(self) -> None:
+        """Log progress periodically until cancelled."""
+        while True:
+            await asyncio.sleep(self.progress_interval)
+            summary = self.stats.summary()
+            remaining = self.stats.total - self.stats.processed
+            rate = summary["items_per_second"]
+            eta = f"{remaining / rate:.0f}s" if rate else "unknown"
+            logger.info(
+                f"DLQ replay progress: {self.stats.processed}/{self.stats.total} "
+                f"(replayed={self.stats.replayed}, failed={self.stats.failed}, "
+                f"missing={self.stats.missing}, {rate} items/s, eta {eta})"
+            )
+
+    async def run(self, collection_ids: list[str] | None = None) -> dict[str, Any]:
+        """Replay the DLQ of the given collections (all collections by default).
+
+        Returns:
+            Summary counters of the replay.
+        """
+        if collection_ids is None:
+            collection_ids = await self.queue_manager.get_failed_collections()
+
+        batches: list[tuple[str, list[str]]] = []
+        for collection_id in collection_ids:
+            for batch in await self._collect_ids(collection_id):
+                batches.append((collection_id, batch))
+                self.stats.total += len(batch)
+
+        logger.info(
+            f"Replaying {self.stats.total} DLQ entries from {len(collection_ids)} "
+            f"collection(s) in {len(batches)} batches (mode={self.mode}, dry_run={self.dry_run})"
+        )
+
+        self.stats.started_at = time.monotonic()
+        progress_task = asyncio.create_task(self._report_progress())
+        try:
+            await asyncio.gather(
+                *(self._replay_batch(cid, batch) for cid, batch in batches)
+            )
+        finally:
+            progress_task.cancel()
+            await asyncio.gather(progress_task, return_exceptions=True)
+
+        summary = self.stats.summary()
+        logger.info(f"DLQ replay finished: {summary}")
+        return summary
+
+
+def _create_database_logic(backend: str):  # type: ignore[no-untyped-def]
+    """Create the DatabaseLogic of the configured backend."""
+    if backend == "elasticsearch":
+        from stac_fastapi.elasticsearch.database_logic import DatabaseLogic
+    else:
+        from stac_fastapi.opensearch.database_logic import DatabaseLogic
+    return DatabaseLogic()
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--mode",
+        choices=("requeue", "index"),
+        default="requeue",
+        help="Push items back into the pending queue or bulk-index them directly.",
+    )
+    parser.add_argument(
+        "--collection",
+        action="append",
+        dest="collections",
+        help="Collection to replay (repeatable). Defaults to all collections in the DLQ.",
+    )
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument(
+        "--rate-limit",
+        type=float,
+        default=None,
+        help="Maximum number of items replayed per second.",
+    )
+    parser.add_argument("--progress-interval", type=float, default=10.0)
+    parser.add_argument(
+        "--drop-missing",
+        action="store_true",
+        help="Remove DLQ entries whose payload has expired.",
+    )
+    parser.add_argument("--dry-run", action="store_true")
+    return parser.parse_args(argv)
+
+
+async def replay(args: argparse.Namespace) -> dict[str, Any]:
+    """Run a replay with parsed CLI arguments."""
+    settings = ItemQueueSettings()
+    queue_manager = await AsyncRedisQueueManager.create()
+    db = _create_database_logic(settings.BACKEND) if args.mode == "index" else None
+    try:
+        replayer = DLQReplayer(
+            queue_manager,
+            db=db,
+            mode=args.mode,
+            batch_size=args.batch_size,
+            concurrency=args.concurrency,
+            rate_limit=args.rate_limit,
+            dry_run=args.dry_run,
+            drop_missing=args.drop_missing,
+            progress_interval=args.progress_interval,
+        )
+        return await replayer.run(args.collections)
+    finally:
+        await queue_manager.close()
+        await close_redis()
+
+
+def main() -> None:
+    """Entry point for the DLQ replay tool."""
+    settings = ItemQueueSettings()
+    logging.basicConfig(
+        level=getattr(logging, settings.LOG_LEVEL, logging.INFO),
+        format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
+    )
+    summary = asyncio.run(replay(parse_args()))
+    print(json.dumps(summary))
+
+
+if __name__ == "__main__":
+    main()
@@ -96,6 +96,48 @@ class BaseDatabaseLogic(abc.ABC):
         """Delete an item from the database."""
         pass
 
+    @abc.abstractmethod
+    async def bulk_delete_items(
+        self, collection_id: str, item_ids: list[str], refresh: bool = False
+    ) -> dict[str, Any]:
+        """Delete items of a collection by id with one bulk request."""
+        pass
+
+    @abc.abstractmethod
+    async def delete_items_by_search(
+        self,
+        collection_id: str,
+        search: Any,
+        datetime_search: dict[str, Any],
+        requests_per_second: float | None = None,
+    ) -> dict[str, Any]:
+        """Delete the items of a collection matching a search in a background task."""
+        pass
+
+    @abc.abstractmethod
+    async def bulk_patch_items(
+        self,
+        collection_id: str,
+        item_ids: list[str],
+        patch: Any,
+        refresh: bool = False,
+    ) -> dict[str, Any]:
+        """Apply one merge or JSON patch to items of a collection by id."""
+        pass
+
+    @abc.abstractmethod
+    async def patch_items_by_search(
+        self,
+        collection_id: str,
+        search: Any,
+        datetime_search: dict[str, Any],
+        patch: Any,
+        refresh: bool = True,
+        requests_per_second: float | None = None,
+    ) -> dict[str, Any]:
+        """Apply one patch to the items matching a search in a background task."""
+        pass
+
     @abc.abstractmethod
     async def get_items_mapping(self, collection_id: str) -> dict[str, dict[str, Any]]:
         """Get the mapping for the items in the collection."""
@@ -144,8 +186,45 @@ class BaseDatabaseLogic(abc.ABC):
     @abc.abstractmethod
     async def update_collection(
         self, collection_id: str, collection: Collection, **kwargs: Any
-    ) -> None:
-        """Update a collection in the database."""
+    ) -> dict[str, Any] | None:
+        """Update a collection in the database, returning a reindex task on id change."""
+        pass
+
+    @abc.abstractmethod
+    async def get_reindex_task(self, task_id: str) -> dict[str, Any] | None:
+        """Return the status of a reindex task, if it exists."""
+        pass
+
+    @abc.abstractmethod
+    async def list_reindex_tasks(
+        self, status: str | None = None, limit: int = 100
+    ) -> list[dict[str, Any]]:
+        """List reindex tasks, newest first."""
+        pass
+
+    @abc.abstractmethod
+    async def resume_reindex_tasks(self) -> list[str]:
+        """Resume unfinished reindex tasks whose runner stopped."""
+        pass
+
+    @abc.abstractmethod
+    async def start_rollups(self, refresh_loop: bool = True) -> None:
+        """Keep rollup summaries up to date, if enabled."""
+        pass
+
+    @abc.abstractmethod
+    async def refresh_rollups(self, collection_id: str) -> int:
+        """Rebuild the rollup summaries of a collection."""
+        pass
+
+    @abc.abstractmethod
+    async def start_queryables_store(self, refresh_loop: bool = True) -> None:
+        """Keep the stored queryables of collections up to date, if enabled."""
+        pass
+
+    @abc.abstractmethod
+    async def get_stored_queryables(self, collection_id: str) -> dict[str, Any] | None:
+        """Return the stored queryables of a collection, if the store is enabled."""
         pass
 
     @abc.abstractmethod
@@ -204,6 +283,33 @@ class BaseDatabaseLogic(abc.ABC):
         """Delete a catalog from the database."""
         pass
 
+    @abc.abstractmethod
+    async def get_ancestor_ids(self, parent_ids: list[str]) -> list[str]:
+        """Compute the ancestors of a new catalog or collection from its parents."""
+        pass
+
+    @abc.abstractmethod
+    async def update_ancestor_ids(
+        self, root_ids: list[str] | None = None, refresh: bool = True
+    ) -> int:
+        """Recompute the ancestors of catalogs and of all their descendants."""
+        pass
+
+    @abc.abstractmethod
+    async def backfill_ancestor_ids(self) -> int:
+        """Add `ancestor_ids` to catalogs and collections written before it existed."""
+        pass
+
+    @abc.abstractmethod
+    async def get_descendant_collection_ids(self, catalog_id: str) -> list[str]:
+        """Get the IDs of all collections below a catalog, at any depth."""
+        pass
+
+    @abc.abstractmethod
+    async def get_catalog_hierarchy(self) -> list[dict[str, Any]]:
+        """Get the `id`, `type`, `title` and `parent_ids` of all catalogs and linked collections."""
+        pass
+
     @abc.abstractmethod
     async def get_catalog_children(
         self,
@@ -416,10 +522,46 @@ class BaseDatabaseLogic(abc.ABC):
         datetime_frequency_interval: str,
         datetime_search: str,
         ignore_unavailable: bool | None = True,
+        approximate: bool = False,
+        bucket_limit: int | None = None,
+        after_keys: dict[str, Any] | None = None,
     ) -> Any:
         """Return aggregations of STAC Items."""
         pass
 
+    @abc.abstractmethod
+    async def aggregate_geotile(
+        self,
+        collection_ids: list[str] | None,
+        search: Any,
+        datetime_search: str | None,
+        zoom: int,
+        x: int,
+        y: int,
+        grid_offset: int,
+    ) -> list[dict[str, Any]]:
+        """Return the centroid geotile grid buckets of the items inside a tile."""
+        pass
+
+    @abc.abstractmethod
+    async def aggregate_from_rollups(
+        self,
+        collection_ids: list[str] | None,
+        aggregations: list[str],
+        datetime_search: str | None,
+        interval: str,
+        geotile_precision: int,
+    ) -> dict[str, Any] | None:
+        """Return aggregations from rollup summaries, or None if they cannot answer."""
+        pass
+
+    @abc.abstractmethod
+    async def split_unchanged_items(
+        self, collection_id: str, processed_items: list[Item]
+    ) -> tuple[list[Item], list[str]]:
+        """Separate items whose stored content hash matches from those to write."""
+        pass
+
     @abc.abstractmethod
     async def bulk_async(
         self,
@@ -454,6 +596,34 @@ class BaseDatabaseLogic(abc.ABC):
         """Prepare an item for insertion into the database."""
         pass
 
+    @abc.abstractmethod
+    async def start_bulk_load_session(
+        self, collection_id: str, ttl: int | None = None
+    ) -> dict[str, Any]:
+        """Start or renew a bulk-load session for a collection."""
+        pass
+
+    @abc.abstractmethod
+    async def get_bulk_load_session(self, collection_id: str) -> dict[str, Any] | None:
+        """Return the active bulk-load session of a collection, if any."""
+        pass
+
+    @abc.abstractmethod
+    async def finish_bulk_load_session(
+        self,
+        collection_id: str,
+        forcemerge: bool = False,
+        wait_for_status: str | None = "green",
+        timeout: str = "30s",
+    ) -> dict[str, Any] | None:
+        """Finish a bulk-load session and restore the original index settings."""
+        pass
+
+    @abc.abstractmethod
+    async def revert_stale_bulk_load_sessions(self) -> list[str]:
+        """Revert bulk-load sessions whose lease expired."""
+        pass
+
     @abc.abstractmethod
     async def check_collection_exists(self, collection_id: str) -> None:
         """Check if a collection exists."""
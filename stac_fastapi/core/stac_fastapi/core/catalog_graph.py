@@ -0,0 +1,291 @@
+"""Process-wide graph of the catalog hierarchy.
+
+With `ENABLE_CATALOG_GRAPH=true` the catalogs extension reads parent/child
+relationships from an in-memory graph instead of querying the collections
+index, so child links and descendant expansion are dictionary lookups. The
+graph holds the id, type, title and parent ids of every catalog and of every
+collection linked to a catalog.
+
+The graph is loaded at startup and stamped with a version. The catalog and
+collection write paths apply their changes to the graph and bump the version.
+With `REDIS_ENABLE=true` the version is kept in Redis, so a change made by
+another API worker makes the graph of this process outdated and it is
+reloaded on the next read. A graph older than `CATALOG_GRAPH_MAX_AGE` seconds
+is reloaded too, to pick up changes made outside the API.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from typing import Any, Awaitable, Callable, Iterable, NamedTuple
+
+from stac_fastapi.core.utilities import get_bool_env
+
+logger = logging.getLogger(__name__)
+
+REDIS_VERSION_KEY = "catalog_graph_version"
+
+
+class HierarchyNode(NamedTuple):
+    """A catalog or linked collection of the hierarchy."""
+
+    id: str
+    type: str
+    title: str
+    parent_ids: tuple[str, ...]
+
+
+def _node_of(document: dict[str, Any]) -> HierarchyNode | None:
+    """Return the node of a catalog or collection document, or None if it is not linked."""
+    doc_id = document["id"]
+    doc_type = document.get("type", "Collection")
+    parent_ids = tuple(dict.fromkeys(document.get("parent_ids") or []))
+    if doc_type != "Catalog" and not parent_ids:
+        return None
+    return HierarchyNode(doc_id, doc_type, document.get("title", doc_id), parent_ids)
+
+
+class HierarchySnapshot:
+    """An immutable view of the hierarchy."""
+
+    def __init__(
+        self,
+        nodes: dict[str, HierarchyNode],
+        children: dict[str, list[str]] | None = None,
+    ):
+        """Initialize the snapshot.
+
+        Args:
+            nodes (dict[str, HierarchyNode]): The nodes by id.
+            children (dict[str, list[str]] | None): The sorted child ids by
+                parent id, derived from `nodes` if not given.
+        """
+        self._nodes = nodes
+        if children is None:
+            children = {}
+            for node in nodes.values():
+                for parent_id in node.parent_ids:
+                    children.setdefault(parent_id, []).append(node.id)
+            for child_ids in children.values():
+                child_ids.sort()
+        self._children = children
+
+    @classmethod
+    def from_documents(cls, documents: Iterable[dict[str, Any]]) -> "HierarchySnapshot":
+        """Build a snapshot from catalog and collection documents."""
+        nodes = {}
+        for document in documents:
+            node = _node_of(document)
+            if node is not None:
+                nodes[node.id] = node
+        return cls(nodes)
+
+    def __len__(self) -> int:
+        """Return the number of nodes."""
+        return len(self._nodes)
+
+    def node(self, node_id: str) -> HierarchyNode | None:
+        """Return a node by id."""
+        return self._nodes.get(node_id)
+
+    def children(
+        self, catalog_id: str, resource_type: str | None = None
+    ) -> list[HierarchyNode]:
+        """Return the children of a catalog, sorted by id.
+
+        Args:
+            catalog_id (str): The parent catalog.
+            resource_type (str | None): Only return children of this type.
+        """
+        children = [
+            self._nodes[child_id] for child_id in self._children.get(catalog_id, [])
+        ]
+        if resource_type:
+            children = [child for child in children if child.type == resource_type]
+        return children
+
+    def descendant_collection_ids(self, catalog_id: str) -> list[str]:
+        """Return the ids of all collections below a catalog, at any depth."""
+        visited = {catalog_id}
+        queue = [catalog_id]
+        collection_ids = set()
+        while queue:
+            for child_id in self._children.get(queue.pop(), []):
+                if self._nodes[child_id].type != "Catalog":
+                    collection_ids.add(child_id)
+                elif child_id not in visited:
+                    visited.add(child_id)
+                    queue.append(child_id)
+        return sorted(collection_ids)
+
+    def with_changes(
+        self, upserted: Iterable[dict[str, Any]] = (), removed: Iterable[str] = ()
+    ) -> "HierarchySnapshot":
+        """Return a snapshot with written and deleted documents applied.
+
+        Args:
+            upserted (Iterable[dict[str, Any]]): Written catalog and collection documents.
+            removed (Iterable[str]): Ids of deleted catalogs and collections.
+
+        Returns:
+            HierarchySnapshot: The new snapshot, or this one if nothing changed.
+        """
+        changes = {doc_id: None for doc_id in removed}
+        changes.update((document["id"], _node_of(document)) for document in upserted)
+        changes = {
+            doc_id: node
+            for doc_id, node in changes.items()
+            if self._nodes.get(doc_id) != node
+        }
+        if not changes:
+            return self
+
+        nodes = dict(self._nodes)
+        children = dict(self._children)
+        touched = set()
+        for doc_id, node in changes.items():
+            old = nodes.pop(doc_id, None)
+            if old is not None:
+                touched.update(old.parent_ids)
+            if node is not None:
+                nodes[doc_id] = node
+                touched.update(node.parent_ids)
+        for parent_id in touched:
+            child_ids = set(children.get(parent_id, [])) | changes.keys()
+            children[parent_id] = sorted(
+                child_id
+                for child_id in child_ids
+                if child_id in nodes and parent_id in nodes[child_id].parent_ids
+            )
+        return HierarchySnapshot(nodes, children)
+
+
+class CatalogGraph:
+    """Version-stamped, lazily reloaded hierarchy snapshot."""
+
+    def __init__(self, max_age: float | None = None):
+        """Initialize an empty graph.
+
+        Args:
+            max_age (float | None): Seconds after which the graph is reloaded,
+                `CATALOG_GRAPH_MAX_AGE` by default.
+        """
+        if max_age is None:
+            max_age = float(os.getenv("CATALOG_GRAPH_MAX_AGE", "300"))
+        self.max_age = max_age
+        self._snapshot: HierarchySnapshot | None = None
+        self._stamp: tuple[int, int | None] | None = None
+        self._loaded_at = 0.0
+        self._local_version = 0
+        self._lock = asyncio.Lock()
+
+    @staticmethod
+    async def _redis() -> Any | None:
+        if not get_bool_env("REDIS_ENABLE", default=False):
+            return None
+        from stac_fastapi.core.redis_utils import get_redis
+
+        return await get_redis()
+
+    async def version(self) -> tuple[int, int | None]:
+        """Return the version of the hierarchy, as seen by this process."""
+        try:
+            redis = await self._redis()
+            if redis is not None:
+                return self._local_version, int(await redis.get(REDIS_VERSION_KEY) or 0)
+        except Exception as e:
+            logger.warning(f"Could not read the catalog graph version: {e}")
+        return self._local_version, None
+
+    def _is_fresh(self, version: tuple[int, int | None]) -> bool:
+        return (
+            self._snapshot is not None
+            and self._stamp == version
+            and time.monotonic() - self._loaded_at < self.max_age
+        )
+
+    async def get(
+        self, load: Callable[[], Awaitable[list[dict[str, Any]]]]
+    ) -> HierarchySnapshot:
+        """Return the current hierarchy, (re)loading it if it is outdated.
+
+        Args:
+            load (Callable[[], Awaitable[list[dict[str, Any]]]]): Returns the
+                `id`, `type`, `title` and `parent_ids` of all catalogs and
+                linked collections.
+
+        Returns:
+            HierarchySnapshot: The hierarchy.
+        """
+        snapshot = self._snapshot
+        if snapshot is not None and self._is_fresh(await self.version()):
+            return snapshot
+        async with self._lock:
+            # The version is read first: a change during the load makes the
+            # loaded graph outdated instead of being missed
+            version = await self.version()
+            if self._is_fresh(version):
+                return self._snapshot  # type: ignore[return-value]
+            started = time.monotonic()
+            snapshot = HierarchySnapshot.from_documents(await load())
+            self._snapshot, self._stamp, self._loaded_at = snapshot, version, started
+            logger.info(
+                f"Loaded the catalog graph ({len(snapshot)} nodes) in "
+                f"{time.monotonic() - started:.2f}s"
+            )
+            return snapshot
+
+    async def apply(
+        self, upserted: Iterable[dict[str, Any]] = (), removed: Iterable[str] = ()
+    ) -> None:
+        """Record a change of the hierarchy written by this process.
+
+        The change is applied to the loaded graph if no other process changed
+        the hierarchy since it was loaded, otherwise the graph is reloaded on
+        the next read.
+
+        Args:
+            upserted (Iterable[dict[str, Any]]): Written catalog and collection documents.
+            removed (Iterable[str]): Ids of deleted catalogs and collections.
+        """
+        upserted, removed = list(upserted), list(removed)
+        if self._snapshot is not None and self._is_fresh(await self.version()):
+            if self._snapshot.with_changes(upserted, removed) is self._snapshot:
+                return
+
+        self._local_version += 1
+        version: tuple[int, int | None] = (self._local_version, None)
+        try:
+            redis = await self._redis()
+            if redis is not None:
+                version = (
+                    self._local_version,
+                    int(await redis.incr(REDIS_VERSION_KEY)),
+                )
+        except Exception as e:
+            logger.warning(f"Could not bump the catalog graph version: {e}")
+
+        previous = (version[0] - 1, None if version[1] is None else version[1] - 1)
+        if self._snapshot is not None and self._stamp == previous:
+            self._snapshot = self._snapshot.with_changes(upserted, removed)
+            self._stamp = version
+
+
+catalog_graph = CatalogGraph()
+
+
+def get_catalog_graph() -> CatalogGraph | None:
+    """Return the process-wide catalog graph, or None if it is disabled."""
+    if not get_bool_env("ENABLE_CATALOG_GRAPH", default=False):
+        return None
+    return catalog_graph
+
+
+async def apply_to_catalog_graph(
+    upserted: Iterable[dict[str, Any]] = (), removed: Iterable[str] = ()
+) -> None:
+    """Apply written or deleted collections to the catalog graph, if it is enabled."""
+    graph = get_catalog_graph()
+    if graph is not None:
+        await graph.apply(upserted, removed)
@@ -2,7 +2,7 @@
 
 import logging
 from datetime import datetime
-from typing import Any, List, Literal, Set
+from typing import Any, List, Literal
 
 import attr
 from fastapi import HTTPException, Request
@@ -19,12 +19,12 @@ from stac_pydantic.item_collection import ItemCollection
 from starlette.responses import JSONResponse, Response
 
 from stac_fastapi.core.base_database_logic import BaseDatabaseLogic
+from stac_fastapi.core.catalog_graph import CatalogGraph, get_catalog_graph
 from stac_fastapi.core.serializers import (
     CatalogSerializer,
     CollectionSerializer,
     ItemSerializer,
 )
-from stac_fastapi.sfeos_helpers.mappings import COLLECTIONS_INDEX
 from stac_fastapi.types.errors import NotFoundError
 from stac_fastapi.types.search import BaseSearchPostRequest
 
@@ -44,6 +44,7 @@ class CatalogsClient(AsyncBaseCatalogsClient, AsyncCatalogsSearchClient):
     collection_serializer: CollectionSerializer = attr.ib(default=CollectionSerializer)
     item_serializer: ItemSerializer = attr.ib(default=ItemSerializer)
     core_client: Any = attr.ib(default=None)
+    catalog_graph: CatalogGraph | None = attr.ib(factory=get_catalog_graph)
 
     def _get_base_url(self, request: Request | None) -> str:
         """Extract base URL from request with sensible default.
@@ -121,6 +122,36 @@ class CatalogsClient(AsyncBaseCatalogsClient, AsyncCatalogsSearchClient):
         if "parent_ids" in obj:
             obj["parent_ids"] = [pid for pid in obj["parent_ids"] if pid != parent_id]
 
+    async def _get_child_links_source(
+        self, catalog_id: str, request: Request | None
+    ) -> list[dict]:
+        """Return the first 100 children of a catalog, for its child links.
+
+        Read from the catalog graph when it is enabled, otherwise from the index.
+        """
+        if self.catalog_graph is not None:
+            hierarchy = await self.catalog_graph.get(
+                self.database.get_catalog_hierarchy
+            )
+            return [
+                {"id": child.id, "type": child.type, "title": child.title}
+                for child in hierarchy.children(catalog_id)[:100]
+            ]
+        children_list, _, _ = await self.database.get_catalog_children(
+            catalog_id=catalog_id,
+            limit=100,
+            token=None,
+            request=request,
+        )
+        return children_list
+
+    async def _hierarchy_changed(
+        self, upserted: list[dict] | None = None, removed: list[str] | None = None
+    ) -> None:
+        """Apply a written or deleted catalog or collection to the catalog graph."""
+        if self.catalog_graph is not None:
+            await self.catalog_graph.apply(upserted or [], removed or [])
+
     async def get_catalogs(
         self,
         limit: int | None = None,
@@ -236,11 +267,8 @@ class CatalogsClient(AsyncBaseCatalogsClient, AsyncCatalogsSearchClient):
 
             # Get children (catalogs and collections) for child links
             try:
-                children_list, _, _ = await self.database.get_catalog_children(
-                    catalog_id=original_catalog.get("id"),
-                    limit=100,
-                    token=None,
-                    request=request,
+                children_list = await self._get_child_links_source(
+                    original_catalog.get("id"), request
                 )
 
                 # Add child links for each child (up to 100)
@@ -287,6 +315,9 @@ class CatalogsClient(AsyncBaseCatalogsClient, AsyncCatalogsSearchClient):
         db_catalog_dict = self._to_dict(catalog)
         db_catalog_dict["type"] = "Catalog"
         db_catalog_dict["parent_ids"] = db_catalog_dict.get("parent_ids", [])
+        db_catalog_dict["ancestor_ids"] = await self.database.get_ancestor_ids(
+            db_catalog_dict["parent_ids"]
+        )
 
         # Filter out dynamic links
         if "links" in db_catalog_dict:
@@ -305,6 +336,7 @@ class CatalogsClient(AsyncBaseCatalogsClient, AsyncCatalogsSearchClient):
                 exc_info=True,
             )
             raise
+        await self._hierarchy_changed(upserted=[db_catalog_dict])
         created_obj = self.catalog_serializer.db_to_stac(
             db_catalog_dict, request, extensions=["CatalogsExtension"]
         )
@@ -417,12 +449,7 @@ class CatalogsClient(AsyncBaseCatalogsClient, AsyncCatalogsSearchClient):
 
         # 7. Dynamically inject child links (one level deep lookup)
         try:
-            children_list, _, _ = await self.database.get_catalog_children(
-                catalog_id=catalog_id,
-                limit=100,
-                token=None,
-                request=request,
-            )
+            children_list = await self._get_child_links_source(catalog_id, request)
 
             for child in children_list[:100]:
                 child_id = child.get("id")
@@ -469,6 +496,7 @@ class CatalogsClient(AsyncBaseCatalogsClient, AsyncCatalogsSearchClient):
         db_catalog_dict["type"] = "Catalog"
         db_catalog_dict["id"] = catalog_id
         db_catalog_dict["parent_ids"] = existing.get("parent_ids", [])
+        db_catalog_dict["ancestor_ids"] = existing.get("ancestor_ids", [])
 
         # Filter out dynamic links
         if "links" in db_catalog_dict:
@@ -484,6 +512,7 @@ class CatalogsClient(AsyncBaseCatalogsClient, AsyncCatalogsSearchClient):
         except Exception as e:
             logger.error(f"Error updating catalog {catalog_id}: {e}", exc_info=True)
             raise
+        await self._hierarchy_changed(upserted=[db_catalog_dict])
         updated = await self.database.find_catalog(catalog_id)
         updated_obj = self.catalog_serializer.db_to_stac(
             updated, request, extensions=["CatalogsExtension"]
@@ -504,9 +533,12 @@ class CatalogsClient(AsyncBaseCatalogsClient, AsyncCatalogsSearchClient):
         """Delete a catalog."""
         try:
             await self.database.delete_catalog(catalog_id, refresh=True)
+            # Drop the catalog from the ancestors of everything below it
+            await self.database.update_ancestor_ids([catalog_id])
         except Exception as e:
             logger.error(f"Error deleting catalog {catalog_id}: {e}", exc_info=True)
             raise
+        await self._hierarchy_changed(removed=[catalog_id])
 
     async def get_catalog_collections(
         self,
@@ -647,11 +679,8 @@ class CatalogsClient(AsyncBaseCatalogsClient, AsyncCatalogsSearchClient):
 
             # Get children (catalogs and collections) for child links
             try:
-                children_list, _, _ = await self.database.get_catalog_children(
-                    catalog_id=cat.get("id"),
-                    limit=100,
-                    token=None,
-                    request=request,
+                children_list = await self._get_child_links_source(
+                    cat.get("id"), request
                 )
 
                 # Add child links for each child (up to 100)
@@ -739,12 +768,14 @@ class CatalogsClient(AsyncBaseCatalogsClient, AsyncCatalogsSearchClient):
             self._add_parent_id(existing, catalog_id)
             try:
                 await self.database.create_catalog(existing, refresh=True)
+                await self.database.update_ancestor_ids([cat_id])
             except Exception as e:
                 logger.error(
                     f"Error linking existing catalog {cat_id} to catalog {catalog_id}: {e}",
                     exc_info=True,
                 )
                 raise
+            await self._hierarchy_changed(upserted=[existing])
             existing_obj = self.catalog_serializer.db_to_stac(
                 existing, request, extensions=["CatalogsExtension"]
             )
@@ -758,6 +789,9 @@ class CatalogsClient(AsyncBaseCatalogsClient, AsyncCatalogsSearchClient):
             db_catalog_dict = self._to_dict(catalog)
             db_catalog_dict["type"] = "Catalog"
             db_catalog_dict["parent_ids"] = [catalog_id]
+            db_catalog_dict["ancestor_ids"] = await self.database.get_ancestor_ids(
+                [catalog_id]
+            )
 
             # Filter out dynamic links
             if "links" in db_catalog_dict:
@@ -776,6 +810,7 @@ class CatalogsClient(AsyncBaseCatalogsClient, AsyncCatalogsSearchClient):
                     exc_info=True,
                 )
                 raise
+            await self._hierarchy_changed(upserted=[db_catalog_dict])
             new_obj = self.catalog_serializer.db_to_stac(
                 db_catalog_dict, request, extensions=["CatalogsExtension"]
             )
@@ -817,6 +852,9 @@ class CatalogsClient(AsyncBaseCatalogsClient, AsyncCatalogsSearchClient):
                 self._add_parent_id(existing, catalog_id)
             except NotFoundError:
                 raise NotFoundError(f"Collection {col_id} not found")
+            existing["ancestor_ids"] = await self.database.get_ancestor_ids(
+                existing["parent_ids"]
+            )
 
             try:
                 await self.database.update_collection(col_id, existing, refresh=True)
@@ -826,6 +864,7 @@ class CatalogsClient(AsyncBaseCatalogsClient, AsyncCatalogsSearchClient):
                     exc_info=True,
                 )
                 raise
+            await self._hierarchy_changed(upserted=[existing])
 
             collection_obj = self.collection_serializer.db_to_stac_in_catalog(
                 existing,
@@ -846,6 +885,9 @@ class CatalogsClient(AsyncBaseCatalogsClient, AsyncCatalogsSearchClient):
             pass
         else:
             # Collection exists, link it
+            existing["ancestor_ids"] = await self.database.get_ancestor_ids(
+                existing["parent_ids"]
+            )
             try:
                 await self.database.update_collection(col_id, existing, refresh=True)
             except Exception as e:
@@ -854,6 +896,7 @@ class CatalogsClient(AsyncBaseCatalogsClient, AsyncCatalogsSearchClient):
                     exc_info=True,
                 )
                 raise
+            await self._hierarchy_changed(upserted=[existing])
 
             collection_obj = self.collection_serializer.db_to_stac_in_catalog(
                 existing,
@@ -868,6 +911,7 @@ class CatalogsClient(AsyncBaseCatalogsClient, AsyncCatalogsSearchClient):
         # Create new collection
         col_dict = self._to_dict(collection)
         col_dict["parent_ids"] = [catalog_id]
+        col_dict["ancestor_ids"] = await self.database.get_ancestor_ids([catalog_id])
 
         # Filter out dynamic links
         if "links" in col_dict:
@@ -886,6 +930,7 @@ class CatalogsClient(AsyncBaseCatalogsClient, AsyncCatalogsSearchClient):
                 exc_info=True,
             )
             raise
+        await self._hierarchy_changed(upserted=[col_dict])
         collection_obj = self.collection_serializer.db_to_stac_in_catalog(
             col_dict,
             request,
@@ -986,6 +1031,7 @@ class CatalogsClient(AsyncBaseCatalogsClient, AsyncCatalogsSearchClient):
         updated_dict = self._to_dict(collection)
         updated_dict["id"] = collection_id
         updated_dict["parent_ids"] = parent_ids  # Preserve catalog linkage
+        updated_dict["ancestor_ids"] = collection_dict.get("ancestor_ids", [])
 
         # Filter out dynamic links
         if "links" in updated_dict:
@@ -1006,6 +1052,7 @@ class CatalogsClient(AsyncBaseCatalogsClient, AsyncCatalogsSearchClient):
                 exc_info=True,
             )
             raise
+        await self._hierarchy_changed(upserted=[updated_dict])
 
         # Fetch updated collection
         updated_collection = await self.database.get_catalog_collection(
@@ -1055,6 +1102,9 @@ class CatalogsClient(AsyncBaseCatalogsClient, AsyncCatalogsSearchClient):
 
         # Remove this catalog from parent_ids
         self._remove_parent_id(collection_dict, catalog_id)
+        collection_dict["ancestor_ids"] = await self.database.get_ancestor_ids(
+            collection_dict["parent_ids"]
+        )
         try:
             await self.database.update_collection(
                 collection_id, collection_dict, refresh=True
@@ -1065,6 +1115,7 @@ class CatalogsClient(AsyncBaseCatalogsClient, AsyncCatalogsSearchClient):
                 exc_info=True,
             )
             raise
+        await self._hierarchy_changed(upserted=[collection_dict])
 
     async def get_catalog_collection_items(
         self,
@@ -1453,20 +1504,22 @@ class CatalogsClient(AsyncBaseCatalogsClient, AsyncCatalogsSearchClient):
         self._remove_parent_id(sub_catalog, catalog_id)
         try:
             await self.database.create_catalog(sub_catalog, refresh=True)
+            await self.database.update_ancestor_ids([sub_catalog_id])
         except Exception as e:
             logger.error(
                 f"Error unlinking sub-catalog {sub_catalog_id} from catalog {catalog_id}: {e}",
                 exc_info=True,
             )
             raise
+        await self._hierarchy_changed(upserted=[sub_catalog])
 
     async def get_all_descendant_collections(
         self, catalog_id: str, request: Request | None = None, **kwargs
     ) -> List[str]:
-        """BFS DAG crawl to find all descendant collections using parent_ids field.
+        """Find all descendant collections in the catalog graph or with the ancestor_ids field.
 
         Args:
-            catalog_id: The root catalog ID to start traversal from.
+            catalog_id: The root catalog ID.
             request: FastAPI request object.
             **kwargs: Additional keyword arguments.
 
@@ -1477,60 +1530,24 @@ class CatalogsClient(AsyncBaseCatalogsClient, AsyncCatalogsSearchClient):
             NotFoundError: If the catalog does not exist.
         """
         # Validate that the catalog exists
-        try:
-            await self.database.find_catalog(catalog_id)
-        except NotFoundError:
-            raise
+        await self.database.find_catalog(catalog_id)
 
-        visited_catalogs: Set[str] = {catalog_id}
-        queue: List[str] = [catalog_id]
-        descendant_collections: Set[str] = set()
-
-        # SFEOS uses the collections index for both catalogs and collections (configurable via STAC_COLLECTIONS_INDEX)
-        index_name = COLLECTIONS_INDEX
-
-        while queue:
-            # We can fetch both Sub-Catalogs AND Collections in a single query!
-            query = {
-                "query": {"terms": {"parent_ids": queue}},
-                "_source": ["id", "type"],
-                "size": 10000,
-            }
-            try:
-                resp = await self.database.client.search(index=index_name, body=query)
-                hits = resp.get("hits", {}).get("hits", [])
-
-                if len(hits) == 10000:
-                    logger.warning(
-                        "DAG traversal hit 10k result limit. Some descendants may be truncated."
-                    )
-
-                next_queue = []
-                for hit in hits:
-                    source = hit.get("_source", {})
-                    doc_id = source.get("id")
-                    # Differentiate between Catalog and Collection
-                    doc_type = source.get("type", "Collection")
-
-                    if doc_type == "Catalog":
-                        if doc_id not in visited_catalogs:
-                            visited_catalogs.add(doc_id)
-                            next_queue.append(doc_id)
-                    else:
-                        descendant_collections.add(doc_id)
-
-                queue = next_queue
-
-            except Exception as e:
-                logger.error(
-                    f"Error fetching descendants for queue {queue}: {e}", exc_info=True
+        try:
+            if self.catalog_graph is not None:
+                hierarchy = await self.catalog_graph.get(
+                    self.database.get_catalog_hierarchy
                 )
-                raise HTTPException(
-                    status_code=500,
-                    detail="Failed to resolve descendant collections for catalog search.",
-                ) from e
-
-        return list(descendant_collections)
+                return hierarchy.descendant_collection_ids(catalog_id)
+            return await self.database.get_descendant_collection_ids(catalog_id)
+        except Exception as e:
+            logger.error(
+                f"Error fetching descendants of catalog {catalog_id}: {e}",
+                exc_info=True,
+            )
+            raise HTTPException(
+                status_code=500,
+                detail="Failed to resolve descendant collections for catalog search.",
+            ) from e
 
     async def catalog_search_post(
         self,
@@ -6,7 +6,7 @@ import os
 from datetime import datetime as datetime_type
 from datetime import timezone
 from enum import Enum
-from typing import Type
+from typing import AsyncIterator, Type
 from urllib.parse import unquote_plus, urljoin
 
 import attr
@@ -24,12 +24,14 @@ from starlette.responses import Response
 
 from stac_fastapi.core.base_database_logic import BaseDatabaseLogic
 from stac_fastapi.core.base_settings import ApiBaseSettings
+from stac_fastapi.core.catalog_graph import apply_to_catalog_graph
 from stac_fastapi.core.datetime_utils import format_datetime_range
-from stac_fastapi.core.exceptions import QueuedSuccess
+from stac_fastapi.core.exceptions import NdjsonLineTooLong, QueuedSuccess
 from stac_fastapi.core.models.links import PagingLinks
 from stac_fastapi.core.queryables import (
     QueryablesCache,
     get_properties_from_cql2_filter,
+    queryables_schema_version,
 )
 from stac_fastapi.core.serializers import (
     CatalogSerializer,
@@ -44,6 +46,7 @@ from stac_fastapi.core.utilities import (
     format_conflict_errors,
     get_bool_env,
     get_int_env,
+    iter_ndjson_lines,
 )
 from stac_fastapi.core.validate import (
     async_validate_batch_with_stac_validator,
@@ -52,6 +55,10 @@ from stac_fastapi.core.validate import (
     validate_datetime_range,
     validate_item_topology_lightweight,
 )
+from stac_fastapi.core.write_generations import (
+    bumps_write_generation,
+    write_generations,
+)
 from stac_fastapi.extensions.bulk_transactions import (
     BaseBulkTransactionsClient,
     BulkTransactionMethod,
@@ -1206,6 +1213,7 @@ class TransactionsClient(AsyncBaseTransactionsClient):
 
         return valid_features, validation_errors
 
+    @bumps_write_generation
     @overrides
     async def create_item(
         self, collection_id: str, item: Item | ItemCollection, **kwargs
@@ -1517,9 +1525,13 @@ class TransactionsClient(AsyncBaseTransactionsClient):
                 raise QueuedSuccess(payload={"message": result, "status": "queued"})
 
         # 5. DATABASE INSERTION LAYER
+        # Items re-sent with identical content (same content hash) are not rewritten
+        items_to_write, unchanged_ids = await self.database.split_unchanged_items(
+            collection_id, valid_items
+        )
         success, errors = await self.database.bulk_async(
             collection_id=collection_id,
-            processed_items=valid_items,
+            processed_items=items_to_write,
             op_type="create",
             **kwargs,
         )
@@ -1534,7 +1546,7 @@ class TransactionsClient(AsyncBaseTransactionsClient):
 
         successfully_added_ids = [
             item.get("id")
-            for item in valid_items
+            for item in items_to_write
             if item.get("id") not in failed_item_ids
         ]
 
@@ -1552,7 +1564,7 @@ class TransactionsClient(AsyncBaseTransactionsClient):
         )
 
         # Fix Spot 3: Database writes failed completely
-        if success == 0:
+        if success == 0 and not unchanged_ids:
             raise HTTPException(
                 status_code=400,
                 detail={
@@ -1577,6 +1589,8 @@ class TransactionsClient(AsyncBaseTransactionsClient):
             message_parts.append(f"{validation_error_count} validation errors")
         if skipped_db_duplicates > 0:
             message_parts.append(f"{skipped_db_duplicates} preprocessing skipped")
+        if unchanged_ids:
+            message_parts.append(f"{len(unchanged_ids)} unchanged")
         if len(conflict_errors) > 0:
             message_parts.append(f"{len(conflict_errors)} conflicts")
         if len(other_errors) > 0:
@@ -1585,6 +1599,8 @@ class TransactionsClient(AsyncBaseTransactionsClient):
         response: dict = {"message": " | ".join(message_parts)}
         if successfully_added_ids:
             response["successfully_added"] = successfully_added_ids
+        if unchanged_ids:
+            response["unchanged"] = unchanged_ids
         if validation_errors:
             response["validation_errors"] = validation_errors
         if conflict_errors:
@@ -1594,6 +1610,210 @@ class TransactionsClient(AsyncBaseTransactionsClient):
 
         return response
 
+    @bumps_write_generation
+    async def create_items_from_ndjson(
+        self,
+        collection_id: str,
+        byte_chunks: AsyncIterator[bytes],
+        base_url: str,
+        **kwargs,
+    ) -> AsyncIterator[dict]:
+        """Ingest a newline-delimited stream of STAC Items chunk by chunk.
+
+        Lines are parsed incrementally and grouped into chunks of
+        NDJSON_INGEST_CHUNK_SIZE items. Each chunk goes through the same
+        deduplication, preprocessing, validation and routing layers as a
+        FeatureCollection before the next chunk is read, so memory use does not
+        depend on the size of the upload.
+
+        Args:
+            collection_id (str): The ID of the destination collection.
+            byte_chunks (AsyncIterator[bytes]): The raw request body stream.
+            base_url (str): The base URL of the incoming request.
+            **kwargs: Additional arguments passed to `bulk_async`.
+
+        Yields:
+            dict: One report per chunk, with the chunk's line range, the number of
+            items added or queued, a `build_bulk_summary` summary and any grouped
+            errors. When RAISE_ON_BULK_ERROR is true the stream stops after the first
+            chunk with errors and the last report has `"aborted": True`.
+
+        Raises:
+            NotFoundError: If the collection does not exist.
+            NdjsonLineTooLong: If a line exceeds NDJSON_INGEST_MAX_LINE_BYTES. The
+                lines before it are ingested and reported first.
+        """
+        await self.database.find_collection(collection_id=collection_id)
+
+        use_queue = get_bool_env("ENABLE_REDIS_QUEUE", default=False)
+        raise_on_error = get_bool_env("RAISE_ON_BULK_ERROR", default=False)
+        chunk_size = max(1, get_int_env("NDJSON_INGEST_CHUNK_SIZE", default=1000))
+        max_line_bytes = get_int_env(
+            "NDJSON_INGEST_MAX_LINE_BYTES", default=10 * 1024 * 1024
+        )
+
+        lines: list[tuple[int, bytes]] = []
+        chunk_number = 0
+        try:
+            async for line_number, line in iter_ndjson_lines(
+                byte_chunks, max_line_bytes
+            ):
+                lines.append((line_number, line))
+                if len(lines) < chunk_size:
+                    continue
+                chunk_number += 1
+                report = await self._ingest_ndjson_chunk(
+                    collection_id, chunk_number, lines, base_url, use_queue, **kwargs
+                )
+                lines = []
+                yield report
+                if raise_on_error and report.get("aborted"):
+                    return
+        except NdjsonLineTooLong:
+            # Everything before the oversized line is ingested, so the upload
+            # can be resumed at that line
+            if lines:
+                chunk_number += 1
+                yield await self._ingest_ndjson_chunk(
+                    collection_id, chunk_number, lines, base_url, use_queue, **kwargs
+                )
+            raise
+
+        if lines:
+            chunk_number += 1
+            yield await self._ingest_ndjson_chunk(
+                collection_id, chunk_number, lines, base_url, use_queue, **kwargs
+            )
+
+    async def _ingest_ndjson_chunk(
+        self,
+        collection_id: str,
+        chunk_number: int,
+        lines: list[tuple[int, bytes]],
+        base_url: str,
+        use_queue: bool,
+        **kwargs,
+    ) -> dict:
+        """Parse, validate and insert (or queue) one chunk of NDJSON lines.
+
+        Args:
+            collection_id (str): The ID of the destination collection.
+            chunk_number (int): 1-based position of the chunk in the stream.
+            lines (list[tuple[int, bytes]]): (line number, raw line) pairs.
+            base_url (str): The base URL of the incoming request.
+            use_queue (bool): Whether to push to Redis instead of the database.
+            **kwargs: Additional arguments passed to `bulk_async`.
+
+        Returns:
+            dict: The chunk report described in `create_items_from_ndjson`.
+        """
+        raise_on_error = get_bool_env("RAISE_ON_BULK_ERROR", default=False)
+
+        # 1. PARSING + DEDUPLICATION LAYER (last occurrence wins, as for FeatureCollections)
+        parse_errors: dict[str, list[str]] = {}
+        seen_ids: dict = {}
+        for line_number, line in lines:
+            try:
+                feature = orjson.loads(line)
+            except orjson.JSONDecodeError:
+                parse_errors.setdefault("Invalid JSON", []).append(
+                    f"line {line_number}"
+                )
+                continue
+
+            if not isinstance(feature, dict) or feature.get("type") != "Feature":
+                err_msg = "Unsupported item type. Expected 'Feature'."
+            elif feature.get("id") is None:
+                err_msg = "Item has no 'id'."
+            elif feature.get("collection", collection_id) != collection_id:
+                err_msg = (
+                    "Collection ID from path does not match Collection ID from Item."
+                )
+            else:
+                feature["collection"] = collection_id
+                seen_ids[feature["id"]] = feature
+                continue
+            parse_errors.setdefault(err_msg, []).append(f"line {line_number}")
+
+        # 2. PREPROCESSING LAYER (the collection was checked once for the whole stream)
+        processed_items = []
+        for feature in seen_ids.values():
+            try:
+                processed_items.append(ItemSerializer.stac_to_db(feature, base_url))
+            except Exception as e:
+                logger.warning(
+                    f"Failed to preprocess item {feature.get('id', 'unknown')}: {e}"
+                )
+        seen_ids.clear()
+
+        # 3. VALIDATION LAYER
+        validate_before_queue = get_bool_env("VALIDATE_BEFORE_QUEUE", default=True)
+        if validate_before_queue or not use_queue:
+            valid_items, validation_errors = await self._validate_feature_collection(
+                processed_items, skip_validation=False
+            )
+        else:
+            valid_items, validation_errors = processed_items, {}
+        validation_error_count = count_validation_errors(validation_errors)
+
+        report: dict = {
+            "chunk": chunk_number,
+            "first_line": lines[0][0],
+            "last_line": lines[-1][0],
+        }
+
+        # 4. ROUTING LAYER (Queue vs Database)
+        conflict_errors: list = []
+        other_errors: list = []
+        unchanged_ids: list[str] = []
+        if use_queue:
+            from stac_fastapi.core.utilities import queue_items_if_enabled
+
+            if valid_items:
+                await queue_items_if_enabled(collection_id, valid_items)
+            report["queued"] = len(valid_items)
+        else:
+            success = 0
+            items_to_write, unchanged_ids = await self.database.split_unchanged_items(
+                collection_id, valid_items
+            )
+            if items_to_write:
+                success, errors = await self.database.bulk_async(
+                    collection_id=collection_id,
+                    processed_items=items_to_write,
+                    op_type="create",
+                    **kwargs,
+                )
+                conflict_errors, other_errors = separate_bulk_conflict_errors(errors)
+            report["added"] = success
+
+        # 5. CHUNK REPORT
+        report["summary"] = build_bulk_summary(
+            lines,
+            processed_items,
+            valid_items,
+            validation_error_count,
+            conflict_errors,
+            other_errors,
+            unchanged_count=len(unchanged_ids),
+        )
+        if parse_errors:
+            report["parse_errors"] = parse_errors
+        if validation_errors:
+            report["validation_errors"] = validation_errors
+        if conflict_errors:
+            report["conflict_errors"] = format_conflict_errors(conflict_errors)
+        if other_errors:
+            report["database_errors"] = other_errors
+
+        if raise_on_error and (
+            parse_errors or validation_errors or conflict_errors or other_errors
+        ):
+            report["aborted"] = True
+
+        return report
+
+    @bumps_write_generation
     @overrides
     async def update_item(
         self, collection_id: str, item_id: str, item: Item, **kwargs
@@ -1656,6 +1876,7 @@ class TransactionsClient(AsyncBaseTransactionsClient):
         )
         return ItemSerializer.db_to_stac(processed_item, base_url)
 
+    @bumps_write_generation
     @overrides
     async def patch_item(
         self,
@@ -1768,6 +1989,7 @@ class TransactionsClient(AsyncBaseTransactionsClient):
 
         return ItemSerializer.db_to_stac(db_item, base_url=base_url)
 
+    @bumps_write_generation
     @overrides
     async def delete_item(self, item_id: str, collection_id: str, **kwargs) -> None:
         """Delete an item from a collection.
@@ -1784,6 +2006,189 @@ class TransactionsClient(AsyncBaseTransactionsClient):
         )
         return None
 
+    @bumps_write_generation
+    async def bulk_delete_items(
+        self,
+        collection_id: str,
+        ids: list[str] | None = None,
+        filter: dict | None = None,
+        datetime: str | None = None,
+        bbox: list[float] | None = None,
+        query: dict[str, dict] | None = None,
+        requests_per_second: float | None = None,
+        **kwargs,
+    ) -> dict:
+        """Delete many items of a collection, by id or by search filter.
+
+        An id list is deleted synchronously with one bulk request. Otherwise the
+        items matching the filter are deleted by a background task that selects
+        indexes like item search does; the result links to the task with a
+        `monitor` link.
+
+        Args:
+            collection_id (str): The identifier of the collection containing the items.
+            ids (list[str] | None): Ids of the items to delete.
+            filter (dict | None): CQL2-JSON filter selecting the items to delete.
+            datetime (str | None): Datetime or interval selecting the items to delete.
+            bbox (list[float] | None): Bounding box selecting the items to delete.
+            query (dict[str, dict] | None): STACQL query selecting the items to delete.
+            requests_per_second (float | None): Throttle of the background delete.
+            kwargs: Additional keyword arguments, like `request` and `refresh`.
+
+        Returns:
+            dict: The id-list delete report, or the status of the delete task.
+
+        Raises:
+            NotFoundError: If the collection does not exist.
+            HTTPException: If the filter is invalid.
+        """
+        await self.database.check_collection_exists(collection_id)
+        request = kwargs.pop("request", None)
+
+        if ids is not None:
+            return await self.database.bulk_delete_items(
+                collection_id=collection_id, item_ids=ids, **kwargs
+            )
+
+        search, datetime_search = await self._item_selection_search(
+            collection_id, filter=filter, datetime=datetime, bbox=bbox, query=query
+        )
+        task = await self.database.delete_items_by_search(
+            collection_id=collection_id,
+            search=search,
+            datetime_search=datetime_search,
+            requests_per_second=requests_per_second,
+        )
+        return self._with_monitor_link(task, request)
+
+    @bumps_write_generation
+    async def bulk_patch_items(
+        self,
+        collection_id: str,
+        patch: PartialItem | list[PatchOperation],
+        ids: list[str] | None = None,
+        filter: dict | None = None,
+        datetime: str | None = None,
+        bbox: list[float] | None = None,
+        query: dict[str, dict] | None = None,
+        requests_per_second: float | None = None,
+        **kwargs,
+    ) -> dict:
+        """Apply one merge or JSON patch to many items of a collection.
+
+        The patch is compiled into a single parameterized update script. An id
+        list is patched synchronously with one bulk request; otherwise the items
+        matching the filter are patched by a background `update_by_query` task,
+        linked from the result with a `monitor` link. The patched items are not
+        run through the STAC validator.
+
+        Args:
+            collection_id (str): The identifier of the collection containing the items.
+            patch (PartialItem | list[PatchOperation]): A merge patch or JSON patch operations.
+            ids (list[str] | None): Ids of the items to patch.
+            filter (dict | None): CQL2-JSON filter selecting the items to patch.
+            datetime (str | None): Datetime or interval selecting the items to patch.
+            bbox (list[float] | None): Bounding box selecting the items to patch.
+            query (dict[str, dict] | None): STACQL query selecting the items to patch.
+            requests_per_second (float | None): Throttle of the background update.
+            kwargs: Additional keyword arguments, like `request` and `refresh`.
+
+        Returns:
+            dict: The id-list patch report, or the status of the patch task.
+
+        Raises:
+            NotFoundError: If the collection does not exist.
+            HTTPException: If the filter is invalid or the patch changes `id`,
+                `collection` or an index-defining datetime.
+        """
+        await self.database.check_collection_exists(collection_id)
+        request = kwargs.pop("request", None)
+        if isinstance(patch, dict):
+            patch = partialItemValidator.validate_python(patch)
+
+        if ids is not None:
+            return await self.database.bulk_patch_items(
+                collection_id=collection_id, item_ids=ids, patch=patch, **kwargs
+            )
+
+        search, datetime_search = await self._item_selection_search(
+            collection_id, filter=filter, datetime=datetime, bbox=bbox, query=query
+        )
+        task = await self.database.patch_items_by_search(
+            collection_id=collection_id,
+            search=search,
+            datetime_search=datetime_search,
+            patch=patch,
+            refresh=kwargs.get("refresh", True),
+            requests_per_second=requests_per_second,
+        )
+        return self._with_monitor_link(task, request)
+
+    async def _item_selection_search(
+        self,
+        collection_id: str,
+        filter: dict | None = None,
+        datetime: str | None = None,
+        bbox: list[float] | None = None,
+        query: dict[str, dict] | None = None,
+    ) -> tuple:
+        """Build the search selecting items of a collection for a bulk operation.
+
+        The criteria are applied with the same database methods as `post_search`.
+
+        Returns:
+            tuple: The search and the datetime used for index selection.
+        """
+        search = self.database.make_search()
+        search = self.database.apply_collections_filter(
+            search=search, collection_ids=[collection_id]
+        )
+        try:
+            search, datetime_search = self.database.apply_datetime_filter(
+                search=search, datetime=format_datetime_range(date_str=datetime)
+            )
+        except (ValueError, TypeError) as e:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Invalid interval format: {datetime}, error: {e}",
+            )
+        if bbox:
+            if len(bbox) == 6:
+                bbox = [bbox[0], bbox[1], bbox[3], bbox[4]]
+            search = self.database.apply_bbox_filter(search=search, bbox=bbox)
+        for field_name, expr in (query or {}).items():
+            for op, value in expr.items():
+                search = self.database.apply_stacql_filter(
+                    search=search,
+                    op=op,
+                    field="properties__" + field_name,
+                    value=value,
+                )
+        if filter is not None:
+            try:
+                search, _ = await self.database.apply_cql2_filter(search, filter)
+            except HTTPException:
+                raise
+            except Exception as e:
+                raise HTTPException(
+                    status_code=400, detail=f"Error with cql2 filter: {e}"
+                )
+
+        return search, datetime_search
+
+    @staticmethod
+    def _with_monitor_link(task: dict, request: Request | None) -> dict:
+        """Link a background task to its status endpoint."""
+        if request is not None:
+            task["links"] = [
+                {
+                    "rel": "monitor",
+                    "type": "application/json",
+                    "href": urljoin(get_base_url(request), f"tasks/{task['id']}"),
+                }
+            ]
+        return task
+
     @overrides
     async def create_collection(
         self, collection: Collection, **kwargs
@@ -1812,12 +2217,15 @@ class TransactionsClient(AsyncBaseTransactionsClient):
 
         collection = self.database.collection_serializer.stac_to_db(collection, request)
         await self.database.create_collection(collection=collection, **kwargs)
+        await apply_to_catalog_graph(upserted=[collection])
+        await queryables_schema_version.bump()
         return CollectionSerializer.db_to_stac(
             collection,
             request,
             extensions=[type(ext).__name__ for ext in self.database.extensions],
         )
 
+    @bumps_write_generation
     @overrides
     async def update_collection(
         self, collection_id: str, collection: Collection, **kwargs
@@ -1853,16 +2261,33 @@ class TransactionsClient(AsyncBaseTransactionsClient):
         request = kwargs["request"]
 
         collection = self.database.collection_serializer.stac_to_db(collection, request)
-        await self.database.update_collection(
+        task = await self.database.update_collection(
             collection_id=collection_id, collection=collection, **kwargs
         )
+        await apply_to_catalog_graph(
+            upserted=[collection],
+            removed=[collection_id] if collection["id"] != collection_id else [],
+        )
+        if collection["id"] != collection_id:
+            await queryables_schema_version.bump()
 
-        return CollectionSerializer.db_to_stac(
+        response = CollectionSerializer.db_to_stac(
             collection,
             request,
             extensions=[type(ext).__name__ for ext in self.database.extensions],
         )
+        if task:
+            # The items are moved to the new collection id in the background
+            response.setdefault("links", []).append(
+                {
+                    "rel": "monitor",
+                    "type": "application/json",
+                    "href": urljoin(get_base_url(request), f"tasks/{task['id']}"),
+                }
+            )
+        return response
 
+    @bumps_write_generation
     @overrides
     async def patch_collection(
         self,
@@ -1921,6 +2346,7 @@ class TransactionsClient(AsyncBaseTransactionsClient):
                 )
 
             if collection:
+                await apply_to_catalog_graph(upserted=[collection])
                 return CollectionSerializer.db_to_stac(
                     collection,
                     request,
@@ -1971,6 +2397,7 @@ class TransactionsClient(AsyncBaseTransactionsClient):
             collection=db_collection,
             refresh=True,
         )
+        await apply_to_catalog_graph(upserted=[db_collection])
 
         return CollectionSerializer.db_to_stac(
             db_collection,
@@ -1978,6 +2405,7 @@ class TransactionsClient(AsyncBaseTransactionsClient):
             extensions=[type(ext).__name__ for ext in self.database.extensions],
         )
 
+    @bumps_write_generation
     @overrides
     async def delete_collection(self, collection_id: str, **kwargs) -> None:
         """
@@ -1995,6 +2423,8 @@ class TransactionsClient(AsyncBaseTransactionsClient):
             NotFoundError: If the collection doesn't exist
         """
         await self.database.delete_collection(collection_id=collection_id, **kwargs)
+        await apply_to_catalog_graph(removed=[collection_id])
+        await queryables_schema_version.bump()
         return None
 
 
@@ -2125,6 +2555,7 @@ class BulkTransactionsClient(BaseBulkTransactionsClient):
             op_type=op_type,
             **kwargs,
         )
+        write_generations.bump_sync([collection_id])
 
         conflict_errors, other_errors = separate_bulk_conflict_errors(errors)
 
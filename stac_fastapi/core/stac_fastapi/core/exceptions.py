@@ -26,6 +26,25 @@ class QueuedSuccess(Exception):
         super().__init__(str(payload))
 
 
+class NdjsonLineTooLong(ValueError):
+    """Raised when a line of an NDJSON upload exceeds the maximum line size.
+
+    The `line_number` attribute holds the 1-based number of the oversized line.
+    """
+
+    def __init__(self, line_number: int, max_line_bytes: int):
+        """Initialize with the position of the oversized line.
+
+        Args:
+            line_number: 1-based number of the oversized line.
+            max_line_bytes: The maximum size of a line.
+        """
+        self.line_number = line_number
+        super().__init__(
+            f"Line {line_number} exceeds the maximum size of {max_line_bytes} bytes"
+        )
+
+
 async def queued_success_handler(request: Request, exc: QueuedSuccess) -> JSONResponse:
     """Catch :class:`QueuedSuccess` and format it as a ``202 Accepted`` response.
 
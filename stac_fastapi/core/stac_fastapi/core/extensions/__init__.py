@@ -1,11 +1,23 @@
 """elasticsearch extensions modifications."""
 
+from .bulk_delete import BulkDeleteExtension
+from .bulk_load import BulkLoadExtension
+from .bulk_patch import BulkPatchExtension
 from .collections_search import CollectionsSearchEndpointExtension
+from .ndjson_ingest import NdjsonIngestExtension
 from .query import Operator, QueryableTypes, QueryExtension
+from .tasks import TasksExtension
+from .tiles import TilesExtension
 
 __all__ = [
     "Operator",
     "QueryableTypes",
     "QueryExtension",
     "CollectionsSearchEndpointExtension",
+    "NdjsonIngestExtension",
+    "BulkLoadExtension",
+    "BulkDeleteExtension",
+    "BulkPatchExtension",
+    "TasksExtension",
+    "TilesExtension",
 ]
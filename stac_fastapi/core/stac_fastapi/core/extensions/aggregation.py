@@ -34,6 +34,9 @@ class EsAggregationExtensionGetRequest(
     geometry_geohash_grid_frequency_precision: int | None = attr.ib(default=None)
     geometry_geotile_grid_frequency_precision: int | None = attr.ib(default=None)
     datetime_frequency_interval: str | None = attr.ib(default=None)
+    approximate: bool | None = attr.ib(default=None)
+    bucket_limit: int | None = attr.ib(default=None)
+    token: str | None = attr.ib(default=None)
 
 
 class EsAggregationExtensionPostRequest(
@@ -47,3 +50,6 @@ class EsAggregationExtensionPostRequest(
     geometry_geohash_grid_frequency_precision: int | None = None
     geometry_geotile_grid_frequency_precision: int | None = None
     datetime_frequency_interval: str | None = None
+    approximate: bool | None = None
+    bucket_limit: int | None = None
+    token: str | None = None
@@ -0,0 +1,107 @@
+"""Bulk item delete endpoint."""
+
+from typing import Annotated, Any
+
+import attr
+from fastapi import APIRouter, Body, FastAPI, Query, Request
+from pydantic import BaseModel, Field, model_validator
+from starlette.responses import JSONResponse
+
+from stac_fastapi.types.extension import ApiExtension
+
+
+class BulkItemSelection(BaseModel):
+    """Items selected by a bulk operation: either an id list or search criteria.
+
+    The search criteria (`filter`, `datetime`, `bbox` and `query`) have the same
+    meaning as in `POST /search` and are combined with AND. At least one of them
+    is required, so a bulk operation never silently targets a whole collection.
+    """
+
+    ids: list[str] | None = Field(default=None, min_length=1)
+    filter: dict[str, Any] | None = Field(
+        default=None, description="CQL2-JSON filter selecting the items."
+    )
+    datetime: str | None = None
+    bbox: list[float] | None = None
+    query: dict[str, dict[str, Any]] | None = None
+    requests_per_second: float | None = Field(
+        default=None,
+        description="Throttle of the background task, -1 disables throttling.",
+    )
+
+    @model_validator(mode="after")
+    def check_ids_or_filter(self) -> "BulkItemSelection":
+        """Require exactly one of an id list or search criteria."""
+        has_filter = any(
+            value is not None
+            for value in (self.filter, self.datetime, self.bbox, self.query)
+        )
+        if self.ids is not None and has_filter:
+            raise ValueError("Provide either `ids` or search criteria, not both")
+        if self.ids is None and not has_filter:
+            raise ValueError(
+                "Provide `ids` or at least one of `filter`, `datetime`, `bbox` or `query`"
+            )
+        return self
+
+
+class BulkDeleteRequest(BulkItemSelection):
+    """Items to delete. Deleting every item of a collection is done by deleting the collection."""
+
+
+@attr.s
+class BulkDeleteExtension(ApiExtension):
+    """Register the `POST /collections/{collection_id}/bulk-delete` endpoint.
+
+    An id list is deleted with a single bulk request and the response reports
+    the deleted and missing ids. Search criteria start a background
+    `delete_by_query` task, monitored through the `/tasks` endpoints; the
+    response is `202 Accepted` with a `monitor` link to the task.
+    """
+
+    client: Any = attr.ib(default=None)
+    settings: dict = attr.ib(factory=dict)
+    router: APIRouter = attr.ib(factory=APIRouter)
+
+    def register(self, app: FastAPI) -> None:
+        """Register the extension with a FastAPI application.
+
+        Args:
+            app: target FastAPI application.
+
+        Returns:
+            None
+        """
+        self.router.add_api_route(
+            path="/collections/{collection_id}/bulk-delete",
+            endpoint=self.bulk_delete,
+            methods=["POST"],
+            response_model=None,
+            summary="Delete many items by id or by search filter",
+            tags=["Transaction Extension"],
+        )
+        app.include_router(self.router)
+
+    async def bulk_delete(
+        self,
+        collection_id: str,
+        request: Request,
+        body: Annotated[BulkDeleteRequest, Body()],
+        refresh: Annotated[
+            bool | None,
+            Query(description="Refresh the indexes after an id-list delete."),
+        ] = None,
+    ) -> JSONResponse:
+        """POST /collections/{collection_id}/bulk-delete endpoint."""
+        kwargs: dict[str, Any] = {"request": request}
+        if refresh is not None:
+            kwargs["refresh"] = refresh
+        result = await self.client.bulk_delete_items(
+            collection_id,
+            **body.model_dump(exclude_none=True),
+            **kwargs,
+        )
+        if body.ids is not None:
+            return JSONResponse(content=result)
+        return JSONResponse(content=result, status_code=202)
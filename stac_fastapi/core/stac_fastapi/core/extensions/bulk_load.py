@@ -0,0 +1,115 @@
+"""Bulk-load session endpoints for large backfills."""
+
+from typing import Annotated, Any, Literal
+
+import attr
+from fastapi import APIRouter, FastAPI, Query
+from starlette.responses import JSONResponse
+
+from stac_fastapi.types.errors import NotFoundError
+from stac_fastapi.types.extension import ApiExtension
+
+
+@attr.s
+class BulkLoadExtension(ApiExtension):
+    """Register `/collections/{collection_id}/bulk-load` session endpoints.
+
+    `POST` starts (or renews) a session that disables refreshes and replicas on
+    the collection's item indexes, `GET` returns the active session and `DELETE`
+    restores the original settings. Items are loaded with the regular transaction
+    and bulk endpoints in between. Sessions whose lease expires are reverted when
+    the application starts.
+    """
+
+    database: Any = attr.ib(default=None)
+    settings: dict = attr.ib(factory=dict)
+    router: APIRouter = attr.ib(factory=APIRouter)
+
+    def register(self, app: FastAPI) -> None:
+        """Register the extension with a FastAPI application.
+
+        Args:
+            app: target FastAPI application.
+
+        Returns:
+            None
+        """
+        path = "/collections/{collection_id}/bulk-load"
+        self.router.add_api_route(
+            path=path,
+            endpoint=self.start_session,
+            methods=["POST"],
+            response_model=None,
+            summary="Start or renew a bulk-load session",
+            description=(
+                "Disable refreshes and replicas on the collection's item indexes for "
+                "a large backfill. Calling it again renews the session lease."
+            ),
+            tags=["Transaction Extension"],
+        )
+        self.router.add_api_route(
+            path=path,
+            endpoint=self.get_session,
+            methods=["GET"],
+            response_model=None,
+            summary="Get the active bulk-load session",
+            tags=["Transaction Extension"],
+        )
+        self.router.add_api_route(
+            path=path,
+            endpoint=self.finish_session,
+            methods=["DELETE"],
+            response_model=None,
+            summary="Finish a bulk-load session",
+            description=(
+                "Restore the original index settings, optionally force-merge closed "
+                "datetime indexes and wait for the index health."
+            ),
+            tags=["Transaction Extension"],
+        )
+        app.include_router(self.router)
+
+    async def start_session(
+        self,
+        collection_id: str,
+        ttl: Annotated[
+            int | None,
+            Query(gt=0, description="Lease duration in seconds."),
+        ] = None,
+    ) -> JSONResponse:
+        """POST /collections/{collection_id}/bulk-load endpoint."""
+        session = await self.database.start_bulk_load_session(collection_id, ttl=ttl)
+        return JSONResponse(content=session)
+
+    async def get_session(self, collection_id: str) -> JSONResponse:
+        """GET /collections/{collection_id}/bulk-load endpoint."""
+        session = await self.database.get_bulk_load_session(collection_id)
+        if session is None:
+            raise NotFoundError(f"No bulk-load session for collection {collection_id}")
+        return JSONResponse(content=session)
+
+    async def finish_session(
+        self,
+        collection_id: str,
+        forcemerge: bool = Query(
+            default=False,
+            description="Force-merge closed datetime indexes to a single segment.",
+        ),
+        wait_for_status: Literal["green", "yellow", "none"] = Query(
+            default="green",
+            description="Index health to wait for after restoring replicas.",
+        ),
+        timeout: str = Query(
+            default="30s", description="How long to wait for the health status."
+        ),
+    ) -> JSONResponse:
+        """DELETE /collections/{collection_id}/bulk-load endpoint."""
+        report = await self.database.finish_bulk_load_session(
+            collection_id,
+            forcemerge=forcemerge,
+            wait_for_status=None if wait_for_status == "none" else wait_for_status,
+            timeout=timeout,
+        )
+        if report is None:
+            raise NotFoundError(f"No bulk-load session for collection {collection_id}")
+        return JSONResponse(content=report)
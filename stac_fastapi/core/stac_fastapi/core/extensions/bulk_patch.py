@@ -0,0 +1,80 @@
+"""Bulk item patch endpoint."""
+
+from typing import Annotated, Any
+
+import attr
+from fastapi import APIRouter, Body, FastAPI, Query, Request
+from pydantic import Field
+from starlette.responses import JSONResponse
+
+from stac_fastapi.core.extensions.bulk_delete import BulkItemSelection
+from stac_fastapi.extensions.transaction.request import PatchOperation
+from stac_fastapi.types.extension import ApiExtension
+
+
+class BulkPatchRequest(BulkItemSelection):
+    """One patch applied to the selected items."""
+
+    patch: list[PatchOperation] | dict[str, Any] = Field(
+        description=(
+            "A list of JSON Patch (RFC 6902) operations, or a JSON Merge Patch "
+            "(RFC 7396) document."
+        )
+    )
+
+
+@attr.s
+class BulkPatchExtension(ApiExtension):
+    """Register the `POST /collections/{collection_id}/bulk-patch` endpoint.
+
+    The patch is compiled once into a parameterized update script. An id list is
+    patched with a single bulk request and the response reports the updated,
+    missing and failed ids. Search criteria start a background
+    `update_by_query` task, monitored through the `/tasks` endpoints; the
+    response is `202 Accepted` with a `monitor` link to the task.
+    """
+
+    client: Any = attr.ib(default=None)
+    settings: dict = attr.ib(factory=dict)
+    router: APIRouter = attr.ib(factory=APIRouter)
+
+    def register(self, app: FastAPI) -> None:
+        """Register the extension with a FastAPI application.
+
+        Args:
+            app: target FastAPI application.
+
+        Returns:
+            None
+        """
+        self.router.add_api_route(
+            path="/collections/{collection_id}/bulk-patch",
+            endpoint=self.bulk_patch,
+            methods=["POST"],
+            response_model=None,
+            summary="Apply one patch to many items by id or by search filter",
+            tags=["Transaction Extension"],
+        )
+        app.include_router(self.router)
+
+    async def bulk_patch(
+        self,
+        collection_id: str,
+        request: Request,
+        body: Annotated[BulkPatchRequest, Body()],
+        refresh: Annotated[
+            bool | None,
+            Query(description="Refresh the indexes once the items are patched."),
+        ] = None,
+    ) -> JSONResponse:
+        """POST /collections/{collection_id}/bulk-patch endpoint."""
+        kwargs: dict[str, Any] = {"request": request}
+        if refresh is not None:
+            kwargs["refresh"] = refresh
+        selection = body.model_dump(exclude_none=True, exclude={"patch"})
+        result = await self.client.bulk_patch_items(
+            collection_id, patch=body.patch, **selection, **kwargs
+        )
+        if body.ids is not None:
+            return JSONResponse(content=result)
+        return JSONResponse(content=result, status_code=202)
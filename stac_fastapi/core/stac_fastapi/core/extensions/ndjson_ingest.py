@@ -0,0 +1,241 @@
+"""Streaming NDJSON item ingestion endpoint."""
+
+from typing import Any, AsyncIterator
+
+import attr
+import orjson
+from fastapi import APIRouter, FastAPI, HTTPException, Request
+from starlette.requests import ClientDisconnect
+from starlette.responses import JSONResponse, Response, StreamingResponse
+from starlette.types import Receive, Scope, Send
+
+from stac_fastapi.core.exceptions import NdjsonLineTooLong
+from stac_fastapi.core.utilities import get_bool_env, merge_bulk_summaries
+from stac_fastapi.types.extension import ApiExtension
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+def _merge_grouped_errors(target: dict, errors: dict) -> None:
+    """Merge `{message: [ids]}` (or `{id: message}`) error groups into target."""
+    for key, value in errors.items():
+        if isinstance(value, list):
+            target.setdefault(key, []).extend(value)
+        else:
+            target[key] = value
+
+
+def build_ndjson_ingest_response(reports: list[dict]) -> dict:
+    """Combine chunk reports into the response of a whole NDJSON upload.
+
+    Args:
+        reports: Chunk reports yielded by `TransactionsClient.create_items_from_ndjson`.
+
+    Returns:
+        dict: Overall message, merged `build_bulk_summary` summary and grouped errors.
+    """
+    summary = merge_bulk_summaries([report["summary"] for report in reports])
+    added = sum(report.get("added", 0) for report in reports)
+    queued = sum(report.get("queued", 0) for report in reports)
+
+    response: dict = {}
+    for key in (
+        "parse_errors",
+        "validation_errors",
+        "conflict_errors",
+        "database_errors",
+    ):
+        for report in reports:
+            if key not in report:
+                continue
+            if key == "database_errors":
+                response.setdefault(key, []).extend(report[key])
+            else:
+                _merge_grouped_errors(response.setdefault(key, {}), report[key])
+
+    message_parts = [f"Processed {summary['input_count']} items"]
+    message_parts[0] += f": {queued} queued" if queued else f": {added} added"
+    parse_error_count = sum(
+        len(ids) for ids in response.get("parse_errors", {}).values()
+    )
+    if parse_error_count:
+        message_parts.append(f"{parse_error_count} unparsable lines")
+    if summary["validation_error_count"]:
+        message_parts.append(f"{summary['validation_error_count']} validation errors")
+    if summary["conflict_count"]:
+        message_parts.append(f"{summary['conflict_count']} conflicts")
+    if summary["database_error_count"]:
+        message_parts.append(f"{summary['database_error_count']} database errors")
+
+    result = {
+        "message": " | ".join(message_parts),
+        "chunks": len(reports),
+        "summary": summary,
+    }
+    if reports and reports[-1].get("aborted"):
+        result["aborted_at_line"] = reports[-1]["last_line"]
+    result.update(response)
+    return result
+
+
+def _line_too_long_error(
+    reports: list[dict], error: NdjsonLineTooLong
+) -> HTTPException:
+    """Return the 413 error of an upload with an oversized line.
+
+    The chunks before the line were ingested, so the detail is the report of the
+    upload so far, like for an upload aborted on errors.
+    """
+    response = build_ndjson_ingest_response(reports)
+    response.setdefault("aborted_at_line", error.line_number)
+    response["error"] = str(error)
+    return HTTPException(status_code=413, detail=response)
+
+
+class _DuplexStreamingResponse(StreamingResponse):
+    """StreamingResponse that does not consume `receive` while streaming.
+
+    StreamingResponse listens for client disconnects by reading from `receive`
+    on ASGI servers older than spec 2.4, which would steal the request body
+    chunks that the endpoint is still reading. Disconnects are detected by the
+    body reader instead (`request.stream()` raises ClientDisconnect).
+    """
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Stream the response without a concurrent disconnect listener."""
+        try:
+            await self.stream_response(send)
+        except OSError:
+            raise ClientDisconnect()
+        if self.background is not None:
+            await self.background()
+
+
+@attr.s
+class NdjsonIngestExtension(ApiExtension):
+    """Register `POST /collections/{collection_id}/items/stream`.
+
+    The endpoint accepts `application/x-ndjson` bodies (one STAC Item per line)
+    and ingests them chunk by chunk through `TransactionsClient`, so the upload is
+    never held in memory as a whole. Clients sending `Accept: application/x-ndjson`
+    receive one report line per chunk as it is processed; otherwise a single
+    summary is returned at the end.
+    """
+
+    client: Any = attr.ib(default=None)
+    settings: dict = attr.ib(factory=dict)
+    router: APIRouter = attr.ib(factory=APIRouter)
+
+    def register(self, app: FastAPI) -> None:
+        """Register the extension with a FastAPI application.
+
+        Args:
+            app: target FastAPI application.
+
+        Returns:
+            None
+        """
+        self.router.add_api_route(
+            path="/collections/{collection_id}/items/stream",
+            endpoint=self.ingest_ndjson,
+            methods=["POST"],
+            response_model=None,
+            summary="Stream items into a collection",
+            description=(
+                "Ingest newline-delimited STAC Items (`application/x-ndjson`) with "
+                "bounded memory. Items are validated and indexed in chunks."
+            ),
+            tags=["Transaction Extension"],
+            openapi_extra={
+                "requestBody": {
+                    "required": True,
+                    "content": {
+                        NDJSON_MEDIA_TYPE: {
+                            "schema": {"type": "string", "format": "binary"}
+                        }
+                    },
+                }
+            },
+        )
+        app.include_router(self.router)
+
+    async def ingest_ndjson(self, collection_id: str, request: Request) -> Response:
+        """POST /collections/{collection_id}/items/stream endpoint.
+
+        Args:
+            collection_id: The ID of the destination collection.
+            request: The incoming request; its body is read as a stream.
+
+        Returns:
+            A streaming NDJSON response of chunk reports, or a JSON summary.
+        """
+        content_type = request.headers.get("content-type", "").split(";")[0].strip()
+        if content_type != NDJSON_MEDIA_TYPE:
+            raise HTTPException(
+                status_code=415,
+                detail=f"Unsupported content type '{content_type}'. Expected '{NDJSON_MEDIA_TYPE}'.",
+            )
+
+        status_code = 202 if get_bool_env("ENABLE_REDIS_QUEUE", default=False) else 201
+        reports = self.client.create_items_from_ndjson(
+            collection_id,
+            request.stream(),
+            base_url=str(request.base_url),
+            request=request,
+        )
+
+        if NDJSON_MEDIA_TYPE in request.headers.get("accept", ""):
+            # Fail fast on an unknown collection before the streaming response starts
+            first_report = await self._next_report(reports)
+            return _DuplexStreamingResponse(
+                self._stream_reports(first_report, reports),
+                status_code=status_code,
+                media_type=NDJSON_MEDIA_TYPE,
+            )
+
+        chunk_reports = []
+        try:
+            async for report in reports:
+                chunk_reports.append(report)
+        except NdjsonLineTooLong as e:
+            raise _line_too_long_error(chunk_reports, e)
+
+        response = build_ndjson_ingest_response(chunk_reports)
+        if "aborted_at_line" in response:
+            raise HTTPException(status_code=400, detail=response)
+        return JSONResponse(content=response, status_code=status_code)
+
+    @staticmethod
+    async def _next_report(reports: AsyncIterator[dict]) -> dict | None:
+        """Return the first chunk report, or None for an empty body."""
+        try:
+            return await reports.__anext__()
+        except StopAsyncIteration:
+            return None
+        except NdjsonLineTooLong as e:
+            raise _line_too_long_error([], e)
+
+    @staticmethod
+    async def _stream_reports(
+        report: dict | None, reports: AsyncIterator[dict]
+    ) -> AsyncIterator[bytes]:
+        """Serialize chunk reports as NDJSON, followed by an overall summary line."""
+        summaries = []
+        final: dict = {"done": True}
+        while report is not None:
+            summaries.append(report["summary"])
+            if report.get("aborted"):
+                final["aborted_at_line"] = report["last_line"]
+            yield orjson.dumps(report) + b"\n"
+            try:
+                report = await reports.__anext__()
+            except StopAsyncIteration:
+                report = None
+            except NdjsonLineTooLong as e:
+                # Headers are already sent, so errors are reported in-band
+                final.setdefault("aborted_at_line", e.line_number)
+                final["error"] = str(e)
+                report = None
+
+        final["summary"] = merge_bulk_summaries(summaries)
+        yield orjson.dumps(final) + b"\n"
@@ -0,0 +1,70 @@
+"""Endpoints to monitor background reindex tasks."""
+
+from typing import Annotated, Any, Literal
+
+import attr
+from fastapi import APIRouter, FastAPI, Query
+from starlette.responses import JSONResponse
+
+from stac_fastapi.types.errors import NotFoundError
+from stac_fastapi.types.extension import ApiExtension
+
+
+@attr.s
+class TasksExtension(ApiExtension):
+    """Register `/tasks` endpoints for background reindex tasks.
+
+    Changing a collection id moves its items with a reindex task that runs in the
+    background; the collection update response links to the task with a
+    `monitor` link. Tasks interrupted by a restart are resumed at startup.
+    """
+
+    database: Any = attr.ib(default=None)
+    settings: dict = attr.ib(factory=dict)
+    router: APIRouter = attr.ib(factory=APIRouter)
+
+    def register(self, app: FastAPI) -> None:
+        """Register the extension with a FastAPI application.
+
+        Args:
+            app: target FastAPI application.
+
+        Returns:
+            None
+        """
+        self.router.add_api_route(
+            path="/tasks",
+            endpoint=self.list_tasks,
+            methods=["GET"],
+            response_model=None,
+            summary="List reindex tasks",
+            tags=["Transaction Extension"],
+        )
+        self.router.add_api_route(
+            path="/tasks/{task_id}",
+            endpoint=self.get_task,
+            methods=["GET"],
+            response_model=None,
+            summary="Get the status of a reindex task",
+            tags=["Transaction Extension"],
+        )
+        app.include_router(self.router)
+
+    async def list_tasks(
+        self,
+        status: Annotated[
+            Literal["pending", "running", "completed", "failed"] | None,
+            Query(description="Only return tasks with this status."),
+        ] = None,
+        limit: Annotated[int, Query(gt=0, le=1000)] = 100,
+    ) -> JSONResponse:
+        """GET /tasks endpoint."""
+        tasks = await self.database.list_reindex_tasks(status=status, limit=limit)
+        return JSONResponse(content={"tasks": tasks})
+
+    async def get_task(self, task_id: str) -> JSONResponse:
+        """GET /tasks/{task_id} endpoint."""
+        task = await self.database.get_reindex_task(task_id)
+        if task is None:
+            raise NotFoundError(f"Task {task_id} not found")
+        return JSONResponse(content=task)
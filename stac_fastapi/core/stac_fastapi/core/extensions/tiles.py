@@ -0,0 +1,107 @@
+"""Vector tile endpoints drawn from geotile grid aggregations."""
+
+from typing import Annotated, Any
+
+import attr
+from fastapi import APIRouter, FastAPI, Path, Query
+from starlette.responses import Response
+
+from stac_fastapi.types.extension import ApiExtension
+
+MVT_MEDIA_TYPE = "application/vnd.mapbox-vector-tile"
+
+
+@attr.s
+class TilesExtension(ApiExtension):
+    """Register `/tiles/{z}/{x}/{y}.mvt` and `/collections/{collection_id}/tiles/{z}/{x}/{y}.mvt`.
+
+    A tile holds one polygon per cell of a `geotile_grid` aggregation of the
+    item centroids (`proj:centroid`) inside the tile, with the number of items
+    as `count`. Items can be filtered like in the aggregation extension.
+    """
+
+    client: Any = attr.ib(default=None)
+    settings: dict = attr.ib(factory=dict)
+    router: APIRouter = attr.ib(factory=APIRouter)
+
+    def register(self, app: FastAPI) -> None:
+        """Register the extension with a FastAPI application.
+
+        Args:
+            app: target FastAPI application.
+
+        Returns:
+            None
+        """
+        self.router.add_api_route(
+            path="/tiles/{z}/{x}/{y}.mvt",
+            endpoint=self.get_tile,
+            methods=["GET"],
+            response_class=Response,
+            summary="Vector tile of the item counts of a geotile grid",
+            tags=["Aggregation Extension"],
+        )
+        self.router.add_api_route(
+            path="/collections/{collection_id}/tiles/{z}/{x}/{y}.mvt",
+            endpoint=self.get_collection_tile,
+            methods=["GET"],
+            response_class=Response,
+            summary="Vector tile of the item counts of a collection",
+            tags=["Aggregation Extension"],
+        )
+        app.include_router(self.router)
+
+    async def get_tile(
+        self,
+        z: Annotated[int, Path(ge=0)],
+        x: Annotated[int, Path(ge=0)],
+        y: Annotated[int, Path(ge=0)],
+        collections: Annotated[list[str] | None, Query()] = None,
+        ids: Annotated[list[str] | None, Query()] = None,
+        datetime: str | None = None,
+        filter_expr: Annotated[str | None, Query(alias="filter")] = None,
+        filter_lang: Annotated[str | None, Query(alias="filter-lang")] = None,
+    ) -> Response:
+        """GET /tiles/{z}/{x}/{y}.mvt endpoint."""
+        tile = await self.client.tile(
+            z,
+            x,
+            y,
+            collections=_split(collections),
+            ids=_split(ids),
+            datetime=datetime,
+            filter_expr=filter_expr,
+            filter_lang=filter_lang,
+        )
+        return Response(content=tile, media_type=MVT_MEDIA_TYPE)
+
+    async def get_collection_tile(
+        self,
+        collection_id: str,
+        z: Annotated[int, Path(ge=0)],
+        x: Annotated[int, Path(ge=0)],
+        y: Annotated[int, Path(ge=0)],
+        ids: Annotated[list[str] | None, Query()] = None,
+        datetime: str | None = None,
+        filter_expr: Annotated[str | None, Query(alias="filter")] = None,
+        filter_lang: Annotated[str | None, Query(alias="filter-lang")] = None,
+    ) -> Response:
+        """GET /collections/{collection_id}/tiles/{z}/{x}/{y}.mvt endpoint."""
+        tile = await self.client.tile(
+            z,
+            x,
+            y,
+            collection_id=collection_id,
+            ids=_split(ids),
+            datetime=datetime,
+            filter_expr=filter_expr,
+            filter_lang=filter_lang,
+        )
+        return Response(content=tile, media_type=MVT_MEDIA_TYPE)
+
+
+def _split(values: list[str] | None) -> list[str] | None:
+    """Accept both repeated and comma-separated query parameters."""
+    if not values:
+        return None
+    return [part for value in values for part in value.split(",") if part]
@@ -9,9 +9,58 @@ from typing import Any
 from fastapi import HTTPException
 
 from stac_fastapi.core.extensions.filter import DEFAULT_QUERYABLES
+from stac_fastapi.core.utilities import get_bool_env
 
 logger = logging.getLogger(__name__)
 
+REDIS_SCHEMA_VERSION_KEY = "queryables_schema_version"
+
+
+class QueryablesSchemaVersion:
+    """Version of the item schemas, bumped by schema-changing writes.
+
+    Creating or deleting a collection, changing its id or finishing a reindex
+    changes the set of item mappings the root `/queryables` union is built
+    from. Caches of the union store the version they were built at and are
+    rebuilt once it changed. With `REDIS_ENABLE=true` the version is kept in
+    Redis, so a write made by another API worker is seen by every process.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the in-process version."""
+        self._local = 0
+
+    @staticmethod
+    async def _redis() -> Any | None:
+        if not get_bool_env("REDIS_ENABLE", default=False):
+            return None
+        from stac_fastapi.core.redis_utils import get_redis
+
+        return await get_redis()
+
+    async def get(self) -> tuple[int, int | None]:
+        """Return the current version, to compare with the one of a later call."""
+        try:
+            redis = await self._redis()
+            if redis is not None:
+                return self._local, int(await redis.get(REDIS_SCHEMA_VERSION_KEY) or 0)
+        except Exception as e:
+            logger.warning(f"Could not read the queryables schema version: {e}")
+        return self._local, None
+
+    async def bump(self) -> None:
+        """Record a schema-changing write."""
+        self._local += 1
+        try:
+            redis = await self._redis()
+            if redis is not None:
+                await redis.incr(REDIS_SCHEMA_VERSION_KEY)
+        except Exception as e:
+            logger.warning(f"Could not bump the queryables schema version: {e}")
+
+
+queryables_schema_version = QueryablesSchemaVersion()
+
 
 class QueryablesCache:
     """A thread-safe, time-based cache for queryable properties."""
@@ -1,7 +1,11 @@
 """Utilities for connecting to and managing Redis connections."""
 
+import asyncio
+import base64
 import json
 import logging
+import time
+import zlib
 from datetime import datetime as dt_datetime
 from functools import wraps
 from typing import Any, Callable, Literal, cast
@@ -213,6 +217,73 @@ async def connect_redis() -> aioredis.Redis | None:
     return None
 
 
+_shared_redis: aioredis.Redis | None = None
+_shared_redis_loop: asyncio.AbstractEventLoop | None = None
+_shared_redis_lock: asyncio.Lock | None = None
+
+
+def redis_configured() -> bool:
+    """Return whether a Redis server or Redis Sentinel is configured."""
+    return bool(sentinel_settings.REDIS_SENTINEL_HOSTS or settings.REDIS_HOST)
+
+
+async def get_redis() -> aioredis.Redis | None:
+    """Return the process-wide Redis client, connecting on first use.
+
+    The client and its connection pool are shared by pagination links, the
+    index alias cache and the item queue, so requests reuse pooled connections
+    instead of connecting (and resolving the Sentinel master) every time. The
+    client is bound to the event loop that created it.
+
+    Returns:
+        aioredis.Redis | None: The shared client, or None if Redis is not configured
+        or unreachable.
+    """
+    global _shared_redis, _shared_redis_loop, _shared_redis_lock
+
+    loop = asyncio.get_running_loop()
+    if _shared_redis is not None and _shared_redis_loop is loop:
+        return _shared_redis
+    if _shared_redis_lock is None or _shared_redis_loop is not loop:
+        _shared_redis_lock = asyncio.Lock()
+        _shared_redis = None
+        _shared_redis_loop = loop
+    async with _shared_redis_lock:
+        if _shared_redis is None:
+            _shared_redis = await connect_redis()
+    return _shared_redis
+
+
+async def init_redis() -> aioredis.Redis | None:
+    """Create the process-wide Redis client at startup and check it responds.
+
+    Returns:
+        aioredis.Redis | None: The shared client, or None if Redis is not configured.
+    """
+    if not redis_configured():
+        return None
+    redis = await get_redis()
+    if redis is None:
+        return None
+    try:
+        await redis.ping()
+    except (RedisConnectionError, RedisTimeoutError) as e:
+        logger.warning(f"Redis is not reachable yet, will reconnect on use: {e}")
+    return redis
+
+
+async def close_redis() -> None:
+    """Close the process-wide Redis client, e.g. at shutdown."""
+    global _shared_redis, _shared_redis_loop, _shared_redis_lock
+
+    redis = _shared_redis
+    _shared_redis = None
+    _shared_redis_loop = None
+    _shared_redis_lock = None
+    if redis is not None:
+        await redis.aclose()  # type: ignore
+
+
 def get_redis_key(url: str, token: str) -> str:
     """Create Redis key using URL path and token."""
     parsed = urlparse(url)
@@ -240,6 +311,29 @@ def build_url_with_token(base_url: str, token: str) -> str:
     )
 
 
+def _prev_link_payload(
+    current_url: str, current_method: str, current_body: dict | None
+) -> str:
+    """Serialize the link to the current page, stored as the next page's previous link."""
+    payload: dict[str, Any] = {"href": current_url, "method": current_method}
+    if current_method == "POST" and current_body is not None:
+        payload["body"] = current_body
+    return json.dumps(payload)
+
+
+def _parse_prev_link(prev_link: str | bytes | None) -> dict | None:
+    """Parse a stored previous link."""
+    if not prev_link:
+        return None
+    try:
+        return json.loads(prev_link)
+    except json.JSONDecodeError:
+        # Backward compatibility for previously stored plain URLs.
+        if isinstance(prev_link, bytes):
+            prev_link = prev_link.decode()
+        return {"href": prev_link, "method": "GET"}
+
+
 @redis_retry
 async def save_prev_link(
     redis: aioredis.Redis,
@@ -251,15 +345,12 @@ async def save_prev_link(
 ) -> None:
     """Save the current page as the previous link for the next URL."""
     if next_url and next_token:
-        if sentinel_settings.REDIS_SENTINEL_HOSTS:
-            ttl_seconds = settings.REDIS_SELF_LINK_TTL
-        elif settings.REDIS_HOST:
-            ttl_seconds = settings.REDIS_SELF_LINK_TTL
         key = get_redis_key(next_url, next_token)
-        payload: dict[str, Any] = {"href": current_url, "method": current_method}
-        if current_method == "POST" and current_body is not None:
-            payload["body"] = current_body
-        await redis.setex(key, ttl_seconds, json.dumps(payload))
+        await redis.setex(
+            key,
+            settings.REDIS_SELF_LINK_TTL,
+            _prev_link_payload(current_url, current_method, current_body),
+        )
 
 
 @redis_retry
@@ -270,15 +361,39 @@ async def get_prev_link(
     if not current_url or not current_token:
         return None
     key = get_redis_key(current_url, current_token)
-    prev_link = await redis.get(key)
-    if not prev_link:
-        return None
+    return _parse_prev_link(await redis.get(key))
 
-    try:
-        return json.loads(prev_link)
-    except json.JSONDecodeError:
-        # Backward compatibility for previously stored plain URLs.
-        return {"href": prev_link, "method": "GET"}
+
+@redis_retry
+async def save_and_get_prev_link(
+    redis: aioredis.Redis,
+    current_url: str,
+    token: str | None,
+    next_token: str | None,
+    current_method: str = "GET",
+    current_body: dict | None = None,
+) -> dict | None:
+    """Save the previous link of the next page and get the one of the current page.
+
+    Both commands are sent in a single pipeline, i.e. one round trip.
+
+    Returns:
+        dict | None: The previous link of the current page, if any.
+    """
+    pipe: Pipeline = redis.pipeline(transaction=False)
+    if next_token:
+        next_url = build_url_with_token(current_url, next_token)
+        pipe.setex(
+            get_redis_key(next_url, next_token),
+            settings.REDIS_SELF_LINK_TTL,
+            _prev_link_payload(current_url, current_method, current_body),
+        )
+    if token:
+        pipe.get(get_redis_key(current_url, token))
+    if not next_token and not token:
+        return None
+    results = await pipe.execute()
+    return _parse_prev_link(results[-1]) if token else None
 
 
 async def redis_pagination_links(
@@ -290,39 +405,60 @@ async def redis_pagination_links(
     body: dict | None = None,
 ) -> None:
     """Handle Redis pagination."""
-    redis = await connect_redis()
+    redis = await get_redis()
     if not redis:
         logger.warning("Redis connection failed.")
         return
 
     try:
-        if next_token:
-            next_url = build_url_with_token(current_url, next_token)
-            await save_prev_link(
-                redis,
-                next_url,
-                current_url,
-                next_token,
-                current_method=method,
-                current_body=body,
-            )
-
-        if token:
-            prev_link = await get_prev_link(redis, current_url, token)
-            if prev_link:
-                link = {
-                    "rel": "previous",
-                    "type": "application/json",
-                    "method": prev_link.get("method", "GET"),
-                    "href": prev_link["href"],
-                }
-                if prev_link.get("method") == "POST" and "body" in prev_link:
-                    link["body"] = prev_link["body"]
-                links.insert(0, link)
+        prev_link = await save_and_get_prev_link(
+            redis,
+            current_url,
+            token,
+            next_token,
+            current_method=method,
+            current_body=body,
+        )
+        if prev_link:
+            link = {
+                "rel": "previous",
+                "type": "application/json",
+                "method": prev_link.get("method", "GET"),
+                "href": prev_link["href"],
+            }
+            if prev_link.get("method") == "POST" and "body" in prev_link:
+                link["body"] = prev_link["body"]
+            links.insert(0, link)
     except Exception as e:
         logger.warning(f"Redis pagination operation failed: {e}")
-    finally:
-        await redis.aclose()  # type: ignore
+
+
+def failed_item_ids_by_collection(errors: list[dict]) -> dict[str, set[str]]:
+    """Group the item IDs of failed bulk operations by collection.
+
+    Each error dict has the shape:
+        {"<op_type>": {"_id": "item_id|collection_id", ...}}
+    where op_type is one of: index, create, update, delete (see `mk_item_id`).
+
+    Returns:
+        Mapping of collection ID to the set of failed item IDs.
+    """
+    failed: dict[str, set[str]] = {}
+    for error in errors:
+        for op_type in ("index", "create", "update", "delete"):
+            info = error.get(op_type)
+            if info:
+                doc_id = info.get("_id", "")
+                if doc_id:
+                    item_id, _, collection_id = doc_id.partition("|")
+                    failed.setdefault(collection_id, set()).add(item_id)
+                break
+    return failed
+
+
+def failed_item_ids(errors: list[dict]) -> set[str]:
+    """Return the item IDs of failed bulk operations, of any collection."""
+    return set().union(*failed_item_ids_by_collection(errors).values())
 
 
 class ItemQueueSettings(BaseSettings):
@@ -333,6 +469,11 @@ class ItemQueueSettings(BaseSettings):
     QUEUE_KEY_PREFIX: str = "item_queue"
     WORKER_POLL_INTERVAL: float = Field(default=1.0, gt=0)
     WORKER_MAX_THREADS: int = Field(default=4, gt=0)
+    QUEUE_MERGE_COLLECTIONS: bool = False
+    QUEUE_MERGE_MAX_BYTES: int = Field(default=10 * 1024 * 1024, gt=0)
+    QUEUE_DLQ_PAYLOAD_TTL: int = Field(default=7 * 24 * 3600, ge=0)
+    WORKER_METRICS_PORT: int | None = None
+    WORKER_METRICS_REFRESH_INTERVAL: float = Field(default=15.0, gt=0)
     BACKEND: Literal["opensearch", "elasticsearch"] = "opensearch"
     LOG_LEVEL: Literal["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"] = "INFO"
 
@@ -346,19 +487,42 @@ class AsyncRedisQueueManager:
     for ordering and a hash (HASH) for item data storage.
 
     Redis key layout per collection:
-        {prefix}:{collection_id}:zset  — ZSET where score = primary datetime timestamp
-        {prefix}:{collection_id}:data  — HASH  item_id → JSON payload
-        {prefix}:collections           — SET   collection IDs with pending items
+        {prefix}:{collection_id}:zset      — ZSET where score = primary datetime timestamp
+        {prefix}:{collection_id}:data      — HASH  item_id → JSON payload
+        {prefix}:{collection_id}:enqueued  — ZSET where score = first enqueue time
+        {prefix}:collections               — SET   collection IDs with pending items
+
+    Dead-letter queue (DLQ) layout:
+        {prefix}:failed:{collection_id}                  — SET    failed item IDs
+        {prefix}:failed:collections                      — SET    collection IDs with failed items
+        {prefix}:failed:{collection_id}:item:{item_id}   — STRING compressed failure
+                                                           record, expires after
+                                                           QUEUE_DLQ_PAYLOAD_TTL
     """
 
-    def __init__(self, redis: aioredis.Redis) -> None:
-        """Initialize with an existing async Redis connection."""
+    def __init__(self, redis: aioredis.Redis, owns_connection: bool = True) -> None:
+        """Initialize with an existing async Redis connection.
+
+        Args:
+            redis: Async Redis client.
+            owns_connection: Whether `close()` closes the client. False for the
+                shared process-wide client.
+        """
         self.queue_settings = ItemQueueSettings()
         self.redis: aioredis.Redis = redis
+        self._owns_connection = owns_connection
 
     @classmethod
     async def create(cls) -> "AsyncRedisQueueManager":
-        """Create and connect an AsyncRedisQueueManager."""
+        """Create an AsyncRedisQueueManager on the process-wide Redis client.
+
+        A dedicated connection is used if there is no shared client, or if it
+        does not decode responses, which the queue relies on.
+        """
+        if settings.REDIS_DECODE_RESPONSES:
+            redis = await get_redis()
+            if redis is not None:
+                return cls(redis, owns_connection=False)
         redis = await cls._connect()
         return cls(redis)
 
@@ -425,6 +589,10 @@ class AsyncRedisQueueManager:
         """Get Redis key for collection's item data hash."""
         return f"{self.queue_settings.QUEUE_KEY_PREFIX}:{collection_id}:data"
 
+    def _get_enqueued_key(self, collection_id: str) -> str:
+        """Get Redis key for collection's sorted set of enqueue times."""
+        return f"{self.queue_settings.QUEUE_KEY_PREFIX}:{collection_id}:enqueued"
+
     def _get_collections_set_key(self) -> str:
         """Get Redis key for set of collections with pending items."""
         return f"{self.queue_settings.QUEUE_KEY_PREFIX}:collections"
@@ -452,8 +620,10 @@ class AsyncRedisQueueManager:
 
         zset_key = self._get_zset_key(collection_id)
         data_key = self._get_data_key(collection_id)
+        enqueued_key = self._get_enqueued_key(collection_id)
         collections_key = self._get_collections_set_key()
 
+        enqueued_at = time.time()
         zset_mapping = {}
         data_mapping = {}
         for item in items:
@@ -470,6 +640,8 @@ class AsyncRedisQueueManager:
             pipe.hset(data_key, mapping=data_mapping)
             pipe.zadd(zset_key, zset_mapping)
             pipe.zcard(zset_key)
+            # Keep the first enqueue time of re-queued items for queue age metrics
+            pipe.zadd(enqueued_key, dict.fromkeys(zset_mapping, enqueued_at), nx=True)
             results = await pipe.execute()
 
             queue_length = results[3]
@@ -535,6 +707,25 @@ class AsyncRedisQueueManager:
         """Get number of items in the queue."""
         return await self.redis.zcard(self._get_zset_key(collection_id))
 
+    async def get_queue_lengths(self, collection_ids: list[str]) -> dict[str, int]:
+        """Get the number of queued items for several collections in one round trip.
+
+        Args:
+            collection_ids: The collection identifiers.
+
+        Returns:
+            Mapping of collection ID to queue length.
+        """
+        if not collection_ids:
+            return {}
+
+        pipe: Pipeline = self.redis.pipeline(transaction=False)
+        for collection_id in collection_ids:
+            pipe.zcard(self._get_zset_key(collection_id))
+        results = await pipe.execute()
+
+        return dict(zip(collection_ids, results))
+
     async def mark_items_processed(
         self, collection_id: str, item_ids: list[str]
     ) -> int:
@@ -553,10 +744,13 @@ class AsyncRedisQueueManager:
         zset_key = self._get_zset_key(collection_id)
         data_key = self._get_data_key(collection_id)
 
+        enqueued_key = self._get_enqueued_key(collection_id)
+
         pipe: Pipeline = self.redis.pipeline(transaction=True)
         pipe.zrem(zset_key, *item_ids)
         pipe.hdel(data_key, *item_ids)
         pipe.zcard(zset_key)
+        pipe.zrem(enqueued_key, *item_ids)
         results = await pipe.execute()
 
         remaining = results[2]
@@ -564,7 +758,7 @@ class AsyncRedisQueueManager:
         if remaining == 0:
             pipe = self.redis.pipeline(transaction=True)
             pipe.srem(self._get_collections_set_key(), collection_id)
-            pipe.delete(data_key)
+            pipe.delete(data_key, enqueued_key)
             await pipe.execute()
 
         return remaining
@@ -582,10 +776,13 @@ class AsyncRedisQueueManager:
         zset_key = self._get_zset_key(collection_id)
         data_key = self._get_data_key(collection_id)
 
+        enqueued_key = self._get_enqueued_key(collection_id)
+
         pipe: Pipeline = self.redis.pipeline(transaction=True)
         pipe.zrem(zset_key, item_id)
         pipe.hdel(data_key, item_id)
         pipe.zcard(zset_key)
+        pipe.zrem(enqueued_key, item_id)
         results = await pipe.execute()
 
         removed = results[0]
@@ -593,7 +790,7 @@ class AsyncRedisQueueManager:
         if results[2] == 0:
             pipe = self.redis.pipeline(transaction=True)
             pipe.srem(self._get_collections_set_key(), collection_id)
-            pipe.delete(data_key)
+            pipe.delete(data_key, enqueued_key)
             await pipe.execute()
 
         return removed > 0
@@ -606,22 +803,190 @@ class AsyncRedisQueueManager:
         """Get Redis key for the SET of collections that have failed items."""
         return f"{self.queue_settings.QUEUE_KEY_PREFIX}:failed:collections"
 
-    async def save_failed_items(self, collection_id: str, item_ids: list[str]) -> None:
-        """Save failed item IDs to the dead-letter queue.
+    def _get_failed_payload_key(self, collection_id: str, item_id: str) -> str:
+        """Get Redis key holding the compressed payload of a failed item."""
+        return f"{self.queue_settings.QUEUE_KEY_PREFIX}:failed:{collection_id}:item:{item_id}"
+
+    @staticmethod
+    def _encode_failed_record(record: dict) -> str:
+        """Compress a DLQ record into a string safe for decoded Redis clients."""
+        return base64.b64encode(zlib.compress(json.dumps(record).encode())).decode()
+
+    @staticmethod
+    def _decode_failed_record(value: str | bytes) -> dict:
+        """Decode a DLQ record produced by `_encode_failed_record`."""
+        return json.loads(zlib.decompress(base64.b64decode(value)))
+
+    async def save_failed_items(
+        self, collection_id: str, item_ids: list[str], reason: str | None = None
+    ) -> None:
+        """Save failed items to the dead-letter queue.
+
+        The item IDs are recorded in the collection's failed set. Unless
+        QUEUE_DLQ_PAYLOAD_TTL is 0, the queued payloads are also kept, compressed
+        and with that TTL, so they can be replayed later. Must therefore be
+        called before `mark_items_processed` removes the payloads.
 
         Args:
             collection_id: The collection identifier.
-            item_ids: Item IDs that failed during bulk indexing.
+            item_ids: Item IDs that failed during validation or bulk indexing.
+            reason: Optional failure reason stored alongside the payload.
         """
         if not item_ids:
             return
         failed_key = self._get_failed_set_key(collection_id)
         collections_key = self._get_failed_collections_key()
+
+        payload_ttl = self.queue_settings.QUEUE_DLQ_PAYLOAD_TTL
+        payloads = []
+        if payload_ttl:
+            payloads = await self.redis.hmget(
+                self._get_data_key(collection_id), *item_ids
+            )
+
         pipe: Pipeline = self.redis.pipeline(transaction=True)
         pipe.sadd(failed_key, *item_ids)
         pipe.sadd(collections_key, collection_id)
+        failed_at = time.time()
+        for item_id, payload in zip(item_ids, payloads):
+            if not payload:
+                continue
+            record = {
+                "item": json.loads(payload),
+                "reason": reason,
+                "failed_at": failed_at,
+            }
+            pipe.set(
+                self._get_failed_payload_key(collection_id, item_id),
+                self._encode_failed_record(record),
+                ex=payload_ttl,
+            )
         await pipe.execute()
 
+    async def get_failed_collections(self) -> list[str]:
+        """Get list of collections with items in the dead-letter queue."""
+        return list(await self.redis.smembers(self._get_failed_collections_key()))
+
+    async def get_failed_count(self, collection_id: str) -> int:
+        """Get number of item IDs in a collection's dead-letter queue."""
+        return await self.redis.scard(self._get_failed_set_key(collection_id))
+
+    async def scan_failed_item_ids(self, collection_id: str, count: int = 1000):
+        """Iterate over failed item IDs of a collection in batches.
+
+        Uses SSCAN, so the set can be large and may be modified while iterating.
+
+        Args:
+            collection_id: The collection identifier.
+            count: Approximate number of IDs per batch.
+
+        Yields:
+            Lists of failed item IDs.
+        """
+        failed_key = self._get_failed_set_key(collection_id)
+        cursor = 0
+        while True:
+            cursor, item_ids = await self.redis.sscan(
+                failed_key, cursor=cursor, count=count
+            )
+            if item_ids:
+                yield list(item_ids)
+            if cursor == 0:
+                break
+
+    async def get_failed_records(
+        self, collection_id: str, item_ids: list[str]
+    ) -> dict[str, dict]:
+        """Fetch retained DLQ records for the given failed items.
+
+        Args:
+            collection_id: The collection identifier.
+            item_ids: Failed item IDs.
+
+        Returns:
+            Mapping of item ID to record (``{"item", "reason", "failed_at"}``).
+            Items whose payload expired or was never kept are omitted.
+        """
+        if not item_ids:
+            return {}
+        values = await self.redis.mget(
+            [self._get_failed_payload_key(collection_id, i) for i in item_ids]
+        )
+        return {
+            item_id: self._decode_failed_record(value)
+            for item_id, value in zip(item_ids, values)
+            if value
+        }
+
+    async def remove_failed_items(self, collection_id: str, item_ids: list[str]) -> int:
+        """Remove items and their payloads from the dead-letter queue.
+
+        Args:
+            collection_id: The collection identifier.
+            item_ids: Failed item IDs to remove.
+
+        Returns:
+            int: Number of failed items remaining for the collection.
+        """
+        failed_key = self._get_failed_set_key(collection_id)
+        if not item_ids:
+            return await self.redis.scard(failed_key)
+
+        pipe: Pipeline = self.redis.pipeline(transaction=True)
+        pipe.srem(failed_key, *item_ids)
+        pipe.delete(*[self._get_failed_payload_key(collection_id, i) for i in item_ids])
+        pipe.scard(failed_key)
+        results = await pipe.execute()
+
+        remaining = results[2]
+        if remaining == 0:
+            await self.redis.srem(self._get_failed_collections_key(), collection_id)
+        return remaining
+
+    async def get_queue_stats(self) -> dict[str, dict[str, Any]]:
+        """Collect queue state for all collections using pipelined reads.
+
+        Returns:
+            Mapping of collection ID to a dict with:
+                - depth (int): number of pending items.
+                - oldest_enqueued_at (float | None): Unix time the oldest pending
+                  item was enqueued, None if unknown.
+                - failed (int): number of item IDs in the dead-letter queue.
+        """
+        pipe: Pipeline = self.redis.pipeline(transaction=False)
+        pipe.smembers(self._get_collections_set_key())
+        pipe.smembers(self._get_failed_collections_key())
+        pending_collections, failed_collections = await pipe.execute()
+
+        pending = sorted(pending_collections)
+        failed = sorted(failed_collections)
+
+        pipe = self.redis.pipeline(transaction=False)
+        for collection_id in pending:
+            pipe.zcard(self._get_zset_key(collection_id))
+            pipe.zrange(self._get_enqueued_key(collection_id), 0, 0, withscores=True)
+        for collection_id in failed:
+            pipe.scard(self._get_failed_set_key(collection_id))
+        results = await pipe.execute()
+
+        stats: dict[str, dict[str, Any]] = {}
+        for i, collection_id in enumerate(pending):
+            oldest = results[2 * i + 1]
+            stats[collection_id] = {
+                "depth": results[2 * i],
+                "oldest_enqueued_at": oldest[0][1] if oldest else None,
+                "failed": 0,
+            }
+        offset = 2 * len(pending)
+        for i, collection_id in enumerate(failed):
+            entry = stats.setdefault(
+                collection_id, {"depth": 0, "oldest_enqueued_at": None, "failed": 0}
+            )
+            entry["failed"] = results[offset + i]
+
+        return stats
+
     async def close(self):
-        """Close Redis connection."""
-        await self.redis.aclose()  # type: ignore
+        """Close the Redis connection, unless it is the shared client."""
+        if self._owns_connection:
+            await self.redis.aclose()  # type: ignore
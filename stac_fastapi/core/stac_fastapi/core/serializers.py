@@ -12,7 +12,11 @@ from starlette.requests import Request
 from stac_fastapi.core.datetime_utils import now_to_rfc3339_str
 from stac_fastapi.core.models import Catalog
 from stac_fastapi.core.models.links import CollectionLinks
-from stac_fastapi.core.utilities import get_bool_env, get_excluded_from_items
+from stac_fastapi.core.utilities import (
+    compute_item_content_hash,
+    get_bool_env,
+    get_excluded_from_items,
+)
 from stac_fastapi.types import stac as stac_types
 from stac_fastapi.types.links import ItemLinks, resolve_links
 
@@ -197,6 +201,9 @@ class ItemSerializer(Serializer):
         if "created" not in stac_data["properties"]:
             stac_data["properties"]["created"] = now
         stac_data["properties"]["updated"] = now
+
+        if get_bool_env("ENABLE_CONTENT_HASH"):
+            stac_data["content_hash"] = compute_item_content_hash(stac_data)
         return stac_data
 
     @classmethod
@@ -364,7 +371,9 @@ class CollectionSerializer(Serializer):
         extensions = extensions or []
         collection = deepcopy(collection)
         parent_ids = collection.pop("parent_ids", [])
+        collection.pop("ancestor_ids", None)
         collection.pop("bbox_shape", None)
+        collection.pop("moving_to", None)
 
         # Set default values for required STAC Collection fields
         cls._set_collection_defaults(collection)
@@ -434,7 +443,9 @@ class CollectionSerializer(Serializer):
         extensions = extensions or []
         collection = deepcopy(collection)
         parent_ids = collection.pop("parent_ids", [])
+        collection.pop("ancestor_ids", None)
         collection.pop("bbox_shape", None)
+        collection.pop("moving_to", None)
 
         # Set default values for required STAC Collection fields
         cls._set_collection_defaults(collection)
@@ -523,6 +534,7 @@ class CatalogSerializer(Serializer):
         extensions = extensions or []
         catalog = deepcopy(catalog)
         parent_ids = catalog.pop("parent_ids", [])
+        catalog.pop("ancestor_ids", None)
         base_url = str(request.base_url)
 
         # Set defaults to prevent Pydantic validation errors on legacy records
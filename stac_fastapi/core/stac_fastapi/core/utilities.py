@@ -4,11 +4,15 @@ This module contains functions for transforming geospatial coordinates,
 such as converting bounding boxes to polygon representations.
 """
 
+import hashlib
 import logging
 import os
 import re
-from typing import Any
+from typing import Any, AsyncIterator
 
+import orjson
+
+from stac_fastapi.core.exceptions import NdjsonLineTooLong
 from stac_fastapi.types.stac import Item
 
 MAX_LIMIT = 10000
@@ -299,6 +303,36 @@ def get_excluded_from_items(obj: dict, field_path: str) -> None:
     current.pop(final, None)
 
 
+# Server-set properties excluded from the item content hash
+_CONTENT_HASH_EXCLUDED_PROPERTIES = ("created", "updated")
+
+
+def compute_item_content_hash(item: dict) -> str:
+    """Hash the canonical JSON form of a database-ready item.
+
+    Keys are sorted so the hash does not depend on key order, and the
+    server-set `created`/`updated` properties as well as a previously stored
+    `content_hash` are left out, so re-sending an unchanged item produces the
+    same hash.
+
+    Args:
+        item: The item as produced by `ItemSerializer.stac_to_db`.
+
+    Returns:
+        Hex digest of the item content.
+    """
+    content = {key: value for key, value in item.items() if key != "content_hash"}
+    properties = content.get("properties")
+    if isinstance(properties, dict):
+        content["properties"] = {
+            key: value
+            for key, value in properties.items()
+            if key not in _CONTENT_HASH_EXCLUDED_PROPERTIES
+        }
+    canonical = orjson.dumps(content, option=orjson.OPT_SORT_KEYS)
+    return hashlib.blake2b(canonical, digest_size=16).hexdigest()
+
+
 async def queue_items_if_enabled(
     collection_id: str,
     items: dict | list[dict],
@@ -367,6 +401,7 @@ def build_bulk_summary(
     validation_error_count: int,
     conflict_errors: list | None = None,
     other_errors: list | None = None,
+    unchanged_count: int = 0,
 ) -> dict:
     """Build a standardized summary dictionary for bulk operations telemetry.
 
@@ -380,9 +415,11 @@ def build_bulk_summary(
         validation_error_count: Count of validation errors encountered.
         conflict_errors: List of items that caused database conflicts (duplicates).
         other_errors: List of items that caused other database errors.
+        unchanged_count: Count of items skipped because their stored content hash
+            matched (see `ENABLE_CONTENT_HASH`).
 
     Returns:
-        Dictionary with telemetry counts for input, processed, valid, skipped, and error items.
+        Dictionary with telemetry counts for input, processed, valid, skipped, unchanged and error items.
     """
     conflict_count = len(conflict_errors) if conflict_errors else 0
     database_error_count = len(other_errors) if other_errors else 0
@@ -392,6 +429,7 @@ def build_bulk_summary(
         (len(raw_features) - len(processed_items))  # input duplicates
         + validation_error_count
         + conflict_count
+        + unchanged_count
     )
 
     return {
@@ -402,6 +440,7 @@ def build_bulk_summary(
         "validation_error_count": validation_error_count,
         "conflict_count": conflict_count,
         "database_error_count": database_error_count,
+        "unchanged_count": unchanged_count,
     }
 
 
@@ -429,3 +468,60 @@ def format_conflict_errors(conflicts: list[dict]) -> dict[str, str]:
         else:
             conflict_details[doc_id] = f"Item '{doc_id}' already exists"
     return conflict_details
+
+
+def merge_bulk_summaries(summaries: list[dict]) -> dict:
+    """Add up summaries produced by `build_bulk_summary` for successive chunks.
+
+    Every field of the summary is a count, so chunk summaries can be summed to
+    get the summary of the whole stream without keeping the items in memory.
+
+    Args:
+        summaries: Summary dictionaries to merge.
+
+    Returns:
+        A summary dictionary with the same keys as `build_bulk_summary`.
+    """
+    merged = build_bulk_summary([], [], [], 0)
+    for summary in summaries:
+        for key, value in summary.items():
+            merged[key] = merged.get(key, 0) + value
+    return merged
+
+
+async def iter_ndjson_lines(
+    byte_chunks: AsyncIterator[bytes], max_line_bytes: int
+) -> AsyncIterator[tuple[int, bytes]]:
+    """Split a byte stream into newline-delimited records.
+
+    Only the current partial line is buffered, so memory use is bounded by
+    `max_line_bytes` regardless of the size of the stream. Blank lines are
+    skipped but still counted.
+
+    Args:
+        byte_chunks: Async iterator of raw body chunks (e.g. `request.stream()`).
+        max_line_bytes: Maximum size of a single line.
+
+    Yields:
+        Tuples of (1-based line number, line bytes without the newline).
+
+    Raises:
+        NdjsonLineTooLong: If a line is longer than `max_line_bytes`.
+    """
+    buffer = b""
+    line_number = 0
+    async for chunk in byte_chunks:
+        if not chunk:
+            continue
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            line_number += 1
+            if len(line) > max_line_bytes:
+                raise NdjsonLineTooLong(line_number, max_line_bytes)
+            if line.strip():
+                yield line_number, line
+        if len(buffer) > max_line_bytes:
+            raise NdjsonLineTooLong(line_number + 1, max_line_bytes)
+    if buffer.strip():
+        yield line_number + 1, buffer
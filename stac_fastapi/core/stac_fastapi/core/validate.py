@@ -3,10 +3,17 @@
 Provides validation for STAC items and collections using multiple validation backends:
 - Pydantic validation (always enabled via FastAPI/stac_pydantic)
 - Fast JSON Schema compiled validation (ultra-fast, sequential STAC validation)
+- Optional process pool for large batches (STAC_VALIDATOR_PROCESSES)
 """
 
 import asyncio
 import logging
+import math
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 
 from dateutil import parser
 
@@ -22,44 +29,44 @@ except ImportError:
     fv_module = None
     get_validator = None
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 from stac_pydantic import Collection, Item
 
-from stac_fastapi.core.utilities import get_bool_env
+from stac_fastapi.core.utilities import get_bool_env, get_int_env
 
 logger = logging.getLogger(__name__)
 
+_validation_pool: ProcessPoolExecutor | None = None
+_validation_pool_size = 0
+_validation_pool_lock = threading.Lock()
 
-def validate_batch_with_stac_validator(
-    items: list[dict],
-) -> tuple[list[dict], dict[str, list[str]]]:
-    """Validate a batch of STAC items using compiled fastjsonschema functions.
 
-    Performs ultra-fast sequential validation in memory. Bypasses multiprocessing
-    to save massive amounts of RAM and Inter-Process Communication (IPC) CPU overhead.
+def _validate_items(
+    items: list[dict], offset: int = 0
+) -> tuple[list[int], dict[str, list[str]]]:
+    """Validate items sequentially with the cached compiled validators.
 
     Args:
         items: List of STAC item dictionaries to validate.
+        offset: Position of the first item in the full batch, used for the
+            fallback IDs of items without an ID.
 
     Returns:
-        Tuple of (valid_items_list, invalid_items_dict) where invalid_items_dict
-        maps error messages to lists of affected item IDs.
+        Tuple of (valid_positions, invalid_items_dict) where valid_positions
+        are the indexes of the valid items in `items`. Positions are returned
+        instead of the items themselves so process-pool workers do not have to
+        send the payloads back.
     """
-    # Guard clause: Return immediately if validation is disabled or the batch is empty
-    if not get_bool_env("ENABLE_STAC_VALIDATOR") or not items:
-        return items, {}
-
-    if fastjsonschema is None or get_validator is None:
-        raise ImportError(
-            "STAC validator is not installed. "
-            "Install it with: pip install stac-fastapi-elasticsearch[validator]"
-        )
-
-    valid_items: list[dict] = []
+    valid_positions: list[int] = []
     invalid_items: dict[str, list[str]] = {}
 
     for idx, item in enumerate(items):
         # Reliable ID matching: use exact object ID or fallback to index
-        item_id = item.get("id", f"unknown_id_{idx}")
+        item_id = item.get("id", f"unknown_id_{offset + idx}")
 
         stac_type = (
             "Item" if item.get("type") == "Feature" else item.get("type", "unknown")
@@ -71,7 +78,7 @@ def validate_batch_with_stac_validator(
             # get_validator uses internal caching, so this compiles instantly for repeated schemas
             validator, _ = get_validator(stac_type, stac_version, extensions)
             validator(item)
-            valid_items.append(item)
+            valid_positions.append(idx)
 
         except fastjsonschema.JsonSchemaValueException as e:
             err_msg = f"{e.name} {e.message.replace(e.name, '').strip()}"
@@ -90,9 +97,186 @@ def validate_batch_with_stac_validator(
                 invalid_items[err_msg] = []
             invalid_items[err_msg].append(item_id)
 
+    return valid_positions, invalid_items
+
+
+def _init_validation_worker(prewarm_extensions: list[str]) -> None:
+    """Mute the validator and compile the common validators in a pool worker."""
+    if fv_module is None or get_validator is None:
+        return
+    fv_module.QUIET_MODE = True
+    specs = [("Item", "1.0.0", []), ("Collection", "1.0.0", [])]
+    if prewarm_extensions:
+        specs.append(("Item", "1.0.0", prewarm_extensions))
+    for stac_type, stac_version, extensions in specs:
+        try:
+            get_validator(stac_type, stac_version, extensions)
+        except Exception as e:
+            logger.warning(
+                f"Could not pre-compile {stac_type} validator for {extensions}: {e}"
+            )
+
+
+def _ping_validation_worker() -> None:
+    """No-op task used to start every pool worker at startup."""
+
+
+def get_validation_pool() -> ProcessPoolExecutor | None:
+    """Return the shared validation process pool, creating it on first use.
+
+    The pool is opt-in: it is only created when STAC_VALIDATOR_PROCESSES is set
+    to a value greater than 1. Workers are started with the "spawn" method so
+    they do not inherit the event loop or open connections of the server.
+
+    Returns:
+        The process pool, or None when process-pool validation is disabled.
+    """
+    global _validation_pool, _validation_pool_size
+
+    processes = get_int_env("STAC_VALIDATOR_PROCESSES", default=0)
+    if processes <= 1:
+        return None
+
+    with _validation_pool_lock:
+        if _validation_pool is None:
+            prewarm_extensions = [
+                ext.strip()
+                for ext in os.getenv("STAC_VALIDATOR_PREWARM_EXTENSIONS", "").split(",")
+                if ext.strip()
+            ]
+            _validation_pool = ProcessPoolExecutor(
+                max_workers=processes,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_validation_worker,
+                initargs=(prewarm_extensions,),
+            )
+            _validation_pool_size = processes
+            logger.info(
+                f"Started STAC validation process pool with {processes} workers"
+            )
+        return _validation_pool
+
+
+def start_validation_pool() -> None:
+    """Create the validation pool and wait until all workers are warm.
+
+    Called from the application lifespan so the first large batch does not pay
+    for process start-up and schema compilation. Does nothing when process-pool
+    validation is disabled or the STAC validator is not enabled.
+    """
+    if not get_bool_env("ENABLE_STAC_VALIDATOR"):
+        return
+    pool = get_validation_pool()
+    if pool is None:
+        return
+    # Submitting one task per worker makes the pool spawn all of them
+    futures = [
+        pool.submit(_ping_validation_worker) for _ in range(_validation_pool_size)
+    ]
+    for future in futures:
+        future.result()
+
+
+def shutdown_validation_pool() -> None:
+    """Shut down the validation process pool if it was started."""
+    global _validation_pool
+
+    with _validation_pool_lock:
+        if _validation_pool is not None:
+            _validation_pool.shutdown(wait=True, cancel_futures=True)
+            _validation_pool = None
+
+
+def _discard_broken_pool(pool: ProcessPoolExecutor) -> None:
+    """Forget a pool whose workers died so the next batch starts a fresh one."""
+    global _validation_pool
+
+    with _validation_pool_lock:
+        if _validation_pool is pool:
+            _validation_pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _use_validation_pool(items: list[dict]) -> ProcessPoolExecutor | None:
+    """Return the pool if this batch is large enough to be split across processes."""
+    threshold = get_int_env("STAC_VALIDATOR_PROCESS_THRESHOLD", default=1000)
+    if len(items) < max(threshold, 2):
+        return None
+    return get_validation_pool()
+
+
+def _split_batch(items: list[dict], parts: int) -> list[tuple[int, list[dict]]]:
+    """Split items into at most `parts` contiguous (offset, chunk) slices."""
+    size = math.ceil(len(items) / parts)
+    return [
+        (start, items[start : start + size]) for start in range(0, len(items), size)
+    ]
+
+
+def _merge_results(
+    items: list[dict],
+    chunks: list[tuple[int, list[dict]]],
+    results: list[tuple[list[int], dict[str, list[str]]]],
+) -> tuple[list[dict], dict[str, list[str]]]:
+    """Merge per-chunk results back into the batch output, preserving item order."""
+    valid_items: list[dict] = []
+    invalid_items: dict[str, list[str]] = {}
+    for (offset, _), (positions, errors) in zip(chunks, results):
+        valid_items.extend(items[offset + pos] for pos in positions)
+        for err_msg, ids in errors.items():
+            invalid_items.setdefault(err_msg, []).extend(ids)
     return valid_items, invalid_items
 
 
+def _check_validator_installed() -> None:
+    """Raise if the optional STAC validator dependency is missing."""
+    if fastjsonschema is None or get_validator is None:
+        raise ImportError(
+            "STAC validator is not installed. "
+            "Install it with: pip install stac-fastapi-elasticsearch[validator]"
+        )
+
+
+def validate_batch_with_stac_validator(
+    items: list[dict],
+) -> tuple[list[dict], dict[str, list[str]]]:
+    """Validate a batch of STAC items using compiled fastjsonschema functions.
+
+    Performs ultra-fast sequential validation in memory. When
+    STAC_VALIDATOR_PROCESSES is set and the batch has at least
+    STAC_VALIDATOR_PROCESS_THRESHOLD items, the batch is split across the
+    pre-warmed validation process pool instead.
+
+    Args:
+        items: List of STAC item dictionaries to validate.
+
+    Returns:
+        Tuple of (valid_items_list, invalid_items_dict) where invalid_items_dict
+        maps error messages to lists of affected item IDs.
+    """
+    # Guard clause: Return immediately if validation is disabled or the batch is empty
+    if not get_bool_env("ENABLE_STAC_VALIDATOR") or not items:
+        return items, {}
+
+    _check_validator_installed()
+
+    pool = _use_validation_pool(items)
+    if pool is not None:
+        chunks = _split_batch(items, _validation_pool_size)
+        try:
+            futures = [
+                pool.submit(_validate_items, chunk, offset) for offset, chunk in chunks
+            ]
+            return _merge_results(items, chunks, [f.result() for f in futures])
+        except BrokenProcessPool:
+            logger.warning(
+                "STAC validation process pool is broken, validating in-process"
+            )
+            _discard_broken_pool(pool)
+
+    return _merge_results(items, [(0, items)], [_validate_items(items)])
+
+
 def validate_stac(
     stac_data: dict | Item | Collection,
     pydantic_model: type[Item] | type[Collection] = Item,
@@ -185,8 +369,9 @@ async def async_validate_batch_with_stac_validator(
 ) -> tuple[list[dict], dict[str, list[str]]]:
     """Asynchronously validate a batch of STAC items.
 
-    Offloads the CPU-bound validation loop to a separate thread to prevent
-    blocking the FastAPI asyncio event loop.
+    Large batches are split across the validation process pool when it is
+    enabled; otherwise the CPU-bound validation loop is offloaded to a separate
+    thread to prevent blocking the FastAPI asyncio event loop.
 
     Args:
         items: List of STAC item dictionaries to validate.
@@ -195,6 +380,29 @@ async def async_validate_batch_with_stac_validator(
         Tuple of (valid_items_list, invalid_items_dict) where invalid_items_dict
         maps error messages to lists of affected item IDs.
     """
+    if not get_bool_env("ENABLE_STAC_VALIDATOR") or not items:
+        return items, {}
+
+    _check_validator_installed()
+
+    pool = _use_validation_pool(items)
+    if pool is not None:
+        loop = asyncio.get_running_loop()
+        chunks = _split_batch(items, _validation_pool_size)
+        try:
+            results = await asyncio.gather(
+                *(
+                    loop.run_in_executor(pool, _validate_items, chunk, offset)
+                    for offset, chunk in chunks
+                )
+            )
+            return _merge_results(items, chunks, list(results))
+        except BrokenProcessPool:
+            logger.warning(
+                "STAC validation process pool is broken, validating in-process"
+            )
+            _discard_broken_pool(pool)
+
     return await asyncio.to_thread(validate_batch_with_stac_validator, items)
 
 
@@ -226,8 +434,11 @@ def validate_geometry_bounds(coords: list) -> None:
             validate_geometry_bounds(sub_coord)
 
 
-def validate_item_topology_lightweight(item_dict: dict) -> None:
-    """Lightweight validation to enforce global coordinate boundaries and antimeridian checks.
+def _validate_item_topology_python(item_dict: dict) -> None:
+    """Pure-Python topology validation of a single item.
+
+    Reference implementation used when NumPy is not installed, and to produce the
+    exact error message for items rejected by the vectorized pre-check.
 
     Validates all geometry types for WGS84 bounds compliance, and checks for improper
     antimeridian line skips in Polygon and MultiPolygon rings. Polygon rings are also
@@ -241,8 +452,6 @@ def validate_item_topology_lightweight(item_dict: dict) -> None:
         ValueError: If geometry is invalid, out of bounds, crosses antimeridian improperly,
                    or exceeds the vertex limit.
     """
-    from stac_fastapi.core.utilities import get_int_env
-
     geometry = item_dict.get("geometry")
     if not geometry:
         return
@@ -294,6 +503,127 @@ def validate_item_topology_lightweight(item_dict: dict) -> None:
         raise ValueError(f"Malformed GeoJSON coordinate structure: {str(e)}")
 
 
+def _geometry_sequences(coords: list) -> list[list]:
+    """Collect the position sequences (lists of [lon, lat, ...]) of a geometry.
+
+    A bare position (Point) is returned as a one-position sequence, so every
+    entry can be converted to a 2D array.
+    """
+    if not coords:
+        return []
+    if isinstance(coords[0], (int, float)):
+        return [[coords]]
+    first = coords[0]
+    if isinstance(first, list) and first and isinstance(first[0], (int, float)):
+        return [coords]
+    sequences: list[list] = []
+    for sub_coords in coords:
+        if not isinstance(sub_coords, list):
+            raise TypeError("Coordinates must be nested lists of numbers")
+        sequences.extend(_geometry_sequences(sub_coords))
+    return sequences
+
+
+def _numpy_topology_mask(features: list[dict], max_vertices: int) -> list[bool]:
+    """Vectorized topology pre-check over a whole batch.
+
+    Flattens every geometry into one coordinate array and checks WGS84 bounds
+    and antimeridian jumps for all vertices at once. Ring sizes are checked per
+    ring. Only a positive answer is trusted: items flagged here (or whose
+    coordinates cannot be converted to a numeric array) are re-validated with
+    the pure-Python implementation, which produces the error message.
+
+    Args:
+        features: List of feature dictionaries to check.
+        max_vertices: Maximum number of vertices allowed per polygon ring.
+
+    Returns:
+        One boolean per feature, True if the feature is known to be valid.
+    """
+    valid = [False] * len(features)
+    arrays = []
+    owners = []
+    ring_flags = []
+
+    for idx, item in enumerate(features):
+        geometry = item.get("geometry")
+        coords = geometry.get("coordinates") if geometry else None
+        if coords is None:
+            valid[idx] = True
+            continue
+
+        try:
+            geom_type = geometry.get("type")
+            is_polygon = geom_type in ("Polygon", "MultiPolygon")
+            if is_polygon:
+                polygons = [coords] if geom_type == "Polygon" else coords
+                if any(
+                    len(ring) < 4 or len(ring) > max_vertices
+                    for polygon in polygons
+                    for ring in polygon
+                ):
+                    continue
+            item_arrays = [np.asarray(seq) for seq in _geometry_sequences(coords)]
+        except (TypeError, ValueError, AttributeError):
+            continue
+
+        if not all(
+            arr.ndim == 2 and arr.shape[1] >= 2 and arr.dtype.kind in "biuf"
+            for arr in item_arrays
+        ):
+            continue
+
+        valid[idx] = True
+        for arr in item_arrays:
+            arrays.append(arr[:, :2].astype(np.float64, copy=False))
+            owners.append(idx)
+            ring_flags.append(is_polygon)
+
+    if not arrays:
+        return valid
+
+    lengths = np.fromiter((len(arr) for arr in arrays), dtype=np.int64)
+    points = np.concatenate(arrays)
+    point_owner = np.repeat(np.asarray(owners, dtype=np.int64), lengths)
+    lon, lat = points[:, 0], points[:, 1]
+
+    # Negated comparisons so NaN coordinates are rejected like in pure Python
+    bad = ~((lon >= -180) & (lon <= 180) & (lat >= -90) & (lat <= 90))
+
+    ring_ids = np.repeat(np.arange(len(arrays)), lengths)
+    is_ring_point = np.repeat(np.asarray(ring_flags, dtype=bool), lengths)
+    same_ring = (ring_ids[1:] == ring_ids[:-1]) & is_ring_point[1:]
+    jumps = same_ring & (np.abs(np.diff(lon)) > 180)
+    bad[1:] |= jumps
+
+    for idx in np.unique(point_owner[bad]).tolist():
+        valid[idx] = False
+    return valid
+
+
+def validate_item_topology_lightweight(item_dict: dict) -> None:
+    """Lightweight validation to enforce global coordinate boundaries and antimeridian checks.
+
+    Validates all geometry types for WGS84 bounds compliance, and checks for improper
+    antimeridian line skips in Polygon and MultiPolygon rings. Polygon rings are also
+    checked against a configurable vertex limit (default 5000) to prevent DoS attacks
+    with pathologically complex geometries. Uses a vectorized NumPy check when NumPy
+    is installed, falling back to pure Python to report errors.
+
+    Args:
+        item_dict: The STAC item dictionary to validate.
+
+    Raises:
+        ValueError: If geometry is invalid, out of bounds, crosses antimeridian improperly,
+                   or exceeds the vertex limit.
+    """
+    if np is not None:
+        max_vertices = get_int_env("MAX_TOPOLOGY_VERTICES", default=5000)
+        if _numpy_topology_mask([item_dict], max_vertices)[0]:
+            return
+    _validate_item_topology_python(item_dict)
+
+
 def batch_validate_topology(
     features: list[dict],
 ) -> tuple[list[dict], dict[str, list[str]]]:
@@ -314,9 +644,18 @@ def batch_validate_topology(
     re_validated_features = []
     topology_errors: dict[str, list[str]] = {}
 
-    for item in features:
+    if np is not None and features:
+        max_vertices = get_int_env("MAX_TOPOLOGY_VERTICES", default=5000)
+        known_valid = _numpy_topology_mask(features, max_vertices)
+    else:
+        known_valid = [False] * len(features)
+
+    for item, is_valid in zip(features, known_valid):
+        if is_valid:
+            re_validated_features.append(item)
+            continue
         try:
-            validate_item_topology_lightweight(item)
+            _validate_item_topology_python(item)
             re_validated_features.append(item)
         except ValueError as e:
             err_msg = f"Topology Error: {str(e)}"
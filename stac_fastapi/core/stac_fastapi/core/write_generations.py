@@ -0,0 +1,180 @@
+"""Per-collection write generation counters.
+
+Every write to the items or the metadata of a collection bumps the
+generation of that collection and the catalog-wide generation. Caches store
+the generations they were computed at and treat an entry as outdated as soon
+as one of them changed, without having to know which entries a write affects.
+
+With `REDIS_ENABLE=true` the counters are kept in Redis, so writes made by other
+API workers or by the item queue worker are seen by every process. Otherwise
+they are kept in process memory.
+
+Listeners registered with `WriteGenerations.add_listener` are called with the
+written collection ids after every write, e.g. to mark derived data outdated.
+"""
+
+import asyncio
+import functools
+import inspect
+import logging
+from typing import Any, Awaitable, Callable, Iterable, TypeVar
+
+from stac_fastapi.core.utilities import get_bool_env
+
+logger = logging.getLogger(__name__)
+
+CATALOG_GENERATION = "*"
+REDIS_GENERATIONS_KEY = "write_generations"
+
+T = TypeVar("T")
+
+
+class WriteGenerations:
+    """Write generation counters by collection id."""
+
+    def __init__(self) -> None:
+        """Initialize the in-process counters."""
+        self._local: dict[str, int] = {}
+        self._listeners: list[
+            tuple[Callable[[list[str]], Awaitable[Any]], asyncio.AbstractEventLoop]
+        ] = []
+
+    def add_listener(self, listener: Callable[[list[str]], Awaitable[Any]]) -> None:
+        """Call `listener(collection_ids)` after every write.
+
+        Must be called from the event loop the listener runs on.
+
+        Args:
+            listener (Callable[[list[str]], Awaitable[Any]]): Async callback.
+        """
+        if all(registered != listener for registered, _ in self._listeners):
+            self._listeners.append((listener, asyncio.get_running_loop()))
+
+    def remove_listener(self, listener: Callable[[list[str]], Awaitable[Any]]) -> None:
+        """Stop calling a listener added with `add_listener`."""
+        self._listeners = [
+            (registered, loop)
+            for registered, loop in self._listeners
+            if registered != listener
+        ]
+
+    @staticmethod
+    async def _redis() -> Any | None:
+        if not get_bool_env("REDIS_ENABLE", default=False):
+            return None
+        from stac_fastapi.core.redis_utils import get_redis
+
+        return await get_redis()
+
+    def bump_local(self, collection_ids: Iterable[str]) -> list[str]:
+        """Record a write to collections in this process only, e.g. from sync code.
+
+        Args:
+            collection_ids (Iterable[str]): The collections that were written to.
+
+        Returns:
+            list[str]: The bumped generation keys.
+        """
+        keys = [*dict.fromkeys(collection_ids), CATALOG_GENERATION]
+        for key in keys:
+            self._local[key] = self._local.get(key, 0) + 1
+        return keys
+
+    def bump_sync(self, collection_ids: Iterable[str]) -> None:
+        """Record a write to collections from sync code running outside the event loop.
+
+        Listeners are run on their event loop and awaited.
+
+        Args:
+            collection_ids (Iterable[str]): The collections that were written to.
+        """
+        keys = self.bump_local(collection_ids)
+        try:
+            current_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            current_loop = None
+        for listener, loop in self._listeners:
+            if loop is current_loop:
+                loop.create_task(listener(keys[:-1]))
+                continue
+            try:
+                asyncio.run_coroutine_threadsafe(listener(keys[:-1]), loop).result(
+                    timeout=30
+                )
+            except Exception as e:
+                logger.warning(f"Write listener failed for {keys[:-1]}: {e}")
+
+    async def bump(self, collection_ids: Iterable[str]) -> None:
+        """Record a write to collections.
+
+        Args:
+            collection_ids (Iterable[str]): The collections that were written to.
+        """
+        keys = self.bump_local(collection_ids)
+        try:
+            redis = await self._redis()
+            if redis is not None:
+                pipe = redis.pipeline(transaction=False)
+                for key in keys:
+                    pipe.hincrby(REDIS_GENERATIONS_KEY, key, 1)
+                await pipe.execute()
+        except Exception as e:
+            logger.warning(f"Could not bump write generations of {keys}: {e}")
+        for listener, _ in self._listeners:
+            try:
+                await listener(keys[:-1])
+            except Exception as e:
+                logger.warning(f"Write listener failed for {keys[:-1]}: {e}")
+
+    async def get(self, collection_ids: list[str] | None) -> tuple[Any, ...]:
+        """Return the current generations of collections.
+
+        Args:
+            collection_ids (list[str] | None): The collections, or None for the
+                whole catalog.
+
+        Returns:
+            tuple[Any, ...]: Generations to compare with the ones of a later call.
+        """
+        keys = sorted(set(collection_ids)) if collection_ids else [CATALOG_GENERATION]
+        local = tuple(self._local.get(key, 0) for key in keys)
+        try:
+            redis = await self._redis()
+            if redis is not None:
+                return local + tuple(await redis.hmget(REDIS_GENERATIONS_KEY, keys))
+        except Exception as e:
+            logger.warning(f"Could not read write generations of {keys}: {e}")
+        return local
+
+
+write_generations = WriteGenerations()
+
+
+def _collection_ids_of(bound: inspect.BoundArguments) -> list[str]:
+    collection_id = bound.arguments.get("collection_id")
+    if collection_id is None:
+        item = bound.arguments.get("item")
+        if isinstance(item, dict):
+            collection_id = item.get("collection")
+    return [collection_id] if collection_id else []
+
+
+def bumps_write_generation(
+    func: Callable[..., Awaitable[T]]
+) -> Callable[..., Awaitable[T]]:
+    """Bump the generation of the `collection_id` argument once `func` returns.
+
+    The generation is also bumped when `func` fails, as a failed bulk write may
+    still have written part of its items.
+    """
+    signature = inspect.signature(func)
+
+    @functools.wraps(func)
+    async def wrapper(*args: Any, **kwargs: Any) -> T:
+        try:
+            return await func(*args, **kwargs)
+        finally:
+            bound = signature.bind_partial(*args, **kwargs)
+            await write_generations.bump(_collection_ids_of(bound))
+
+    return wrapper
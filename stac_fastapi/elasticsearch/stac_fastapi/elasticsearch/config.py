@@ -152,6 +152,21 @@ class AsyncElasticsearchSettings(ApiSettings, SfeosExtensionsSettings, ApiBaseSe
         """Get QUERYABLES_CACHE_TTL from env."""
         return int(os.getenv("QUERYABLES_CACHE_TTL", "1800"))
 
+    @property
+    def bulk_max_in_flight(self) -> int:
+        """Get BULK_MAX_IN_FLIGHT_CHUNKS from env."""
+        return int(os.getenv("BULK_MAX_IN_FLIGHT_CHUNKS", "1"))
+
+    @property
+    def bulk_chunk_size(self) -> int:
+        """Get BULK_CHUNK_SIZE from env."""
+        return int(os.getenv("BULK_CHUNK_SIZE", "500"))
+
+    @property
+    def bulk_max_chunk_bytes(self) -> int:
+        """Get BULK_MAX_CHUNK_BYTES from env."""
+        return int(os.getenv("BULK_MAX_CHUNK_BYTES", str(100 * 1024 * 1024)))
+
     @property
     def database_refresh(self) -> bool | str:
         """
@@ -3,6 +3,7 @@ import asyncio
 import logging
 import os
 from base64 import urlsafe_b64decode, urlsafe_b64encode
+from collections import defaultdict
 from copy import deepcopy
 from typing import Any, Iterable, Type
 
@@ -18,12 +19,14 @@ from starlette.requests import Request
 
 import stac_fastapi.sfeos_helpers.filter as filter_module
 from stac_fastapi.core.base_database_logic import BaseDatabaseLogic
+from stac_fastapi.core.queryables import queryables_schema_version
 from stac_fastapi.core.serializers import (
     CatalogSerializer,
     CollectionSerializer,
     ItemSerializer,
 )
 from stac_fastapi.core.utilities import MAX_LIMIT, bbox2polygon, get_bool_env
+from stac_fastapi.core.write_generations import write_generations
 from stac_fastapi.elasticsearch.config import AsyncElasticsearchSettings
 from stac_fastapi.elasticsearch.config import (
     ElasticsearchSettings as SyncElasticsearchSettings,
@@ -34,31 +37,84 @@ from stac_fastapi.extensions.transaction.request import (
     PatchOperation,
 )
 from stac_fastapi.sfeos_helpers.database import (
+    CollectionMovingError,
     ItemAlreadyExistsError,
+    ReindexTaskClaimLost,
+    ReindexTaskRunner,
+    RollupWriteMarker,
+    StoredScripts,
     add_bbox_shape_to_collection,
+    add_total_count_shared,
+    aggregate_rollups_shared,
+    aggregation_search_params_shared,
     apply_collections_bbox_filter_shared,
     apply_collections_datetime_filter_shared,
     apply_collections_free_text_filter_shared,
     apply_free_text_filter_shared,
     apply_intersects_filter_shared,
+    backfill_ancestor_ids_shared,
+    build_aggregation_body_shared,
+    build_geotile_tile_body_shared,
+    bulk_item_actions_shared,
+    bulk_patch_to_script,
     check_item_exists_in_alias,
     check_item_exists_in_alias_sync,
+    composite_aggregations_shared,
     create_index_templates_shared,
+    create_queryables_index_shared,
+    create_rollups_index_shared,
     delete_item_index_shared,
+    delete_items_by_id_shared,
+    delete_stored_queryables_shared,
+    find_outdated_queryables_shared,
+    find_resumable_reindex_tasks_shared,
+    find_stale_rollups_shared,
+    find_unchanged_items_shared,
+    finish_bulk_load_session_shared,
+    fresh_rollup_collections_shared,
+    get_all_collection_queryables_shared,
+    get_ancestor_ids_shared,
+    get_bulk_load_session_shared,
     get_queryables_mapping_shared,
+    get_reindex_task_shared,
+    get_stored_queryables_shared,
     index_alias_by_collection_id,
+    list_reindex_tasks_shared,
+    load_catalog_hierarchy_shared,
     mk_actions,
     mk_item_id,
+    new_delete_by_query_task,
+    new_update_by_query_task,
+    page_composite_aggregations_shared,
+    parallel_bulk_shared,
+    patch_items_by_id_shared,
+    plan_collection_id_change_shared,
     populate_sort_shared,
+    refresh_queryables_shared,
+    refresh_rollups_shared,
+    reindex_task_collection_ids,
     retry_on_connection_error,
     retry_on_datetime_not_found,
     return_date,
+    revert_stale_bulk_load_sessions_shared,
+    rollup_day_range,
+    rollup_request_supported,
+    sample_aggregations_shared,
+    scale_sampled_aggregations_shared,
     search_children_with_pagination_shared,
     search_collections_by_parent_id_with_pagination_shared,
+    search_descendant_collection_ids_shared,
     search_sub_catalogs_with_pagination_shared,
+    start_bulk_load_session_shared,
+    store_collection_queryables_shared,
+    update_ancestor_ids_shared,
     update_catalog_in_index_shared,
     validate_refresh,
 )
+from stac_fastapi.sfeos_helpers.database.aggregation import (
+    SAMPLE_SEED,
+    get_aggregation_sample_probability,
+)
 from stac_fastapi.sfeos_helpers.database.catalogs import (
     decode_token_to_search_after,
     encode_search_after_to_token,
@@ -67,8 +123,19 @@ from stac_fastapi.sfeos_helpers.database.query import (
     ES_MAX_URL_LENGTH,
     add_collections_to_body,
 )
+from stac_fastapi.sfeos_helpers.database.queryables_store import (
+    ALL_COLLECTIONS,
+    get_queryables_store_enabled,
+    get_queryables_store_refresh_interval,
+)
+from stac_fastapi.sfeos_helpers.database.rollups import (
+    get_rollup_refresh_interval,
+    get_rollups_enabled,
+)
 from stac_fastapi.sfeos_helpers.database.utils import (
+    COLLECTION_MOVING_FIELD,
     add_hidden_filter,
+    is_write_block_error,
     merge_to_operations,
     operations_to_script,
     validate_datetime_operations,
@@ -154,6 +221,12 @@ class DatabaseLogic(BaseDatabaseLogic):
 
     client = attr.ib(init=False)
     sync_client = attr.ib(init=False)
+    _reindex_runs: set[asyncio.Task] = attr.ib(init=False, factory=set)
+    stored_scripts: StoredScripts = attr.ib(init=False)
+    _rollup_refresher: asyncio.Task | None = attr.ib(init=False, default=None)
+    _rollup_marker: RollupWriteMarker = attr.ib(init=False)
+    _queryables_refresher: asyncio.Task | None = attr.ib(init=False, default=None)
+    _queryables_written: set[str] = attr.ib(init=False, factory=set)
 
     def __attrs_post_init__(self):
         """Initialize clients after the class is instantiated."""
@@ -163,6 +236,8 @@ class DatabaseLogic(BaseDatabaseLogic):
             self.client
         )
         self.async_index_selector = IndexSelectorFactory.create_selector(self.client)
+        self.stored_scripts = StoredScripts(self.client)
+        self._rollup_marker = RollupWriteMarker(self.client)
 
     item_serializer: Type[ItemSerializer] = attr.ib(default=ItemSerializer)
     collection_serializer: Type[CollectionSerializer] = attr.ib(
@@ -436,6 +511,10 @@ class DatabaseLogic(BaseDatabaseLogic):
         Returns:
             dict: A dictionary containing the Queryables mappings.
         """
+        stored = await self.get_stored_queryables(collection_id)
+        if stored is not None:
+            return defaultdict(list, stored["mapping"])
+
         mappings = await self.client.indices.get_mapping(
             index=f"{ITEMS_INDEX_PREFIX}{collection_id}",
         )
@@ -460,18 +539,46 @@ class DatabaseLogic(BaseDatabaseLogic):
     async def get_all_collection_queryables(self) -> list[dict]:
         """Retrieve all queryables from all collections safely.
 
-        Generates queryables on-the-fly from each collection's item index mappings
-        using a scroll to prevent memory spikes, and a semaphore to prevent
-        connection pool exhaustion.
+        Reads the merged document of the queryables store when it is enabled.
+        Otherwise generates queryables on-the-fly from the item index mappings,
+        with a single mapping fetch for all collections and a single msearch
+        for the enum values.
 
         Returns:
             A list of queryables dictionaries, one from each active collection.
         """
+        stored = await self.get_stored_queryables(ALL_COLLECTIONS)
+        if stored is not None:
+            return [
+                {
+                    "type": "object",
+                    "properties": stored["queryables"],
+                    "additionalProperties": False,
+                }
+            ]
+
+        filters_client = filter_module.EsAsyncBaseFiltersClient(
+            database=self, settings=self.async_settings
+        )
+        return await get_all_collection_queryables_shared(
+            self.client,
+            await self.get_all_collection_ids(),
+            filters_client.queryables_from_mapping,
+        )
+
+    async def get_all_collection_ids(self) -> list[str]:
+        """Retrieve the ids of all collections, without catalogs.
+
+        Uses a scroll to prevent memory spikes with many collections.
+
+        Returns:
+            list[str]: The collection ids.
+        """
         collection_ids = []
         scroll_id = None
 
         try:
-            # 1. Use the Scroll API to safely fetch all IDs
+            # Use the Scroll API to safely fetch all IDs
             response = await self.client.search(
                 index=COLLECTIONS_INDEX,
                 scroll="2m",  # Keep the search context alive for 2 minutes
@@ -503,32 +610,7 @@ class DatabaseLogic(BaseDatabaseLogic):
                 except Exception as e:
                     logger.debug(f"Failed to clear scroll context: {e}")
 
-        # Initialize the filters client
-        filters_client = filter_module.EsAsyncBaseFiltersClient(
-            database=self, settings=self.async_settings
-        )
-
-        # 2. Add a Semaphore
-        sem = asyncio.Semaphore(50)  # Only allow 50 concurrent DB requests
-
-        async def fetch_queryables_safely(collection_id: str) -> dict | None:
-            async with sem:
-                try:
-                    return await filters_client.get_queryables(
-                        collection_id=collection_id
-                    )
-                except Exception as e:
-                    logger.warning(
-                        f"Failed to retrieve queryables for collection {collection_id}: {e}"
-                    )
-                    return None
-
-        # 3. Gather results. The semaphore ensures we only process 50 at a time.
-        results = await asyncio.gather(
-            *[fetch_queryables_safely(cid) for cid in collection_ids]
-        )
-
-        return [q for q in results if q]
+        return collection_ids
 
     @staticmethod
     def make_search():
@@ -1047,12 +1129,18 @@ class DatabaseLogic(BaseDatabaseLogic):
         datetime_frequency_interval: str,
         datetime_search: str,
         ignore_unavailable: bool | None = True,
+        approximate: bool = False,
+        bucket_limit: int | None = None,
+        after_keys: dict[str, Any] | None = None,
     ):
-        """Return aggregations of STAC Items."""
-        search_body: dict[str, Any] = {}
+        """Return aggregations of STAC Items.
+
+        With `approximate`, frequency aggregations are computed on a sample of
+        the matching items and their counts are scaled to the number of matches.
+        With `bucket_limit`, terms aggregations return pages of at most that
+        many buckets, continued after the keys of `after_keys`.
+        """
         query = search.query.to_dict() if search.query else None
-        if query:
-            search_body["query"] = query
 
         logger.debug("Aggregations: %s", aggregations)
 
@@ -1075,37 +1163,118 @@ class DatabaseLogic(BaseDatabaseLogic):
 
         # include all aggregations specified
         # this will ignore aggregations with the wrong names
-        search_body["aggregations"] = {
+        requested = {
             k: _fill_aggregation_parameters(k, deepcopy(v))
             for k, v in self.aggregation_mapping.items()
             if k in aggregations
         }
+        paged: list[str] = []
+        if bucket_limit:
+            requested, paged = composite_aggregations_shared(
+                requested, bucket_limit, after_keys
+            )
+        search_body = build_aggregation_body_shared(query, requested)
+        if approximate:
+            probability = get_aggregation_sample_probability()
+            if probability < 1:
+                search_body = sample_aggregations_shared(
+                    search_body,
+                    {
+                        "random_sampler": {
+                            "probability": probability,
+                            "seed": SAMPLE_SEED,
+                        }
+                    },
+                )
 
         index_param = await self.async_index_selector.select_indexes(
             collection_ids, datetime_search
         )
 
-        search_task = asyncio.create_task(
-            self.client.search(
+        try:
+            db_response = await self.client.search(
                 index=index_param,
                 ignore_unavailable=ignore_unavailable,
                 body=search_body,
+                **aggregation_search_params_shared(index_param, search_body),
             )
+        except ESNotFoundError:
+            raise NotFoundError(f"Collections '{collection_ids}' do not exist")
+
+        # random_sampler already scales the counts of its sub-aggregations
+        response = scale_sampled_aggregations_shared(
+            add_total_count_shared(db_response, requested), rescale=False
         )
+        if paged:
+            response = page_composite_aggregations_shared(response, paged, bucket_limit)
+        return response
+
+    async def aggregate_geotile(
+        self,
+        collection_ids: list[str] | None,
+        search: Search,
+        datetime_search: str | None,
+        zoom: int,
+        x: int,
+        y: int,
+        grid_offset: int,
+    ) -> list[dict[str, Any]]:
+        """Return the centroid geotile grid buckets of the items inside a tile.
+
+        Args:
+            collection_ids (list[str] | None): The collections to search.
+            search (Search): The search with the request filters applied.
+            datetime_search (str | None): The datetime interval, to select indexes.
+            zoom (int): Zoom of the web mercator tile.
+            x (int): Column of the tile.
+            y (int): Row of the tile.
+            grid_offset (int): Number of zoom levels of the grid below the tile.
 
+        Returns:
+            list[dict[str, Any]]: The `geotile_grid` buckets.
+        """
+        query = search.query.to_dict() if search.query else None
+        field = self.aggregation_mapping["centroid_geotile_grid_frequency"][
+            "geotile_grid"
+        ]["field"]
+        search_body = build_geotile_tile_body_shared(
+            query, field, zoom, x, y, grid_offset
+        )
+        index_param = await self.async_index_selector.select_indexes(
+            collection_ids, datetime_search
+        )
         try:
-            db_response = await search_task
+            db_response = await self.client.search(
+                index=index_param,
+                ignore_unavailable=True,
+                body=search_body,
+                **aggregation_search_params_shared(index_param, search_body),
+            )
         except ESNotFoundError:
             raise NotFoundError(f"Collections '{collection_ids}' do not exist")
-
-        return db_response
+        db_response = getattr(db_response, "body", db_response)
+        return db_response.get("aggregations", {}).get("tile", {}).get("buckets", [])
 
     """ TRANSACTION LOGIC """
 
     async def check_collection_exists(self, collection_id: str):
-        """Database logic to check if a collection exists."""
-        if not await self.client.exists(index=COLLECTIONS_INDEX, id=collection_id):
+        """Database logic to check if a collection exists and accepts item writes.
+
+        Raises:
+            NotFoundError: If the collection does not exist.
+            CollectionMovingError: If the items of the collection are being moved
+                to a new collection id.
+        """
+        try:
+            collection = await self.client.get(
+                index=COLLECTIONS_INDEX,
+                id=collection_id,
+                source_includes=[COLLECTION_MOVING_FIELD],
+            )
+        except ESNotFoundError:
             raise NotFoundError(f"Collection {collection_id} does not exist")
+        if collection["_source"].get(COLLECTION_MOVING_FIELD):
+            raise CollectionMovingError(collection_id)
 
     async def _check_item_exists_in_collection(
         self, collection_id: str, item_id: str
@@ -1217,9 +1386,17 @@ class DatabaseLogic(BaseDatabaseLogic):
         """
         logger.debug(f"Preparing item {item['id']} in collection {item['collection']}.")
 
-        # Check if the collection exists
-        if not self.sync_client.exists(index=COLLECTIONS_INDEX, id=item["collection"]):
+        # Check if the collection exists and accepts item writes
+        try:
+            collection = self.sync_client.get(
+                index=COLLECTIONS_INDEX,
+                id=item["collection"],
+                source_includes=[COLLECTION_MOVING_FIELD],
+            )
+        except ESNotFoundError:
             raise NotFoundError(f"Collection {item['collection']} does not exist")
+        if collection["_source"].get(COLLECTION_MOVING_FIELD):
+            raise CollectionMovingError(item["collection"])
 
         # Serialize the item into a database-compatible format
         prepped_item = self.item_serializer.stac_to_db(item, base_url)
@@ -1241,7 +1418,8 @@ class DatabaseLogic(BaseDatabaseLogic):
             base_url (str, optional): The base URL for the item. Defaults to an empty string.
             upsert (bool, optional): If False (default), performs an insert-only operation
                 that rejects duplicates (op_type="create"). If True, performs an upsert
-                that overwrites existing items (op_type="index").
+                that overwrites existing items (op_type="index"); an item whose
+                `content_hash` matches the stored one is not written again.
             **kwargs: Additional keyword arguments.
                 - refresh (str): Whether to refresh the index after the operation. Can be "true", "false", or "wait_for".
                 - refresh (bool): Whether to refresh the index after the operation. Defaults to the value in `self.async_settings.database_refresh`.
@@ -1267,6 +1445,13 @@ class DatabaseLogic(BaseDatabaseLogic):
             f"Creating item {item_id} in collection {collection_id} with refresh={refresh}"
         )
 
+        if upsert and item.get("content_hash"):
+            if await find_unchanged_items_shared(self.client, collection_id, [item]):
+                logger.info(
+                    f"Item {item_id} in collection {collection_id} is unchanged, skipping write"
+                )
+                return
+
         if upsert and isinstance(self.async_index_inserter, DatetimeIndexInserter):
             existing_item = await self.get_one_item(collection_id, item_id)
             primary_datetime_name = self.async_index_inserter.primary_datetime_name
@@ -1309,6 +1494,10 @@ class DatabaseLogic(BaseDatabaseLogic):
             )
         except ESConflictError:
             raise ItemAlreadyExistsError(item_id, collection_id)
+        except Exception as e:
+            if is_write_block_error(e):
+                raise CollectionMovingError(collection_id) from e
+            raise
 
     @retry_on_connection_error
     async def merge_patch_item(
@@ -1406,8 +1595,12 @@ class DatabaseLogic(BaseDatabaseLogic):
 
             # Write to database using script operations
             if script_operations:
-                script = operations_to_script(
-                    script_operations, create_nest=create_nest
+                script = await self.stored_scripts.resolve(
+                    operations_to_script(
+                        script_operations,
+                        create_nest=create_nest,
+                        drop_content_hash=True,
+                    )
                 )
                 document_index = search_response["hits"]["hits"][0]["_index"]
                 await self.client.update(
@@ -1424,6 +1617,10 @@ class DatabaseLogic(BaseDatabaseLogic):
             raise HTTPException(
                 status_code=400, detail=exc.info["error"]["caused_by"]
             ) from exc
+        except Exception as exc:
+            if is_write_block_error(exc):
+                raise CollectionMovingError(collection_id) from exc
+            raise
 
         item = await self.get_one_item(collection_id, item_id)
 
@@ -1484,7 +1681,7 @@ class DatabaseLogic(BaseDatabaseLogic):
 
         try:
             # Perform the delete operation
-            await self.client.delete_by_query(
+            response = await self.client.delete_by_query(
                 index=index_alias_by_collection_id(collection_id),
                 body={"query": {"term": {"_id": mk_item_id(item_id, collection_id)}}},
                 refresh=refresh,
@@ -1494,6 +1691,166 @@ class DatabaseLogic(BaseDatabaseLogic):
             raise NotFoundError(
                 f"Item {item_id} in collection {collection_id} not found"
             )
+        except Exception as e:
+            if is_write_block_error(e):
+                raise CollectionMovingError(collection_id) from e
+            raise
+        if any(
+            is_write_block_error(failure) for failure in response.get("failures", [])
+        ):
+            raise CollectionMovingError(collection_id)
+
+    async def bulk_delete_items(
+        self, collection_id: str, item_ids: list[str], **kwargs: Any
+    ) -> dict[str, Any]:
+        """Delete items of a collection by id with a single bulk request.
+
+        Args:
+            collection_id (str): The ID of the collection containing the items.
+            item_ids (list[str]): The IDs of the items to delete.
+            **kwargs: Additional keyword arguments like refresh.
+
+        Returns:
+            dict[str, Any]: The number of `deleted` items, the ids that were
+            `not_found` and the per-item `errors`.
+        """
+        refresh = validate_refresh(
+            kwargs.get("refresh", self.async_settings.database_refresh)
+        )
+        return await delete_items_by_id_shared(
+            self.client,
+            collection_id,
+            item_ids,
+            bulk_helper=helpers.async_bulk,
+            refresh=refresh,
+        )
+
+    async def delete_items_by_search(
+        self,
+        collection_id: str,
+        search: Search,
+        datetime_search: dict[str, Any],
+        requests_per_second: float | None = None,
+    ) -> dict[str, Any]:
+        """Delete the items of a collection matching a search in a background task.
+
+        The indexes are selected like `execute_search` does for the collection and
+        datetime, then every index is processed with a sliced, throttled
+        `delete_by_query` whose progress is reported by the task.
+
+        Args:
+            collection_id (str): The ID of the collection containing the items.
+            search (Search): The search selecting the items to delete.
+            datetime_search (dict[str, Any]): Datetime used for index selection.
+            requests_per_second (float | None): Delete throttle. Defaults to
+                `REINDEX_REQUESTS_PER_SECOND`.
+
+        Returns:
+            dict[str, Any]: The task status at submission time.
+        """
+        indexes = await self._select_collection_indexes(collection_id, datetime_search)
+        query = search.query.to_dict() if search.query else {"match_all": {}}
+        task = new_delete_by_query_task(
+            collection_id, indexes, query, requests_per_second=requests_per_second
+        )
+        logger.info(
+            f"Deleting items of collection {collection_id} matching {query} from {indexes}"
+        )
+        return await self.start_reindex_task(task)
+
+    async def _select_collection_indexes(
+        self, collection_id: str, datetime_search: dict[str, Any]
+    ) -> list[str]:
+        """Select the item indexes of a collection like `execute_search` does."""
+        index_param = await self.async_index_selector.select_indexes(
+            [collection_id], datetime_search
+        )
+        return [index for index in index_param.split(",") if index]
+
+    async def bulk_patch_items(
+        self,
+        collection_id: str,
+        item_ids: list[str],
+        patch: PartialItem | list[PatchOperation],
+        **kwargs: Any,
+    ) -> dict[str, Any]:
+        """Apply one merge or JSON patch to items of a collection by id.
+
+        The patch is compiled into a single parameterized script and sent as bulk
+        update actions addressed to the concrete index of every item.
+
+        Args:
+            collection_id (str): The ID of the collection containing the items.
+            item_ids (list[str]): The IDs of the items to patch.
+            patch (PartialItem | list[PatchOperation]): A merge patch or JSON patch operations.
+            **kwargs: Additional keyword arguments like refresh.
+
+        Returns:
+            dict[str, Any]: The number of `updated` items, the ids that were
+            `not_found` and the per-item `errors`.
+        """
+        script = await self.stored_scripts.resolve(
+            bulk_patch_to_script(
+                patch, self.async_index_inserter.validate_datetime_field_update
+            )
+        )
+        refresh = validate_refresh(
+            kwargs.get("refresh", self.async_settings.database_refresh)
+        )
+        return await patch_items_by_id_shared(
+            self.client,
+            collection_id,
+            item_ids,
+            script,
+            bulk_helper=helpers.async_bulk,
+            refresh=refresh,
+        )
+
+    async def patch_items_by_search(
+        self,
+        collection_id: str,
+        search: Search,
+        datetime_search: dict[str, Any],
+        patch: PartialItem | list[PatchOperation],
+        refresh: bool = True,
+        requests_per_second: float | None = None,
+    ) -> dict[str, Any]:
+        """Apply one merge or JSON patch to the items matching a search in a background task.
+
+        Every selected index is processed with a sliced, throttled `update_by_query`
+        running the compiled patch script.
+
+        Args:
+            collection_id (str): The ID of the collection containing the items.
+            search (Search): The search selecting the items to patch.
+            datetime_search (dict[str, Any]): Datetime used for index selection.
+            patch (PartialItem | list[PatchOperation]): A merge patch or JSON patch operations.
+            refresh (bool): Whether to refresh each index once it has been updated.
+            requests_per_second (float | None): Update throttle. Defaults to
+                `REINDEX_REQUESTS_PER_SECOND`.
+
+        Returns:
+            dict[str, Any]: The task status at submission time.
+        """
+        script = await self.stored_scripts.resolve(
+            bulk_patch_to_script(
+                patch, self.async_index_inserter.validate_datetime_field_update
+            )
+        )
+        indexes = await self._select_collection_indexes(collection_id, datetime_search)
+        query = search.query.to_dict() if search.query else {"match_all": {}}
+        task = new_update_by_query_task(
+            collection_id,
+            indexes,
+            query,
+            script,
+            refresh=refresh,
+            requests_per_second=requests_per_second,
+        )
+        logger.info(
+            f"Patching items of collection {collection_id} matching {query} in {indexes}"
+        )
+        return await self.start_reindex_task(task)
 
     async def get_items_mapping(self, collection_id: str) -> dict[str, Any]:
         """Get the mapping for the specified collection's items index.
@@ -1635,7 +1992,7 @@ class DatabaseLogic(BaseDatabaseLogic):
     @retry_on_connection_error
     async def update_collection(
         self, collection_id: str, collection: Collection, **kwargs: Any
-    ) -> None:
+    ) -> dict[str, Any] | None:
         """Update a collection in the database.
 
         Args:
@@ -1645,7 +2002,8 @@ class DatabaseLogic(BaseDatabaseLogic):
                 - refresh (str): Whether to refresh the index after the operation. Can be "true", "false", or "wait_for".
                 - refresh (bool): Whether to refresh the index after the operation. Defaults to the value in `self.async_settings.database_refresh`.
         Returns:
-            None
+            dict[str, Any] | None: The reindex task moving the items when the collection ID
+            changes, otherwise None.
 
         Raises:
             NotFoundError: If the collection with the given `collection_id` is not found in the database.
@@ -1654,8 +2012,8 @@ class DatabaseLogic(BaseDatabaseLogic):
         Notes:
             This function updates the collection in the database using the specified
             `collection_id` and the provided `Collection` object. If the collection ID
-            changes, the function creates a new collection, reindexes the items, and deletes
-            the old collection.
+            changes, the function creates the new collection and starts a background reindex
+            task (see `start_reindex_task`) that moves the items and deletes the old collection.
         """
         # Ensure kwargs is a dictionary
         kwargs = kwargs or {}
@@ -1688,24 +2046,12 @@ class DatabaseLogic(BaseDatabaseLogic):
             # Create the new collection
             await self.create_collection(collection_dict, refresh=refresh)
 
-            # Reindex items from the old collection to the new collection
-            await self.client.reindex(
-                body={
-                    "dest": {
-                        "index": f"{ITEMS_INDEX_PREFIX}{collection_dict.get('id')}"
-                    },
-                    "source": {"index": f"{ITEMS_INDEX_PREFIX}{collection_id}"},
-                    "script": {
-                        "lang": "painless",
-                        "source": f"""ctx._id = ctx._id.replace('{collection_id}', '{collection_dict.get("id")}'); ctx._source.collection = '{collection_dict.get("id")}' ;""",  # noqa: E702
-                    },
-                },
-                wait_for_completion=True,
-                refresh=refresh,
+            # Move the items in a background reindex task; the old collection is
+            # deleted once the new indexes have been swapped in
+            task = await plan_collection_id_change_shared(
+                self.client, collection_id, collection_dict["id"], COLLECTIONS_INDEX
             )
-
-            # Delete the old collection
-            await self.delete_collection(collection_id)
+            return await self.start_reindex_task(task)
 
         else:
             if get_bool_env("ENABLE_COLLECTIONS_SEARCH") or get_bool_env(
@@ -1786,7 +2132,9 @@ class DatabaseLogic(BaseDatabaseLogic):
             else:
                 script_operations.append(operation)
 
-        script = operations_to_script(script_operations, create_nest=create_nest)
+        script = await self.stored_scripts.resolve(
+            operations_to_script(script_operations, create_nest=create_nest)
+        )
 
         try:
             await self.client.update(
@@ -1849,6 +2197,46 @@ class DatabaseLogic(BaseDatabaseLogic):
         )
         await delete_item_index(collection_id)
         await self.async_index_inserter.refresh_cache()
+        if get_queryables_store_enabled():
+            try:
+                await delete_stored_queryables_shared(
+                    self.client, helpers.async_bulk, collection_id
+                )
+            except Exception as e:
+                logger.warning(
+                    f"Could not remove the stored queryables of {collection_id}: {e}"
+                )
+
+    @retry_on_connection_error
+    async def split_unchanged_items(
+        self, collection_id: str, processed_items: list[Item]
+    ) -> tuple[list[Item], list[str]]:
+        """Separate items whose stored content hash equals their new one.
+
+        Only items carrying a `content_hash` (set by the item serializer when
+        `ENABLE_CONTENT_HASH` is true) are looked up, so without hashes this makes
+        no request.
+
+        Args:
+            collection_id (str): The ID of the collection the items belong to.
+            processed_items (list[Item]): Database-ready items.
+
+        Returns:
+            tuple[list[Item], list[str]]: The items that still need to be written and
+            the ids of the unchanged items that can be skipped.
+        """
+        unchanged = await find_unchanged_items_shared(
+            self.client, collection_id, processed_items
+        )
+        if not unchanged:
+            return processed_items, []
+        changed = [item for item in processed_items if item["id"] not in unchanged]
+        logger.info(
+            f"Skipping {len(unchanged)} unchanged items in collection {collection_id}"
+        )
+        return changed, [
+            item["id"] for item in processed_items if item["id"] in unchanged
+        ]
 
     @retry_on_connection_error
     async def bulk_async(
@@ -1873,6 +2261,10 @@ class DatabaseLogic(BaseDatabaseLogic):
                 - raise_on_error (bool, optional): Whether to raise an error if any of the bulk operations fail.
                 Defaults to the value of `self.async_settings.raise_on_bulk_error`.
 
+            When `BULK_MAX_IN_FLIGHT_CHUNKS` is greater than 1, actions are produced lazily and
+            sent in chunks of `BULK_CHUNK_SIZE` (split further by `BULK_MAX_CHUNK_BYTES`) with up
+            to that many bulk requests in flight. Per-item errors of all chunks are aggregated.
+
         Returns:
             tuple[int, list[dict[str, Any]]]: A tuple containing:
                 - The number of successfully processed actions (`success`).
@@ -1911,21 +2303,90 @@ class DatabaseLogic(BaseDatabaseLogic):
             raise_on_error = False
         else:
             raise_on_error = self.async_settings.raise_on_bulk_error
-        actions = await self.async_index_inserter.prepare_bulk_actions(
-            collection_id, processed_items, op_type=op_type
+
+        max_in_flight = self.async_settings.bulk_max_in_flight
+        if max_in_flight > 1:
+            # Stream actions into concurrent chunked requests and aggregate
+            # per-item errors so conflicts can still be separated by the caller
+            success, errors = await parallel_bulk_shared(
+                self.client,
+                self.async_index_inserter.iter_bulk_actions(
+                    collection_id, processed_items, op_type=op_type
+                ),
+                bulk_helper=helpers.async_bulk,
+                max_in_flight=max_in_flight,
+                chunk_size=self.async_settings.bulk_chunk_size,
+                max_chunk_bytes=self.async_settings.bulk_max_chunk_bytes,
+                refresh=refresh,
+            )
+        else:
+            actions = await self.async_index_inserter.prepare_bulk_actions(
+                collection_id, processed_items, op_type=op_type
+            )
+            success, errors = await bulk_item_actions_shared(
+                self.client, actions, helpers.async_bulk, refresh=refresh
+            )
+        if any(is_write_block_error(error) for error in errors):
+            raise CollectionMovingError(collection_id)
+        if raise_on_error and errors:
+            raise helpers.BulkIndexError(
+                f"{len(errors)} document(s) failed to index.", errors
+            )
+
+        # Log the result
+        logger.info(
+            f"Bulk insert completed for collection {collection_id}: {success} successes, {len(errors)} errors"
+        )
+
+        return success, errors
+
+    @retry_on_connection_error
+    async def bulk_async_actions(
+        self,
+        actions: list[dict[str, Any]],
+        max_chunk_bytes: int | None = None,
+        **kwargs: Any,
+    ) -> tuple[int, list[dict[str, Any]]]:
+        """
+        Send pre-built bulk actions, possibly spanning several collections, in one request.
+
+        Unlike `bulk_async`, the target index of each action must already be resolved
+        (e.g. with `async_index_inserter.prepare_bulk_actions`), which allows items of
+        different collections to share a single bulk request.
+
+        Args:
+            actions (list[dict[str, Any]]): Bulk actions with `_op_type`, `_index`, `_id` and `_source`.
+            max_chunk_bytes (int | None): Maximum size in bytes of a single bulk request.
+                When None, the client library default is used.
+            **kwargs (Any): Additional keyword arguments, including:
+                - refresh (str | bool, optional): Whether to refresh the index after the bulk insert.
+                Defaults to the value of `self.async_settings.database_refresh`.
+
+        Returns:
+            tuple[int, list[dict[str, Any]]]: The number of successful actions and the list of
+            per-action errors. Errors are always returned rather than raised so the caller can
+            attribute them to their collections.
+        """
+        if not actions:
+            return 0, []
+
+        refresh = validate_refresh(
+            kwargs.get("refresh", self.async_settings.database_refresh)
         )
-        success, errors = await helpers.async_bulk(
+        chunk_kwargs: dict[str, Any] = {"chunk_size": len(actions)}
+        if max_chunk_bytes is not None:
+            chunk_kwargs["max_chunk_bytes"] = max_chunk_bytes
+
+        success, errors = await bulk_item_actions_shared(
             self.client,
             actions,
+            helpers.async_bulk,
             refresh=refresh,
-            raise_on_error=raise_on_error,
+            **chunk_kwargs,
         )
-
-        # Log the result
         logger.info(
-            f"Bulk insert completed for collection {collection_id}: {success} successes, {len(errors)} errors"
+            f"Bulk request with {len(actions)} prepared actions completed: {success} successes, {len(errors)} errors"
         )
-
         return success, errors
 
     def bulk_sync(
@@ -1987,12 +2448,19 @@ class DatabaseLogic(BaseDatabaseLogic):
             raise_on_error = False
         else:
             raise_on_error = self.sync_settings.raise_on_bulk_error
-        success, errors = helpers.bulk(
-            self.sync_client,
-            mk_actions(collection_id, processed_items, op_type=op_type),
-            refresh=refresh,
-            raise_on_error=raise_on_error,
-        )
+        try:
+            success, errors = helpers.bulk(
+                self.sync_client,
+                mk_actions(collection_id, processed_items, op_type=op_type),
+                refresh=refresh,
+                raise_on_error=raise_on_error,
+            )
+        except helpers.BulkIndexError as e:
+            if any(is_write_block_error(error) for error in e.errors):
+                raise CollectionMovingError(collection_id) from e
+            raise
+        if any(is_write_block_error(error) for error in errors):
+            raise CollectionMovingError(collection_id)
 
         # Log the result
         logger.info(
@@ -2001,6 +2469,341 @@ class DatabaseLogic(BaseDatabaseLogic):
 
         return success, errors
 
+    async def start_bulk_load_session(
+        self, collection_id: str, ttl: int | None = None
+    ) -> dict[str, Any]:
+        """Start or renew a bulk-load session for a collection.
+
+        Disables refreshes and replicas on the collection's item indexes until the
+        session is finished or its lease of `ttl` seconds expires.
+
+        Args:
+            collection_id (str): The ID of the collection to load items into.
+            ttl (int | None): Lease duration in seconds. Defaults to `BULK_LOAD_SESSION_TTL`.
+
+        Returns:
+            dict[str, Any]: The bulk-load session.
+
+        Raises:
+            NotFoundError: If the collection does not exist.
+        """
+        await self.check_collection_exists(collection_id)
+        return await start_bulk_load_session_shared(self.client, collection_id, ttl)
+
+    async def get_bulk_load_session(self, collection_id: str) -> dict[str, Any] | None:
+        """Return the active bulk-load session of a collection, if any."""
+        return await get_bulk_load_session_shared(self.client, collection_id)
+
+    async def finish_bulk_load_session(
+        self,
+        collection_id: str,
+        forcemerge: bool = False,
+        wait_for_status: str | None = "green",
+        timeout: str = "30s",
+    ) -> dict[str, Any] | None:
+        """Finish a bulk-load session and restore the original index settings.
+
+        Args:
+            collection_id (str): The ID of the collection.
+            forcemerge (bool): Whether to force-merge closed datetime indexes.
+            wait_for_status (str | None): Cluster health status to wait for, or None.
+            timeout (str): How long to wait for the health status.
+
+        Returns:
+            dict[str, Any] | None: A report of the restored indexes, or None if the
+            collection has no active session.
+        """
+        return await finish_bulk_load_session_shared(
+            self.client,
+            collection_id,
+            forcemerge=forcemerge,
+            wait_for_status=wait_for_status,
+            timeout=timeout,
+        )
+
+    async def revert_stale_bulk_load_sessions(self) -> list[str]:
+        """Revert bulk-load sessions whose lease expired, e.g. after a crashed load."""
+        return await revert_stale_bulk_load_sessions_shared(self.client)
+
+    async def start_reindex_task(self, task: dict[str, Any]) -> dict[str, Any]:
+        """Persist a reindex task and run it in the background.
+
+        Args:
+            task (dict[str, Any]): A task built with `new_reindex_task` or
+                `plan_collection_id_change_shared`.
+
+        Returns:
+            dict[str, Any]: The task status at submission time.
+        """
+        runner = await ReindexTaskRunner.create(self.client, task)
+        self._spawn_reindex_run(runner)
+        return await get_reindex_task_shared(self.client, task["id"])
+
+    def _spawn_reindex_run(self, runner: ReindexTaskRunner) -> None:
+        run = asyncio.create_task(self._run_reindex_task(runner))
+        self._reindex_runs.add(run)
+        run.add_done_callback(self._reindex_runs.discard)
+
+    async def _run_reindex_task(self, runner: ReindexTaskRunner) -> None:
+        """Run a reindex task, recording unexpected errors in its state."""
+        try:
+            await runner.run()
+        except ReindexTaskClaimLost:
+            logger.warning(
+                f"Reindex task {runner.task['id']} was taken over by another runner"
+            )
+        except Exception as e:
+            logger.exception(f"Reindex task {runner.task['id']} failed: {e}")
+            runner.task["status"] = "failed"
+            runner.task["error"] = str(e)
+            try:
+                await runner.roll_back()
+            except Exception:
+                logger.exception(f"Could not roll back task {runner.task['id']}")
+            try:
+                await runner._persist()
+            except Exception:
+                logger.exception(
+                    f"Could not record failure of task {runner.task['id']}"
+                )
+        finally:
+            await self.async_index_inserter.refresh_cache()
+            await queryables_schema_version.bump()
+            # The items are only written now, after the bump at submission time
+            await write_generations.bump(reindex_task_collection_ids(runner.task))
+
+    async def get_reindex_task(self, task_id: str) -> dict[str, Any] | None:
+        """Return the status of a reindex task, if it exists."""
+        return await get_reindex_task_shared(self.client, task_id)
+
+    async def list_reindex_tasks(
+        self, status: str | None = None, limit: int = 100
+    ) -> list[dict[str, Any]]:
+        """List reindex tasks, newest first."""
+        return await list_reindex_tasks_shared(self.client, status=status, limit=limit)
+
+    async def resume_reindex_tasks(self) -> list[str]:
+        """Resume unfinished reindex tasks whose runner stopped, e.g. after a crash.
+
+        Returns:
+            list[str]: Ids of the tasks resumed by this process.
+        """
+        resumed = []
+        for task_id in await find_resumable_reindex_tasks_shared(self.client):
+            runner = await ReindexTaskRunner.claim(self.client, task_id)
+            if runner is None:
+                continue
+            self._spawn_reindex_run(runner)
+            resumed.append(task_id)
+        if resumed:
+            logger.info(f"Resumed reindex tasks {resumed}")
+        return resumed
+
+    async def register_patch_scripts(self) -> list[str]:
+        """Store the painless scripts of the most common patch shapes.
+
+        Returns:
+            list[str]: Ids of the stored scripts.
+        """
+        return await self.stored_scripts.register_common()
+
+    async def start_rollups(self, refresh_loop: bool = True) -> None:
+        """Mark the rollups of written collections outdated and rebuild them.
+
+        Does nothing unless `ENABLE_ROLLUPS` is set.
+
+        Args:
+            refresh_loop (bool): Rebuild outdated rollups every
+                `ROLLUP_REFRESH_INTERVAL` seconds in this process.
+        """
+        if not get_rollups_enabled():
+            return
+        await create_rollups_index_shared(self.client)
+        write_generations.add_listener(self.mark_rollups_stale)
+        interval = get_rollup_refresh_interval()
+        if refresh_loop and interval > 0 and self._rollup_refresher is None:
+            self._rollup_refresher = asyncio.create_task(
+                self._refresh_rollups_periodically(interval)
+            )
+
+    async def _refresh_rollups_periodically(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.refresh_stale_rollups()
+            except Exception as e:
+                logger.warning(f"Rollup refresh failed: {e}")
+
+    async def refresh_rollups(self, collection_id: str) -> int:
+        """Rebuild the rollup summaries of a collection.
+
+        Returns:
+            int: The number of summary documents.
+        """
+        return await refresh_rollups_shared(
+            self.client, collection_id, helpers.async_bulk
+        )
+
+    async def refresh_stale_rollups(self) -> list[str]:
+        """Rebuild the rollups of the collections written to since their last build.
+
+        Returns:
+            list[str]: Ids of the rebuilt collections.
+        """
+        await self._rollup_marker.retry_pending()
+        refreshed = []
+        for collection_id in await find_stale_rollups_shared(self.client):
+            await self.refresh_rollups(collection_id)
+            refreshed.append(collection_id)
+        return refreshed
+
+    async def mark_rollups_stale(self, collection_ids: list[str]) -> None:
+        """Mark the rollups of collections outdated after a write."""
+        await self._rollup_marker.mark(collection_ids)
+
+    async def aggregate_from_rollups(
+        self,
+        collection_ids: list[str] | None,
+        aggregations: list[str],
+        datetime_search: str | None,
+        interval: str,
+        geotile_precision: int,
+    ) -> dict[str, Any] | None:
+        """Answer an aggregation request from the rollup summaries, if possible.
+
+        Args:
+            collection_ids (list[str] | None): The requested collections, or None
+                for the whole catalog.
+            aggregations (list[str]): The requested aggregation names.
+            datetime_search (str | None): The requested datetime interval.
+            interval (str): The `datetime_frequency` calendar interval.
+            geotile_precision (int): The centroid geotile grid precision.
+
+        Returns:
+            dict[str, Any] | None: The aggregation response, or None if the
+            request needs the items, e.g. rollups are disabled or outdated.
+        """
+        if not get_rollups_enabled():
+            return None
+        day_range = rollup_day_range(datetime_search)
+        if day_range is None or not rollup_request_supported(
+            aggregations, self.aggregation_mapping, interval, geotile_precision
+        ):
+            return None
+        await self._rollup_marker.retry_pending()
+        fresh = await fresh_rollup_collections_shared(
+            self.client, collection_ids, self._rollup_marker.pending
+        )
+        if fresh is None:
+            return None
+        return await aggregate_rollups_shared(
+            self.client, fresh, aggregations, day_range, interval, geotile_precision
+        )
+
+    async def start_queryables_store(self, refresh_loop: bool = True) -> None:
+        """Keep the stored queryables of collections up to date.
+
+        Does nothing unless `ENABLE_QUERYABLES_STORE` is set.
+
+        Args:
+            refresh_loop (bool): Check the item mappings every
+                `QUERYABLES_STORE_REFRESH_INTERVAL` seconds in this process and
+                rebuild the outdated documents, starting now.
+        """
+        if not get_queryables_store_enabled():
+            return
+        await create_queryables_index_shared(self.client)
+        write_generations.add_listener(self.mark_queryables_written)
+        interval = get_queryables_store_refresh_interval()
+        if refresh_loop and interval > 0 and self._queryables_refresher is None:
+            self._queryables_refresher = asyncio.create_task(
+                self._refresh_queryables_periodically(interval)
+            )
+
+    async def _refresh_queryables_periodically(self, interval: float) -> None:
+        while True:
+            try:
+                await self.refresh_outdated_queryables()
+            except Exception as e:
+                logger.warning(f"Queryables refresh failed: {e}")
+            await asyncio.sleep(interval)
+
+    async def mark_queryables_written(self, collection_ids: list[str]) -> None:
+        """Record writes to collections, so their enum values are rebuilt."""
+        self._queryables_written.update(collection_ids)
+
+    def _queryables_from_mapping(
+        self, mapping_properties: dict[str, Any]
+    ) -> tuple[dict[str, Any], dict[str, dict[str, Any]]]:
+        filters_client = filter_module.EsAsyncBaseFiltersClient(
+            database=self, settings=self.async_settings
+        )
+        return filters_client.queryables_from_mapping(mapping_properties)
+
+    async def refresh_queryables(
+        self, collection_ids: list[str], merge: bool = False
+    ) -> dict[str, dict[str, Any]]:
+        """Rebuild the stored queryables of collections.
+
+        Args:
+            collection_ids (list[str]): The collections to rebuild.
+            merge (bool): Create the document merging all collections, if missing.
+
+        Returns:
+            dict[str, dict[str, Any]]: The stored documents by collection id.
+        """
+        return await refresh_queryables_shared(
+            self.client,
+            helpers.async_bulk,
+            collection_ids,
+            self._queryables_from_mapping,
+            merge=merge,
+        )
+
+    async def refresh_outdated_queryables(self) -> list[str]:
+        """Rebuild the stored queryables whose item mappings changed.
+
+        Returns:
+            list[str]: Ids of the rebuilt collections.
+        """
+        written, self._queryables_written = self._queryables_written, set()
+        outdated, removed = await find_outdated_queryables_shared(
+            self.client, await self.get_all_collection_ids(), written
+        )
+        if outdated or removed:
+            refreshed = await self.refresh_queryables(outdated + removed, merge=True)
+            return list(refreshed)
+        if await get_stored_queryables_shared(self.client, ALL_COLLECTIONS) is None:
+            await self.refresh_queryables([], merge=True)
+        return []
+
+    async def get_stored_queryables(self, collection_id: str) -> dict[str, Any] | None:
+        """Return the stored queryables of a collection, building them if missing.
+
+        Args:
+            collection_id (str): The collection id, or `*` for all collections.
+
+        Returns:
+            dict[str, Any] | None: The stored document, or None if the store is
+            disabled, unavailable or the collection has no items index.
+        """
+        if not get_queryables_store_enabled():
+            return None
+        try:
+            stored = await get_stored_queryables_shared(self.client, collection_id)
+            if stored is None and collection_id != ALL_COLLECTIONS:
+                # Only the indexes of this collection are read; the merged
+                # document is left to the periodic refresh
+                stored = await store_collection_queryables_shared(
+                    self.client, collection_id, self._queryables_from_mapping
+                )
+            return stored
+        except Exception as e:
+            logger.warning(
+                f"Could not read the stored queryables of {collection_id}: {e}"
+            )
+            return None
+
     # DANGER
     async def delete_items(self) -> None:
         """Danger. this is only for tests."""
@@ -2170,6 +2973,61 @@ class DatabaseLogic(BaseDatabaseLogic):
             logger.error(f"Error deleting catalog {catalog_id}: {e}", exc_info=True)
             raise
 
+    @retry_on_connection_error
+    async def get_ancestor_ids(self, parent_ids: list[str]) -> list[str]:
+        """Compute the ancestors of a new catalog or collection from its parents.
+
+        Args:
+            parent_ids (list[str]): The parent catalog IDs.
+
+        Returns:
+            list[str]: The sorted ancestor catalog IDs.
+        """
+        return await get_ancestor_ids_shared(self.client, parent_ids)
+
+    @retry_on_connection_error
+    async def update_ancestor_ids(
+        self, root_ids: list[str] | None = None, refresh: bool = True
+    ) -> int:
+        """Recompute the ancestors of catalogs and of all their descendants.
+
+        Args:
+            root_ids (list[str] | None): Catalogs whose parents changed or that
+                were deleted, or None to rebuild the whole hierarchy.
+            refresh (bool): Whether to refresh the index after the update.
+
+        Returns:
+            int: The number of updated catalogs and collections.
+        """
+        return await update_ancestor_ids_shared(
+            self.client, helpers.async_bulk, root_ids, refresh=refresh
+        )
+
+    async def backfill_ancestor_ids(self) -> int:
+        """Add `ancestor_ids` to catalogs and collections written before it existed."""
+        return await backfill_ancestor_ids_shared(self.client, helpers.async_bulk)
+
+    @retry_on_connection_error
+    async def get_descendant_collection_ids(self, catalog_id: str) -> list[str]:
+        """Get the IDs of all collections below a catalog, at any depth.
+
+        Args:
+            catalog_id (str): The ID of the catalog.
+
+        Returns:
+            list[str]: The collection IDs.
+        """
+        return await search_descendant_collection_ids_shared(self.client, catalog_id)
+
+    @retry_on_connection_error
+    async def get_catalog_hierarchy(self) -> list[dict[str, Any]]:
+        """Get the `id`, `type`, `title` and `parent_ids` of all catalogs and linked collections.
+
+        Returns:
+            list[dict[str, Any]]: The documents, see `stac_fastapi.core.catalog_graph`.
+        """
+        return await load_catalog_hierarchy_shared(self.client)
+
     @retry_on_connection_error
     async def get_catalog_children(
         self,
@@ -2315,6 +3173,7 @@ class DatabaseLogic(BaseDatabaseLogic):
 
         if catalog_id not in catalog["parent_ids"]:
             catalog["parent_ids"].append(catalog_id)
+        catalog["ancestor_ids"] = await self.get_ancestor_ids(catalog["parent_ids"])
 
         try:
             await self.create_catalog(
@@ -2357,6 +3216,9 @@ class DatabaseLogic(BaseDatabaseLogic):
 
         if catalog_id not in collection["parent_ids"]:
             collection["parent_ids"].append(catalog_id)
+        collection["ancestor_ids"] = await self.get_ancestor_ids(
+            collection["parent_ids"]
+        )
 
         try:
             await self.create_collection(
@@ -1,5 +1,6 @@
 """FastAPI application."""
 
+import asyncio
 import logging
 import os
 from contextlib import asynccontextmanager
@@ -13,12 +14,14 @@ from stac_fastapi.api.models import (
     create_post_request_model,
     create_request_model,
 )
+from stac_fastapi.core.catalog_graph import get_catalog_graph
 from stac_fastapi.core.core import CoreClient
 from stac_fastapi.core.exceptions import QueuedSuccess, queued_success_handler
 from stac_fastapi.core.rate_limit import setup_rate_limit
 from stac_fastapi.core.route_dependencies import get_route_dependencies
 from stac_fastapi.core.session import Session
 from stac_fastapi.core.utilities import get_bool_env
+from stac_fastapi.core.validate import shutdown_validation_pool, start_validation_pool
 from stac_fastapi.opensearch.config import OpensearchSettings
 from stac_fastapi.opensearch.database_logic import (
     DatabaseLogic,
@@ -115,7 +118,32 @@ def instantiate_api(
         """Initialize index templates and the collections index at startup."""
         await create_index_templates()
         await create_collection_index()
+        await database_logic.revert_stale_bulk_load_sessions()
+        await database_logic.backfill_ancestor_ids()
+        await database_logic.resume_reindex_tasks()
+        await database_logic.register_patch_scripts()
+        await database_logic.start_rollups()
+        await database_logic.start_queryables_store()
+        use_redis = any(
+            get_bool_env(name)
+            for name in (
+                "REDIS_ENABLE",
+                "ENABLE_REDIS_QUEUE",
+                "ENABLE_DATETIME_INDEX_FILTERING",
+            )
+        )
+        if use_redis:
+            from stac_fastapi.core.redis_utils import close_redis, init_redis
+
+            await init_redis()
+        catalog_graph = get_catalog_graph()
+        if catalog_graph is not None and extensions_manager.catalogs_enabled:
+            await catalog_graph.get(database_logic.get_catalog_hierarchy)
+        await asyncio.to_thread(start_validation_pool)
         yield
+        await asyncio.to_thread(shutdown_validation_pool)
+        if use_redis:
+            await close_redis()
 
     title = os.getenv("STAC_FASTAPI_TITLE", "stac-fastapi-opensearch")
     description = os.getenv("STAC_FASTAPI_DESCRIPTION", "stac-fastapi-opensearch")
@@ -10,6 +10,8 @@ with Elasticsearch and OpenSearch. It includes:
 The aggregation package is organized as follows:
 - client.py: Aggregation client implementation
 - format.py: Response formatting functions
+- cache.py: Aggregation result cache invalidated by collection write generations
+- mvt.py: Mapbox Vector Tile encoding of geotile grid buckets
 
 When adding new functionality to this package, consider:
 1. Will this code be used by both Elasticsearch and OpenSearch implementations?
@@ -21,11 +23,16 @@ Function Naming Conventions:
 - Parameter names should be consistent across similar functions
 """
 
+from .cache import AggregationCache, aggregation_cache_key
 from .client import EsAsyncBaseAggregationClient
 from .format import frequency_agg, metric_agg
+from .mvt import encode_geotile_tile
 
 __all__ = [
+    "AggregationCache",
+    "aggregation_cache_key",
     "EsAsyncBaseAggregationClient",
     "frequency_agg",
     "metric_agg",
+    "encode_geotile_tile",
 ]
@@ -0,0 +1,166 @@
+"""Result cache for aggregation requests.
+
+Entries are keyed on the normalized aggregation request and store the write
+generations (see `stac_fastapi.core.write_generations`) of the aggregated
+collections, or of the whole catalog, read before the aggregation ran. An
+entry is fresh while these generations are unchanged and it is younger than
+`AGGREGATION_CACHE_TTL`. Outdated entries younger than
+`AGGREGATION_CACHE_MAX_STALENESS` are still served while a background task
+recomputes them (stale-while-revalidate).
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable
+
+from stac_fastapi.core.utilities import get_bool_env
+from stac_fastapi.core.write_generations import WriteGenerations, write_generations
+
+logger = logging.getLogger(__name__)
+
+# Request fields whose order does not change the result
+_UNORDERED_FIELDS = ("aggregations", "collections", "ids")
+
+
+def aggregation_cache_key(request: dict[str, Any], **parameters: Any) -> str:
+    """Return the cache key of a normalized aggregation request.
+
+    Args:
+        request (dict[str, Any]): The aggregation request, as JSON-compatible dict.
+        **parameters: The resolved precisions and datetime interval.
+
+    Returns:
+        str: A hex digest identifying the request.
+    """
+    normalized = {k: v for k, v in request.items() if v is not None}
+    for field in _UNORDERED_FIELDS:
+        if isinstance(normalized.get(field), list):
+            normalized[field] = sorted(set(normalized[field]))
+    canonical = json.dumps(
+        {"request": normalized, "parameters": parameters},
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str,
+    )
+    return hashlib.blake2b(canonical.encode(), digest_size=16).hexdigest()
+
+
+class AggregationCache:
+    """In-process LRU cache of aggregation results."""
+
+    def __init__(
+        self,
+        ttl: float,
+        max_staleness: float = 0,
+        max_entries: int = 1000,
+        generations: WriteGenerations = write_generations,
+    ):
+        """Initialize the cache.
+
+        Args:
+            ttl (float): Seconds an unchanged entry is served without recomputing.
+            max_staleness (float): Seconds after which an outdated entry is no
+                longer served while it is refreshed. 0 disables stale serving.
+            max_entries (int): Maximum number of cached results.
+            generations (WriteGenerations): Write generation counters.
+        """
+        self.ttl = ttl
+        self.max_staleness = max_staleness
+        self.max_entries = max_entries
+        self.generations = generations
+        self._entries: OrderedDict[str, tuple[tuple, float, Any]] = OrderedDict()
+        self._refreshing: dict[str, asyncio.Task] = {}
+
+    @classmethod
+    def from_env(
+        cls,
+        prefix: str = "AGGREGATION",
+        enabled: bool = False,
+        max_entries: int = 1000,
+    ) -> "AggregationCache | None":
+        """Create the cache configured by env, or None if it is disabled.
+
+        Args:
+            prefix (str): Prefix of the `ENABLE_<prefix>_CACHE` and
+                `<prefix>_CACHE_*` variables.
+            enabled (bool): Whether the cache is enabled by default.
+            max_entries (int): Default maximum number of cached results.
+        """
+        if not get_bool_env(f"ENABLE_{prefix}_CACHE", default=enabled):
+            return None
+        return cls(
+            ttl=float(os.getenv(f"{prefix}_CACHE_TTL", "300")),
+            max_staleness=float(os.getenv(f"{prefix}_CACHE_MAX_STALENESS", "0")),
+            max_entries=int(os.getenv(f"{prefix}_CACHE_MAX_ENTRIES", str(max_entries))),
+        )
+
+    def _store(self, key: str, generations: tuple, result: Any) -> None:
+        self._entries[key] = (generations, time.monotonic(), result)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def _compute(
+        self,
+        key: str,
+        collection_ids: list[str] | None,
+        compute: Callable[[], Awaitable[Any]],
+    ) -> Any:
+        # Generations are read first: a write during the computation makes the
+        # stored entry outdated instead of hiding the write
+        generations = await self.generations.get(collection_ids)
+        result = await compute()
+        self._store(key, generations, result)
+        return result
+
+    async def _refresh(
+        self,
+        key: str,
+        collection_ids: list[str] | None,
+        compute: Callable[[], Awaitable[Any]],
+    ) -> None:
+        try:
+            await self._compute(key, collection_ids, compute)
+        except Exception as e:
+            logger.warning(f"Background aggregation refresh failed: {e}")
+        finally:
+            self._refreshing.pop(key, None)
+
+    async def get_or_compute(
+        self,
+        key: str,
+        collection_ids: list[str] | None,
+        compute: Callable[[], Awaitable[Any]],
+    ) -> Any:
+        """Return the cached result of a request, or compute and cache it.
+
+        Args:
+            key (str): The request key, see `aggregation_cache_key`.
+            collection_ids (list[str] | None): The aggregated collections, or
+                None for the whole catalog.
+            compute (Callable[[], Awaitable[Any]]): Computes the result.
+
+        Returns:
+            Any: The result.
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            generations, computed_at, result = entry
+            age = time.monotonic() - computed_at
+            if age < self.ttl and generations == await self.generations.get(
+                collection_ids
+            ):
+                self._entries.move_to_end(key)
+                return result
+            if age < self.max_staleness:
+                if key not in self._refreshing:
+                    self._refreshing[key] = asyncio.create_task(
+                        self._refresh(key, collection_ids, compute)
+                    )
+                return result
+        return await self._compute(key, collection_ids, compute)
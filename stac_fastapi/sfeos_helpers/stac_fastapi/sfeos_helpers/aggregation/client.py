@@ -18,9 +18,15 @@ from stac_fastapi.core.extensions.aggregation import EsAggregationExtensionPostR
 from stac_fastapi.core.session import Session
 from stac_fastapi.extensions.aggregation.client import AsyncBaseAggregationClient
 from stac_fastapi.extensions.aggregation.types import Aggregation, AggregationCollection
+from stac_fastapi.sfeos_helpers.database.aggregation import (
+    decode_aggregation_token,
+    get_tile_grid_offset,
+)
 from stac_fastapi.types.rfc3339 import DateTimeType
 
+from .cache import AggregationCache, aggregation_cache_key
 from .format import frequency_agg, metric_agg
+from .mvt import encode_geotile_tile
 
 
 @attr.s
@@ -30,6 +36,10 @@ class EsAsyncBaseAggregationClient(AsyncBaseAggregationClient):
     database: BaseDatabaseLogic = attr.ib()
     settings: ApiBaseSettings = attr.ib()
     session: Session = attr.ib(default=attr.Factory(Session.create_from_env))
+    cache: AggregationCache | None = attr.ib(factory=AggregationCache.from_env)
+    tile_cache: AggregationCache | None = attr.ib(
+        factory=lambda: AggregationCache.from_env("TILE", max_entries=5000)
+    )
 
     # Default aggregations to use if none are specified
     DEFAULT_AGGREGATIONS = [
@@ -87,6 +97,10 @@ class EsAsyncBaseAggregationClient(AsyncBaseAggregationClient):
     MAX_GEOHEX_PRECISION = 15
     MAX_GEOTILE_PRECISION = 29
 
+    # Buckets per page of paged terms aggregations
+    DEFAULT_BUCKET_LIMIT = 1000
+    MAX_BUCKET_LIMIT = 10000
+
     async def get_aggregations(
         self, collection_id: str | None = None, **kwargs
     ) -> dict[str, Any]:
@@ -240,6 +254,9 @@ class EsAsyncBaseAggregationClient(AsyncBaseAggregationClient):
         geometry_geohash_grid_frequency_precision: int | None = None,
         geometry_geotile_grid_frequency_precision: int | None = None,
         datetime_frequency_interval: str | None = None,
+        approximate: bool | None = None,
+        bucket_limit: int | None = None,
+        token: str | None = None,
         **kwargs,
     ) -> dict | Exception:
         """Get aggregations from the database."""
@@ -261,6 +278,9 @@ class EsAsyncBaseAggregationClient(AsyncBaseAggregationClient):
                 "geometry_geohash_grid_frequency_precision": geometry_geohash_grid_frequency_precision,
                 "geometry_geotile_grid_frequency_precision": geometry_geotile_grid_frequency_precision,
                 "datetime_frequency_interval": datetime_frequency_interval,
+                "approximate": approximate,
+                "bucket_limit": bucket_limit,
+                "token": token,
             }
 
             if collection_id:
@@ -400,8 +420,39 @@ class EsAsyncBaseAggregationClient(AsyncBaseAggregationClient):
             aggregate_request.datetime_frequency_interval,
         )
 
-        try:
-            db_response = await self.database.aggregate(
+        after_keys = None
+        if aggregate_request.token:
+            try:
+                after_keys = decode_aggregation_token(aggregate_request.token)
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+        bucket_limit = aggregate_request.bucket_limit
+        if bucket_limit is None and after_keys is not None:
+            bucket_limit = self.DEFAULT_BUCKET_LIMIT
+        if bucket_limit is not None and not 1 <= bucket_limit <= self.MAX_BUCKET_LIMIT:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Invalid bucket_limit. Must be between 1 and {self.MAX_BUCKET_LIMIT}",
+            )
+
+        async def compute() -> Any:
+            if not (
+                bucket_limit
+                or aggregate_request.ids
+                or aggregate_request.bbox
+                or aggregate_request.intersects
+                or aggregate_request.filter_expr
+            ):
+                rollup_response = await self.database.aggregate_from_rollups(
+                    aggregate_request.collections,
+                    aggregate_request.aggregations,
+                    aggregate_request.datetime,
+                    datetime_frequency_interval,
+                    centroid_geotile_grid_precision,
+                )
+                if rollup_response is not None:
+                    return rollup_response
+            return await self.database.aggregate(
                 collections,
                 aggregate_request.aggregations,
                 search,
@@ -412,7 +463,30 @@ class EsAsyncBaseAggregationClient(AsyncBaseAggregationClient):
                 geometry_geotile_grid_precision,
                 datetime_frequency_interval,
                 aggregate_request.datetime,
+                approximate=bool(aggregate_request.approximate),
+                bucket_limit=bucket_limit,
+                after_keys=after_keys,
             )
+
+        try:
+            if self.cache is None:
+                db_response = await compute()
+            else:
+                key = aggregation_cache_key(
+                    aggregate_request.model_dump(mode="json"),
+                    collections=collections,
+                    precisions=[
+                        centroid_geohash_grid_precision,
+                        centroid_geohex_grid_precision,
+                        centroid_geotile_grid_precision,
+                        geometry_geohash_grid_precision,
+                        geometry_geotile_grid_precision,
+                    ],
+                    interval=datetime_frequency_interval,
+                )
+                db_response = await self.cache.get_or_compute(
+                    key, aggregate_request.collections or None, compute
+                )
         except Exception as error:
             if not isinstance(error, IndexError):
                 raise error
@@ -460,8 +534,106 @@ class EsAsyncBaseAggregationClient(AsyncBaseAggregationClient):
                     "href": urljoin(base_url, "aggregate"),
                 }
             )
+        next_token = db_response.get("next_token") if db_response else None
+        if next_token:
+            next_link: dict[str, Any] = {"rel": "next", "type": "application/json"}
+            if request.method == "POST":
+                next_link.update(
+                    href=str(request.url),
+                    method="POST",
+                    body={"token": next_token},
+                    merge=True,
+                )
+            else:
+                next_link["href"] = str(
+                    request.url.include_query_params(token=next_token)
+                )
+            links.append(next_link)
+
         results = AggregationCollection(
             type="AggregationCollection", aggregations=aggs, links=links
         )
 
         return results
+
+    async def tile(
+        self,
+        zoom: int,
+        x: int,
+        y: int,
+        collection_id: str | None = None,
+        collections: list[str] | None = None,
+        ids: list[str] | None = None,
+        datetime: str | None = None,
+        filter_expr: str | None = None,
+        filter_lang: str | None = None,
+    ) -> bytes:
+        """Return a vector tile of the centroid geotile grid of the matching items.
+
+        Args:
+            zoom (int): Zoom of the web mercator tile.
+            x (int): Column of the tile.
+            y (int): Row of the tile.
+            collection_id (str | None): The collection of the items.
+            collections (list[str] | None): The collections of the items, if no
+                `collection_id` is given.
+            ids (list[str] | None): Item ids to restrict to.
+            datetime (str | None): The datetime interval of the items.
+            filter_expr (str | None): A CQL2 filter of the items.
+            filter_lang (str | None): The language of `filter_expr`.
+
+        Returns:
+            bytes: The Mapbox Vector Tile, one polygon per grid cell with a `count`.
+
+        Raises:
+            HTTPException: If the tile does not exist or a filter is invalid.
+        """
+        if not 0 <= zoom <= self.MAX_GEOTILE_PRECISION or not (
+            0 <= x < 2**zoom and 0 <= y < 2**zoom
+        ):
+            raise HTTPException(
+                status_code=404, detail=f"Tile {zoom}/{x}/{y} does not exist"
+            )
+        collection_ids = [collection_id] if collection_id else collections or None
+        search = self.database.make_search()
+        if ids:
+            search = self.database.apply_ids_filter(search=search, item_ids=ids)
+        datetime_search = format_datetime_range(datetime) if datetime else None
+        if datetime_search:
+            search, _ = self.database.apply_datetime_filter(
+                search=search, datetime=datetime_search
+            )
+        if collection_ids:
+            search = self.database.apply_collections_filter(
+                search=search, collection_ids=collection_ids
+            )
+        cql2_filter = None
+        if filter_expr:
+            cql2_filter = self.get_filter(filter_expr, filter_lang or "cql2-text")
+            try:
+                search, _ = await self.database.apply_cql2_filter(search, cql2_filter)
+            except Exception as e:
+                raise HTTPException(
+                    status_code=400, detail=f"Error with cql2 filter: {e}"
+                )
+        grid_offset = get_tile_grid_offset()
+
+        async def compute() -> bytes:
+            buckets = await self.database.aggregate_geotile(
+                collection_ids, search, datetime_search, zoom, x, y, grid_offset
+            )
+            return encode_geotile_tile(buckets, zoom, x, y)
+
+        if self.tile_cache is None:
+            return await compute()
+        key = aggregation_cache_key(
+            {
+                "collections": collection_ids,
+                "ids": ids,
+                "datetime": datetime_search,
+                "filter": cql2_filter,
+            },
+            tile=[zoom, x, y],
+            grid_offset=grid_offset,
+        )
+        return await self.tile_cache.get_or_compute(key, collection_ids, compute)
@@ -20,20 +20,28 @@ def frequency_agg(es_aggs: dict[str, Any], name: str, data_type: str) -> Aggrega
     """
     buckets = []
     for bucket in es_aggs.get(name, {}).get("buckets", []):
+        key = bucket.get("key_as_string") or bucket.get("key")
+        # Composite aggregations (paged requests) key buckets by source name
+        if isinstance(key, dict):
+            key = key.get(name)
         bucket_data = {
-            "key": bucket.get("key_as_string") or bucket.get("key"),
+            "key": key,
             "data_type": data_type,
             "frequency": bucket.get("doc_count"),
             "to": bucket.get("to"),
             "from": bucket.get("from"),
         }
         buckets.append(bucket_data)
-    return Aggregation(
+    aggregation = Aggregation(
         name=name,
         data_type="frequency_distribution",
         overflow=es_aggs.get(name, {}).get("sum_other_doc_count", 0),
         buckets=buckets,
     )
+    # Frequencies scaled from a sample of the items (approximate requests)
+    if es_aggs.get(name, {}).get("estimated"):
+        aggregation["estimated"] = True  # type: ignore[typeddict-unknown-key]
+    return aggregation
 
 
 def metric_agg(es_aggs: dict[str, Any], name: str, data_type: str) -> Aggregation:
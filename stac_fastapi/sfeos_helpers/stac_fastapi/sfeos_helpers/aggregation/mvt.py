@@ -0,0 +1,137 @@
+"""Mapbox Vector Tile encoding of geotile grid buckets.
+
+Implements the subset of the Mapbox Vector Tile 2.1 specification needed to
+draw grid cells: one layer of polygon features with a `count` and a `key`
+property, written directly as protobuf without a protobuf dependency.
+"""
+
+from typing import Any
+
+DEFAULT_EXTENT = 4096
+
+_POLYGON = 3
+_MOVE_TO, _LINE_TO, _CLOSE_PATH = 1, 2, 7
+
+
+def _varint(value: int) -> bytes:
+    out = bytearray()
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if value:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return bytes(out)
+
+
+def _zigzag(value: int) -> int:
+    return (value << 1) ^ (value >> 63)
+
+
+def _field(number: int, wire_type: int) -> bytes:
+    return _varint((number << 3) | wire_type)
+
+
+def _uint_field(number: int, value: int) -> bytes:
+    return _field(number, 0) + _varint(value)
+
+
+def _bytes_field(number: int, value: bytes) -> bytes:
+    return _field(number, 2) + _varint(len(value)) + value
+
+
+def _packed_field(number: int, values: list[int]) -> bytes:
+    return _bytes_field(number, b"".join(_varint(value) for value in values))
+
+
+def _command(command: int, count: int) -> int:
+    return (command & 0x7) | (count << 3)
+
+
+def _rectangle(x0: int, y0: int, x1: int, y1: int) -> list[int]:
+    """Encode a rectangle as a clockwise (exterior) polygon ring."""
+    geometry = [_command(_MOVE_TO, 1), _zigzag(x0), _zigzag(y0)]
+    geometry.append(_command(_LINE_TO, 3))
+    for dx, dy in ((x1 - x0, 0), (0, y1 - y0), (x0 - x1, 0)):
+        geometry += [_zigzag(dx), _zigzag(dy)]
+    geometry.append(_command(_CLOSE_PATH, 1))
+    return geometry
+
+
+def _cell_rectangle(
+    key: str, zoom: int, x: int, y: int, extent: int
+) -> tuple[int, int, int, int] | None:
+    """Return the tile coordinates of a geotile cell, or None if it is outside the tile."""
+    cell_zoom, cell_x, cell_y = (int(part) for part in key.split("/"))
+    depth = cell_zoom - zoom
+    if depth < 0:
+        return None
+    dx, dy = cell_x - (x << depth), cell_y - (y << depth)
+    cells = 1 << depth
+    if not (0 <= dx < cells and 0 <= dy < cells):
+        return None
+    return (
+        dx * extent // cells,
+        dy * extent // cells,
+        (dx + 1) * extent // cells,
+        (dy + 1) * extent // cells,
+    )
+
+
+def encode_geotile_tile(
+    buckets: list[dict[str, Any]],
+    zoom: int,
+    x: int,
+    y: int,
+    layer: str = "items",
+    extent: int = DEFAULT_EXTENT,
+) -> bytes:
+    """Encode geotile grid buckets as a vector tile of cell polygons.
+
+    Args:
+        buckets (list[dict[str, Any]]): `geotile_grid` buckets (`key`, `doc_count`).
+        zoom (int): Zoom of the tile.
+        x (int): Column of the tile.
+        y (int): Row of the tile.
+        layer (str): Name of the layer.
+        extent (int): Number of tile coordinate units per tile side.
+
+    Returns:
+        bytes: The encoded tile, empty if no bucket falls inside the tile.
+    """
+    features = []
+    values: dict[Any, int] = {}
+    for bucket in buckets:
+        rectangle = _cell_rectangle(bucket["key"], zoom, x, y, extent)
+        if rectangle is None:
+            continue
+        tags = []
+        for key_index, value in enumerate((bucket["doc_count"], bucket["key"])):
+            value_index = values.setdefault((key_index, value), len(values))
+            tags += [key_index, value_index]
+        features.append(
+            _uint_field(1, len(features) + 1)
+            + _packed_field(2, tags)
+            + _uint_field(3, _POLYGON)
+            + _packed_field(4, _rectangle(*rectangle))
+        )
+    if not features:
+        return b""
+
+    encoded_values = []
+    for (key_index, value), _ in sorted(values.items(), key=lambda kv: kv[1]):
+        if key_index == 0:
+            encoded_values.append(_bytes_field(4, _uint_field(5, value)))
+        else:
+            encoded_values.append(_bytes_field(4, _bytes_field(1, value.encode())))
+    encoded_layer = (
+        _uint_field(15, 2)
+        + _bytes_field(1, layer.encode())
+        + b"".join(_bytes_field(2, feature) for feature in features)
+        + _bytes_field(3, b"count")
+        + _bytes_field(3, b"key")
+        + b"".join(encoded_values)
+        + _uint_field(5, extent)
+    )
+    return _bytes_field(3, encoded_layer)
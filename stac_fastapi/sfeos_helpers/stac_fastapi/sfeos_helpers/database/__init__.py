@@ -17,6 +17,12 @@ The database package is organized as follows:
 - document.py: Document operations
 - utils.py: Utility functions
 - datetime.py: Datetime utilities for query formatting
+- bulk_load.py: Bulk-load sessions that retune index settings during backfills
+- reindex.py: Persistent, resumable reindex and delete-by-query tasks
+- stored_scripts.py: Stored, parameterized painless scripts for patches
+- aggregation.py: Hit-free, cacheable aggregation requests
+- rollups.py: Per-collection, per-day summaries answering aggregations
+- queryables_store.py: Materialized per-collection queryables
 
 When adding new functionality to this package, consider:
 1. Will this code be used by both Elasticsearch and OpenSearch implementations?
@@ -30,11 +36,35 @@ Function Naming Conventions:
 """
 
 # Re-export all functions for backward compatibility
+from .aggregation import (
+    add_total_count_shared,
+    aggregation_search_params_shared,
+    build_aggregation_body_shared,
+    build_geotile_tile_body_shared,
+    composite_aggregations_shared,
+    decode_aggregation_token,
+    encode_aggregation_token,
+    page_composite_aggregations_shared,
+    sample_aggregations_shared,
+    scale_sampled_aggregations_shared,
+)
+from .bulk_load import (
+    finish_bulk_load_session_shared,
+    get_bulk_load_session_shared,
+    revert_stale_bulk_load_sessions_shared,
+    start_bulk_load_session_shared,
+)
 from .catalogs import (
+    backfill_ancestor_ids_shared,
+    get_ancestor_ids_shared,
+    load_catalog_hierarchy_shared,
+    resolve_ancestor_ids,
     search_children_with_pagination_shared,
     search_collections_by_parent_id_shared,
     search_collections_by_parent_id_with_pagination_shared,
+    search_descendant_collection_ids_shared,
     search_sub_catalogs_with_pagination_shared,
+    update_ancestor_ids_shared,
     update_catalog_in_index_shared,
 )
 from .datetime import (
@@ -44,9 +74,19 @@ from .datetime import (
     is_index_closed,
     return_date,
 )
-from .document import mk_actions, mk_item_id
+from .document import (
+    bulk_item_actions_shared,
+    delete_items_by_id_shared,
+    find_existing_items_shared,
+    find_unchanged_items_shared,
+    mk_actions,
+    mk_item_id,
+    parallel_bulk_shared,
+    patch_items_by_id_shared,
+)
 from .index import (
     create_index_templates_shared,
+    create_system_index_shared,
     delete_item_index_shared,
     filter_indexes_by_datetime,
     filter_indexes_by_datetime_range,
@@ -54,7 +94,13 @@ from .index import (
     index_by_collection_id,
     indices,
 )
-from .mapping import get_queryables_mapping_shared
+from .mapping import (
+    build_collection_queryables_shared,
+    get_all_collection_queryables_shared,
+    get_items_mappings_by_alias_shared,
+    get_items_unique_values_by_alias_shared,
+    get_queryables_mapping_shared,
+)
 from .query import (
     apply_collections_bbox_filter_shared,
     apply_collections_datetime_filter_shared,
@@ -63,13 +109,50 @@ from .query import (
     apply_intersects_filter_shared,
     populate_sort_shared,
 )
+from .queryables_store import (
+    create_queryables_index_shared,
+    delete_stored_queryables_shared,
+    find_outdated_queryables_shared,
+    get_mapping_versions_shared,
+    get_stored_queryables_shared,
+    refresh_queryables_shared,
+    store_collection_queryables_shared,
+)
+from .reindex import (
+    ReindexTaskClaimLost,
+    ReindexTaskRunner,
+    find_resumable_reindex_tasks_shared,
+    get_reindex_task_shared,
+    list_reindex_tasks_shared,
+    new_delete_by_query_task,
+    new_reindex_task,
+    new_update_by_query_task,
+    plan_collection_id_change_shared,
+    reindex_task_collection_ids,
+)
+from .rollups import (
+    RollupWriteMarker,
+    aggregate_rollups_shared,
+    create_rollups_index_shared,
+    find_stale_rollups_shared,
+    fresh_rollup_collections_shared,
+    list_collection_ids_shared,
+    mark_rollups_stale_shared,
+    refresh_rollups_shared,
+    rollup_day_range,
+    rollup_request_supported,
+)
+from .stored_scripts import StoredScripts, stored_script_id
 from .utils import (
     BulkIndexError,
+    CollectionMovingError,
     ItemAlreadyExistsError,
     add_bbox_shape_to_collection,
+    bulk_patch_to_script,
     check_item_exists_in_alias,
     check_item_exists_in_alias_sync,
     get_bool_env,
+    is_write_block_error,
     retry_on_connection_error,
     retry_on_datetime_not_found,
     separate_bulk_conflict_errors,
@@ -83,8 +166,15 @@ __all__ = [
     "search_sub_catalogs_with_pagination_shared",
     "update_catalog_in_index_shared",
     "search_children_with_pagination_shared",
+    "search_descendant_collection_ids_shared",
+    "get_ancestor_ids_shared",
+    "update_ancestor_ids_shared",
+    "backfill_ancestor_ids_shared",
+    "load_catalog_hierarchy_shared",
+    "resolve_ancestor_ids",
     # Index operations
     "create_index_templates_shared",
+    "create_system_index_shared",
     "delete_item_index_shared",
     "index_alias_by_collection_id",
     "index_by_collection_id",
@@ -100,13 +190,24 @@ __all__ = [
     "populate_sort_shared",
     # Mapping operations
     "get_queryables_mapping_shared",
+    "get_all_collection_queryables_shared",
+    "get_items_mappings_by_alias_shared",
+    "get_items_unique_values_by_alias_shared",
+    "build_collection_queryables_shared",
     # Document operations
     "mk_item_id",
     "mk_actions",
+    "parallel_bulk_shared",
+    "bulk_item_actions_shared",
+    "find_unchanged_items_shared",
+    "find_existing_items_shared",
+    "delete_items_by_id_shared",
+    "patch_items_by_id_shared",
     # Utility functions
     "validate_refresh",
     "get_bool_env",
     "add_bbox_shape_to_collection",
+    "bulk_patch_to_script",
     "retry_on_datetime_not_found",
     "retry_on_connection_error",
     "check_item_exists_in_alias",
@@ -114,7 +215,58 @@ __all__ = [
     # Errors
     "BulkIndexError",
     "ItemAlreadyExistsError",
+    "CollectionMovingError",
     "separate_bulk_conflict_errors",
+    "is_write_block_error",
+    # Bulk-load sessions
+    "start_bulk_load_session_shared",
+    "get_bulk_load_session_shared",
+    "finish_bulk_load_session_shared",
+    "revert_stale_bulk_load_sessions_shared",
+    # Reindex tasks
+    "ReindexTaskRunner",
+    "ReindexTaskClaimLost",
+    "new_reindex_task",
+    "new_delete_by_query_task",
+    "new_update_by_query_task",
+    "plan_collection_id_change_shared",
+    "reindex_task_collection_ids",
+    "get_reindex_task_shared",
+    "list_reindex_tasks_shared",
+    "find_resumable_reindex_tasks_shared",
+    # Aggregation requests
+    "build_aggregation_body_shared",
+    "aggregation_search_params_shared",
+    "add_total_count_shared",
+    "sample_aggregations_shared",
+    "scale_sampled_aggregations_shared",
+    "composite_aggregations_shared",
+    "build_geotile_tile_body_shared",
+    "page_composite_aggregations_shared",
+    "encode_aggregation_token",
+    "decode_aggregation_token",
+    # Rollups
+    "create_rollups_index_shared",
+    "refresh_rollups_shared",
+    "mark_rollups_stale_shared",
+    "RollupWriteMarker",
+    "find_stale_rollups_shared",
+    "fresh_rollup_collections_shared",
+    "list_collection_ids_shared",
+    "aggregate_rollups_shared",
+    "rollup_day_range",
+    "rollup_request_supported",
+    # Queryables store
+    "create_queryables_index_shared",
+    "get_stored_queryables_shared",
+    "get_mapping_versions_shared",
+    "find_outdated_queryables_shared",
+    "refresh_queryables_shared",
+    "store_collection_queryables_shared",
+    "delete_stored_queryables_shared",
+    # Stored scripts
+    "StoredScripts",
+    "stored_script_id",
     # Datetime utilities
     "return_date",
     "extract_date",
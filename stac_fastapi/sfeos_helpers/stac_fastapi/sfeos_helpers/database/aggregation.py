@@ -0,0 +1,403 @@
+"""Aggregation request building shared by Elasticsearch and OpenSearch.
+
+Aggregation requests never return hits: they are sent with `size: 0`, which
+also makes them eligible for the shard request cache. The `total_count`
+aggregation is answered from the exact `hits.total` instead of a `value_count`
+over every matching document.
+
+Approximate requests compute the frequency aggregations on a sample of the
+matching items (`sample_aggregations_shared`). The counts of an OpenSearch
+`sampler` are scaled back to the exact `hits.total`
+(`scale_sampled_aggregations_shared`), while Elasticsearch `random_sampler`
+already scales the counts of its sub-aggregations.
+
+Paged requests replace `terms` aggregations by `composite` aggregations
+(`composite_aggregations_shared`), which return a bounded number of buckets
+per request and the key to continue after (`page_composite_aggregations_shared`).
+
+Vector tiles are drawn from a `geotile_grid` aggregation of the items inside
+the tile, a fixed number of zoom levels finer than the tile
+(`build_geotile_tile_body_shared`).
+"""
+
+import base64
+import binascii
+import hashlib
+import json
+import logging
+import math
+import os
+from typing import Any
+
+from stac_fastapi.core.utilities import get_bool_env
+from stac_fastapi.sfeos_helpers.mappings import AGGREGATION_MAPPING
+
+logger = logging.getLogger(__name__)
+
+TOTAL_COUNT = "total_count"
+SAMPLE_AGGREGATION = "sample"
+# Fixed seed, so repeated approximate requests return the same estimate
+SAMPLE_SEED = 42
+MAX_GEOTILE_PRECISION = 29
+
+
+def get_aggregation_request_cache() -> bool:
+    """Get AGGREGATION_REQUEST_CACHE from env."""
+    return get_bool_env("AGGREGATION_REQUEST_CACHE", default=True)
+
+
+def get_aggregation_shard_preference() -> bool:
+    """Get AGGREGATION_SHARD_PREFERENCE from env."""
+    return get_bool_env("AGGREGATION_SHARD_PREFERENCE", default=False)
+
+
+def get_aggregation_sample_probability() -> float:
+    """Get AGGREGATION_SAMPLE_PROBABILITY (Elasticsearch `random_sampler`) from env.
+
+    `random_sampler` only accepts probabilities up to 0.5, or 1 for no
+    sampling. Values between 0.5 and 1 are lowered to 0.5, and values that
+    are not positive fall back to the default of 0.1.
+    """
+    probability = float(os.getenv("AGGREGATION_SAMPLE_PROBABILITY", "0.1"))
+    if probability <= 0:
+        logger.warning(
+            f"AGGREGATION_SAMPLE_PROBABILITY must be positive, got {probability}; using 0.1"
+        )
+        return 0.1
+    if 0.5 < probability < 1:
+        logger.warning(
+            f"AGGREGATION_SAMPLE_PROBABILITY must be at most 0.5 or 1, got {probability}; using 0.5"
+        )
+        return 0.5
+    return probability
+
+
+def get_aggregation_sample_shard_size() -> int:
+    """Get AGGREGATION_SAMPLE_SHARD_SIZE (OpenSearch `sampler`) from env."""
+    return int(os.getenv("AGGREGATION_SAMPLE_SHARD_SIZE", "10000"))
+
+
+def get_tile_grid_offset() -> int:
+    """Get TILE_GRID_PRECISION_OFFSET (grid zoom levels below the tile zoom) from env."""
+    return int(os.getenv("TILE_GRID_PRECISION_OFFSET", "6"))
+
+
+def tile_bounds(zoom: int, x: int, y: int) -> tuple[float, float, float, float]:
+    """Return the `(west, south, east, north)` bounds of a web mercator tile."""
+    tiles = 2**zoom
+
+    def _lat(row: int) -> float:
+        return math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * row / tiles))))
+
+    return (x / tiles * 360 - 180, _lat(y + 1), (x + 1) / tiles * 360 - 180, _lat(y))
+
+
+def build_geotile_tile_body_shared(
+    query: dict[str, Any] | None,
+    field: str,
+    zoom: int,
+    x: int,
+    y: int,
+    grid_offset: int,
+) -> dict[str, Any]:
+    """Build the search body of the geotile grid buckets inside a tile.
+
+    Args:
+        query (dict[str, Any] | None): The search query, or None to match all items.
+        field (str): The geo_point field to aggregate.
+        zoom (int): Zoom of the tile.
+        x (int): Column of the tile.
+        y (int): Row of the tile.
+        grid_offset (int): Number of zoom levels of the grid below the tile.
+
+    Returns:
+        dict[str, Any]: The search body, with a `tile` aggregation.
+    """
+    west, south, east, north = tile_bounds(zoom, x, y)
+    precision = min(zoom + grid_offset, MAX_GEOTILE_PRECISION)
+    filters: list[dict[str, Any]] = [
+        {
+            "geo_bounding_box": {
+                field: {
+                    "top_left": {"lat": north, "lon": west},
+                    "bottom_right": {"lat": south, "lon": east},
+                }
+            }
+        }
+    ]
+    if query:
+        filters.append(query)
+    return {
+        "size": 0,
+        "track_total_hits": False,
+        "query": {"bool": {"filter": filters}},
+        "aggregations": {
+            "tile": {
+                "geotile_grid": {
+                    "field": field,
+                    "precision": precision,
+                    "size": min(4 ** (precision - zoom), 65536),
+                }
+            }
+        },
+    }
+
+
+def build_aggregation_body_shared(
+    query: dict[str, Any] | None, aggregations: dict[str, dict[str, Any]]
+) -> dict[str, Any]:
+    """Build a hit-free aggregation search body.
+
+    Args:
+        query (dict[str, Any] | None): The search query, or None to match all items.
+        aggregations (dict[str, dict[str, Any]]): The aggregations to compute, by name.
+
+    Returns:
+        dict[str, Any]: The search body. A default `total_count` aggregation is
+        left out, see `add_total_count_shared`.
+    """
+    body: dict[str, Any] = {
+        "size": 0,
+        "track_total_hits": True,
+        "aggregations": {
+            name: agg
+            for name, agg in aggregations.items()
+            if not (name == TOTAL_COUNT and agg == AGGREGATION_MAPPING[TOTAL_COUNT])
+        },
+    }
+    if query:
+        body["query"] = query
+    return body
+
+
+def sample_aggregations_shared(
+    body: dict[str, Any], sampler: dict[str, Any], random_score: bool = False
+) -> dict[str, Any]:
+    """Compute the frequency aggregations of a search body on a sample of items.
+
+    Metric aggregations such as `datetime_min` stay exact.
+
+    Args:
+        body (dict[str, Any]): The search body, see `build_aggregation_body_shared`.
+        sampler (dict[str, Any]): The sampling aggregation, e.g. `random_sampler`.
+        random_score (bool): Score items randomly, so that a `sampler`, which
+            keeps the best scoring items of each shard, keeps a random sample.
+
+    Returns:
+        dict[str, Any]: The search body.
+    """
+    aggregations = body["aggregations"]
+    # Composite aggregations must stay at the top level
+    sampled = {
+        k: v
+        for k, v in aggregations.items()
+        if k.endswith("_frequency") and "composite" not in v
+    }
+    if not sampled:
+        return body
+    body["aggregations"] = {
+        **{k: v for k, v in aggregations.items() if k not in sampled},
+        SAMPLE_AGGREGATION: {**sampler, "aggs": sampled},
+    }
+    if random_score:
+        body["query"] = {
+            "function_score": {
+                "query": body.get("query", {"match_all": {}}),
+                "random_score": {"seed": SAMPLE_SEED, "field": "_seq_no"},
+                "boost_mode": "replace",
+            }
+        }
+    return body
+
+
+def scale_sampled_aggregations_shared(
+    response: dict[str, Any], rescale: bool = True
+) -> dict[str, Any]:
+    """Scale the counts of sampled aggregations to the number of matching items.
+
+    Sampled aggregations are flagged with `estimated`, unless the sample held
+    every matching item.
+
+    Args:
+        response (dict[str, Any]): The aggregation response body.
+        rescale (bool): Scale the bucket counts by the share of sampled items.
+            Elasticsearch `random_sampler` already scales them, while its own
+            `doc_count` stays the sample size, so it only needs the flag.
+
+    Returns:
+        dict[str, Any]: The response body, with the sampled aggregations lifted
+        to the top level.
+    """
+    result_aggs = response.get("aggregations") or {}
+    sample = result_aggs.pop(SAMPLE_AGGREGATION, None)
+    if sample is None:
+        return response
+    total = response.get("hits", {}).get("total", 0)
+    if isinstance(total, dict):
+        total = total.get("value", 0)
+    sampled = sample.get("doc_count", 0)
+    factor = total / sampled if sampled and rescale else 1
+    for name, agg in sample.items():
+        if not isinstance(agg, dict) or not isinstance(agg.get("buckets"), list):
+            continue
+        for bucket in agg["buckets"]:
+            bucket["doc_count"] = round(bucket["doc_count"] * factor)
+        if "sum_other_doc_count" in agg:
+            agg["sum_other_doc_count"] = round(agg["sum_other_doc_count"] * factor)
+        agg["estimated"] = sampled < total
+        result_aggs[name] = agg
+    return response
+
+
+def encode_aggregation_token(after_keys: dict[str, dict[str, Any] | None]) -> str:
+    """Encode the after keys of paged aggregations, None once exhausted."""
+    return base64.urlsafe_b64encode(
+        json.dumps(after_keys, separators=(",", ":")).encode()
+    ).decode()
+
+
+def decode_aggregation_token(token: str) -> dict[str, dict[str, Any] | None]:
+    """Decode a token of `encode_aggregation_token`.
+
+    Raises:
+        ValueError: If the token is malformed.
+    """
+    try:
+        after_keys = json.loads(base64.urlsafe_b64decode(token.encode()))
+    except (binascii.Error, UnicodeError, json.JSONDecodeError) as e:
+        raise ValueError(f"Invalid aggregation token: {e}") from e
+    if not isinstance(after_keys, dict) or not all(
+        value is None or isinstance(value, dict) for value in after_keys.values()
+    ):
+        raise ValueError("Invalid aggregation token")
+    return after_keys
+
+
+def composite_aggregations_shared(
+    aggregations: dict[str, dict[str, Any]],
+    size: int,
+    after_keys: dict[str, dict[str, Any] | None] | None = None,
+) -> tuple[dict[str, dict[str, Any]], list[str]]:
+    """Replace `terms` aggregations by `composite` aggregations paged by key.
+
+    Composite buckets are ordered by key instead of by count, and no more than
+    `size` buckets are built per request.
+
+    Args:
+        aggregations (dict[str, dict[str, Any]]): The aggregations, by name.
+        size (int): The number of buckets per page.
+        after_keys (dict[str, dict[str, Any] | None] | None): The keys to
+            continue after, from a previous page. Aggregations whose key is
+            None were exhausted and are not requested again.
+
+    Returns:
+        tuple[dict[str, dict[str, Any]], list[str]]: The aggregations and the
+        names of the paged ones.
+    """
+    after_keys = after_keys or {}
+    converted: dict[str, dict[str, Any]] = {}
+    paged = []
+    for name, agg in aggregations.items():
+        if list(agg) != ["terms"]:
+            converted[name] = agg
+            continue
+        paged.append(name)
+        if name in after_keys and after_keys[name] is None:
+            continue
+        source = {k: v for k, v in agg["terms"].items() if k in ("field", "script")}
+        composite: dict[str, Any] = {
+            "size": size,
+            "sources": [{name: {"terms": source}}],
+        }
+        if after_keys.get(name):
+            composite["after"] = after_keys[name]
+        converted[name] = {"composite": composite}
+    return converted, paged
+
+
+def page_composite_aggregations_shared(
+    response: dict[str, Any], paged: list[str], size: int
+) -> dict[str, Any]:
+    """Add the token of the next page of composite aggregations to a response.
+
+    Args:
+        response (dict[str, Any]): The aggregation response body.
+        paged (list[str]): The names of the paged aggregations.
+        size (int): The number of buckets per page.
+
+    Returns:
+        dict[str, Any]: The response body, with a `next_token` while an
+        aggregation has more buckets.
+    """
+    result_aggs = response.setdefault("aggregations", {})
+    after_keys = {}
+    for name in paged:
+        agg = result_aggs.setdefault(name, {"buckets": []})
+        after_key = agg.get("after_key")
+        full = len(agg.get("buckets", [])) >= size
+        after_keys[name] = after_key if after_key and full else None
+    if any(after_key is not None for after_key in after_keys.values()):
+        response["next_token"] = encode_aggregation_token(after_keys)
+    return response
+
+
+def aggregation_fingerprint(index: str, body: dict[str, Any]) -> str:
+    """Return a stable fingerprint of an aggregation request.
+
+    Args:
+        index (str): The searched indexes.
+        body (dict[str, Any]): The search body.
+
+    Returns:
+        str: A short hex digest, identical for identical requests.
+    """
+    canonical = json.dumps(
+        {"index": index, "body": body}, sort_keys=True, separators=(",", ":")
+    )
+    return hashlib.blake2b(canonical.encode(), digest_size=8).hexdigest()
+
+
+def aggregation_search_params_shared(
+    index: str, body: dict[str, Any]
+) -> dict[str, Any]:
+    """Return the search parameters of an aggregation request.
+
+    Identical requests use the same custom `preference`, so they are routed
+    to the same shard copies and hit the request cache filled by the first one.
+
+    Args:
+        index (str): The searched indexes.
+        body (dict[str, Any]): The search body.
+
+    Returns:
+        dict[str, Any]: `request_cache` and `preference` keyword arguments.
+    """
+    params: dict[str, Any] = {}
+    if get_aggregation_request_cache():
+        params["request_cache"] = True
+    if get_aggregation_shard_preference():
+        params["preference"] = f"agg-{aggregation_fingerprint(index, body)}"
+    return params
+
+
+def add_total_count_shared(
+    response: Any, aggregations: dict[str, dict[str, Any]]
+) -> dict[str, Any]:
+    """Add the `total_count` aggregation answered from `hits.total`.
+
+    Args:
+        response (Any): The aggregation search response.
+        aggregations (dict[str, dict[str, Any]]): The requested aggregations, by name.
+
+    Returns:
+        dict[str, Any]: The response body, with a `total_count` metric if it was requested.
+    """
+    # Elasticsearch wraps the response body in an ObjectApiResponse
+    response = getattr(response, "body", response)
+    result_aggs = response.setdefault("aggregations", {})
+    if TOTAL_COUNT in aggregations and TOTAL_COUNT not in result_aggs:
+        total = response.get("hits", {}).get("total", 0)
+        if isinstance(total, dict):
+            total = total.get("value", 0)
+        result_aggs[TOTAL_COUNT] = {"value": total}
+    return response
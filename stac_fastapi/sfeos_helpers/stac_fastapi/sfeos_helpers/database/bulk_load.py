@@ -0,0 +1,261 @@
+"""Bulk-load sessions for Elasticsearch/OpenSearch.
+
+A bulk-load session retunes the item indexes of one collection for large
+backfills: refreshes are disabled (`refresh_interval: -1`) and replicas are
+dropped (`number_of_replicas: 0`). The original settings are persisted in the
+`BULK_LOAD_SESSIONS_INDEX` system index *before* the indexes are changed, so a
+session whose lease expired (e.g. because the loader crashed) can always be
+reverted, which the application does at startup.
+"""
+
+import logging
+import os
+import socket
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from stac_fastapi.sfeos_helpers.database.datetime import is_index_closed
+from stac_fastapi.sfeos_helpers.database.index import (
+    create_system_index_shared,
+    index_alias_by_collection_id,
+)
+from stac_fastapi.sfeos_helpers.mappings import BULK_LOAD_SESSIONS_INDEX
+
+logger = logging.getLogger(__name__)
+
+BULK_LOAD_SETTINGS = {"refresh_interval": "-1", "number_of_replicas": "0"}
+
+_BULK_LOAD_SESSIONS_MAPPINGS = {
+    "dynamic": False,
+    "properties": {
+        "collection_id": {"type": "keyword"},
+        "owner": {"type": "keyword"},
+        "started_at": {"type": "date"},
+        "expires_at": {"type": "date"},
+    },
+}
+
+
+def get_bulk_load_session_ttl() -> int:
+    """Get BULK_LOAD_SESSION_TTL (lease duration in seconds) from env."""
+    return int(os.getenv("BULK_LOAD_SESSION_TTL", "3600"))
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+async def _collection_index_settings(
+    client: Any, collection_id: str
+) -> dict[str, dict[str, str | None]]:
+    """Return the current refresh/replica settings of a collection's item indexes."""
+    response = await client.indices.get_settings(
+        index=index_alias_by_collection_id(collection_id),
+        name="index.refresh_interval,index.number_of_replicas",
+        flat_settings=True,
+        ignore_unavailable=True,
+        allow_no_indices=True,
+    )
+    return {
+        index: {
+            "refresh_interval": data["settings"].get("index.refresh_interval"),
+            "number_of_replicas": data["settings"].get("index.number_of_replicas"),
+        }
+        for index, data in response.items()
+    }
+
+
+async def _put_index_settings(
+    client: Any, indexes: list[str], settings: dict[str, str | None]
+) -> None:
+    """Apply index settings; a None value resets the setting to its default."""
+    await client.indices.put_settings(index=",".join(indexes), body={"index": settings})
+
+
+async def _save_session(client: Any, session: dict[str, Any]) -> None:
+    await client.index(
+        index=BULK_LOAD_SESSIONS_INDEX,
+        id=session["collection_id"],
+        body=session,
+        refresh=True,
+    )
+
+
+async def _delete_session(client: Any, collection_id: str) -> None:
+    await client.delete(index=BULK_LOAD_SESSIONS_INDEX, id=collection_id, refresh=True)
+
+
+async def _search_sessions(client: Any, query: dict[str, Any]) -> list[dict[str, Any]]:
+    await create_system_index_shared(
+        client, BULK_LOAD_SESSIONS_INDEX, _BULK_LOAD_SESSIONS_MAPPINGS
+    )
+    response = await client.search(
+        index=BULK_LOAD_SESSIONS_INDEX, body={"query": query, "size": 1000}
+    )
+    return [hit["_source"] for hit in response["hits"]["hits"]]
+
+
+async def get_bulk_load_session_shared(
+    client: Any, collection_id: str
+) -> dict[str, Any] | None:
+    """Return the bulk-load session of a collection, or None if there is none.
+
+    Args:
+        client: Async Elasticsearch/OpenSearch client.
+        collection_id (str): The collection id.
+
+    Returns:
+        dict[str, Any] | None: The persisted session document.
+    """
+    sessions = await _search_sessions(client, {"ids": {"values": [collection_id]}})
+    return sessions[0] if sessions else None
+
+
+async def start_bulk_load_session_shared(
+    client: Any, collection_id: str, ttl: int | None = None
+) -> dict[str, Any]:
+    """Start, or renew, the bulk-load session of a collection.
+
+    The original settings of every item index of the collection are saved before
+    `refresh_interval` and `number_of_replicas` are changed. Calling this again for
+    an active session extends its lease and retunes indexes created since (e.g.
+    new datetime indexes), so long-running loaders use it as a heartbeat.
+
+    Args:
+        client: Async Elasticsearch/OpenSearch client.
+        collection_id (str): The collection id.
+        ttl (int | None): Lease duration in seconds. Defaults to `BULK_LOAD_SESSION_TTL`.
+
+    Returns:
+        dict[str, Any]: The persisted session document.
+    """
+    ttl = get_bulk_load_session_ttl() if ttl is None else ttl
+    now = _now()
+    session = await get_bulk_load_session_shared(client, collection_id) or {
+        "collection_id": collection_id,
+        "owner": f"{socket.gethostname()}:{os.getpid()}",
+        "started_at": now.isoformat(),
+        "indexes": {},
+    }
+    session["expires_at"] = (now + timedelta(seconds=ttl)).isoformat()
+
+    current = await _collection_index_settings(client, collection_id)
+    new_indexes = [index for index in current if index not in session["indexes"]]
+    for index in new_indexes:
+        session["indexes"][index] = current[index]
+
+    # Persist the originals first so a crash never leaves untracked indexes behind
+    await _save_session(client, session)
+    if new_indexes:
+        await _put_index_settings(client, new_indexes, BULK_LOAD_SETTINGS)
+        logger.info(
+            f"Bulk-load session for collection {collection_id} retuned indexes {new_indexes}"
+        )
+    return session
+
+
+async def _restore_session_indexes(client: Any, session: dict[str, Any]) -> list[str]:
+    """Restore the original settings of a session's indexes that still exist."""
+    existing = await _collection_index_settings(client, session["collection_id"])
+    restored = []
+    for index, original in session["indexes"].items():
+        if index not in existing:
+            continue
+        await _put_index_settings(client, [index], original)
+        restored.append(index)
+    return restored
+
+
+async def finish_bulk_load_session_shared(
+    client: Any,
+    collection_id: str,
+    forcemerge: bool = False,
+    wait_for_status: str | None = "green",
+    timeout: str = "30s",
+) -> dict[str, Any] | None:
+    """Finish the bulk-load session of a collection.
+
+    Restores the saved settings, refreshes the indexes so loaded items become
+    searchable, optionally force-merges closed datetime indexes (which receive no
+    further writes) and waits for the cluster health of the indexes.
+
+    Args:
+        client: Async Elasticsearch/OpenSearch client.
+        collection_id (str): The collection id.
+        forcemerge (bool): Whether to force-merge closed datetime indexes to one segment.
+        wait_for_status (str | None): Health status to wait for, or None to skip waiting.
+        timeout (str): How long to wait for the health status.
+
+    Returns:
+        dict[str, Any] | None: A report of the restored indexes, started force-merge
+        tasks and health status, or None if the collection has no session.
+    """
+    session = await get_bulk_load_session_shared(client, collection_id)
+    if session is None:
+        return None
+
+    restored = await _restore_session_indexes(client, session)
+    await _delete_session(client, collection_id)
+    report: dict[str, Any] = {
+        "collection_id": collection_id,
+        "restored_indexes": restored,
+        "forcemerge_tasks": {},
+    }
+    if not restored:
+        return report
+
+    await client.indices.refresh(index=",".join(restored))
+
+    if forcemerge:
+        aliases = await client.indices.get_alias(index=",".join(restored))
+        closed = [
+            index
+            for index, data in aliases.items()
+            if any(is_index_closed(alias) for alias in data.get("aliases", {}))
+        ]
+        for index in closed:
+            response = await client.indices.forcemerge(
+                index=index, max_num_segments=1, wait_for_completion=False
+            )
+            report["forcemerge_tasks"][index] = response.get("task")
+
+    if wait_for_status:
+        health = await client.cluster.health(
+            index=",".join(restored),
+            wait_for_status=wait_for_status,
+            timeout=timeout,
+        )
+        report["health"] = {
+            "status": health.get("status"),
+            "timed_out": health.get("timed_out", False),
+        }
+
+    logger.info(f"Finished bulk-load session for collection {collection_id}: {report}")
+    return report
+
+
+async def revert_stale_bulk_load_sessions_shared(client: Any) -> list[str]:
+    """Revert every bulk-load session whose lease has expired.
+
+    Args:
+        client: Async Elasticsearch/OpenSearch client.
+
+    Returns:
+        list[str]: The ids of the collections whose sessions were reverted.
+    """
+    sessions = await _search_sessions(
+        client, {"range": {"expires_at": {"lt": _now().isoformat()}}}
+    )
+    reverted = []
+    for session in sessions:
+        collection_id = session["collection_id"]
+        restored = await _restore_session_indexes(client, session)
+        if restored:
+            await client.indices.refresh(index=",".join(restored))
+        await _delete_session(client, collection_id)
+        reverted.append(collection_id)
+        logger.warning(
+            f"Reverted stale bulk-load session for collection {collection_id} "
+            f"(owner {session.get('owner')}, expired {session['expires_at']})"
+        )
+    return reverted
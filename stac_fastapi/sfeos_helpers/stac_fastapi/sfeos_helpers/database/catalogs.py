@@ -265,3 +265,257 @@ async def search_children_with_pagination_shared(
     next_search_after = hits[-1].get("sort") if len(hits) == limit else None
 
     return children, total_hits, next_search_after
+
+
+_HIERARCHY_PAGE_SIZE = 10000
+_ANCESTORS_BACKFILLED = "ancestor_ids_backfilled"
+
+
+def resolve_ancestor_ids(
+    parents: dict[str, list[str]], known: dict[str, list[str]]
+) -> dict[str, list[str]]:
+    """Compute the ancestors of a set of catalogs and collections.
+
+    The ancestors of a document are its parents and the ancestors of its
+    parents. Parents that are neither in `parents` nor in `known`, e.g.
+    deleted catalogs, contribute nothing. Cycles are tolerated.
+
+    Args:
+        parents: The `parent_ids` of the documents to resolve, by id.
+        known: The (up to date) `ancestor_ids` of other parents, by id.
+
+    Returns:
+        The sorted ancestor ids of every document of `parents`.
+    """
+    children: dict[str, list[str]] = {}
+    for doc_id, parent_ids in parents.items():
+        for parent_id in parent_ids:
+            children.setdefault(parent_id, []).append(doc_id)
+
+    ancestors: dict[str, set[str]] = {doc_id: set() for doc_id in parents}
+    queue = list(parents)
+    while queue:
+        doc_id = queue.pop()
+        resolved = set()
+        for parent_id in parents[doc_id]:
+            if parent_id in ancestors:
+                resolved |= ancestors[parent_id] | {parent_id}
+            elif parent_id in known:
+                resolved |= set(known[parent_id]) | {parent_id}
+        if resolved != ancestors[doc_id]:
+            ancestors[doc_id] = resolved
+            queue.extend(children.get(doc_id, []))
+    return {doc_id: sorted(ids) for doc_id, ids in ancestors.items()}
+
+
+async def _search_hierarchy(
+    es_client: Any,
+    query: dict[str, Any],
+    fields: tuple[str, ...] = ("id", "type", "parent_ids", "ancestor_ids"),
+) -> list[dict]:
+    """Return the hierarchy fields of all matching documents."""
+    documents: list[dict] = []
+    search_after = None
+    while True:
+        body: dict[str, Any] = {
+            "query": query,
+            "_source": list(fields),
+            "sort": [{"id": {"order": "asc"}}],
+            "size": _HIERARCHY_PAGE_SIZE,
+        }
+        if search_after:
+            body["search_after"] = search_after
+        response = await es_client.search(index=COLLECTIONS_INDEX, body=body)
+        hits = response["hits"]["hits"]
+        documents.extend(hit["_source"] for hit in hits)
+        if len(hits) < _HIERARCHY_PAGE_SIZE:
+            return documents
+        search_after = hits[-1]["sort"]
+
+
+async def get_ancestor_ids_shared(es_client: Any, parent_ids: list[str]) -> list[str]:
+    """Compute the ancestors of a new or relinked collection from its parents.
+
+    Args:
+        es_client: Elasticsearch/OpenSearch client instance.
+        parent_ids: The parent catalog ids of the collection.
+
+    Returns:
+        The sorted ancestor ids.
+    """
+    if not parent_ids:
+        return []
+    known = {
+        doc["id"]: doc.get("ancestor_ids", [])
+        for doc in await _search_hierarchy(
+            es_client, {"ids": {"values": list(parent_ids)}}
+        )
+    }
+    return resolve_ancestor_ids({"": list(parent_ids)}, known)[""]
+
+
+async def update_ancestor_ids_shared(
+    es_client: Any,
+    bulk_helper: Any,
+    root_ids: list[str] | None = None,
+    refresh: bool | str = True,
+) -> int:
+    """Recompute the stored ancestors of catalogs and all of their descendants.
+
+    Call it after the `parent_ids` of the roots changed, or after a root was
+    deleted. The descendants are found with a single query on the current
+    `ancestor_ids`, resolved in memory and only the documents whose ancestors
+    changed are rewritten, in one bulk request.
+
+    Args:
+        es_client: Elasticsearch/OpenSearch client instance.
+        bulk_helper: `helpers.async_bulk` of the backend.
+        root_ids: The changed catalogs, or None to rebuild the whole hierarchy.
+        refresh: Whether to refresh the index after the update.
+
+    Returns:
+        The number of updated documents.
+    """
+    if root_ids is None:
+        query: dict[str, Any] = {"match_all": {}}
+    else:
+        query = {
+            "bool": {
+                "should": [
+                    {"ids": {"values": list(root_ids)}},
+                    {"terms": {"ancestor_ids": list(root_ids)}},
+                ],
+                "minimum_should_match": 1,
+            }
+        }
+    documents = {doc["id"]: doc for doc in await _search_hierarchy(es_client, query)}
+    if not documents:
+        return 0
+
+    parents = {doc_id: doc.get("parent_ids") or [] for doc_id, doc in documents.items()}
+    outside = {pid for pids in parents.values() for pid in pids} - documents.keys()
+    known = {}
+    if outside:
+        known = {
+            doc["id"]: doc.get("ancestor_ids", [])
+            for doc in await _search_hierarchy(
+                es_client, {"ids": {"values": sorted(outside)}}
+            )
+        }
+
+    actions = [
+        {
+            "_op_type": "update",
+            "_index": COLLECTIONS_INDEX,
+            "_id": doc_id,
+            "doc": {"ancestor_ids": ancestor_ids},
+        }
+        for doc_id, ancestor_ids in resolve_ancestor_ids(parents, known).items()
+        if documents[doc_id].get("ancestor_ids") != ancestor_ids
+    ]
+    if actions:
+        await bulk_helper(es_client, actions, refresh=refresh, raise_on_error=True)
+    logger.info(f"Updated the ancestors of {len(actions)} catalogs and collections")
+    return len(actions)
+
+
+async def backfill_ancestor_ids_shared(es_client: Any, bulk_helper: Any) -> int:
+    """Add `ancestor_ids` to the catalogs and collections written before it existed.
+
+    Maps the field on an existing collections index, then rebuilds the whole
+    hierarchy if any linked document lacks its ancestors. Completion is
+    recorded in the `_meta` of the index mapping: documents whose parents were
+    all deleted keep empty ancestors, which `exists` cannot tell apart from
+    missing ones, so counting them would rebuild the hierarchy at every startup.
+
+    Args:
+        es_client: Elasticsearch/OpenSearch client instance.
+        bulk_helper: `helpers.async_bulk` of the backend.
+
+    Returns:
+        The number of updated documents.
+    """
+    try:
+        mappings = await es_client.indices.get_mapping(index=COLLECTIONS_INDEX)
+        meta: dict[str, Any] = {}
+        for mapping in mappings.values():
+            meta.update(mapping.get("mappings", {}).get("_meta", {}))
+        if meta.get(_ANCESTORS_BACKFILLED):
+            return 0
+        await es_client.indices.put_mapping(
+            index=COLLECTIONS_INDEX,
+            body={"properties": {"ancestor_ids": {"type": "keyword"}}},
+        )
+    except Exception as e:
+        logger.warning(f"Could not map ancestor_ids on {COLLECTIONS_INDEX}: {e}")
+        return 0
+
+    response = await es_client.count(
+        index=COLLECTIONS_INDEX,
+        body={
+            "query": {
+                "bool": {
+                    "filter": [{"exists": {"field": "parent_ids"}}],
+                    "must_not": [{"exists": {"field": "ancestor_ids"}}],
+                }
+            }
+        },
+    )
+    updated = 0
+    if response["count"]:
+        updated = await update_ancestor_ids_shared(es_client, bulk_helper)
+    # `_meta` is replaced as a whole, so the other keys are written back
+    await es_client.indices.put_mapping(
+        index=COLLECTIONS_INDEX, body={"_meta": {**meta, _ANCESTORS_BACKFILLED: True}}
+    )
+    return updated
+
+
+async def search_descendant_collection_ids_shared(
+    es_client: Any, catalog_id: str
+) -> list[str]:
+    """Return the ids of all collections below a catalog, at any depth.
+
+    Args:
+        es_client: Elasticsearch/OpenSearch client instance.
+        catalog_id: The catalog ID.
+
+    Returns:
+        The sorted collection ids.
+    """
+    documents = await _search_hierarchy(
+        es_client,
+        {
+            "bool": {
+                "filter": [
+                    {"term": {"ancestor_ids": catalog_id}},
+                    {"term": {"type": "Collection"}},
+                ]
+            }
+        },
+    )
+    return [doc["id"] for doc in documents]
+
+
+async def load_catalog_hierarchy_shared(es_client: Any) -> list[dict[str, Any]]:
+    """Return the `id`, `type`, `title` and `parent_ids` of all catalogs and linked collections.
+
+    Args:
+        es_client: Elasticsearch/OpenSearch client instance.
+
+    Returns:
+        The documents, sorted by id.
+    """
+    return await _search_hierarchy(
+        es_client,
+        {
+            "bool": {
+                "should": [
+                    {"term": {"type": "Catalog"}},
+                    {"exists": {"field": "parent_ids"}},
+                ],
+                "minimum_should_match": 1,
+            }
+        },
+        fields=("id", "type", "title", "parent_ids"),
+    )
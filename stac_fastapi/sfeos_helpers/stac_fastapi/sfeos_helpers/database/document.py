@@ -1,14 +1,19 @@
 """Document operations for Elasticsearch/OpenSearch.
 
 This module provides functions for working with documents in Elasticsearch/OpenSearch,
-including document ID generation and bulk action creation.
+including document ID generation, bulk action creation, concurrent bulk writes,
+content-hash lookups for idempotent ingest and bulk deletes and patches by id.
 """
 
-from typing import Any
+import asyncio
+import logging
+from typing import Any, AsyncIterable, AsyncIterator, Awaitable, Callable
 
 from stac_fastapi.sfeos_helpers.database.index import index_alias_by_collection_id
 from stac_fastapi.types.stac import Item
 
+logger = logging.getLogger(__name__)
+
 
 def mk_item_id(item_id: str, collection_id: str) -> str:
     """Create the document id for an Item in Elasticsearch.
@@ -54,3 +59,367 @@ def mk_actions(
         }
         for item in processed_items
     ]
+
+
+async def find_existing_items_shared(
+    client: Any,
+    collection_id: str,
+    item_ids: list[str],
+    source_includes: list[str],
+    batch_size: int = 1000,
+) -> dict[str, dict[str, Any]]:
+    """Look up which items of a collection are already stored, and where.
+
+    The documents are read with `ids` queries on the collection alias, which,
+    unlike `mget`, also resolves collections split into several datetime indexes.
+
+    Args:
+        client: Async Elasticsearch/OpenSearch client.
+        collection_id (str): The collection the items belong to.
+        item_ids (list[str]): Item ids to look up.
+        source_includes (list[str]): Source fields to fetch for each document.
+        batch_size (int): Number of ids looked up per search request.
+
+    Returns:
+        dict[str, dict[str, Any]]: For each stored item id, the concrete `_index`
+        holding it and the requested `_source` fields.
+    """
+    doc_ids = {mk_item_id(item_id, collection_id): item_id for item_id in item_ids}
+    batches = list(doc_ids)
+    existing: dict[str, dict[str, Any]] = {}
+    for start in range(0, len(batches), batch_size):
+        batch = batches[start : start + batch_size]
+        response = await client.search(
+            index=index_alias_by_collection_id(collection_id),
+            body={
+                "query": {"ids": {"values": batch}},
+                "_source": source_includes,
+                "size": len(batch),
+            },
+            ignore_unavailable=True,
+        )
+        for hit in response["hits"]["hits"]:
+            existing[doc_ids[hit["_id"]]] = {
+                "_index": hit["_index"],
+                "_source": hit.get("_source", {}),
+            }
+    return existing
+
+
+async def find_unchanged_items_shared(
+    client: Any,
+    collection_id: str,
+    items: list[Item],
+    batch_size: int = 1000,
+) -> set[str]:
+    """Return the ids of items whose stored `content_hash` equals their new one.
+
+    Only the `content_hash` field is fetched. Items without a hash are never
+    looked up nor reported as unchanged.
+
+    Args:
+        client: Async Elasticsearch/OpenSearch client.
+        collection_id (str): The collection the items belong to.
+        items (list[Item]): Database-ready items, as produced by `stac_to_db`.
+        batch_size (int): Number of ids looked up per search request.
+
+    Returns:
+        set[str]: Ids of the items that are already stored with identical content.
+    """
+    new_hashes = {
+        item["id"]: item["content_hash"] for item in items if item.get("content_hash")
+    }
+    if not new_hashes:
+        return set()
+    existing = await find_existing_items_shared(
+        client, collection_id, list(new_hashes), ["content_hash"], batch_size
+    )
+    return {
+        item_id
+        for item_id, document in existing.items()
+        if document["_source"].get("content_hash") == new_hashes[item_id]
+    }
+
+
+async def _bulk_by_id(
+    client: Any,
+    collection_id: str,
+    item_ids: list[str],
+    action: dict[str, Any],
+    bulk_helper: Callable[..., Awaitable[tuple[int, list[dict[str, Any]]]]],
+    refresh: str,
+    batch_size: int,
+) -> tuple[int, list[str], list[dict[str, Any]]]:
+    """Send one bulk action per stored item, addressed to its concrete index.
+
+    Returns the number of successful actions, the ids that do not exist and the
+    per-item failures as `{"id", "status", "error"}` entries.
+    """
+    item_ids = list(dict.fromkeys(item_ids))
+    existing = await find_existing_items_shared(
+        client, collection_id, item_ids, ["id"], batch_size
+    )
+    not_found = [item_id for item_id in item_ids if item_id not in existing]
+    actions = [
+        {
+            **action,
+            "_index": document["_index"],
+            "_id": mk_item_id(item_id, collection_id),
+        }
+        for item_id, document in existing.items()
+    ]
+    if not actions:
+        return 0, not_found, []
+
+    success, bulk_errors = await bulk_helper(
+        client, actions, refresh=refresh, raise_on_error=False
+    )
+    suffix = f"|{collection_id}"
+    failures = []
+    for error in bulk_errors:
+        result = error.get(action["_op_type"], {})
+        item_id = result.get("_id", "")[: -len(suffix)]
+        if result.get("status") == 404:
+            # Deleted concurrently since the lookup
+            not_found.append(item_id)
+        else:
+            failures.append(
+                {
+                    "id": item_id,
+                    "status": result.get("status"),
+                    "error": result.get("error"),
+                }
+            )
+    return success, not_found, failures
+
+
+async def delete_items_by_id_shared(
+    client: Any,
+    collection_id: str,
+    item_ids: list[str],
+    bulk_helper: Callable[..., Awaitable[tuple[int, list[dict[str, Any]]]]],
+    refresh: str = "false",
+    batch_size: int = 1000,
+) -> dict[str, Any]:
+    """Delete items of a collection by id with a single bulk request.
+
+    The concrete index of every item is resolved first, so the delete actions
+    also reach items stored in datetime indexes behind the collection alias.
+
+    Args:
+        client: Async Elasticsearch/OpenSearch client.
+        collection_id (str): The collection the items belong to.
+        item_ids (list[str]): Ids of the items to delete.
+        bulk_helper: The client library's `async_bulk` helper.
+        refresh (str): "true", "false" or "wait_for", as returned by `validate_refresh`.
+        batch_size (int): Number of ids looked up per search request.
+
+    Returns:
+        dict[str, Any]: The number of `deleted` items, the ids that were `not_found`
+        and the per-item `errors`.
+    """
+    deleted, not_found, errors = await _bulk_by_id(
+        client,
+        collection_id,
+        item_ids,
+        {"_op_type": "delete"},
+        bulk_helper,
+        refresh,
+        batch_size,
+    )
+    logger.info(
+        f"Bulk delete in collection {collection_id}: {deleted} deleted, "
+        f"{len(not_found)} not found, {len(errors)} errors"
+    )
+    return {"deleted": deleted, "not_found": not_found, "errors": errors}
+
+
+async def patch_items_by_id_shared(
+    client: Any,
+    collection_id: str,
+    item_ids: list[str],
+    script: dict[str, Any],
+    bulk_helper: Callable[..., Awaitable[tuple[int, list[dict[str, Any]]]]],
+    refresh: str = "false",
+    batch_size: int = 1000,
+) -> dict[str, Any]:
+    """Apply one update script to items of a collection with a single bulk request.
+
+    Every update action carries the same parameterized script (see
+    `bulk_patch_to_script`), so it is compiled once by the cluster. Items for
+    which the script fails, e.g. a failed `test` operation, are reported without
+    affecting the others.
+
+    Args:
+        client: Async Elasticsearch/OpenSearch client.
+        collection_id (str): The collection the items belong to.
+        item_ids (list[str]): Ids of the items to patch.
+        script (dict[str, Any]): The painless update script.
+        bulk_helper: The client library's `async_bulk` helper.
+        refresh (str): "true", "false" or "wait_for", as returned by `validate_refresh`.
+        batch_size (int): Number of ids looked up per search request.
+
+    Returns:
+        dict[str, Any]: The number of `updated` items, the ids that were `not_found`
+        and the per-item `errors`.
+    """
+    updated, not_found, errors = await _bulk_by_id(
+        client,
+        collection_id,
+        item_ids,
+        {"_op_type": "update", "script": script},
+        bulk_helper,
+        refresh,
+        batch_size,
+    )
+    logger.info(
+        f"Bulk patch in collection {collection_id}: {updated} updated, "
+        f"{len(not_found)} not found, {len(errors)} errors"
+    )
+    return {"updated": updated, "not_found": not_found, "errors": errors}
+
+
+async def bulk_item_actions_shared(
+    client: Any,
+    actions: list[dict[str, Any]],
+    bulk_helper: Callable[..., Awaitable[tuple[int, list[dict[str, Any]]]]],
+    **kwargs: Any,
+) -> tuple[int, list[dict[str, Any]]]:
+    """Send item bulk actions, leaving out the deletes of moved items from the results.
+
+    An upserted item whose new datetime moves it to another index is deleted from
+    its old index in the same request (see `prepare_bulk_actions`). These deletes
+    are not items of their own, so they are not counted as successes, and a
+    delete of an item that is already gone (404) is not an error. Per-action
+    errors are never raised.
+
+    Args:
+        client: Async Elasticsearch/OpenSearch client.
+        actions (list[dict[str, Any]]): Bulk actions with `_op_type`, `_index`,
+            `_id` and `_source`.
+        bulk_helper: The client library's `async_bulk` helper.
+        **kwargs: Passed to `bulk_helper`, e.g. `refresh`.
+
+    Returns:
+        tuple[int, list[dict[str, Any]]]: The number of successfully written items
+        and the list of per-action errors.
+    """
+    success, errors = await bulk_helper(
+        client, actions, **{**kwargs, "raise_on_error": False}
+    )
+    deletes = sum(1 for action in actions if action.get("_op_type") == "delete")
+    if deletes:
+        failed_deletes = sum(1 for error in errors if "delete" in error)
+        success -= deletes - failed_deletes
+        errors = [
+            error for error in errors if error.get("delete", {}).get("status") != 404
+        ]
+    return success, errors
+
+
+async def _chunk_actions(
+    actions: AsyncIterable[dict[str, Any]], chunk_size: int
+) -> AsyncIterator[list[dict[str, Any]]]:
+    """Group a stream of bulk actions into lists of at most `chunk_size` actions."""
+    chunk: list[dict[str, Any]] = []
+    async for action in actions:
+        chunk.append(action)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _raise_first_failure(done: set[asyncio.Task]) -> None:
+    """Raise the first exception of finished tasks, retrieving all of them."""
+    failures = [task.exception() for task in done if not task.cancelled()]
+    for failure in failures:
+        if failure is not None:
+            raise failure
+
+
+async def parallel_bulk_shared(
+    client: Any,
+    actions: AsyncIterable[dict[str, Any]],
+    bulk_helper: Callable[..., Awaitable[tuple[int, list[dict[str, Any]]]]],
+    max_in_flight: int,
+    chunk_size: int = 500,
+    max_chunk_bytes: int = 100 * 1024 * 1024,
+    refresh: str = "false",
+) -> tuple[int, list[dict[str, Any]]]:
+    """Send a stream of bulk actions with several bulk requests in flight.
+
+    Actions are consumed lazily and grouped into chunks of `chunk_size`. At most
+    `max_in_flight` chunks are being sent at any time; each chunk is sent with
+    `bulk_helper`, which further splits it into requests of at most
+    `max_chunk_bytes`. Per-action errors are never raised, they are collected in
+    chunk order so callers can keep using `separate_bulk_conflict_errors`. The
+    deletes of moved items are left out as in `bulk_item_actions_shared`.
+
+    Args:
+        client: Async Elasticsearch/OpenSearch client.
+        actions (AsyncIterable[dict[str, Any]]): Bulk actions with `_op_type`, `_index`,
+            `_id` and `_source`.
+        bulk_helper: The client library's `async_bulk` helper.
+        max_in_flight (int): Maximum number of chunks sent concurrently.
+        chunk_size (int): Number of actions per chunk.
+        max_chunk_bytes (int): Maximum size in bytes of a single bulk request.
+        refresh (str): "true", "false" or "wait_for", as returned by `validate_refresh`.
+            With "true" the touched indexes are refreshed once after all chunks
+            completed instead of on every request.
+
+    Returns:
+        tuple[int, list[dict[str, Any]]]: The number of successful actions and the
+        list of per-action errors.
+    """
+    chunk_refresh = "wait_for" if refresh == "wait_for" else "false"
+    results: dict[int, tuple[int, list[dict[str, Any]]]] = {}
+    pending: set[asyncio.Task] = set()
+    touched_indexes: set[str] = set()
+
+    async def send(position: int, chunk: list[dict[str, Any]]) -> None:
+        results[position] = await bulk_item_actions_shared(
+            client,
+            chunk,
+            bulk_helper,
+            chunk_size=len(chunk),
+            max_chunk_bytes=max_chunk_bytes,
+            refresh=chunk_refresh,
+        )
+
+    try:
+        position = 0
+        async for chunk in _chunk_actions(actions, max(chunk_size, 1)):
+            touched_indexes.update(action["_index"] for action in chunk)
+            if len(pending) >= max_in_flight:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                _raise_first_failure(done)
+            pending.add(asyncio.create_task(send(position, chunk)))
+            position += 1
+
+        if pending:
+            done, pending = await asyncio.wait(pending)
+            _raise_first_failure(done)
+    except BaseException:
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        raise
+
+    success = 0
+    errors: list[dict[str, Any]] = []
+    for chunk_position in sorted(results):
+        chunk_success, chunk_errors = results[chunk_position]
+        success += chunk_success
+        errors.extend(chunk_errors)
+
+    if refresh == "true" and touched_indexes:
+        await client.indices.refresh(index=",".join(sorted(touched_indexes)))
+
+    logger.debug(
+        f"Parallel bulk sent {len(results)} chunks to {len(touched_indexes)} indexes"
+    )
+    return success, errors
@@ -295,6 +295,29 @@ async def create_index_templates_shared(settings: Any) -> None:
     await client.close()
 
 
+async def create_system_index_shared(
+    client: Any, index: str, mappings: dict[str, Any]
+) -> None:
+    """Create a single-shard internal index (e.g. task state) if it does not exist.
+
+    Args:
+        client: Async Elasticsearch/OpenSearch client.
+        index (str): Name of the index.
+        mappings (dict[str, Any]): Mappings of the index.
+
+    Returns:
+        None
+    """
+    body = {
+        "settings": {"index": {"number_of_shards": 1, "auto_expand_replicas": "0-1"}},
+        "mappings": mappings,
+    }
+    if hasattr(client, "options"):
+        await client.options(ignore_status=[400]).indices.create(index=index, body=body)
+    else:
+        await client.indices.create(index=index, body=body, params={"ignore": [400]})
+
+
 async def delete_item_index_shared(settings: Any, collection_id: str) -> None:
     """Delete the index for items in a collection.
 
@@ -3,9 +3,15 @@
 This module provides functions for working with Elasticsearch/OpenSearch mappings.
 """
 
+import logging
 import os
 from collections import defaultdict, deque
-from typing import Any
+from typing import Any, Callable, Iterable
+
+from stac_fastapi.sfeos_helpers.database.index import index_alias_by_collection_id
+from stac_fastapi.sfeos_helpers.mappings import ITEM_INDICES
+
+logger = logging.getLogger(__name__)
 
 
 def _get_excluded_from_queryables() -> set[str]:
@@ -114,3 +120,209 @@ async def get_queryables_mapping_shared(
             queryables_mapping[field_name].append(field_fqn)
 
     return queryables_mapping
+
+
+def _merge_mapping_properties(
+    target: dict[str, Any], source: dict[str, Any]
+) -> dict[str, Any]:
+    """Merge mapping properties into `target`, keeping its definition of a field."""
+    for name, definition in source.items():
+        existing = target.get(name)
+        if existing is None:
+            target[name] = definition
+        elif "properties" in existing and "properties" in definition:
+            target[name] = {
+                **existing,
+                "properties": _merge_mapping_properties(
+                    dict(existing["properties"]), definition["properties"]
+                ),
+            }
+    return target
+
+
+async def get_items_mappings_by_alias_shared(
+    es_client: Any, aliases: Iterable[str], index: str = ITEM_INDICES
+) -> dict[str, dict[str, Any]]:
+    """Return the mapping properties of many collection aliases at once.
+
+    Fetches the mappings and the aliases of all item indexes with one request
+    each and groups them in memory. The properties of the indexes behind an
+    alias, e.g. the datetime indexes of a collection, are merged.
+
+    Args:
+        es_client: Async Elasticsearch/OpenSearch client.
+        aliases (Iterable[str]): The collection aliases.
+        index (str): The indexes to read, e.g. the alias of a single collection
+            instead of all item indexes.
+
+    Returns:
+        dict[str, dict[str, Any]]: The mapping properties by alias. Aliases
+            without an index are left out.
+    """
+    wanted = set(aliases)
+    mappings = await es_client.indices.get_mapping(
+        index=index, ignore_unavailable=True, allow_no_indices=True
+    )
+    index_aliases = await es_client.indices.get_alias(
+        index=index, ignore_unavailable=True, allow_no_indices=True
+    )
+
+    properties_by_alias: dict[str, dict[str, Any]] = {}
+    for index in sorted(mappings.keys()):
+        names = {index, *index_aliases.get(index, {}).get("aliases", {})}
+        index_properties = mappings[index]["mappings"].get("properties", {})
+        for alias in names & wanted:
+            _merge_mapping_properties(
+                properties_by_alias.setdefault(alias, {}), index_properties
+            )
+    return properties_by_alias
+
+
+async def get_items_unique_values_by_alias_shared(
+    es_client: Any, fields_by_alias: dict[str, Iterable[str]], limit: int = 100
+) -> dict[str, dict[str, list[Any]]]:
+    """Return the unique values of fields of many aliases with one `msearch`.
+
+    Fields with more than `limit` unique values are skipped, as for a single
+    collection.
+
+    Args:
+        es_client: Async Elasticsearch/OpenSearch client.
+        fields_by_alias (dict[str, Iterable[str]]): The fields by alias.
+        limit (int): The maximum number of unique values of a field.
+
+    Returns:
+        dict[str, dict[str, list[Any]]]: The unique values by field, by alias.
+    """
+    aliases = list(fields_by_alias)
+    if not aliases:
+        return {}
+
+    searches: list[dict[str, Any]] = []
+    for alias in aliases:
+        searches.append({"index": alias})
+        searches.append(
+            {
+                "size": 0,
+                "aggs": {
+                    field: {"terms": {"field": field, "size": limit + 1}}
+                    for field in fields_by_alias[alias]
+                },
+            }
+        )
+    response = await es_client.msearch(body=searches)
+
+    result: dict[str, dict[str, list[Any]]] = {}
+    for alias, search in zip(aliases, response["responses"]):
+        if "error" in search:
+            logger.warning(
+                f"Failed to get the enum values of {alias}: {search['error']}"
+            )
+            continue
+        values = result.setdefault(alias, {})
+        for field, agg in search.get("aggregations", {}).items():
+            if len(agg["buckets"]) > limit:
+                logger.warning(
+                    "Skipping enum field %s: exceeds limit of %d unique values. "
+                    "Consider excluding this field from enumeration or increase the limit.",
+                    field,
+                    limit,
+                )
+                continue
+            values[field] = [bucket["key"] for bucket in agg["buckets"]]
+    return result
+
+
+async def build_collection_queryables_shared(
+    es_client: Any,
+    collection_ids: Iterable[str],
+    queryables_from_mapping: Callable[
+        [dict[str, Any]], tuple[dict[str, Any], dict[str, dict[str, Any]]]
+    ],
+    index: str = ITEM_INDICES,
+) -> dict[str, dict[str, Any]]:
+    """Build the queryable properties of many collections in a single pass.
+
+    One mapping fetch serves every collection, and the enum values of all
+    collections are fetched with one `msearch`, instead of one mapping fetch
+    and one aggregation per collection.
+
+    Args:
+        es_client: Async Elasticsearch/OpenSearch client.
+        collection_ids (Iterable[str]): The collections.
+        queryables_from_mapping: Returns the queryable properties of a mapping
+            and the properties whose enum to fill, by field path, e.g.
+            `EsAsyncBaseFiltersClient.queryables_from_mapping`.
+        index (str): The indexes to read the mappings of, see
+            `get_items_mappings_by_alias_shared`.
+
+    Returns:
+        dict[str, dict[str, Any]]: By id of every collection with an items
+            index, its queryable `properties`, the `mapping_properties` they
+            were built from and the paths of its `enum_fields`.
+    """
+    aliases = {
+        collection_id: index_alias_by_collection_id(collection_id)
+        for collection_id in collection_ids
+    }
+    properties_by_alias = await get_items_mappings_by_alias_shared(
+        es_client, aliases.values(), index=index
+    )
+
+    built: dict[str, dict[str, Any]] = {}
+    enum_fields_by_alias: dict[str, dict[str, dict[str, Any]]] = {}
+    for collection_id, alias in aliases.items():
+        if alias not in properties_by_alias:
+            continue
+        properties, enum_fields = queryables_from_mapping(properties_by_alias[alias])
+        built[collection_id] = {
+            "properties": properties,
+            "mapping_properties": properties_by_alias[alias],
+            "enum_fields": list(enum_fields),
+        }
+        if enum_fields:
+            enum_fields_by_alias.setdefault(alias, {}).update(enum_fields)
+
+    unique_values = await get_items_unique_values_by_alias_shared(
+        es_client,
+        {alias: list(fields) for alias, fields in enum_fields_by_alias.items()},
+    )
+    for collection_id, alias in aliases.items():
+        for field_fqn, values in unique_values.get(alias, {}).items():
+            field = built[collection_id]["properties"].get(
+                field_fqn.removeprefix("properties.").removeprefix("assets.")
+            )
+            if field is not None:
+                field["enum"] = values
+
+    return built
+
+
+async def get_all_collection_queryables_shared(
+    es_client: Any,
+    collection_ids: Iterable[str],
+    queryables_from_mapping: Callable[
+        [dict[str, Any]], tuple[dict[str, Any], dict[str, dict[str, Any]]]
+    ],
+) -> list[dict[str, Any]]:
+    """Build the queryables of many collections in a single pass.
+
+    Args:
+        es_client: Async Elasticsearch/OpenSearch client.
+        collection_ids (Iterable[str]): The collections.
+        queryables_from_mapping: See `build_collection_queryables_shared`.
+
+    Returns:
+        list[dict[str, Any]]: The queryables of every collection with an items index.
+    """
+    built = await build_collection_queryables_shared(
+        es_client, collection_ids, queryables_from_mapping
+    )
+    return [
+        {
+            "type": "object",
+            "properties": collection["properties"],
+            "additionalProperties": False,
+        }
+        for collection in built.values()
+    ]
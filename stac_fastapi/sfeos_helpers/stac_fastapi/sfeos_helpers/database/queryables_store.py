@@ -0,0 +1,371 @@
+"""Materialized per-collection queryables.
+
+With `ENABLE_QUERYABLES_STORE=true` the `QUERYABLES_INDEX` system index holds one
+document per collection with its queryable properties, enum values included,
+and the field paths CQL2 filters are translated with, plus one document (`*`)
+merging all of them. `/queryables`, queryables validation and CQL2 translation
+read these documents with a single GET instead of fetching index mappings and
+aggregating enum values.
+
+A document records the `mapping_version` of every item index of its collection.
+The versions of all item indexes are checked with one cluster state request
+(`find_outdated_queryables_shared`), and the documents of collections whose
+mappings grew, e.g. through dynamic mapping of new item fields, are rebuilt.
+So are the documents with enum fields of collections written to since, as
+their values may have changed.
+
+A document missing on read is built from the indexes of its collection alone
+and stored without mapping versions, so the next periodic check rebuilds it
+together with the merged document.
+"""
+
+import logging
+import os
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Any, Callable, Iterable
+
+from stac_fastapi.core.queryables import merge_queryables
+from stac_fastapi.core.utilities import get_bool_env
+from stac_fastapi.sfeos_helpers.database.index import (
+    create_system_index_shared,
+    index_alias_by_collection_id,
+)
+from stac_fastapi.sfeos_helpers.database.mapping import (
+    build_collection_queryables_shared,
+    get_queryables_mapping_shared,
+)
+from stac_fastapi.sfeos_helpers.mappings import ITEM_INDICES, QUERYABLES_INDEX
+
+logger = logging.getLogger(__name__)
+
+ALL_COLLECTIONS = "*"
+_PAGE_SIZE = 10000
+
+_QUERYABLES_MAPPINGS = {
+    "dynamic": False,
+    "properties": {
+        "collection": {"type": "keyword"},
+        "enum_fields": {"type": "keyword"},
+        "queryables": {"type": "object", "enabled": False},
+        "mapping": {"type": "object", "enabled": False},
+        "mapping_versions": {"type": "object", "enabled": False},
+        "built_at": {"type": "date"},
+    },
+}
+
+
+def get_queryables_store_enabled() -> bool:
+    """Get ENABLE_QUERYABLES_STORE from env."""
+    return get_bool_env("ENABLE_QUERYABLES_STORE", default=False)
+
+
+def get_queryables_store_refresh_interval() -> float:
+    """Get QUERYABLES_STORE_REFRESH_INTERVAL (seconds between mapping checks) from env."""
+    return float(os.getenv("QUERYABLES_STORE_REFRESH_INTERVAL", "60"))
+
+
+async def create_queryables_index_shared(client: Any) -> None:
+    """Create the queryables index if it does not exist."""
+    await create_system_index_shared(client, QUERYABLES_INDEX, _QUERYABLES_MAPPINGS)
+
+
+async def get_stored_queryables_shared(
+    client: Any, collection_id: str
+) -> dict[str, Any] | None:
+    """Return the stored queryables of a collection, or None if there are none.
+
+    Args:
+        client: Async Elasticsearch/OpenSearch client.
+        collection_id (str): The collection id, or `*` for all collections.
+
+    Returns:
+        dict[str, Any] | None: The stored document.
+    """
+    response = await client.mget(index=QUERYABLES_INDEX, body={"ids": [collection_id]})
+    document = response["docs"][0]
+    return document["_source"] if document.get("found") else None
+
+
+async def get_mapping_versions_shared(
+    client: Any, collection_ids: Iterable[str]
+) -> dict[str, dict[str, int]]:
+    """Return the mapping version of every item index of collections.
+
+    Args:
+        client: Async Elasticsearch/OpenSearch client.
+        collection_ids (Iterable[str]): The collections.
+
+    Returns:
+        dict[str, dict[str, int]]: The mapping versions by index, by collection.
+    """
+    collections_by_alias: dict[str, list[str]] = defaultdict(list)
+    versions: dict[str, dict[str, int]] = {}
+    for collection_id in collection_ids:
+        collections_by_alias[index_alias_by_collection_id(collection_id)].append(
+            collection_id
+        )
+        versions[collection_id] = {}
+
+    response = await client.cluster.state(
+        metric="metadata",
+        index=ITEM_INDICES,
+        filter_path="metadata.indices.*.mapping_version,metadata.indices.*.aliases",
+    )
+    for index, metadata in response.get("metadata", {}).get("indices", {}).items():
+        for alias in {index, *metadata.get("aliases", [])}:
+            for collection_id in collections_by_alias.get(alias, []):
+                versions[collection_id][index] = int(metadata["mapping_version"])
+    return versions
+
+
+async def _search_stored(
+    client: Any, query: dict[str, Any], fields: list[str]
+) -> list[dict[str, Any]]:
+    """Return the given fields of all matching stored documents."""
+    documents: list[dict[str, Any]] = []
+    search_after = None
+    while True:
+        body: dict[str, Any] = {
+            "query": query,
+            "_source": fields,
+            "sort": [{"collection": {"order": "asc"}}],
+            "size": _PAGE_SIZE,
+        }
+        if search_after:
+            body["search_after"] = search_after
+        response = await client.search(index=QUERYABLES_INDEX, body=body)
+        hits = response["hits"]["hits"]
+        documents.extend(hit["_source"] for hit in hits)
+        if len(hits) < _PAGE_SIZE:
+            return documents
+        search_after = hits[-1]["sort"]
+
+
+async def find_outdated_queryables_shared(
+    client: Any, collection_ids: list[str], written: Iterable[str] = ()
+) -> tuple[list[str], list[str]]:
+    """Return the collections whose stored queryables must be rebuilt or removed.
+
+    Args:
+        client: Async Elasticsearch/OpenSearch client.
+        collection_ids (list[str]): All collections of the catalog.
+        written (Iterable[str]): Collections written to since the last check.
+
+    Returns:
+        tuple[list[str], list[str]]: The collections whose item mappings changed,
+            or that have enum fields and were written to, and the stored
+            collections that no longer exist.
+    """
+    current = await get_mapping_versions_shared(client, collection_ids)
+    stored = {
+        document["collection"]: document
+        for document in await _search_stored(
+            client,
+            {"bool": {"must_not": {"ids": {"values": [ALL_COLLECTIONS]}}}},
+            ["collection", "enum_fields", "mapping_versions"],
+        )
+    }
+    written = set(written)
+
+    outdated = []
+    for collection_id in collection_ids:
+        document = stored.get(collection_id)
+        if document is None:
+            changed = bool(current[collection_id])
+        else:
+            changed = document.get("mapping_versions") != current[collection_id] or (
+                collection_id in written and bool(document.get("enum_fields"))
+            )
+        if changed:
+            outdated.append(collection_id)
+    removed = sorted(stored.keys() - set(collection_ids))
+    return outdated, removed
+
+
+async def _store_merged_queryables(client: Any) -> dict[str, Any]:
+    """Rebuild the document merging the queryables of all collections."""
+    documents = await _search_stored(
+        client,
+        {"bool": {"must_not": {"ids": {"values": [ALL_COLLECTIONS]}}}},
+        ["queryables", "mapping"],
+    )
+    mapping: dict[str, list[str]] = defaultdict(list)
+    for document in documents:
+        for field_name, paths in document.get("mapping", {}).items():
+            mapping[field_name].extend(
+                path for path in paths if path not in mapping[field_name]
+            )
+    merged = {
+        "collection": ALL_COLLECTIONS,
+        "queryables": merge_queryables(
+            [{"properties": document.get("queryables", {})} for document in documents]
+        )["properties"],
+        "mapping": dict(mapping),
+        "enum_fields": [],
+        "mapping_versions": {},
+        "built_at": datetime.now(timezone.utc).isoformat(),
+    }
+    await client.index(
+        index=QUERYABLES_INDEX, id=ALL_COLLECTIONS, body=merged, refresh=True
+    )
+    return merged
+
+
+async def _queryables_document(
+    collection_id: str,
+    collection: dict[str, Any],
+    mapping_versions: dict[str, int],
+    built_at: str,
+) -> dict[str, Any]:
+    """Return the document storing a collection built by `build_collection_queryables_shared`."""
+    mapping = await get_queryables_mapping_shared(
+        {collection_id: {"mappings": {"properties": collection["mapping_properties"]}}}
+    )
+    return {
+        "collection": collection_id,
+        "queryables": collection["properties"],
+        "mapping": dict(mapping),
+        "enum_fields": collection["enum_fields"],
+        "mapping_versions": mapping_versions,
+        "built_at": built_at,
+    }
+
+
+async def store_collection_queryables_shared(
+    client: Any,
+    collection_id: str,
+    queryables_from_mapping: Callable[
+        [dict[str, Any]], tuple[dict[str, Any], dict[str, dict[str, Any]]]
+    ],
+) -> dict[str, Any] | None:
+    """Build and store the queryables of a single collection from its own indexes.
+
+    Only the indexes behind the collection alias are read. The document is
+    stored without mapping versions, so that the next periodic check rebuilds
+    it along with the merged document.
+
+    Args:
+        client: Async Elasticsearch/OpenSearch client.
+        collection_id (str): The collection.
+        queryables_from_mapping: See `build_collection_queryables_shared`.
+
+    Returns:
+        dict[str, Any] | None: The stored document, or None if the collection
+            has no items index.
+    """
+    built = await build_collection_queryables_shared(
+        client,
+        [collection_id],
+        queryables_from_mapping,
+        index=index_alias_by_collection_id(collection_id),
+    )
+    if collection_id not in built:
+        return None
+    document = await _queryables_document(
+        collection_id,
+        built[collection_id],
+        {},
+        datetime.now(timezone.utc).isoformat(),
+    )
+    await client.index(index=QUERYABLES_INDEX, id=collection_id, body=document)
+    return document
+
+
+async def delete_stored_queryables_shared(
+    client: Any, bulk_helper: Any, collection_id: str
+) -> None:
+    """Delete the stored queryables of a deleted collection.
+
+    The merged document is deleted too instead of being rebuilt; the next
+    periodic check creates it again.
+
+    Args:
+        client: Async Elasticsearch/OpenSearch client.
+        bulk_helper: `helpers.async_bulk` of the backend.
+        collection_id (str): The deleted collection.
+    """
+    _, errors = await bulk_helper(
+        client,
+        [
+            {"_op_type": "delete", "_index": QUERYABLES_INDEX, "_id": doc_id}
+            for doc_id in (collection_id, ALL_COLLECTIONS)
+        ],
+        refresh=True,
+        raise_on_error=False,
+    )
+    errors = [error for error in errors if error.get("delete", {}).get("status") != 404]
+    if errors:
+        logger.warning(
+            f"Could not delete the stored queryables of {collection_id}: {errors}"
+        )
+
+
+async def refresh_queryables_shared(
+    client: Any,
+    bulk_helper: Any,
+    collection_ids: Iterable[str],
+    queryables_from_mapping: Callable[
+        [dict[str, Any]], tuple[dict[str, Any], dict[str, dict[str, Any]]]
+    ],
+    merge: bool = False,
+) -> dict[str, dict[str, Any]]:
+    """Rebuild the stored queryables of collections and the merged document.
+
+    The documents of collections without an items index are removed. The
+    merged document is only created with `merge`, once every collection was
+    checked, so that it never covers part of the collections only.
+
+    Args:
+        client: Async Elasticsearch/OpenSearch client.
+        bulk_helper: `helpers.async_bulk` of the backend.
+        collection_ids (Iterable[str]): The collections to rebuild.
+        queryables_from_mapping: See `build_collection_queryables_shared`.
+        merge (bool): Create the merged document if it does not exist.
+
+    Returns:
+        dict[str, dict[str, Any]]: The stored documents by collection id.
+    """
+    collection_ids = list(dict.fromkeys(collection_ids))
+    # The versions are read first: a mapping change during the rebuild makes the
+    # stored document outdated instead of being missed
+    versions = await get_mapping_versions_shared(client, collection_ids)
+    built = await build_collection_queryables_shared(
+        client, collection_ids, queryables_from_mapping
+    )
+
+    built_at = datetime.now(timezone.utc).isoformat()
+    documents = {
+        collection_id: await _queryables_document(
+            collection_id, collection, versions[collection_id], built_at
+        )
+        for collection_id, collection in built.items()
+    }
+    if documents:
+        await bulk_helper(
+            client,
+            [
+                {"_index": QUERYABLES_INDEX, "_id": collection_id, "_source": document}
+                for collection_id, document in documents.items()
+            ],
+            refresh=True,
+            raise_on_error=True,
+        )
+    removed = [
+        collection_id for collection_id in collection_ids if collection_id not in built
+    ]
+    deleted = 0
+    if removed:
+        response = await client.delete_by_query(
+            index=QUERYABLES_INDEX,
+            body={"query": {"ids": {"values": removed}}},
+            refresh=True,
+        )
+        deleted = response.get("deleted", 0)
+    if merge or (
+        (documents or deleted)
+        and await get_stored_queryables_shared(client, ALL_COLLECTIONS)
+    ):
+        await _store_merged_queryables(client)
+    logger.info(f"Rebuilt the stored queryables of {len(documents)} collections")
+    return documents
@@ -0,0 +1,761 @@
+"""Persistent, resumable reindex tasks for Elasticsearch/OpenSearch.
+
+A reindex task copies one or more source indexes into destination indexes with
+sliced (`slices=auto`), throttled (`requests_per_second`) server-side reindex
+requests, several indexes at a time. Before the first step, writes to the
+`write_blocks` indexes are blocked (`index.blocks.write`) and the
+`block_documents` of the task are updated, so that nothing written to the
+sources while they are copied is lost. When every step succeeded, all alias
+changes of the task are applied in a single atomic `update_aliases` call, so
+readers switch from the old to the new indexes at once. When a step fails, the
+source indexes and aliases are left untouched, their writes are unblocked and
+the destination indexes and the `rollback_documents` of the task are deleted,
+so the task can be submitted again.
+
+The task document is persisted in `TASKS_INDEX` after every state change and
+doubles as a lease: the process running a task renews `heartbeat_at` on each
+poll, and tasks whose heartbeat is older than `REINDEX_TASK_LEASE` are resumed
+by the next process that starts. Writes use optimistic concurrency
+(`if_seq_no`/`if_primary_term`), so a task is never driven by two runners.
+
+The same machinery runs bulk deletes and patches: a step with
+`action: "delete_by_query"` or `action: "update_by_query"` submits a sliced,
+throttled `delete_by_query` (or `update_by_query` with the step `script`) of its
+`query` against `source` instead of a reindex.
+"""
+
+import asyncio
+import logging
+import os
+import socket
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from stac_fastapi.sfeos_helpers.database.index import (
+    create_system_index_shared,
+    index_alias_by_collection_id,
+    index_by_collection_id,
+)
+from stac_fastapi.sfeos_helpers.database.utils import (
+    COLLECTION_MOVING_FIELD,
+    error_status_code,
+)
+from stac_fastapi.sfeos_helpers.mappings import (
+    _ES_INDEX_NAME_UNSUPPORTED_CHARS_TABLE,
+    ITEMS_INDEX_PREFIX,
+    TASKS_INDEX,
+)
+
+logger = logging.getLogger(__name__)
+
+TASK_PENDING = "pending"
+TASK_RUNNING = "running"
+TASK_COMPLETED = "completed"
+TASK_FAILED = "failed"
+
+STEP_REINDEX = "reindex"
+STEP_DELETE_BY_QUERY = "delete_by_query"
+STEP_UPDATE_BY_QUERY = "update_by_query"
+
+_PROGRESS_KEYS = ("total", "created", "updated", "deleted", "version_conflicts")
+
+_TASKS_MAPPINGS = {
+    "dynamic": False,
+    "properties": {
+        "id": {"type": "keyword"},
+        "type": {"type": "keyword"},
+        "status": {"type": "keyword"},
+        "created_at": {"type": "date"},
+        "updated_at": {"type": "date"},
+        "heartbeat_at": {"type": "date"},
+    },
+}
+
+
+class ReindexTaskClaimLost(Exception):
+    """Raised when another runner updated a task this runner was driving."""
+
+
+def get_reindex_requests_per_second() -> float:
+    """Get REINDEX_REQUESTS_PER_SECOND from env (-1 disables throttling)."""
+    return float(os.getenv("REINDEX_REQUESTS_PER_SECOND", "-1"))
+
+
+def get_reindex_max_parallel() -> int:
+    """Get REINDEX_MAX_PARALLEL (indexes reindexed concurrently) from env."""
+    return int(os.getenv("REINDEX_MAX_PARALLEL", "4"))
+
+
+def get_reindex_poll_interval() -> float:
+    """Get REINDEX_POLL_INTERVAL (seconds between task status checks) from env."""
+    return float(os.getenv("REINDEX_POLL_INTERVAL", "5"))
+
+
+def get_reindex_task_lease() -> int:
+    """Get REINDEX_TASK_LEASE (seconds before an idle task may be resumed) from env."""
+    return int(os.getenv("REINDEX_TASK_LEASE", "60"))
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def new_reindex_task(
+    task_type: str,
+    steps: list[dict[str, Any]],
+    alias_actions: list[dict[str, Any]] | None = None,
+    delete_documents: list[dict[str, str]] | None = None,
+    params: dict[str, Any] | None = None,
+    requests_per_second: float | None = None,
+    max_parallel: int | None = None,
+    rollback_documents: list[dict[str, str]] | None = None,
+    write_blocks: list[str] | None = None,
+    block_documents: list[dict[str, Any]] | None = None,
+) -> dict[str, Any]:
+    """Build a new reindex task document.
+
+    Args:
+        task_type (str): Kind of task, e.g. "collection_id_change" or "reindex".
+        steps (list[dict[str, Any]]): One entry per index with `source`, `dest` and an
+            optional painless `script`, or with `action: "delete_by_query"` or
+            `action: "update_by_query"`, `source` and the `query` selecting the
+            documents (plus the update `script` and an optional `refresh` flag).
+        alias_actions (list[dict[str, Any]] | None): `update_aliases` actions applied
+            atomically once every step completed.
+        delete_documents (list[dict[str, str]] | None): Documents (`index`, `id`) deleted
+            after the alias swap.
+        params (dict[str, Any] | None): Free-form parameters shown in the task status.
+        requests_per_second (float | None): Reindex throttle. Defaults to
+            `REINDEX_REQUESTS_PER_SECOND`.
+        max_parallel (int | None): Indexes reindexed concurrently. Defaults to
+            `REINDEX_MAX_PARALLEL`.
+        rollback_documents (list[dict[str, str]] | None): Documents (`index`, `id`)
+            deleted along with the destination indexes if the task fails.
+        write_blocks (list[str] | None): Indexes made read-only while the task runs.
+        block_documents (list[dict[str, Any]] | None): Documents (`index`, `id`)
+            partially updated with `doc` while the task runs, e.g. to reject
+            writes before they reach `write_blocks`. The fields of `doc` are
+            set to null again if the task fails.
+
+    Returns:
+        dict[str, Any]: The task document, not yet persisted.
+    """
+    now = _now()
+    return {
+        "id": uuid.uuid4().hex,
+        "type": task_type,
+        "status": TASK_PENDING,
+        "params": params or {},
+        "created_at": now,
+        "updated_at": now,
+        "heartbeat_at": now,
+        "runner": None,
+        "requests_per_second": (
+            get_reindex_requests_per_second()
+            if requests_per_second is None
+            else requests_per_second
+        ),
+        "max_parallel": (
+            get_reindex_max_parallel() if max_parallel is None else max_parallel
+        ),
+        "steps": [
+            {
+                "action": step.get("action", STEP_REINDEX),
+                "source": step["source"],
+                "dest": step.get("dest"),
+                "script": step.get("script"),
+                "query": step.get("query"),
+                "refresh": step.get("refresh", True),
+                "status": TASK_PENDING,
+                "task": None,
+                "progress": {},
+                "error": None,
+            }
+            for step in steps
+        ],
+        "alias_actions": alias_actions or [],
+        "aliases_swapped": False,
+        "delete_documents": delete_documents or [],
+        "rollback_documents": rollback_documents or [],
+        "rolled_back": False,
+        "write_blocks": write_blocks or [],
+        "block_documents": block_documents or [],
+        "error": None,
+    }
+
+
+def new_delete_by_query_task(
+    collection_id: str,
+    indexes: list[str],
+    query: dict[str, Any],
+    requests_per_second: float | None = None,
+) -> dict[str, Any]:
+    """Build a task deleting the items of a collection that match a query.
+
+    Each index gets its own sliced `delete_by_query` step, so large collections
+    split into datetime indexes are processed `max_parallel` indexes at a time
+    and report progress per index.
+
+    Args:
+        collection_id (str): The collection the items belong to.
+        indexes (list[str]): Indexes or aliases selected for the query.
+        query (dict[str, Any]): The query selecting the items to delete.
+        requests_per_second (float | None): Delete throttle. Defaults to
+            `REINDEX_REQUESTS_PER_SECOND`.
+
+    Returns:
+        dict[str, Any]: The task document, not yet persisted.
+    """
+    return new_reindex_task(
+        "bulk_delete",
+        [
+            {"action": STEP_DELETE_BY_QUERY, "source": index, "query": query}
+            for index in indexes
+        ],
+        params={"collection_id": collection_id},
+        requests_per_second=requests_per_second,
+    )
+
+
+def new_update_by_query_task(
+    collection_id: str,
+    indexes: list[str],
+    query: dict[str, Any],
+    script: dict[str, Any],
+    refresh: bool = True,
+    requests_per_second: float | None = None,
+) -> dict[str, Any]:
+    """Build a task applying an update script to the items matching a query.
+
+    Like `new_delete_by_query_task`, each index gets its own sliced step.
+
+    Args:
+        collection_id (str): The collection the items belong to.
+        indexes (list[str]): Indexes or aliases selected for the query.
+        query (dict[str, Any]): The query selecting the items to update.
+        script (dict[str, Any]): The painless update script.
+        refresh (bool): Whether to refresh each index once its step completed.
+        requests_per_second (float | None): Update throttle. Defaults to
+            `REINDEX_REQUESTS_PER_SECOND`.
+
+    Returns:
+        dict[str, Any]: The task document, not yet persisted.
+    """
+    return new_reindex_task(
+        "bulk_patch",
+        [
+            {
+                "action": STEP_UPDATE_BY_QUERY,
+                "source": index,
+                "query": query,
+                "script": script,
+                "refresh": refresh,
+            }
+            for index in indexes
+        ],
+        params={"collection_id": collection_id},
+        requests_per_second=requests_per_second,
+    )
+
+
+def _rename_alias(alias: str, old_id: str, new_id: str) -> str:
+    """Translate an item index alias of collection `old_id` to collection `new_id`."""
+    old_alias = index_alias_by_collection_id(old_id)
+    if alias == old_alias:
+        return index_alias_by_collection_id(new_id)
+
+    old_clean = old_id.translate(_ES_INDEX_NAME_UNSUPPORTED_CHARS_TABLE).lower()
+    new_clean = new_id.translate(_ES_INDEX_NAME_UNSUPPORTED_CHARS_TABLE).lower()
+    for name in ("start_datetime", "end_datetime", "datetime"):
+        prefix = f"{ITEMS_INDEX_PREFIX}{name}_{old_clean}_"
+        if alias.startswith(prefix):
+            return f"{ITEMS_INDEX_PREFIX}{name}_{new_clean}_{alias[len(prefix):]}"
+    return alias
+
+
+def _dest_index_name(index: str, old_id: str, new_id: str) -> str:
+    """Name the index receiving the items of `index` for collection `new_id`."""
+    old_base = index_by_collection_id(old_id)
+    if index.startswith(f"{old_base}-"):
+        return f"{index_by_collection_id(new_id)}{index[len(old_base):]}"
+    new_clean = new_id.translate(_ES_INDEX_NAME_UNSUPPORTED_CHARS_TABLE).lower()
+    return f"{ITEMS_INDEX_PREFIX}{new_clean}_{uuid.uuid4()}"
+
+
+async def plan_collection_id_change_shared(
+    client: Any, old_id: str, new_id: str, collections_index: str
+) -> dict[str, Any]:
+    """Build the reindex task moving the items of a collection to a new id.
+
+    Every item index of the old collection is reindexed into an index of the new
+    collection with a script that rewrites `collection` and the document id.
+    While the task runs, the old indexes are read-only and the old collection
+    document is flagged with `COLLECTION_MOVING_FIELD`, so item writes to the
+    old collection are rejected instead of being lost with its indexes. The
+    final alias swap adds the translated aliases to the new indexes and removes
+    the old indexes in the same request; afterwards the old collection document
+    is deleted. If the task fails, the new indexes and the new collection
+    document are deleted instead and the old collection is writable again.
+
+    Args:
+        client: Async Elasticsearch/OpenSearch client.
+        old_id (str): The current collection id.
+        new_id (str): The new collection id.
+        collections_index (str): The index holding collection documents.
+
+    Returns:
+        dict[str, Any]: The task document, not yet persisted.
+    """
+    aliases = await client.indices.get_alias(
+        index=index_alias_by_collection_id(old_id),
+        ignore_unavailable=True,
+        allow_no_indices=True,
+    )
+    script = {
+        "lang": "painless",
+        "source": (
+            "ctx._id = ctx._id.substring(0, ctx._id.length() - params.old_suffix.length())"
+            " + params.new_suffix; ctx._source.collection = params.new_id;"
+        ),
+        "params": {
+            "old_suffix": f"|{old_id}",
+            "new_suffix": f"|{new_id}",
+            "new_id": new_id,
+        },
+    }
+    steps = []
+    alias_actions: list[dict[str, Any]] = []
+    for index, data in sorted(aliases.items()):
+        dest = _dest_index_name(index, old_id, new_id)
+        steps.append({"source": index, "dest": dest, "script": script})
+        for alias in data.get("aliases", {}):
+            alias_actions.append(
+                {"add": {"index": dest, "alias": _rename_alias(alias, old_id, new_id)}}
+            )
+        alias_actions.append({"remove_index": {"index": index}})
+
+    return new_reindex_task(
+        "collection_id_change",
+        steps,
+        alias_actions=alias_actions,
+        delete_documents=[{"index": collections_index, "id": old_id}],
+        params={"old_collection_id": old_id, "new_collection_id": new_id},
+        rollback_documents=[{"index": collections_index, "id": new_id}],
+        write_blocks=[step["source"] for step in steps],
+        block_documents=[
+            {
+                "index": collections_index,
+                "id": old_id,
+                "doc": {COLLECTION_MOVING_FIELD: new_id},
+            }
+        ],
+    )
+
+
+def reindex_task_collection_ids(task: dict[str, Any]) -> list[str]:
+    """Return the collections whose items a task deletes, updates or moves.
+
+    Args:
+        task (dict[str, Any]): The task document.
+
+    Returns:
+        list[str]: The collection ids found in the task `params`.
+    """
+    params = task.get("params") or {}
+    return [
+        params[key]
+        for key in ("collection_id", "old_collection_id", "new_collection_id")
+        if params.get(key)
+    ]
+
+
+def _public_task(task: dict[str, Any]) -> dict[str, Any]:
+    """Return the task as shown to API clients."""
+    return {
+        key: value
+        for key, value in task.items()
+        if key
+        not in (
+            "alias_actions",
+            "delete_documents",
+            "rollback_documents",
+            "write_blocks",
+            "block_documents",
+        )
+    }
+
+
+async def _search_tasks(
+    client: Any, query: dict[str, Any], size: int = 100
+) -> list[dict[str, Any]]:
+    await create_system_index_shared(client, TASKS_INDEX, _TASKS_MAPPINGS)
+    response = await client.search(
+        index=TASKS_INDEX,
+        body={
+            "query": query,
+            "size": size,
+            "sort": [{"created_at": {"order": "desc"}}],
+            "seq_no_primary_term": True,
+        },
+    )
+    return response["hits"]["hits"]
+
+
+async def get_reindex_task_shared(client: Any, task_id: str) -> dict[str, Any] | None:
+    """Return the status of a reindex task, or None if it does not exist.
+
+    Args:
+        client: Async Elasticsearch/OpenSearch client.
+        task_id (str): The task id.
+
+    Returns:
+        dict[str, Any] | None: The task status.
+    """
+    hits = await _search_tasks(client, {"ids": {"values": [task_id]}}, size=1)
+    return _public_task(hits[0]["_source"]) if hits else None
+
+
+async def list_reindex_tasks_shared(
+    client: Any, status: str | None = None, limit: int = 100
+) -> list[dict[str, Any]]:
+    """List reindex tasks, newest first.
+
+    Args:
+        client: Async Elasticsearch/OpenSearch client.
+        status (str | None): Only return tasks with this status.
+        limit (int): Maximum number of tasks to return.
+
+    Returns:
+        list[dict[str, Any]]: Task statuses.
+    """
+    query = {"term": {"status": status}} if status else {"match_all": {}}
+    hits = await _search_tasks(client, query, size=limit)
+    return [_public_task(hit["_source"]) for hit in hits]
+
+
+async def find_resumable_reindex_tasks_shared(
+    client: Any, lease: int | None = None
+) -> list[str]:
+    """Return the ids of unfinished tasks whose runner stopped heartbeating.
+
+    Args:
+        client: Async Elasticsearch/OpenSearch client.
+        lease (int | None): Seconds without heartbeat after which a task is
+            considered abandoned. Defaults to `REINDEX_TASK_LEASE`.
+
+    Returns:
+        list[str]: Ids of tasks that can be claimed and resumed.
+    """
+    lease = get_reindex_task_lease() if lease is None else lease
+    expired = datetime.now(timezone.utc) - timedelta(seconds=lease)
+    hits = await _search_tasks(
+        client,
+        {
+            "bool": {
+                "filter": [
+                    {"terms": {"status": [TASK_PENDING, TASK_RUNNING]}},
+                    {"range": {"heartbeat_at": {"lt": expired.isoformat()}}},
+                ]
+            }
+        },
+        size=1000,
+    )
+    return [hit["_id"] for hit in hits]
+
+
+class ReindexTaskRunner:
+    """Drive a persisted reindex task to completion.
+
+    Use `create` for a new task or `claim` to take over an abandoned one, then
+    `run`. Every state change is persisted with optimistic concurrency; if
+    another runner wrote the task in between, `ReindexTaskClaimLost` stops this
+    one.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        task: dict[str, Any],
+        seq_no: int | None = None,
+        primary_term: int | None = None,
+        poll_interval: float | None = None,
+    ):
+        """Initialize the runner for a loaded task document."""
+        self.client = client
+        self.task = task
+        self.seq_no = seq_no
+        self.primary_term = primary_term
+        self.poll_interval = (
+            get_reindex_poll_interval() if poll_interval is None else poll_interval
+        )
+        self._lock = asyncio.Lock()
+
+    @classmethod
+    async def create(
+        cls, client: Any, task: dict[str, Any], poll_interval: float | None = None
+    ) -> "ReindexTaskRunner":
+        """Persist a new task document and return a runner owning it."""
+        await create_system_index_shared(client, TASKS_INDEX, _TASKS_MAPPINGS)
+        runner = cls(client, task, poll_interval=poll_interval)
+        await runner._save()
+        return runner
+
+    @classmethod
+    async def claim(
+        cls, client: Any, task_id: str, poll_interval: float | None = None
+    ) -> "ReindexTaskRunner | None":
+        """Take over an unfinished task, or return None if it cannot be claimed."""
+        hits = await _search_tasks(client, {"ids": {"values": [task_id]}}, size=1)
+        if not hits or hits[0]["_source"]["status"] not in (
+            TASK_PENDING,
+            TASK_RUNNING,
+        ):
+            return None
+        runner = cls(
+            client,
+            hits[0]["_source"],
+            seq_no=hits[0]["_seq_no"],
+            primary_term=hits[0]["_primary_term"],
+            poll_interval=poll_interval,
+        )
+        try:
+            await runner._save()
+        except ReindexTaskClaimLost:
+            return None
+        return runner
+
+    async def _save(self) -> None:
+        """Persist the task and renew its heartbeat."""
+        now = _now()
+        self.task["updated_at"] = now
+        self.task["heartbeat_at"] = now
+        self.task["runner"] = f"{socket.gethostname()}:{os.getpid()}"
+        kwargs: dict[str, Any] = {}
+        if self.seq_no is None:
+            kwargs["op_type"] = "create"
+        else:
+            kwargs["if_seq_no"] = self.seq_no
+            kwargs["if_primary_term"] = self.primary_term
+        try:
+            response = await self.client.index(
+                index=TASKS_INDEX,
+                id=self.task["id"],
+                body=self.task,
+                refresh=True,
+                **kwargs,
+            )
+        except Exception as e:
+            if error_status_code(e) == 409:
+                raise ReindexTaskClaimLost(self.task["id"]) from e
+            raise
+        self.seq_no = response["_seq_no"]
+        self.primary_term = response["_primary_term"]
+
+    async def _persist(self) -> None:
+        async with self._lock:
+            await self._save()
+
+    async def run(self) -> dict[str, Any]:
+        """Run all pending steps, swap aliases and finalize the task.
+
+        Returns:
+            dict[str, Any]: The final task status.
+        """
+        task = self.task
+        task["status"] = TASK_RUNNING
+        await self._persist()
+        logger.info(f"Running reindex task {task['id']} ({task['type']})")
+        if not task["aliases_swapped"]:
+            await self._block_writes()
+
+        semaphore = asyncio.Semaphore(max(int(task["max_parallel"]), 1))
+        # Every step is waited for, so no step still writes to a destination
+        # index when a failed task is rolled back
+        results = await asyncio.gather(
+            *(self._run_step(step, semaphore) for step in task["steps"]),
+            return_exceptions=True,
+        )
+        for step, result in zip(task["steps"], results):
+            if isinstance(result, ReindexTaskClaimLost):
+                raise result
+            if isinstance(result, Exception):
+                logger.error(
+                    f"Step {step['source']} of task {task['id']} failed: {result}"
+                )
+                step["status"] = TASK_FAILED
+                step["error"] = str(result)
+
+        failed = [step for step in task["steps"] if step["status"] == TASK_FAILED]
+        if failed:
+            # The old indexes and aliases are left untouched; drop what the task
+            # created, so it can be submitted again
+            task["status"] = TASK_FAILED
+            task["error"] = f"{len(failed)} of {len(task['steps'])} indexes failed"
+            await self.roll_back()
+            await self._persist()
+            logger.error(f"Reindex task {task['id']} failed: {task['error']}")
+            return _public_task(task)
+
+        await self._swap_aliases()
+        for document in task["delete_documents"]:
+            await self._delete_document(document)
+        task["status"] = TASK_COMPLETED
+        await self._persist()
+        logger.info(f"Reindex task {task['id']} completed")
+        return _public_task(task)
+
+    async def _block_writes(self) -> None:
+        """Apply the `block_documents` and `write_blocks` of the task."""
+        task = self.task
+        for document in task.get("block_documents", []):
+            await self.client.update(
+                index=document["index"],
+                id=document["id"],
+                body={"doc": document["doc"]},
+                refresh=True,
+            )
+        if task.get("write_blocks"):
+            await self.client.indices.put_settings(
+                index=task["write_blocks"], body={"index.blocks.write": True}
+            )
+
+    async def _unblock_writes(self) -> None:
+        """Lift the `write_blocks` and clear the `block_documents` of the task."""
+        task = self.task
+        if task.get("write_blocks"):
+            await self.client.indices.put_settings(
+                index=task["write_blocks"],
+                body={"index.blocks.write": False},
+                ignore_unavailable=True,
+            )
+        for document in task.get("block_documents", []):
+            try:
+                await self.client.update(
+                    index=document["index"],
+                    id=document["id"],
+                    body={"doc": {key: None for key in document["doc"]}},
+                    refresh=True,
+                )
+            except Exception as e:
+                if error_status_code(e) != 404:
+                    raise
+
+    async def roll_back(self) -> None:
+        """Delete the destination indexes and `rollback_documents` of a failed task.
+
+        Writes to the sources are unblocked. Does nothing once the aliases were
+        swapped, as the destination indexes are then the live indexes.
+        """
+        task = self.task
+        if task["aliases_swapped"] or task.get("rolled_back"):
+            return
+        dests = [step["dest"] for step in task["steps"] if step.get("dest")]
+        if dests:
+            await self.client.indices.delete(index=dests, ignore_unavailable=True)
+        await self._unblock_writes()
+        for document in task.get("rollback_documents", []):
+            await self._delete_document(document)
+        task["rolled_back"] = True
+        logger.info(f"Rolled back reindex task {task['id']}")
+
+    async def _delete_document(self, document: dict[str, str]) -> None:
+        try:
+            await self.client.delete(
+                index=document["index"], id=document["id"], refresh=True
+            )
+        except Exception as e:
+            if error_status_code(e) != 404:
+                raise
+
+    async def _swap_aliases(self) -> None:
+        """Apply every alias action of the task in one atomic request."""
+        if self.task["aliases_swapped"] or not self.task["alias_actions"]:
+            return
+        try:
+            await self.client.indices.update_aliases(
+                body={"actions": self.task["alias_actions"]}
+            )
+        except Exception as e:
+            # A previous runner may have crashed right after swapping
+            if error_status_code(e) != 404:
+                raise
+            logger.warning(
+                f"Alias swap of reindex task {self.task['id']} referenced missing indexes; "
+                "assuming it was already applied"
+            )
+        self.task["aliases_swapped"] = True
+        await self._persist()
+
+    async def _submit_step(self, step: dict[str, Any]) -> None:
+        if step.get("action") in (STEP_DELETE_BY_QUERY, STEP_UPDATE_BY_QUERY):
+            body: dict[str, Any] = {"query": step["query"]}
+            by_query = self.client.delete_by_query
+            if step["action"] == STEP_UPDATE_BY_QUERY:
+                body["script"] = step["script"]
+                by_query = self.client.update_by_query
+            # Documents changed while the step runs are skipped, not fatal
+            response = await by_query(
+                index=step["source"],
+                body=body,
+                wait_for_completion=False,
+                slices="auto",
+                requests_per_second=self.task["requests_per_second"],
+                refresh=step.get("refresh", True),
+                conflicts="proceed",
+                ignore_unavailable=True,
+            )
+        else:
+            body = {
+                "source": {"index": step["source"]},
+                "dest": {"index": step["dest"]},
+            }
+            if step.get("script"):
+                body["script"] = step["script"]
+            response = await self.client.reindex(
+                body=body,
+                wait_for_completion=False,
+                slices="auto",
+                requests_per_second=self.task["requests_per_second"],
+                refresh=True,
+            )
+        step["task"] = response["task"]
+        step["status"] = TASK_RUNNING
+        await self._persist()
+
+    async def _run_step(self, step: dict[str, Any], semaphore: asyncio.Semaphore):
+        if step["status"] in (TASK_COMPLETED, TASK_FAILED):
+            return
+        async with semaphore:
+            if step["task"] is None:
+                await self._submit_step(step)
+
+            while True:
+                try:
+                    response = await self.client.tasks.get(task_id=step["task"])
+                except Exception as e:
+                    if error_status_code(e) != 404:
+                        raise
+                    # The cluster lost the task (e.g. node restart): start over
+                    logger.warning(
+                        f"{step.get('action', STEP_REINDEX)} of {step['source']} lost task {step['task']}, resubmitting"
+                    )
+                    await self._submit_step(step)
+                    continue
+
+                if response.get("completed"):
+                    result = response.get("response", {})
+                    step["progress"] = {key: result.get(key) for key in _PROGRESS_KEYS}
+                    error = response.get("error") or result.get("failures")
+                    if error:
+                        step["status"] = TASK_FAILED
+                        step["error"] = error
+                    else:
+                        step["status"] = TASK_COMPLETED
+                    await self._persist()
+                    return
+
+                status = response.get("task", {}).get("status", {})
+                step["progress"] = {key: status.get(key) for key in _PROGRESS_KEYS}
+                await self._persist()
+                await asyncio.sleep(self.poll_interval)
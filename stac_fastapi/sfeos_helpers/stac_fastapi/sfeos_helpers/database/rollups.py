@@ -0,0 +1,757 @@
+"""Per-collection, per-day rollup summaries of items.
+
+The `ROLLUPS_INDEX` system index holds one summary document per collection and
+day of `properties.datetime`, plus one for the items without a datetime. A
+summary stores the item count, the datetime bounds and the buckets of the
+`ROLLUP_FREQUENCY_AGGREGATIONS` and of a coarse centroid geotile grid. Catalog-
+or collection-wide aggregation requests whose only filters are collections and
+a whole-day datetime range are answered from these summaries instead of from
+the items.
+
+Rollups are rebuilt per collection (`refresh_rollups_shared`). Writes to a
+collection increment the `write_seq` of its `meta` document; a rebuild records
+the `write_seq` it started from as `built_seq`, and the rollups of a collection
+are only used while both are equal. `RollupWriteMarker` sends these increments
+for the writes of a process, and keeps the collections it failed to mark, which
+are treated as outdated until an increment succeeds.
+"""
+
+import asyncio
+import logging
+import os
+from copy import deepcopy
+from datetime import datetime, timezone
+from typing import Any, Iterable
+
+from stac_fastapi.core.utilities import get_bool_env
+from stac_fastapi.sfeos_helpers.database.index import (
+    create_system_index_shared,
+    index_alias_by_collection_id,
+)
+from stac_fastapi.sfeos_helpers.database.utils import error_status_code
+from stac_fastapi.sfeos_helpers.mappings import (
+    AGGREGATION_MAPPING,
+    COLLECTIONS_INDEX,
+    ROLLUPS_INDEX,
+)
+
+logger = logging.getLogger(__name__)
+
+DATETIME_FIELD = "properties.datetime"
+ROLLUP_FREQUENCY_AGGREGATIONS = (
+    "platform_frequency",
+    "cloud_cover_frequency",
+    "sun_elevation_frequency",
+    "sun_azimuth_frequency",
+    "off_nadir_frequency",
+)
+GEOTILE_AGGREGATION = "centroid_geotile_grid_frequency"
+ROLLUP_AGGREGATIONS = {
+    "total_count",
+    "datetime_min",
+    "datetime_max",
+    "datetime_frequency",
+    "collection_frequency",
+    GEOTILE_AGGREGATION,
+    *ROLLUP_FREQUENCY_AGGREGATIONS,
+}
+ROLLUP_INTERVALS = {"day", "week", "month", "quarter", "year"}
+# Per-day terms buckets kept in a summary, more than returned by a request
+_ROLLUP_TERMS_SIZE = 1000
+_MAX_BUCKETS = 65536
+_MAX_COLLECTIONS = 10000
+
+_ROLLUPS_MAPPINGS = {
+    "dynamic": False,
+    "properties": {
+        "type": {"type": "keyword"},
+        "collection": {"type": "keyword"},
+        "day": {"type": "date_nanos"},
+        "count": {"type": "long"},
+        "datetime_min": {"type": "date_nanos"},
+        "datetime_max": {"type": "date_nanos"},
+        "buckets": {
+            "type": "nested",
+            "properties": {
+                "agg": {"type": "keyword"},
+                "key": {"type": "keyword"},
+                "count": {"type": "long"},
+            },
+        },
+        "write_seq": {"type": "long"},
+        "built_seq": {"type": "long"},
+        "built_at": {"type": "date"},
+    },
+}
+
+
+def get_rollups_enabled() -> bool:
+    """Get ENABLE_ROLLUPS from env."""
+    return get_bool_env("ENABLE_ROLLUPS", default=False)
+
+
+def get_rollup_geotile_precision() -> int:
+    """Get ROLLUP_GEOTILE_PRECISION (stored centroid geotile zoom) from env."""
+    return int(os.getenv("ROLLUP_GEOTILE_PRECISION", "4"))
+
+
+def get_rollup_refresh_interval() -> float:
+    """Get ROLLUP_REFRESH_INTERVAL (seconds between stale rollup rebuilds) from env."""
+    return float(os.getenv("ROLLUP_REFRESH_INTERVAL", "0"))
+
+
+def _meta_id(collection_id: str) -> str:
+    return f"{collection_id}|_meta"
+
+
+async def create_rollups_index_shared(client: Any) -> None:
+    """Create the rollups index if it does not exist."""
+    await create_system_index_shared(client, ROLLUPS_INDEX, _ROLLUPS_MAPPINGS)
+
+
+def _summary_aggregations(precision: int) -> dict[str, Any]:
+    """Return the aggregations computed for every summary."""
+    aggs: dict[str, Any] = {
+        "datetime_min": {"min": {"field": DATETIME_FIELD}},
+        "datetime_max": {"max": {"field": DATETIME_FIELD}},
+        GEOTILE_AGGREGATION: {
+            "geotile_grid": {
+                "field": AGGREGATION_MAPPING[GEOTILE_AGGREGATION]["geotile_grid"][
+                    "field"
+                ],
+                "precision": precision,
+                "size": _MAX_BUCKETS,
+            }
+        },
+    }
+    for name in ROLLUP_FREQUENCY_AGGREGATIONS:
+        agg = deepcopy(AGGREGATION_MAPPING[name])
+        if "terms" in agg:
+            agg["terms"]["size"] = _ROLLUP_TERMS_SIZE
+        if "histogram" in agg:
+            agg["histogram"]["min_doc_count"] = 1
+        aggs[name] = agg
+    return aggs
+
+
+def _summary(collection_id: str, day: str | None, count: int, aggs: dict) -> dict:
+    """Build a summary document from the aggregations of one day."""
+    buckets = [
+        {"agg": name, "key": str(bucket["key"]), "count": bucket["doc_count"]}
+        for name in (*ROLLUP_FREQUENCY_AGGREGATIONS, GEOTILE_AGGREGATION)
+        for bucket in aggs.get(name, {}).get("buckets", [])
+        if bucket["doc_count"]
+    ]
+    return {
+        "type": "day",
+        "collection": collection_id,
+        "day": day,
+        "count": count,
+        "datetime_min": aggs["datetime_min"].get("value_as_string"),
+        "datetime_max": aggs["datetime_max"].get("value_as_string"),
+        "buckets": buckets,
+    }
+
+
+def _next_month(month_start_ms: int) -> str:
+    start = datetime.fromtimestamp(month_start_ms / 1000, tz=timezone.utc)
+    if start.month == 12:
+        end = start.replace(year=start.year + 1, month=1)
+    else:
+        end = start.replace(month=start.month + 1)
+    return end.isoformat()
+
+
+async def build_rollups_shared(
+    client: Any, collection_id: str, precision: int | None = None
+) -> list[dict[str, Any]]:
+    """Compute the summaries of a collection from its items, one month at a time.
+
+    Args:
+        client: Async Elasticsearch/OpenSearch client.
+        collection_id (str): The collection to summarize.
+        precision (int | None): Stored geotile precision. Defaults to
+            `ROLLUP_GEOTILE_PRECISION`.
+
+    Returns:
+        list[dict[str, Any]]: The summary documents.
+    """
+    precision = get_rollup_geotile_precision() if precision is None else precision
+    index = index_alias_by_collection_id(collection_id)
+    aggs = _summary_aggregations(precision)
+    months = await client.search(
+        index=index,
+        ignore_unavailable=True,
+        body={
+            "size": 0,
+            "aggs": {
+                "months": {
+                    "date_histogram": {
+                        "field": DATETIME_FIELD,
+                        "calendar_interval": "month",
+                        "min_doc_count": 1,
+                    }
+                }
+            },
+        },
+    )
+    summaries = []
+    for month in months.get("aggregations", {}).get("months", {}).get("buckets", []):
+        window = {"gte": month["key"], "lt": _next_month(month["key"])}
+        response = await client.search(
+            index=index,
+            ignore_unavailable=True,
+            body={
+                "size": 0,
+                "query": {"range": {DATETIME_FIELD: window}},
+                "aggs": {
+                    "days": {
+                        "date_histogram": {
+                            "field": DATETIME_FIELD,
+                            "calendar_interval": "day",
+                            "min_doc_count": 1,
+                        },
+                        "aggs": aggs,
+                    }
+                },
+            },
+        )
+        for day in response["aggregations"]["days"]["buckets"]:
+            summaries.append(
+                _summary(collection_id, day["key_as_string"], day["doc_count"], day)
+            )
+
+    undated = await client.search(
+        index=index,
+        ignore_unavailable=True,
+        body={
+            "size": 0,
+            "track_total_hits": True,
+            "query": {"bool": {"must_not": {"exists": {"field": DATETIME_FIELD}}}},
+            "aggs": aggs,
+        },
+    )
+    undated_count = undated["hits"]["total"]["value"]
+    if undated_count:
+        summaries.append(
+            _summary(collection_id, None, undated_count, undated["aggregations"])
+        )
+    return summaries
+
+
+async def get_rollup_write_seq_shared(client: Any, collection_id: str) -> int:
+    """Return the write sequence number of a collection, 0 if it has none.
+
+    The `meta` document is read with a realtime get, as a search may not see
+    the latest increments yet.
+    """
+    try:
+        response = await client.get(index=ROLLUPS_INDEX, id=_meta_id(collection_id))
+    except Exception as e:
+        if error_status_code(e) == 404:
+            return 0
+        raise
+    return response["_source"].get("write_seq", 0)
+
+
+async def refresh_rollups_shared(
+    client: Any, collection_id: str, bulk_helper: Any, precision: int | None = None
+) -> int:
+    """Rebuild the summaries of a collection.
+
+    Args:
+        client: Async Elasticsearch/OpenSearch client.
+        collection_id (str): The collection to summarize.
+        bulk_helper: `helpers.async_bulk` of the backend.
+        precision (int | None): Stored geotile precision.
+
+    Returns:
+        int: The number of summary documents.
+    """
+    await create_rollups_index_shared(client)
+    write_seq = await get_rollup_write_seq_shared(client, collection_id)
+    # Writes counted in write_seq must be searchable before they are summarized
+    await client.indices.refresh(
+        index=index_alias_by_collection_id(collection_id), ignore_unavailable=True
+    )
+    summaries = await build_rollups_shared(client, collection_id, precision)
+    ids = [
+        f"{collection_id}|{s['day'][:10] if s['day'] else 'undated'}" for s in summaries
+    ]
+    if summaries:
+        await bulk_helper(
+            client,
+            [
+                {"_index": ROLLUPS_INDEX, "_id": doc_id, "_source": summary}
+                for doc_id, summary in zip(ids, summaries)
+            ],
+            refresh=True,
+            raise_on_error=True,
+        )
+    # Drop the summaries of days that no longer have items
+    await client.delete_by_query(
+        index=ROLLUPS_INDEX,
+        body={
+            "query": {
+                "bool": {
+                    "filter": [
+                        {"term": {"collection": collection_id}},
+                        {"term": {"type": "day"}},
+                    ],
+                    "must_not": [{"ids": {"values": ids}}],
+                }
+            }
+        },
+        refresh=True,
+        conflicts="proceed",
+    )
+    now = datetime.now(timezone.utc).isoformat()
+    await client.update(
+        index=ROLLUPS_INDEX,
+        id=_meta_id(collection_id),
+        body={
+            "script": {
+                "lang": "painless",
+                "source": "ctx._source.built_seq = params.seq; ctx._source.built_at = params.now;",
+                "params": {"seq": write_seq, "now": now},
+            },
+            "upsert": {
+                "type": "meta",
+                "collection": collection_id,
+                "write_seq": write_seq,
+                "built_seq": write_seq,
+                "built_at": now,
+            },
+        },
+        refresh=True,
+        retry_on_conflict=5,
+    )
+    logger.info(f"Rebuilt {len(summaries)} rollups of collection {collection_id}")
+    return len(summaries)
+
+
+async def mark_rollups_stale_shared(client: Any, collection_ids: list[str]) -> None:
+    """Record writes to collections, so their rollups are not used until rebuilt."""
+    for collection_id in collection_ids:
+        await client.update(
+            index=ROLLUPS_INDEX,
+            id=_meta_id(collection_id),
+            body={
+                "script": {
+                    "lang": "painless",
+                    "source": "ctx._source.write_seq = (ctx._source.write_seq == null ? 0 : ctx._source.write_seq) + 1;",
+                },
+                "upsert": {
+                    "type": "meta",
+                    "collection": collection_id,
+                    "write_seq": 1,
+                    "built_seq": 0,
+                },
+            },
+            retry_on_conflict=5,
+        )
+
+
+class RollupWriteMarker:
+    """Mark the rollups of the collections written by this process outdated.
+
+    Concurrent marks of a collection share increments: at most one increment
+    per collection is in flight, and the next one covers every write made
+    meanwhile, so ingest does not contend on the `meta` document.
+
+    Collections whose increment failed are kept in `pending`. They must be
+    treated as outdated (see `fresh_rollup_collections_shared`) and are retried
+    with the next marks and by `retry_pending`.
+    """
+
+    def __init__(self, client: Any):
+        """Initialize the marker for an async Elasticsearch/OpenSearch client."""
+        self.client = client
+        self.pending: set[str] = set()
+        self._requested: dict[str, int] = {}
+        self._marked: dict[str, int] = {}
+        self._locks: dict[str, asyncio.Lock] = {}
+
+    async def _mark(self, collection_id: str) -> None:
+        requested = self._requested.get(collection_id, 0) + 1
+        self._requested[collection_id] = requested
+        async with self._locks.setdefault(collection_id, asyncio.Lock()):
+            # An increment sent after this mark was requested already covers it
+            if self._marked.get(collection_id, 0) >= requested:
+                return
+            covered = self._requested[collection_id]
+            try:
+                await mark_rollups_stale_shared(self.client, [collection_id])
+            except Exception as e:
+                logger.warning(
+                    f"Could not mark the rollups of {collection_id} outdated, "
+                    f"not using them until it succeeds: {e}"
+                )
+                self.pending.add(collection_id)
+                return
+            self._marked[collection_id] = covered
+            self.pending.discard(collection_id)
+
+    async def mark(self, collection_ids: Iterable[str]) -> None:
+        """Record writes to collections, and retry the pending ones.
+
+        Args:
+            collection_ids (Iterable[str]): The collections that were written to.
+        """
+        collection_ids = dict.fromkeys([*collection_ids, *self.pending])
+        await asyncio.gather(
+            *(self._mark(collection_id) for collection_id in collection_ids)
+        )
+
+    async def retry_pending(self) -> None:
+        """Retry marking the collections whose increment failed."""
+        if self.pending:
+            await self.mark([])
+
+
+async def find_stale_rollups_shared(client: Any, limit: int = 100) -> list[str]:
+    """Return collections whose rollups are outdated."""
+    response = await client.search(
+        index=ROLLUPS_INDEX,
+        ignore_unavailable=True,
+        body={
+            "size": limit,
+            "query": {
+                "bool": {
+                    "filter": [
+                        {"term": {"type": "meta"}},
+                        {
+                            "script": {
+                                "script": "doc['write_seq'].value != doc['built_seq'].value"
+                            }
+                        },
+                    ]
+                }
+            },
+        },
+    )
+    return [hit["_source"]["collection"] for hit in response["hits"]["hits"]]
+
+
+async def list_collection_ids_shared(
+    client: Any, limit: int = _MAX_COLLECTIONS
+) -> list[str]:
+    """Return the ids of the collections of the catalog, without catalogs."""
+    response = await client.search(
+        index=COLLECTIONS_INDEX,
+        body={
+            "size": limit,
+            "_source": False,
+            "query": {"bool": {"must_not": {"term": {"type": "Catalog"}}}},
+        },
+    )
+    return [hit["_id"] for hit in response["hits"]["hits"]]
+
+
+async def fresh_rollup_collections_shared(
+    client: Any, collection_ids: list[str] | None, pending: Iterable[str] = ()
+) -> list[str] | None:
+    """Return the collections to aggregate if all of them have up-to-date rollups.
+
+    Args:
+        client: Async Elasticsearch/OpenSearch client.
+        collection_ids (list[str] | None): The requested collections, or None
+            for every collection of the catalog.
+        pending (Iterable[str]): Collections written to but not marked outdated
+            yet (`RollupWriteMarker.pending`), whose rollups are never used.
+
+    Returns:
+        list[str] | None: The collection ids, or None if a rollup is missing or
+        outdated.
+    """
+    if not collection_ids:
+        collection_ids = await list_collection_ids_shared(client)
+        if len(collection_ids) >= _MAX_COLLECTIONS:
+            return None
+    if not collection_ids or not set(pending).isdisjoint(collection_ids):
+        return None
+    response = await client.search(
+        index=ROLLUPS_INDEX,
+        ignore_unavailable=True,
+        body={
+            "size": len(collection_ids),
+            "query": {"ids": {"values": [_meta_id(c) for c in collection_ids]}},
+        },
+    )
+    fresh = {
+        hit["_source"]["collection"]
+        for hit in response["hits"]["hits"]
+        if hit["_source"].get("built_seq") == hit["_source"].get("write_seq")
+    }
+    return collection_ids if fresh.issuperset(collection_ids) else None
+
+
+def rollup_day_range(datetime_str: str | None) -> tuple[str | None, str | None] | None:
+    """Return the first and last day of a whole-day datetime interval.
+
+    Args:
+        datetime_str (str | None): A `start/end` interval, either bound may be open.
+
+    Returns:
+        tuple[str | None, str | None] | None: `(first_day, last_day)` as dates,
+        `(None, None)` without interval, or None if the interval does not start
+        and end on UTC day boundaries.
+    """
+    if not datetime_str:
+        return None, None
+    if not isinstance(datetime_str, str):
+        return None
+    parts = datetime_str.split("/")
+    if len(parts) != 2:
+        return None
+
+    def _parse(value: str) -> datetime | None:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        if parsed.tzinfo is None:
+            parsed = parsed.replace(tzinfo=timezone.utc)
+        return parsed.astimezone(timezone.utc)
+
+    try:
+        start = _parse(parts[0]) if parts[0] not in ("", "..") else None
+        end = _parse(parts[1]) if parts[1] not in ("", "..") else None
+    except ValueError:
+        return None
+    if start is not None and start.time() != datetime.min.time():
+        return None
+    if end is not None and not (
+        end.hour == 23
+        and end.minute == 59
+        and end.second == 59
+        and end.microsecond >= 999000
+    ):
+        return None
+    return (
+        start.date().isoformat() if start else None,
+        end.date().isoformat() if end else None,
+    )
+
+
+def rollup_request_supported(
+    aggregations: list[str],
+    aggregation_mapping: dict[str, dict[str, Any]],
+    interval: str,
+    geotile_precision: int,
+) -> bool:
+    """Return whether rollups can answer the requested aggregations.
+
+    Args:
+        aggregations (list[str]): The requested aggregation names.
+        aggregation_mapping (dict[str, dict[str, Any]]): The aggregation definitions.
+        interval (str): The `datetime_frequency` calendar interval.
+        geotile_precision (int): The requested centroid geotile precision.
+
+    Returns:
+        bool: True if every aggregation is available at rollup granularity.
+    """
+    for name in aggregations:
+        if name not in ROLLUP_AGGREGATIONS:
+            return False
+        if name in ROLLUP_FREQUENCY_AGGREGATIONS and aggregation_mapping.get(
+            name
+        ) != AGGREGATION_MAPPING.get(name):
+            return False
+    if "datetime_frequency" in aggregations and interval not in ROLLUP_INTERVALS:
+        return False
+    if (
+        GEOTILE_AGGREGATION in aggregations
+        and geotile_precision > get_rollup_geotile_precision()
+    ):
+        return False
+    return True
+
+
+def _format_number(value: float | None) -> str:
+    return "*" if value is None else str(float(value))
+
+
+def _terms_buckets(counts: dict[str, int], size: int) -> dict[str, Any]:
+    ordered = sorted(counts.items(), key=lambda kv: (-kv[1], kv[0]))
+    buckets = [{"key": key, "doc_count": count} for key, count in ordered[:size]]
+    return {
+        "buckets": buckets,
+        "sum_other_doc_count": sum(count for _, count in ordered[size:]),
+    }
+
+
+def _range_buckets(counts: dict[str, int], definition: dict) -> dict[str, Any]:
+    buckets = []
+    for bounds in definition["ranges"]:
+        key = f"{_format_number(bounds.get('from'))}-{_format_number(bounds.get('to'))}"
+        bucket: dict[str, Any] = {"key": key, "doc_count": counts.get(key, 0)}
+        if "from" in bounds:
+            bucket["from"] = float(bounds["from"])
+        if "to" in bounds:
+            bucket["to"] = float(bounds["to"])
+        buckets.append(bucket)
+    return {"buckets": buckets}
+
+
+def _histogram_buckets(counts: dict[str, int], interval: float) -> dict[str, Any]:
+    if not counts:
+        return {"buckets": []}
+    by_key = {float(key): count for key, count in counts.items()}
+    key, last = min(by_key), max(by_key)
+    buckets = []
+    while key <= last:
+        buckets.append({"key": key, "doc_count": by_key.get(key, 0)})
+        key += interval
+    return {"buckets": buckets}
+
+
+def _geotile_buckets(counts: dict[str, int], precision: int) -> dict[str, Any]:
+    merged: dict[str, int] = {}
+    for key, count in counts.items():
+        zoom, x, y = (int(part) for part in key.split("/"))
+        shift = zoom - precision
+        parent = f"{precision}/{x >> shift}/{y >> shift}"
+        merged[parent] = merged.get(parent, 0) + count
+    ordered = sorted(merged.items(), key=lambda kv: (-kv[1], kv[0]))
+    return {"buckets": [{"key": k, "doc_count": c} for k, c in ordered[:10000]]}
+
+
+async def aggregate_rollups_shared(
+    client: Any,
+    collection_ids: list[str],
+    aggregations: list[str],
+    day_range: tuple[str | None, str | None],
+    interval: str,
+    geotile_precision: int,
+) -> dict[str, Any] | None:
+    """Answer aggregations from the rollups of collections.
+
+    Args:
+        client: Async Elasticsearch/OpenSearch client.
+        collection_ids (list[str]): Collections with up-to-date rollups.
+        aggregations (list[str]): The requested aggregation names.
+        day_range (tuple[str | None, str | None]): First and last day, or open bounds.
+        interval (str): The `datetime_frequency` calendar interval.
+        geotile_precision (int): The requested centroid geotile precision.
+
+    Returns:
+        dict[str, Any] | None: A search response with the same `aggregations`
+        structure as the items aggregation, or None if items without a datetime
+        prevent answering a datetime-filtered request.
+    """
+    first_day, last_day = day_range
+    day_filter: dict[str, Any] = {"match_all": {}}
+    if first_day or last_day:
+        bounds = {}
+        if first_day:
+            bounds["gte"] = first_day
+        if last_day:
+            bounds["lte"] = last_day
+        day_filter = {"range": {"day": bounds}}
+    response = await client.search(
+        index=ROLLUPS_INDEX,
+        body={
+            "size": 0,
+            "query": {
+                "bool": {
+                    "filter": [
+                        {"terms": {"collection": collection_ids}},
+                        {"term": {"type": "day"}},
+                    ]
+                }
+            },
+            "aggs": {
+                "undated": {"missing": {"field": "day"}},
+                "selected": {
+                    "filter": day_filter,
+                    "aggs": {
+                        "count": {"sum": {"field": "count"}},
+                        "datetime_min": {"min": {"field": "datetime_min"}},
+                        "datetime_max": {"max": {"field": "datetime_max"}},
+                        "datetime_frequency": {
+                            "date_histogram": {
+                                "field": "day",
+                                "calendar_interval": interval,
+                            },
+                            "aggs": {"count": {"sum": {"field": "count"}}},
+                        },
+                        "collection_frequency": {
+                            "terms": {"field": "collection", "size": _MAX_BUCKETS},
+                            "aggs": {"count": {"sum": {"field": "count"}}},
+                        },
+                        "buckets": {
+                            "nested": {"path": "buckets"},
+                            "aggs": {
+                                "by_agg": {
+                                    "terms": {"field": "buckets.agg", "size": 100},
+                                    "aggs": {
+                                        "by_key": {
+                                            "terms": {
+                                                "field": "buckets.key",
+                                                "size": _MAX_BUCKETS,
+                                            },
+                                            "aggs": {
+                                                "count": {
+                                                    "sum": {"field": "buckets.count"}
+                                                }
+                                            },
+                                        }
+                                    },
+                                }
+                            },
+                        },
+                    },
+                },
+            },
+        },
+    )
+    response = getattr(response, "body", response)
+    aggs = response["aggregations"]
+    if (first_day or last_day) and aggs["undated"]["doc_count"]:
+        return None
+    selected = aggs["selected"]
+    counts: dict[str, dict[str, int]] = {
+        agg["key"]: {
+            key["key"]: int(key["count"]["value"]) for key in agg["by_key"]["buckets"]
+        }
+        for agg in selected["buckets"]["by_agg"]["buckets"]
+    }
+    total = int(selected["count"]["value"])
+
+    result: dict[str, Any] = {}
+    for name in aggregations:
+        definition = AGGREGATION_MAPPING.get(name, {})
+        if name == "total_count":
+            result[name] = {"value": total}
+        elif name in ("datetime_min", "datetime_max"):
+            result[name] = selected[name]
+        elif name == "datetime_frequency":
+            result[name] = {
+                "buckets": [
+                    {
+                        "key": bucket["key"],
+                        "key_as_string": bucket.get("key_as_string"),
+                        "doc_count": int(bucket["count"]["value"]),
+                    }
+                    for bucket in selected[name]["buckets"]
+                ]
+            }
+        elif name == "collection_frequency":
+            result[name] = _terms_buckets(
+                {
+                    bucket["key"]: int(bucket["count"]["value"])
+                    for bucket in selected[name]["buckets"]
+                },
+                definition["terms"]["size"],
+            )
+        elif name == GEOTILE_AGGREGATION:
+            result[name] = _geotile_buckets(counts.get(name, {}), geotile_precision)
+        elif "terms" in definition:
+            result[name] = _terms_buckets(
+                counts.get(name, {}), definition["terms"]["size"]
+            )
+        elif "range" in definition:
+            result[name] = _range_buckets(counts.get(name, {}), definition["range"])
+        elif "histogram" in definition:
+            result[name] = _histogram_buckets(
+                counts.get(name, {}), definition["histogram"]["interval"]
+            )
+    return {"hits": {"total": {"value": total}}, "aggregations": result}
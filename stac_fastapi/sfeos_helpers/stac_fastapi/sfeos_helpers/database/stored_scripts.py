@@ -0,0 +1,164 @@
+"""Stored painless scripts for patch operations.
+
+`operations_to_script` generates sources that depend only on the shape of the
+patch operations, with every field name and value passed as `params`. This
+module stores those sources as cluster scripts (`PUT _scripts/<id>`) and keeps
+a local cache from script source to stored script id, so update requests only
+send the id and the params and the cluster compiles each shape once. The
+shapes of the most common patches are stored at startup.
+"""
+
+import hashlib
+import logging
+import os
+from typing import Any
+
+from stac_fastapi.extensions.transaction.request import (
+    PatchAddReplaceTest,
+    PatchOperation,
+    PatchRemove,
+)
+from stac_fastapi.sfeos_helpers.database.utils import (
+    error_status_code,
+    get_bool_env,
+    operations_to_script,
+)
+
+logger = logging.getLogger(__name__)
+
+STORED_SCRIPT_PREFIX = "sfeos-patch-"
+
+
+def _common_patch_shapes() -> list[tuple[list[PatchOperation], bool, bool]]:
+    """Return sample patches, as (operations, create_nest, drop_content_hash).
+
+    Field names and values are placeholders: only the shape matters.
+    """
+    top = "/field"
+    nested = "/properties/field"
+    shapes: list[tuple[list[PatchOperation], bool, bool]] = []
+    for drop_content_hash in (False, True):
+        for create_nest, op in ((True, "add"), (False, "add"), (False, "replace")):
+            for path in (top, nested):
+                shapes.append(
+                    (
+                        [PatchAddReplaceTest(op=op, path=path, value=None)],
+                        create_nest,
+                        drop_content_hash,
+                    )
+                )
+        for path in (top, nested):
+            shapes.append(
+                ([PatchRemove(op="remove", path=path)], False, drop_content_hash)
+            )
+    return shapes
+
+
+def get_stored_patch_scripts_enabled() -> bool:
+    """Get ENABLE_STORED_PATCH_SCRIPTS from env."""
+    return get_bool_env("ENABLE_STORED_PATCH_SCRIPTS", default=True)
+
+
+def get_stored_patch_scripts_max() -> int:
+    """Get STORED_PATCH_SCRIPTS_MAX (distinct patch shapes stored) from env."""
+    return int(os.getenv("STORED_PATCH_SCRIPTS_MAX", "256"))
+
+
+def stored_script_id(source: str) -> str:
+    """Return the deterministic stored script id of a script source."""
+    digest = hashlib.sha1(source.encode(), usedforsecurity=False).hexdigest()
+    return f"{STORED_SCRIPT_PREFIX}{digest[:20]}"
+
+
+def _is_rejection(error: Exception) -> bool:
+    """Return whether the cluster refuses to store scripts, as opposed to failing."""
+    return error_status_code(error) in (400, 403) or (
+        "cannot execute [stored] scripts" in str(error)
+    )
+
+
+class StoredScripts:
+    """Turn inline patch scripts into references to stored scripts.
+
+    Scripts whose shape is not stored yet are stored on first use, up to
+    `max_scripts` shapes. Scripts are sent inline once the limit is reached,
+    and from then on if the cluster rejects storing them (e.g. stored scripts
+    are disabled). Other errors, e.g. timeouts, only send that script inline.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        enabled: bool | None = None,
+        max_scripts: int | None = None,
+    ):
+        """Initialize the cache for an async Elasticsearch/OpenSearch client."""
+        self.client = client
+        self.enabled = (
+            get_stored_patch_scripts_enabled() if enabled is None else enabled
+        )
+        self.max_scripts = (
+            get_stored_patch_scripts_max() if max_scripts is None else max_scripts
+        )
+        self._ids: dict[str, str] = {}
+
+    async def _store(self, source: str) -> str | None:
+        script_id = stored_script_id(source)
+        try:
+            await self.client.put_script(
+                id=script_id, body={"script": {"lang": "painless", "source": source}}
+            )
+        except Exception as e:
+            if _is_rejection(e):
+                logger.warning(
+                    f"Patch scripts cannot be stored, sending scripts inline: {e}"
+                )
+                self.enabled = False
+            else:
+                logger.warning(
+                    f"Could not store patch script {script_id}, sending it inline: {e}"
+                )
+            return None
+        self._ids[source] = script_id
+        return script_id
+
+    async def register_common(self) -> list[str]:
+        """Store the scripts of the most common patch shapes.
+
+        Returns:
+            list[str]: The ids of the stored scripts.
+        """
+        if not self.enabled:
+            return []
+        stored = []
+        for operations, create_nest, drop_content_hash in _common_patch_shapes():
+            source = operations_to_script(
+                operations, create_nest=create_nest, drop_content_hash=drop_content_hash
+            )["source"]
+            if source in self._ids:
+                continue
+            script_id = await self._store(source)
+            if script_id is None:
+                break
+            stored.append(script_id)
+        logger.info(f"Stored {len(stored)} patch scripts")
+        return stored
+
+    async def resolve(self, script: dict[str, Any]) -> dict[str, Any]:
+        """Return a stored script reference for an inline script, if possible.
+
+        Args:
+            script (dict[str, Any]): Inline script as built by `operations_to_script`.
+
+        Returns:
+            dict[str, Any]: `{"id", "params"}` of the stored script, or the inline script.
+        """
+        source = script["source"]
+        script_id = self._ids.get(source)
+        if script_id is None:
+            if not self.enabled or len(self._ids) >= self.max_scripts:
+                return script
+            script_id = await self._store(source)
+            if script_id is None:
+                return script
+        return {"id": script_id, "params": script["params"]}
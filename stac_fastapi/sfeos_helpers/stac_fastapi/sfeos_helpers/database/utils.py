@@ -9,8 +9,11 @@ import os
 from functools import wraps
 from typing import Any, Callable
 
+from fastapi import HTTPException
+
 from stac_fastapi.core.utilities import bbox2polygon, get_bool_env
 from stac_fastapi.extensions.transaction.request import (
+    PartialItem,
     PatchAddReplaceTest,
     PatchOperation,
     PatchRemove,
@@ -64,6 +67,14 @@ DATETIME_RETRY_STRATEGY = AsyncRetrying(
 )
 
 
+def error_status_code(error: Exception) -> int | None:
+    """Return the HTTP status of an Elasticsearch/OpenSearch client error."""
+    status = getattr(error, "status_code", None)
+    if isinstance(status, int):
+        return status
+    return getattr(getattr(error, "meta", None), "status", None)
+
+
 def separate_bulk_conflict_errors(
     errors: list[dict[str, Any]],
 ) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
@@ -102,6 +113,49 @@ class ItemAlreadyExistsError(ConflictError):
         super().__init__(message)
 
 
+# Set on a collection document while its items are moved to a new collection id
+COLLECTION_MOVING_FIELD = "moving_to"
+
+
+class CollectionMovingError(ConflictError):
+    """Error raised when writing items of a collection whose id is being changed.
+
+    Attributes:
+        collection_id: The ID of the collection being moved.
+    """
+
+    def __init__(self, collection_id: str):
+        """Initialize the error with the collection ID."""
+        self.collection_id = collection_id
+        message = (
+            f"Collection {collection_id} is being moved to a new id, "
+            "its items cannot be written until the move finished"
+        )
+        super().__init__(message)
+
+
+def is_write_block_error(error: Exception | dict[str, Any]) -> bool:
+    """Return whether a client error or a bulk item error hit an index write block.
+
+    Args:
+        error: An Elasticsearch/OpenSearch client error, an error dict from
+            ES/OS bulk helpers or a failure of a by-query request.
+
+    Returns:
+        bool: True if the write was rejected by `index.blocks.write`.
+    """
+    if isinstance(error, dict):
+        # Bulk errors are keyed by op type, by-query failures are not
+        details = error if "status" in error else next(iter(error.values()), {})
+        if not isinstance(details, dict):
+            return False
+        cause = details.get("error") or details.get("cause") or {}
+        return (
+            isinstance(cause, dict) and cause.get("type") == "cluster_block_exception"
+        )
+    return error_status_code(error) == 403 and "cluster_block_exception" in str(error)
+
+
 class BulkIndexError(Exception):
     """Error raised when non-conflict errors occur during a bulk indexing operation.
 
@@ -346,154 +400,177 @@ def merge_to_operations(data: dict) -> list:
     return operations
 
 
+class ScriptPath:
+    """A JSON pointer whose parts are passed to a painless script as params.
+
+    Only the structure of the path (its depth and whether its last part is an
+    array index) is visible in the script source; the field names themselves
+    are read from `params`, so patches of different fields share one script.
+
+    Args:
+        pointer (str): JSON pointer, e.g. "/properties/eo:cloud_cover".
+        name (str): Prefix of the params holding the parts of this path.
+        params (dict): Script params, updated in place.
+    """
+
+    def __init__(self, pointer: str, name: str, params: dict):
+        """Register the path parts as params and build the painless expressions."""
+        path = ElasticPath(path=pointer)
+        self.key = path.key
+        self.levels: list[tuple[str, str]] = []
+        nest = ""
+        for index, part in enumerate(path.parts):
+            params[f"{name}_{index}"] = part
+            self.levels.append((nest, f"params.{name}_{index}"))
+            nest += f"[params.{name}_{index}]"
+        self.es_nest = nest
+
+        params[f"{name}_path"] = path.path
+        self.message = f"params.{name}_path"
+
+        self.key_param = f"params.{name}_k"
+        if isinstance(path.key, int):
+            params[f"{name}_k"] = abs(path.key)
+            params[f"{name}_s"] = str(path.key)
+            self.es_key = (
+                f"ctx._source{nest}.size() - params.{name}_k"
+                if path.key < 0
+                else f"params.{name}_k"
+            )
+            # Key used when the container turns out to be a map
+            self.map_key = f"params.{name}_s"
+        else:
+            params[f"{name}_k"] = path.key
+            self.es_key = f"params.{name}_k"
+            self.map_key = self.es_key
+        self.es_path = f"{nest}[{self.es_key}]"
+
+
 def check_commands(
     commands: ESCommandSet,
     op: str,
-    path: ElasticPath,
+    path: ScriptPath,
     from_path: bool = False,
     create_nest: bool = False,
 ) -> None:
     """Add Elasticsearch checks to operation.
 
     Args:
-        commands (List[str]): current commands
+        commands (ESCommandSet): current commands
         op (str): the operation of script
-        path (Dict): path of variable to run operation on
+        path (ScriptPath): path of variable to run operation on
         from_path (bool): True if path is a from path
-
+        create_nest (bool): Create missing parent objects instead of failing
     """
-    if path.nest:
-        part_nest = ""
-        for index, path_part in enumerate(path.parts):
-
+    for container, part in path.levels:
+        if create_nest and not from_path:
             # Create nested dictionaries if not present for merge operations
-            if create_nest and not from_path:
-                value = "[:]"
-                for sub_part in reversed(path.parts[index + 1 :]):
-                    value = f"['{sub_part}': {value}]"
-
-                commands.add(
-                    f"if (!ctx._source{part_nest}.containsKey('{path_part}'))"
-                    f"{{ctx._source{part_nest}['{path_part}'] = {value};}}"
-                    f"{'' if index == len(path.parts) - 1 else' else '}"  # noqa: E275
-                )
-
-            else:
-                commands.add(
-                    f"if (!ctx._source{part_nest}.containsKey('{path_part}'))"
-                    f"{{Debug.explain('{path_part} in {path.path} does not exist');}}"
-                )
-
-            part_nest += f"['{path_part}']"
+            commands.add(
+                f"if (!ctx._source{container}.containsKey({part}))"
+                f"{{ctx._source{container}[{part}] = [:];}}"
+            )
+        else:
+            commands.add(
+                f"if (!ctx._source{container}.containsKey({part}))"
+                f"{{Debug.explain({part} + ' in ' + {path.message} + ' does not exist');}}"
+            )
 
     if from_path or op in ["remove", "replace", "test"]:
-
         if isinstance(path.key, int):
             commands.add(
                 f"if ((ctx._source{path.es_nest} instanceof ArrayList"
-                f" && ctx._source{path.es_nest}.size() < {abs(path.key)})"
+                f" && ctx._source{path.es_nest}.size() < {path.key_param})"
                 f" || (!(ctx._source{path.es_nest} instanceof ArrayList)"
-                f" && !ctx._source{path.es_nest}.containsKey('{path.key}')))"
-                f"{{Debug.explain('{path.key} does not exist in {path.nest}');}}"  # noqa: E713
+                f" && !ctx._source{path.es_nest}.containsKey({path.map_key})))"
+                f"{{Debug.explain({path.message} + ' does not exist');}}"
             )
         else:
             commands.add(
-                f"if (!ctx._source{path.es_nest}.containsKey('{path.key}'))"
-                f"{{Debug.explain('{path.key} does not exist in {path.nest}');}}"  # noqa: E713
+                f"if (!ctx._source{path.es_nest}.containsKey({path.es_key}))"
+                f"{{Debug.explain({path.message} + ' does not exist');}}"
             )
 
 
-def remove_commands(commands: ESCommandSet, path: ElasticPath) -> None:
+def remove_commands(commands: ESCommandSet, path: ScriptPath, variable: str) -> None:
     """Remove value at path.
 
     Args:
-        commands (List[str]): current commands
-        path (ElasticPath): Path to value to be removed
-
+        commands (ESCommandSet): current commands
+        path (ScriptPath): Path to value to be removed
+        variable (str): Name of the variable holding the removed value
     """
-    commands.add(f"def {path.variable_name};")
+    commands.add(f"def {variable};")
     if isinstance(path.key, int):
         commands.add(
             f"if (ctx._source{path.es_nest} instanceof ArrayList)"
-            f"{{{path.variable_name} = ctx._source{path.es_nest}.remove({path.es_key});}} else "
+            f"{{{variable} = ctx._source{path.es_nest}.remove({path.es_key});}} else "
         )
 
-    commands.add(
-        f"{path.variable_name} = ctx._source{path.es_nest}.remove('{path.key}');"
-    )
+    commands.add(f"{variable} = ctx._source{path.es_nest}.remove({path.map_key});")
 
 
 def add_commands(
     commands: ESCommandSet,
     operation: PatchOperation,
-    path: ElasticPath,
-    from_path: ElasticPath,
-    params: dict,
+    path: ScriptPath,
+    value: str,
 ) -> None:
     """Add value at path.
 
     Args:
-        commands (List[str]): current commands
+        commands (ESCommandSet): current commands
         operation (PatchOperation): operation to run
-        path (ElasticPath): path for value to be added
-
+        path (ScriptPath): path for value to be added
+        value (str): painless expression of the value
     """
-    if from_path is not None:
-        value = (
-            from_path.variable_name
-            if operation.op == "move"
-            else f"ctx._source{from_path.es_path}"
-        )
-
-    else:
-        value = f"params.{path.param_key}"
-        params[path.param_key] = operation.value
-
     if isinstance(path.key, int):
         commands.add(
             f"if (ctx._source{path.es_nest} instanceof ArrayList)"
             f"{{ctx._source{path.es_nest}.{'add' if operation.op in ['add', 'move'] else 'set'}({path.es_key}, {value});}}"
-            f" else ctx._source{path.es_nest}['{path.es_key}'] = {value};"
+            f" else ctx._source{path.es_nest}[{path.map_key}] = {value};"
         )
 
     else:
         commands.add(f"ctx._source{path.es_path} = {value};")
 
 
-def test_commands(
-    commands: ESCommandSet, operation: PatchOperation, path: ElasticPath, params: dict
-) -> None:
+def test_commands(commands: ESCommandSet, path: ScriptPath, value: str) -> None:
     """Test value at path.
 
     Args:
-        commands (List[str]): current commands
-        operation (PatchOperation): operation to run
-        path (ElasticPath): path for value to be tested
+        commands (ESCommandSet): current commands
+        path (ScriptPath): path for value to be tested
+        value (str): painless expression of the expected value
     """
-    value = f"params.{path.param_key}"
-    params[path.param_key] = operation.value
-
+    failure = (
+        f"{{Debug.explain('Test failed `' + {path.message}"
+        f" + '` != ' + ctx._source{path.es_path});}}"
+    )
     if isinstance(path.key, int):
         commands.add(
             f"if (ctx._source{path.es_nest} instanceof ArrayList)"
-            f"{{if (ctx._source{path.es_nest}[{path.es_key}] != {value})"
-            f"{{Debug.explain('Test failed `{path.path}`"
-            f" != ' + ctx._source{path.es_path});}}"
+            f"{{if (ctx._source{path.es_nest}[{path.es_key}] != {value}){failure}"
             f"}} else "
         )
 
-    commands.add(
-        f"if (ctx._source{path.es_path} != {value})"
-        f"{{Debug.explain('Test failed `{path.path}`"
-        f" != ' + ctx._source{path.es_path});}}"
-    )
+    commands.add(f"if (ctx._source{path.es_path} != {value}){failure}")
 
 
-def operations_to_script(operations: list, create_nest: bool = False) -> dict:
+def operations_to_script(
+    operations: list, create_nest: bool = False, drop_content_hash: bool = False
+) -> dict:
     """Convert list of operation to painless script.
 
+    The script source only depends on the shape of the operations (their
+    types, path depths and array indexes); field names and values are passed
+    as `params`. Patches of the same shape therefore share one compiled script,
+    which also makes them suitable for stored scripts (see `StoredScripts`).
+
     Args:
         operations: List of RF6902 operations.
+        create_nest: Create missing parent objects (merge patches).
+        drop_content_hash: Also remove the item `content_hash`, which no longer
+            matches the patched document.
 
     Returns:
         dict: elasticsearch update script.
@@ -501,10 +578,13 @@ def operations_to_script(operations: list, create_nest: bool = False) -> dict:
     commands: ESCommandSet = ESCommandSet()
     params: dict = {}
 
-    for operation in operations:
-        path = ElasticPath(path=operation.path)
+    for index, operation in enumerate(operations):
+        name = f"op{index}"
+        path = ScriptPath(operation.path, name, params)
         from_path = (
-            ElasticPath(path=operation.from_) if hasattr(operation, "from_") else None
+            ScriptPath(operation.from_, f"{name}_from", params)
+            if hasattr(operation, "from_")
+            else None
         )
 
         check_commands(
@@ -519,23 +599,27 @@ def operations_to_script(operations: list, create_nest: bool = False) -> dict:
                 create_nest=create_nest,
             )
 
+        variable = f"{name}_removed"
         if operation.op in ["remove", "move"]:
             remove_path = from_path if from_path else path
-            remove_commands(commands=commands, path=remove_path)
+            remove_commands(commands=commands, path=remove_path, variable=variable)
 
         if operation.op in ["add", "replace", "copy", "move"]:
-            add_commands(
-                commands=commands,
-                operation=operation,
-                path=path,
-                from_path=from_path,
-                params=params,
-            )
+            if operation.op == "move":
+                value = variable
+            elif from_path is not None:
+                value = f"ctx._source{from_path.es_path}"
+            else:
+                value = f"params.{name}_value"
+                params[f"{name}_value"] = operation.value
+            add_commands(commands=commands, operation=operation, path=path, value=value)
 
         if operation.op == "test":
-            test_commands(
-                commands=commands, operation=operation, path=path, params=params
-            )
+            params[f"{name}_value"] = operation.value
+            test_commands(commands=commands, path=path, value=f"params.{name}_value")
+
+    if drop_content_hash:
+        commands.add("ctx._source.remove('content_hash');")
 
     source = "".join(commands)
 
@@ -546,6 +630,55 @@ def operations_to_script(operations: list, create_nest: bool = False) -> dict:
     }
 
 
+def bulk_patch_to_script(
+    patch: PartialItem | list[PatchOperation],
+    validator: Callable[[str], None],
+) -> dict:
+    """Compile a patch applied to many items into one parameterized script.
+
+    All values are passed as script params, so the script source is the same for
+    every item and is compiled once by the cluster. Patches that would move
+    items to another document id or index are rejected: `id` and `collection`
+    cannot be changed, and fields refused by `validator` (e.g. the datetime that
+    selects a datetime index) cannot be touched. The script also drops the
+    stored `content_hash`, which no longer matches the patched document.
+
+    Args:
+        patch: A merge patch (RFC 7396) or a list of RFC 6902 operations.
+        validator: Raises for field paths (e.g. "properties/datetime") that
+            cannot be updated in place.
+
+    Returns:
+        dict: elasticsearch update script.
+
+    Raises:
+        HTTPException: If the patch changes `id`, `collection` or a protected field.
+    """
+    if isinstance(patch, list):
+        operations, create_nest = patch, False
+    else:
+        operations, create_nest = merge_to_operations(patch.model_dump()), True
+
+    for operation in operations:
+        if operation.op == "test":
+            continue
+        paths = [operation.path]
+        if operation.op == "move":
+            paths.append(operation.from_)
+        for path in paths:
+            field_path = path.strip("/")
+            if field_path in ("id", "collection"):
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Bulk patches cannot change `{field_path}`",
+                )
+            validator(field_path)
+
+    return operations_to_script(
+        operations, create_nest=create_nest, drop_content_hash=True
+    )
+
+
 def sentry_initialize(
     dsn: str,
     environment: str = "production",
@@ -12,12 +12,13 @@ from fastapi import Request
 from stac_fastapi.core.base_database_logic import BaseDatabaseLogic
 from stac_fastapi.core.base_settings import ApiBaseSettings
 from stac_fastapi.core.extensions.filter import ALL_QUERYABLES, DEFAULT_QUERYABLES
-from stac_fastapi.core.queryables import merge_queryables
+from stac_fastapi.core.queryables import merge_queryables, queryables_schema_version
 from stac_fastapi.extensions.filter.client import AsyncBaseFiltersClient
 from stac_fastapi.sfeos_helpers.mappings import ES_MAPPING_TYPE_TO_JSON
 
 _GLOBAL_QUERYABLES_CACHE: dict[str, Any] | None = None
 _GLOBAL_QUERYABLES_LAST_UPDATED: float = 0.0
+_GLOBAL_QUERYABLES_VERSION: tuple[int, int | None] | None = None
 
 
 @attr.s
@@ -132,10 +133,16 @@ class EsAsyncBaseFiltersClient(AsyncBaseFiltersClient):
             root_queryables_union = self.settings.root_queryables_union
             if root_queryables_union:
                 global _GLOBAL_QUERYABLES_CACHE, _GLOBAL_QUERYABLES_LAST_UPDATED
+                global _GLOBAL_QUERYABLES_VERSION
 
+                # The version is read first: a schema-changing write during the
+                # rebuild makes the cached union outdated instead of being missed
+                version = await queryables_schema_version.get()
                 cache_ttl = getattr(self.settings, "queryables_cache_ttl", 1800)
-                if _GLOBAL_QUERYABLES_CACHE and (
-                    time.time() - _GLOBAL_QUERYABLES_LAST_UPDATED < cache_ttl
+                if (
+                    _GLOBAL_QUERYABLES_CACHE
+                    and _GLOBAL_QUERYABLES_VERSION == version
+                    and time.time() - _GLOBAL_QUERYABLES_LAST_UPDATED < cache_ttl
                 ):
                     return _GLOBAL_QUERYABLES_CACHE
 
@@ -146,12 +153,25 @@ class EsAsyncBaseFiltersClient(AsyncBaseFiltersClient):
 
                 _GLOBAL_QUERYABLES_CACHE = merged_queryables
                 _GLOBAL_QUERYABLES_LAST_UPDATED = time.time()
+                _GLOBAL_QUERYABLES_VERSION = version
 
                 return merged_queryables
 
             return queryables
 
-        properties = queryables["properties"].copy()
+        stored = await self.database.get_stored_queryables(collection_id)
+        if stored is not None:
+            queryables.update(
+                {
+                    "properties": stored["queryables"],
+                    "additionalProperties": False,
+                }
+            )
+            return queryables
+
+        mapping_data = await self.database.get_items_mapping(collection_id)
+        mapping_properties = next(iter(mapping_data.values()))["mappings"]["properties"]
+        properties, enum_fields = self.queryables_from_mapping(mapping_properties)
         queryables.update(
             {
                 "properties": properties,
@@ -159,8 +179,29 @@ class EsAsyncBaseFiltersClient(AsyncBaseFiltersClient):
             }
         )
 
-        mapping_data = await self.database.get_items_mapping(collection_id)
-        mapping_properties = next(iter(mapping_data.values()))["mappings"]["properties"]
+        if enum_fields:
+            unique_values = await self.database.get_items_unique_values(
+                collection_id, enum_fields
+            )
+            for field_fqn, values in unique_values.items():
+                enum_fields[field_fqn]["enum"] = values
+
+        return queryables
+
+    def queryables_from_mapping(
+        self, mapping_properties: dict[str, Any]
+    ) -> tuple[dict[str, Any], dict[str, dict[str, Any]]]:
+        """Build the queryable properties of an items index mapping.
+
+        Args:
+            mapping_properties (dict[str, Any]): The `properties` of the mapping.
+
+        Returns:
+            tuple[dict[str, Any], dict[str, dict[str, Any]]]: The queryable
+                properties, and the properties whose `enum` must be filled with
+                the unique values of the field, by field path.
+        """
+        properties = DEFAULT_QUERYABLES.copy()
         stack: deque[tuple[str, dict[str, Any]]] = deque(mapping_properties.items())
         enum_fields: dict[str, dict[str, Any]] = {}
         excluded_fields = self._get_excluded_from_queryables()
@@ -205,11 +246,4 @@ class EsAsyncBaseFiltersClient(AsyncBaseFiltersClient):
             if field_result.pop("$enum", False):
                 enum_fields[field_fqn] = field_result
 
-        if enum_fields:
-            unique_values = await self.database.get_items_unique_values(
-                collection_id, enum_fields
-            )
-            for field_fqn, values in unique_values.items():
-                enum_fields[field_fqn]["enum"] = values
-
-        return queryables
+        return properties, enum_fields
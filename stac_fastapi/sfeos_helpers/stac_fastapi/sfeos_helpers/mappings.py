@@ -272,6 +272,12 @@ class Geometry(Protocol):  # noqa
 
 COLLECTIONS_INDEX = os.getenv("STAC_COLLECTIONS_INDEX", "collections")
 ITEMS_INDEX_PREFIX = os.getenv("STAC_ITEMS_INDEX_PREFIX", "items_")
+BULK_LOAD_SESSIONS_INDEX = os.getenv(
+    "STAC_BULK_LOAD_SESSIONS_INDEX", "stac_bulk_load_sessions"
+)
+TASKS_INDEX = os.getenv("STAC_TASKS_INDEX", "stac_tasks")
+ROLLUPS_INDEX = os.getenv("STAC_ROLLUPS_INDEX", "stac_rollups")
+QUERYABLES_INDEX = os.getenv("STAC_QUERYABLES_INDEX", "stac_queryables")
 
 ES_INDEX_NAME_UNSUPPORTED_CHARS = {
     "\\",
@@ -380,6 +386,7 @@ _BASE_ITEMS_MAPPINGS = {
     "properties": {
         "id": {"type": "keyword"},
         "collection": {"type": "keyword"},
+        "content_hash": {"type": "keyword", "index": False},
         "geometry": {"type": "geo_shape"},
         "assets": {"type": "object", "enabled": get_bool_env("STAC_INDEX_ASSETS")},
         "links": {"type": "object", "enabled": False},
@@ -409,6 +416,7 @@ _BASE_ES_COLLECTIONS_MAPPINGS = {
     "properties": {
         "id": {"type": "keyword"},
         "parent_ids": {"type": "keyword"},
+        "ancestor_ids": {"type": "keyword"},
         "bbox_shape": {"type": "geo_shape"},
         "extent.temporal.interval": {
             "type": "date",
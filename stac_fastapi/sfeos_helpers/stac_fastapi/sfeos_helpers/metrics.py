@@ -1,4 +1,9 @@
 """This module provides a helper function to create and configure an Instrumentator instance for Prometheus metrics collection in a FastAPI application."""
+import time
+from typing import Any
+
+from prometheus_client import CollectorRegistry, Counter, Gauge, Histogram
+from prometheus_client import start_http_server as start_prometheus_http_server
 from prometheus_fastapi_instrumentator import Instrumentator
 
 
@@ -11,3 +16,113 @@ def get_instrumentator():
         inprogress_name="http_requests_inprogress",
         inprogress_labels=True,
     )
+
+
+class QueueWorkerMetrics:
+    """Prometheus metrics for the Redis item queue worker.
+
+    Metrics live in their own registry so that several workers (or tests) in the
+    same process do not clash on the global default registry.
+
+    Queue-state gauges are updated from periodic snapshots (see
+    `update_queue_state`) rather than on every scrape, so scraping never
+    touches Redis.
+    """
+
+    def __init__(self, registry: CollectorRegistry | None = None) -> None:
+        """Create the worker metrics in the given (or a fresh) registry."""
+        self.registry = registry or CollectorRegistry()
+        self._known_collections: set[str] = set()
+
+        self.queue_depth = Gauge(
+            "item_queue_depth",
+            "Number of items pending in the queue.",
+            ["collection"],
+            registry=self.registry,
+        )
+        self.oldest_item_age = Gauge(
+            "item_queue_oldest_item_age_seconds",
+            "Age of the oldest pending item in the queue.",
+            ["collection"],
+            registry=self.registry,
+        )
+        self.dlq_depth = Gauge(
+            "item_queue_dlq_items",
+            "Number of item IDs held in the dead-letter queue.",
+            ["collection"],
+            registry=self.registry,
+        )
+        self.state_refresh_timestamp = Gauge(
+            "item_queue_state_refresh_timestamp_seconds",
+            "Unix time of the last successful queue-state refresh.",
+            registry=self.registry,
+        )
+        self.batch_duration = Histogram(
+            "item_queue_batch_duration_seconds",
+            "Time to validate, index and settle one batch.",
+            ["mode"],
+            buckets=(0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120),
+            registry=self.registry,
+        )
+        self.batch_size = Histogram(
+            "item_queue_batch_items",
+            "Number of items pulled from the queue per batch.",
+            ["mode"],
+            buckets=(1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000),
+            registry=self.registry,
+        )
+        self.bulk_items = Counter(
+            "item_queue_bulk_items",
+            "Items sent to the search engine by outcome (indexed, failed or unchanged).",
+            ["outcome"],
+            registry=self.registry,
+        )
+        self.bulk_requests = Counter(
+            "item_queue_bulk_requests",
+            "Bulk requests sent to the search engine by outcome (ok or error).",
+            ["outcome"],
+            registry=self.registry,
+        )
+        self.validation_failures = Counter(
+            "item_queue_validation_failures",
+            "Items rejected by worker-side validation.",
+            ["collection"],
+            registry=self.registry,
+        )
+        self.dlq_items = Counter(
+            "item_queue_dlq_items_added",
+            "Items moved to the dead-letter queue.",
+            ["collection", "reason"],
+            registry=self.registry,
+        )
+
+    def update_queue_state(
+        self, stats: dict[str, dict[str, Any]], now: float | None = None
+    ) -> None:
+        """Update the queue-state gauges from a snapshot.
+
+        Args:
+            stats: Output of `AsyncRedisQueueManager.get_queue_stats`.
+            now: Reference Unix time for age computation (defaults to now).
+        """
+        now = time.time() if now is None else now
+
+        for collection_id in self._known_collections - stats.keys():
+            self.queue_depth.remove(collection_id)
+            self.oldest_item_age.remove(collection_id)
+            self.dlq_depth.remove(collection_id)
+
+        for collection_id, entry in stats.items():
+            oldest = entry.get("oldest_enqueued_at")
+            self.queue_depth.labels(collection_id).set(entry.get("depth", 0))
+            self.oldest_item_age.labels(collection_id).set(
+                max(0.0, now - oldest) if oldest else 0.0
+            )
+            self.dlq_depth.labels(collection_id).set(entry.get("failed", 0))
+
+        self._known_collections = set(stats)
+        self.state_refresh_timestamp.set(now)
+
+    def start_http_server(self, port: int, addr: str = "0.0.0.0") -> Any:
+        """Serve the registry on `http://{addr}:{port}/metrics` from a background thread."""
+        return start_prometheus_http_server(port, addr=addr, registry=self.registry)
@@ -11,7 +11,14 @@ from stac_fastapi.core.core import (
     CoreClient,
     TransactionsClient,
 )
-from stac_fastapi.core.extensions import QueryExtension
+from stac_fastapi.core.extensions import (
+    BulkDeleteExtension,
+    BulkLoadExtension,
+    BulkPatchExtension,
+    QueryExtension,
+    TasksExtension,
+    TilesExtension,
+)
 from stac_fastapi.core.extensions.aggregation import (
     EsAggregationExtensionGetRequest,
     EsAggregationExtensionPostRequest,
@@ -20,6 +27,7 @@ from stac_fastapi.core.extensions.collections_search import (
     CollectionsSearchEndpointExtension,
 )
 from stac_fastapi.core.extensions.fields import FieldsExtension
+from stac_fastapi.core.extensions.ndjson_ingest import NdjsonIngestExtension
 from stac_fastapi.core.utilities import get_bool_env
 from stac_fastapi.extensions import (
     AggregationExtension,
@@ -188,17 +196,16 @@ class Extensions:
 
     @property
     def aggregation(self) -> list[ApiExtension]:
-        """Return the aggregation extension."""
-        aggregation_extension = AggregationExtension(
-            client=EsAsyncBaseAggregationClient(
-                database=self.database_logic,
-                session=self.session,
-                settings=self.settings,
-            )
+        """Return the aggregation extension and the vector tiles drawn from it."""
+        aggregation_client = EsAsyncBaseAggregationClient(
+            database=self.database_logic,
+            session=self.session,
+            settings=self.settings,
         )
+        aggregation_extension = AggregationExtension(client=aggregation_client)
         aggregation_extension.POST = EsAggregationExtensionPostRequest
         aggregation_extension.GET = EsAggregationExtensionGetRequest
-        return [aggregation_extension]
+        return [aggregation_extension, TilesExtension(client=aggregation_client)]
 
     @property
     def search(self) -> list[ApiExtension]:
@@ -221,15 +228,21 @@ class Extensions:
         if not self.transactions_enabled:
             return []
 
+        transactions_client = TransactionsClient(
+            database=self.database_logic,
+            session=self.session,
+            settings=self.settings,
+        )
         return [
             TransactionExtension(
-                client=TransactionsClient(
-                    database=self.database_logic,
-                    session=self.session,
-                    settings=self.settings,
-                ),
+                client=transactions_client,
                 settings=self.settings,
             ),
+            NdjsonIngestExtension(client=transactions_client),
+            BulkLoadExtension(database=self.database_logic),
+            BulkDeleteExtension(client=transactions_client),
+            BulkPatchExtension(client=transactions_client),
+            TasksExtension(database=self.database_logic),
             BulkTransactionExtension(
                 client=BulkTransactionsClient(
                     database=self.database_logic,
@@ -1,7 +1,7 @@
 """Base classes for index inserters."""
 
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List
+from typing import Any, AsyncIterator, Dict, List
 
 
 class BaseIndexInserter(ABC):
@@ -39,6 +39,28 @@ class BaseIndexInserter(ABC):
         """
         pass
 
+    async def iter_bulk_actions(
+        self, collection_id: str, items: List[Dict[str, Any]], op_type: str = "create"
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Yield bulk actions for multiple items one at a time.
+
+        Default implementation yields the actions of `prepare_bulk_actions`.
+        Subclasses that can resolve target indexes per item should override this
+        method to produce actions lazily.
+
+        Args:
+            collection_id (str): Collection identifier.
+            items (List[Dict[str, Any]]): List of items to process.
+            op_type (str): The operation type for the bulk actions. Defaults to "create".
+
+        Yields:
+            Dict[str, Any]: Bulk actions.
+        """
+        for action in await self.prepare_bulk_actions(
+            collection_id, items, op_type=op_type
+        ):
+            yield action
+
     @abstractmethod
     async def create_simple_index(self, client: Any, collection_id: str) -> str:
         """Create a simple index asynchronously.
@@ -1,7 +1,7 @@
 """Async index insertion strategies."""
 
 import logging
-from typing import Any
+from typing import Any, AsyncIterator
 
 from fastapi import HTTPException, status
 
@@ -9,6 +9,7 @@ from stac_fastapi.core.utilities import get_bool_env
 from stac_fastapi.sfeos_helpers.database import (
     extract_date,
     extract_first_date_from_index,
+    find_existing_items_shared,
     index_alias_by_collection_id,
     is_index_closed,
     mk_item_id,
@@ -139,6 +140,13 @@ class DatetimeIndexInserter(BaseIndexInserter):
     ) -> list[dict[str, Any]]:
         """Prepare bulk actions for multiple items.
 
+        For upserts (`op_type="index"`) the items that are already stored are
+        looked up in one batch. Items whose datetime fields did not change are
+        written to the index that holds them, without resolving a target index.
+        Items whose datetime moved them to another index get a `delete` action on
+        the old index followed by an `index` action on the new one, so an upsert
+        never leaves a stale copy behind.
+
         Args:
             collection_id (str): Collection identifier.
             items (list[dict[str, Any]]): List of items to process.
@@ -155,35 +163,78 @@ class DatetimeIndexInserter(BaseIndexInserter):
 
         items.sort(key=lambda item: item["properties"][self.primary_datetime_name])
 
-        first_item = items[0]
-        first_target_index = await self._get_target_index_internal(
-            collection_id, first_item, check_size=True, use_cache=True
-        )
+        existing: dict[str, dict[str, Any]] = {}
+        if op_type == "index":
+            existing = await find_existing_items_shared(
+                self.client,
+                collection_id,
+                [item["id"] for item in items],
+                [f"properties.{name}" for name in self._index_datetime_fields],
+            )
 
-        actions = [
-            {
-                "_op_type": op_type,
-                "_index": first_target_index,
-                "_id": mk_item_id(first_item["id"], first_item["collection"]),
-                "_source": first_item,
-            }
-        ]
+        actions = []
+        resolved_indexes: dict[str, str] = {}
+        check_size = True
+        for item in items:
+            doc_id = mk_item_id(item["id"], item["collection"])
+            current = existing.get(item["id"])
+            if current is not None and not self._datetimes_changed(
+                current["_source"], item
+            ):
+                actions.append(
+                    {
+                        "_op_type": op_type,
+                        "_index": current["_index"],
+                        "_id": doc_id,
+                        "_source": item,
+                    }
+                )
+                continue
 
-        for item in items[1:]:
+            # Only the first resolved item checks the index size, as before
             target_index = await self._get_target_index_internal(
-                collection_id, item, check_size=False, use_cache=True
+                collection_id, item, check_size=check_size, use_cache=True
             )
+            check_size = False
+            if current is not None and current["_index"] != (
+                await self._resolve_index(target_index, resolved_indexes)
+            ):
+                actions.append(
+                    {"_op_type": "delete", "_index": current["_index"], "_id": doc_id}
+                )
             actions.append(
                 {
                     "_op_type": op_type,
                     "_index": target_index,
-                    "_id": mk_item_id(item["id"], item["collection"]),
+                    "_id": doc_id,
                     "_source": item,
                 }
             )
 
         return actions
 
+    @property
+    def _index_datetime_fields(self) -> tuple[str, ...]:
+        """Datetime properties that decide which index an item is stored in."""
+        if self.use_datetime:
+            return ("datetime",)
+        return ("start_datetime", "end_datetime")
+
+    def _datetimes_changed(self, stored: dict[str, Any], item: dict[str, Any]) -> bool:
+        """Whether an item's index-deciding datetimes differ from the stored ones."""
+        stored_properties = stored.get("properties", {})
+        return any(
+            stored_properties.get(name) != item["properties"].get(name)
+            for name in self._index_datetime_fields
+        )
+
+    async def _resolve_index(self, alias: str, resolved: dict[str, str]) -> str:
+        """Return the concrete index behind a datetime alias, caching per batch."""
+        if alias not in resolved:
+            response = await self.client.indices.get_alias(index=alias)
+            resolved[alias] = next(iter(response), alias)
+        return resolved[alias]
+
     async def _get_target_index_internal(
         self,
         collection_id: str,
@@ -418,3 +469,25 @@ class SimpleIndexInserter(BaseIndexInserter):
             }
             for item in items
         ]
+
+    async def iter_bulk_actions(
+        self, collection_id: str, items: list[dict[str, Any]], op_type: str = "create"
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Yield bulk actions for simple indexing without building a list.
+
+        Args:
+            collection_id (str): Collection identifier.
+            items (list[dict[str, Any]]): List of items to process.
+            op_type (str): The operation type for the bulk actions. Defaults to "create".
+
+        Yields:
+            dict[str, Any]: Bulk actions with collection alias as target.
+        """
+        target_index = index_alias_by_collection_id(collection_id)
+        for item in items:
+            yield {
+                "_op_type": op_type,
+                "_index": target_index,
+                "_id": mk_item_id(item["id"], item["collection"]),
+                "_source": item,
+            }
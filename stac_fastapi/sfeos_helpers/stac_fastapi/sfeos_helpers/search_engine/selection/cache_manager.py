@@ -28,13 +28,13 @@ class IndexCacheManager:
         self._init_lock = asyncio.Lock()
 
     async def _ensure_redis(self):
-        """Lazily initialize Redis connection."""
+        """Lazily get the process-wide Redis client."""
         if self._redis is None:
             async with self._init_lock:
                 if self._redis is None:
-                    from stac_fastapi.core.redis_utils import connect_redis
+                    from stac_fastapi.core.redis_utils import get_redis
 
-                    redis = await connect_redis()
+                    redis = await get_redis()
                     if redis is None:
                         raise RuntimeError("Redis is required for index alias caching.")
                     self._redis = redis
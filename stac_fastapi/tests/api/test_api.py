@@ -50,6 +50,14 @@ ROUTES = {
     "DELETE /collections/{collection_id}/items/{item_id}",
     "POST /collections",
     "POST /collections/{collection_id}/items",
+    "POST /collections/{collection_id}/items/stream",
+    "POST /collections/{collection_id}/bulk-load",
+    "GET /collections/{collection_id}/bulk-load",
+    "DELETE /collections/{collection_id}/bulk-load",
+    "POST /collections/{collection_id}/bulk-delete",
+    "POST /collections/{collection_id}/bulk-patch",
+    "GET /tasks",
+    "GET /tasks/{task_id}",
     "PUT /collections/{collection_id}",
     "PATCH /collections/{collection_id}",
     "PUT /collections/{collection_id}/items/{item_id}",
@@ -63,6 +71,8 @@ ROUTES = {
     "GET /collections/{collection_id}/aggregate",
     "POST /collections/{collection_id}/aggregations",
     "POST /collections/{collection_id}/aggregate",
+    "GET /tiles/{z}/{x}/{y}.mvt",
+    "GET /collections/{collection_id}/tiles/{z}/{x}/{y}.mvt",
     "GET /collections-search",
     "POST /collections-search",
     "GET /catalogs",
@@ -6,7 +6,7 @@ from datetime import datetime, timedelta
 
 import pytest
 
-from ..conftest import create_collection, create_item
+from ..conftest import create_collection, create_item, refresh_indices
 
 
 @pytest.mark.asyncio
@@ -412,3 +412,117 @@ async def test_create_item_collection_auto_filled_when_missing(
     assert resp.status_code == 200
     resp_json = resp.json()
     assert resp_json["collection"] == test_collection_id
+
+
+@pytest.mark.asyncio
+async def test_feature_collection_resend_reports_unchanged_items(
+    app_client, ctx, txn_client, monkeypatch
+):
+    """Re-sent items with identical content are skipped and reported as unchanged."""
+    monkeypatch.setenv("ENABLE_CONTENT_HASH", "true")
+    items = []
+    for _ in range(3):
+        item = deepcopy(ctx.item)
+        item["id"] = str(uuid.uuid4())
+        items.append(item)
+    url = f"/collections/{ctx.collection['id']}/items"
+
+    resp = await app_client.post(
+        url, json={"type": "FeatureCollection", "features": deepcopy(items)}
+    )
+    assert resp.status_code == 201
+    await refresh_indices(txn_client)
+
+    items[0]["properties"]["platform"] = "changed-platform"
+    resp = await app_client.post(
+        url, json={"type": "FeatureCollection", "features": deepcopy(items)}
+    )
+
+    body = resp.json()
+    assert sorted(body["unchanged"]) == sorted(item["id"] for item in items[1:])
+    assert "2 unchanged" in body["message"]
+    # The changed item is still rejected as a conflict by the insert-only endpoint
+    assert list(body["conflict_errors"]) == [items[0]["id"]]
+
+
+@pytest.mark.asyncio
+async def test_bulk_delete_items_by_id(app_client, ctx, txn_client):
+    """An id list is deleted in one request and missing ids are reported."""
+    item_ids = []
+    for _ in range(3):
+        item = deepcopy(ctx.item)
+        item["id"] = str(uuid.uuid4())
+        await create_item(txn_client, item)
+        item_ids.append(item["id"])
+    await refresh_indices(txn_client)
+
+    resp = await app_client.post(
+        f"/collections/{ctx.collection['id']}/bulk-delete?refresh=true",
+        json={"ids": item_ids[:2] + ["missing-item"]},
+    )
+
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["deleted"] == 2
+    assert body["not_found"] == ["missing-item"]
+    assert body["errors"] == []
+    for item_id in item_ids[:2]:
+        resp = await app_client.get(
+            f"/collections/{ctx.collection['id']}/items/{item_id}"
+        )
+        assert resp.status_code == 404
+    resp = await app_client.get(
+        f"/collections/{ctx.collection['id']}/items/{item_ids[2]}"
+    )
+    assert resp.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_bulk_delete_requires_ids_or_filter(app_client, ctx):
+    """Deleting without criteria is rejected rather than emptying the collection."""
+    resp = await app_client.post(
+        f"/collections/{ctx.collection['id']}/bulk-delete", json={}
+    )
+    assert resp.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_bulk_patch_items_by_id(app_client, ctx, txn_client):
+    """One merge patch is applied to every listed item."""
+    item_ids = []
+    for _ in range(2):
+        item = deepcopy(ctx.item)
+        item["id"] = str(uuid.uuid4())
+        await create_item(txn_client, item)
+        item_ids.append(item["id"])
+    await refresh_indices(txn_client)
+
+    resp = await app_client.post(
+        f"/collections/{ctx.collection['id']}/bulk-patch?refresh=true",
+        json={
+            "ids": item_ids + ["missing-item"],
+            "patch": {"properties": {"processing:version": "2.0"}},
+        },
+    )
+
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["updated"] == 2
+    assert body["not_found"] == ["missing-item"]
+    for item_id in item_ids:
+        resp = await app_client.get(
+            f"/collections/{ctx.collection['id']}/items/{item_id}"
+        )
+        assert resp.json()["properties"]["processing:version"] == "2.0"
+
+
+@pytest.mark.asyncio
+async def test_bulk_patch_rejects_collection_change(app_client, ctx):
+    resp = await app_client.post(
+        f"/collections/{ctx.collection['id']}/bulk-patch",
+        json={
+            "ids": [ctx.item["id"]],
+            "patch": [{"op": "replace", "path": "/collection", "value": "other"}],
+        },
+    )
+    assert resp.status_code == 400
@@ -0,0 +1,78 @@
+"""Tests for the in-memory catalog hierarchy graph."""
+
+import pytest
+
+from stac_fastapi.core.catalog_graph import CatalogGraph, HierarchySnapshot
+
+DOCUMENTS = [
+    {"id": "root", "type": "Catalog", "title": "Root"},
+    {"id": "sub", "type": "Catalog", "parent_ids": ["root"]},
+    {"id": "other", "type": "Catalog", "parent_ids": ["root", "sub"]},
+    {"id": "b-col", "type": "Collection", "title": "B", "parent_ids": ["sub"]},
+    {"id": "a-col", "type": "Collection", "parent_ids": ["sub", "other"]},
+    {"id": "loose", "type": "Collection"},
+]
+
+
+class Loader:
+    def __init__(self, documents):
+        self.documents = documents
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        return self.documents
+
+
+def test_children_and_descendants():
+    hierarchy = HierarchySnapshot.from_documents(DOCUMENTS)
+
+    assert len(hierarchy) == 5
+    assert [(c.id, c.title) for c in hierarchy.children("sub")] == [
+        ("a-col", "a-col"),
+        ("b-col", "B"),
+        ("other", "other"),
+    ]
+    assert [c.id for c in hierarchy.children("sub", "Collection")] == [
+        "a-col",
+        "b-col",
+    ]
+    assert hierarchy.descendant_collection_ids("root") == ["a-col", "b-col"]
+    assert hierarchy.descendant_collection_ids("other") == ["a-col"]
+
+
+def test_changes_update_only_affected_parents():
+    hierarchy = HierarchySnapshot.from_documents(DOCUMENTS)
+
+    assert hierarchy.with_changes(upserted=[DOCUMENTS[3]]) is hierarchy
+    changed = hierarchy.with_changes(
+        upserted=[{"id": "b-col", "type": "Collection", "parent_ids": ["other"]}],
+        removed=["sub"],
+    )
+
+    assert [c.id for c in changed.children("root")] == ["other"]
+    assert [c.id for c in changed.children("other")] == ["a-col", "b-col"]
+    assert changed.descendant_collection_ids("root") == ["a-col", "b-col"]
+    # The original snapshot is unchanged
+    assert [c.id for c in hierarchy.children("root")] == ["other", "sub"]
+
+
+@pytest.mark.asyncio
+async def test_graph_is_reloaded_only_when_outdated(monkeypatch):
+    monkeypatch.delenv("REDIS_ENABLE", raising=False)
+    graph = CatalogGraph(max_age=300)
+    load = Loader(DOCUMENTS)
+
+    await graph.get(load)
+    await graph.get(load)
+    await graph.apply(
+        upserted=[{"id": "new", "type": "Catalog", "parent_ids": ["root"]}]
+    )
+    hierarchy = await graph.get(load)
+
+    assert load.calls == 1
+    assert [c.id for c in hierarchy.children("root")] == ["new", "other", "sub"]
+
+    graph.max_age = 0
+    await graph.get(load)
+    assert load.calls == 2
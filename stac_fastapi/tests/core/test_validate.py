@@ -4,9 +4,17 @@ from copy import deepcopy
 
 import pytest
 
+from stac_fastapi.core import validate as validate_module
 from stac_fastapi.core.validate import (
+    _merge_results,
+    _split_batch,
     async_validate_batch_with_stac_validator,
     async_validate_stac,
+    batch_validate_topology,
+    shutdown_validation_pool,
+    start_validation_pool,
+    validate_batch_with_stac_validator,
+    validate_item_topology_lightweight,
 )
 
 
@@ -81,3 +89,170 @@ async def test_async_validate_batch_with_stac_validator_mixed_results(
     error_message_key = list(invalid_output.keys())[0]
 
     assert "invalid-unit-batch-2" in invalid_output[error_message_key]
+
+
+def test_split_and_merge_batch_preserves_order():
+    """Test that per-chunk results are merged back in the original batch order."""
+    items = [{"id": f"item-{i}"} for i in range(5)]
+    chunks = _split_batch(items, 2)
+
+    assert [offset for offset, _ in chunks] == [0, 3]
+    assert sum(len(chunk) for _, chunk in chunks) == 5
+
+    results = [
+        ([0, 2], {"bad geometry": ["item-1"]}),
+        ([1], {"bad geometry": ["item-3"], "bad datetime": ["item-4"]}),
+    ]
+    valid_items, invalid_items = _merge_results(items, chunks, results)
+
+    assert [item["id"] for item in valid_items] == ["item-0", "item-2", "item-4"]
+    assert invalid_items == {
+        "bad geometry": ["item-1", "item-3"],
+        "bad datetime": ["item-4"],
+    }
+
+
+@pytest.mark.asyncio
+async def test_small_batch_skips_validation_pool(monkeypatch):
+    """Test that batches below the threshold never create the process pool."""
+    monkeypatch.setenv("ENABLE_STAC_VALIDATOR", "true")
+    monkeypatch.setenv("STAC_VALIDATOR_PROCESSES", "2")
+    monkeypatch.setenv("STAC_VALIDATOR_PROCESS_THRESHOLD", "100")
+    batch = [{"id": f"small-{i}", "type": "Unknown"} for i in range(3)]
+
+    _, invalid_items = await async_validate_batch_with_stac_validator(batch)
+
+    assert validate_module._validation_pool is None
+    assert sum(len(ids) for ids in invalid_items.values()) == 3
+
+
+@pytest.mark.asyncio
+async def test_process_pool_matches_in_process_validation(monkeypatch):
+    """Test that process-pool validation returns the same grouped errors as in-process."""
+    monkeypatch.setenv("ENABLE_STAC_VALIDATOR", "true")
+    # Unknown STAC types fail before any schema is fetched, keeping the test offline
+    batch = [{"id": f"pool-{i}", "type": "Unknown"} for i in range(6)]
+    batch.append({"type": "Unknown"})
+
+    monkeypatch.setenv("STAC_VALIDATOR_PROCESSES", "0")
+    expected = validate_batch_with_stac_validator(batch)
+
+    monkeypatch.setenv("STAC_VALIDATOR_PROCESSES", "2")
+    monkeypatch.setenv("STAC_VALIDATOR_PROCESS_THRESHOLD", "2")
+    try:
+        start_validation_pool()
+        assert validate_module._validation_pool is not None
+        sync_result = validate_batch_with_stac_validator(batch)
+        async_result = await async_validate_batch_with_stac_validator(batch)
+    finally:
+        shutdown_validation_pool()
+
+    assert sync_result == expected
+    assert async_result == expected
+    assert expected[1]["Unknown STAC type for validation: Unknown"][-1] == (
+        "unknown_id_6"
+    )
+
+
+def _topology_item(item_id, geometry):
+    return {"id": item_id, "type": "Feature", "geometry": geometry}
+
+
+TOPOLOGY_CASES = [
+    {"type": "Point", "coordinates": [10, 20]},
+    {"type": "Point", "coordinates": [181, 20]},
+    {"type": "Point", "coordinates": [10]},
+    {"type": "LineString", "coordinates": [[170, 0], [-170, 0]]},
+    {"type": "LineString", "coordinates": [[0, 0, 10], [1, 1]]},
+    {"type": "Polygon", "coordinates": [[[0, 0], [1, 0], [1, 1], [0, 0]]]},
+    {"type": "Polygon", "coordinates": [[[0, 0], [1, 0], [0, 0]]]},
+    {"type": "Polygon", "coordinates": [[[170, 0], [-170, 0], [-170, 1], [170, 0]]]},
+    {"type": "Polygon", "coordinates": [[[0, 0], [1, 95], [1, 1], [0, 0]]]},
+    {"type": "Polygon", "coordinates": [[[0, 0], [1, float("nan")], [1, 1], [0, 0]]]},
+    {"type": "LineString", "coordinates": [[0, 0], [True, 1]]},
+    {
+        "type": "MultiPolygon",
+        "coordinates": [
+            [[[0, 0], [1, 0], [1, 1], [0, 0]]],
+            [[[179, 0], [-179, 0], [-179, 1], [179, 0]]],
+        ],
+    },
+    {"type": "GeometryCollection", "geometries": []},
+    {"type": "Polygon", "coordinates": [[[i % 2, 0] for i in range(30)]]},
+]
+
+
+@pytest.mark.parametrize("geometry", TOPOLOGY_CASES)
+def test_numpy_topology_matches_python(geometry, monkeypatch):
+    """Test that the vectorized topology check gives the same result as pure Python."""
+    monkeypatch.setenv("MAX_TOPOLOGY_VERTICES", "20")
+    item = _topology_item("topology-item", geometry)
+
+    try:
+        validate_module._validate_item_topology_python(item)
+        expected = None
+    except ValueError as e:
+        expected = str(e)
+
+    try:
+        validate_item_topology_lightweight(item)
+        actual = None
+    except ValueError as e:
+        actual = str(e)
+
+    assert actual == expected
+
+
+def test_batch_validate_topology_numpy_and_python_agree(monkeypatch):
+    """Test that batch topology validation is identical with and without NumPy."""
+    monkeypatch.setenv("MAX_TOPOLOGY_VERTICES", "20")
+    features = [
+        _topology_item(f"item-{i}", geometry)
+        for i, geometry in enumerate(TOPOLOGY_CASES)
+    ]
+
+    vectorized = batch_validate_topology(features)
+    monkeypatch.setattr(validate_module, "np", None)
+    pure_python = batch_validate_topology(features)
+
+    assert vectorized == pure_python
+    assert [item["id"] for item in vectorized[0]] == [
+        "item-0",
+        "item-3",
+        "item-4",
+        "item-5",
+        "item-10",
+        "item-12",
+    ]
+
+
+def test_numpy_topology_mask_flags_only_invalid_items():
+    """Test that the vectorized pre-check accepts valid items and flags invalid ones."""
+    features = [
+        _topology_item("ok", {"type": "Point", "coordinates": [10, 20]}),
+        _topology_item(
+            "jump",
+            {
+                "type": "Polygon",
+                "coordinates": [[[170, 0], [-170, 0], [-170, 1], [170, 0]]],
+            },
+        ),
+        # Jump between the last vertex of one ring and the first of the next
+        # must not be reported
+        _topology_item(
+            "two-rings",
+            {
+                "type": "Polygon",
+                "coordinates": [
+                    [[170, 0], [171, 0], [171, 1], [170, 0]],
+                    [[-170, 0], [-171, 0], [-171, 1], [-170, 0]],
+                ],
+            },
+        ),
+    ]
+
+    assert validate_module._numpy_topology_mask(features, 5000) == [
+        True,
+        False,
+        True,
+    ]
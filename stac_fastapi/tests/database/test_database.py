@@ -23,10 +23,16 @@ else:
     )
 
 from stac_fastapi.core.utilities import get_bool_env
+from stac_fastapi.core.write_generations import write_generations
 from stac_fastapi.sfeos_helpers.database import (
+    CollectionMovingError,
+    ReindexTaskRunner,
     filter_indexes_by_datetime,
     filter_indexes_by_datetime_range,
+    find_stale_rollups_shared,
     index_alias_by_collection_id,
+    new_delete_by_query_task,
+    plan_collection_id_change_shared,
 )
 from stac_fastapi.sfeos_helpers.filter.cql2 import resolve_cql2_indexes
 from stac_fastapi.sfeos_helpers.mappings import (
@@ -34,10 +40,12 @@ from stac_fastapi.sfeos_helpers.mappings import (
     ES_COLLECTIONS_MAPPINGS,
     ES_ITEMS_MAPPINGS,
     ITEM_INDICES,
+    ROLLUPS_INDEX,
 )
 from stac_fastapi.sfeos_helpers.search_engine.selection.selectors import (
     DatetimeBasedIndexSelector,
 )
+from stac_fastapi.types.errors import NotFoundError
 
 from ..conftest import (
     MockRequest,
@@ -1083,6 +1091,64 @@ async def test_item_add_accepted_coerce_true(txn_client, load_test_data, monkeyp
         importlib.reload(index_operations_module)
 
 
+@pytest.mark.asyncio
+async def test_rollups_are_stale_again_when_reindex_task_completes(ctx, monkeypatch):
+    """Rollups rebuilt while a bulk delete task was pending are outdated once it ran."""
+    monkeypatch.setenv("ENABLE_ROLLUPS", "true")
+    collection_id = ctx.collection["id"]
+    await database.start_rollups(refresh_loop=False)
+    try:
+        task = new_delete_by_query_task(
+            collection_id,
+            [index_alias_by_collection_id(collection_id)],
+            {"match_all": {}},
+        )
+        runner = await ReindexTaskRunner.create(database.client, task, poll_interval=0)
+        # Like the bulk-delete endpoint, bump the generations on submission
+        await write_generations.bump([collection_id])
+        await database.refresh_rollups(collection_id)
+        assert collection_id not in await find_stale_rollups_shared(database.client)
+
+        await database._run_reindex_task(runner)
+        await database.client.indices.refresh(index=ROLLUPS_INDEX)
+
+        assert runner.task["status"] == "completed"
+        assert collection_id in await find_stale_rollups_shared(database.client)
+    finally:
+        write_generations.remove_listener(database.mark_rollups_stale)
+
+
+@pytest.mark.asyncio
+async def test_item_writes_are_rejected_while_collection_id_changes(ctx):
+    """Writes to the old collection during an id change are rejected, not lost."""
+    old_id = ctx.collection["id"]
+    new_id = f"{old_id}-{uuid.uuid4().hex[:8]}"
+    await database.create_collection(dict(ctx.collection, id=new_id), refresh=True)
+    task = await plan_collection_id_change_shared(
+        database.client, old_id, new_id, COLLECTIONS_INDEX
+    )
+    runner = await ReindexTaskRunner.create(database.client, task, poll_interval=0)
+    # The runner blocks writes like this before its first step
+    await runner._block_writes()
+
+    new_item = dict(ctx.item, id=f"{ctx.item['id']}-new")
+    with pytest.raises(CollectionMovingError):
+        await database.create_item(new_item, base_url="http://test-server")
+    updated_item = database.item_serializer.stac_to_db(ctx.item, "http://test-server")
+    with pytest.raises(CollectionMovingError):
+        await database.bulk_async(old_id, [updated_item], op_type="index")
+    with pytest.raises(CollectionMovingError):
+        await database.delete_item(ctx.item["id"], old_id)
+
+    await database._run_reindex_task(runner)
+
+    assert runner.task["status"] == "completed"
+    moved = await database.get_one_item(new_id, ctx.item["id"])
+    assert moved["collection"] == new_id
+    with pytest.raises(NotFoundError):
+        await database.get_one_item(new_id, new_item["id"])
+
+
 @pytest.mark.datetime_filtering
 def test_filter_datetime_field_outside_range():
     collection_indexes = [
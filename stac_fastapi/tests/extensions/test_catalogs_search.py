@@ -186,6 +186,71 @@ async def test_catalog_search_with_multi_level_hierarchy(
     assert search_result["features"][0]["id"] == item_id
 
 
+@pytest.mark.asyncio
+async def test_catalog_search_follows_relinked_sub_catalogs(
+    catalogs_app_client, load_test_data
+):
+    """Test that moving a sub-catalog moves its collections between search scopes."""
+    root_ids = []
+    for _ in range(2):
+        root_catalog = load_test_data("test_catalog.json")
+        root_catalog["id"] = f"root-catalog-{uuid.uuid4()}"
+        resp = await catalogs_app_client.post("/catalogs", json=root_catalog)
+        assert resp.status_code == 201
+        root_ids.append(root_catalog["id"])
+
+    # root 0 -> sub -> leaf -> collection
+    sub_catalog = load_test_data("test_catalog.json")
+    sub_catalog["id"] = f"sub-catalog-{uuid.uuid4()}"
+    resp = await catalogs_app_client.post(
+        f"/catalogs/{root_ids[0]}/catalogs", json=sub_catalog
+    )
+    assert resp.status_code == 201
+    leaf_catalog = load_test_data("test_catalog.json")
+    leaf_catalog["id"] = f"leaf-catalog-{uuid.uuid4()}"
+    resp = await catalogs_app_client.post(
+        f"/catalogs/{sub_catalog['id']}/catalogs", json=leaf_catalog
+    )
+    assert resp.status_code == 201
+
+    test_collection = load_test_data("test_collection.json")
+    collection_id = f"test-collection-{uuid.uuid4()}"
+    test_collection["id"] = collection_id
+    resp = await catalogs_app_client.post(
+        f"/catalogs/{leaf_catalog['id']}/collections", json=test_collection
+    )
+    assert resp.status_code == 201
+
+    test_item = load_test_data("test_item.json")
+    test_item["id"] = f"test-item-{uuid.uuid4()}"
+    test_item["collection"] = collection_id
+    resp = await catalogs_app_client.post(
+        f"/collections/{collection_id}/items", json=test_item
+    )
+    assert resp.status_code == 201
+
+    async def found(catalog_id):
+        resp = await catalogs_app_client.get(f"/catalogs/{catalog_id}/search")
+        assert resp.status_code == 200
+        return [feature["id"] for feature in resp.json()["features"]]
+
+    assert await found(root_ids[0]) == [test_item["id"]]
+    assert await found(root_ids[1]) == []
+
+    # Move the sub-catalog, with everything below it, from root 0 to root 1
+    resp = await catalogs_app_client.post(
+        f"/catalogs/{root_ids[1]}/catalogs", json=sub_catalog
+    )
+    assert resp.status_code == 201
+    resp = await catalogs_app_client.delete(
+        f"/catalogs/{root_ids[0]}/catalogs/{sub_catalog['id']}"
+    )
+    assert resp.status_code == 204
+
+    assert await found(root_ids[0]) == []
+    assert await found(root_ids[1]) == [test_item["id"]]
+
+
 @pytest.mark.asyncio
 async def test_catalog_search_get_with_limit(catalogs_app_client, load_test_data):
     """Test GET search with limit parameter."""
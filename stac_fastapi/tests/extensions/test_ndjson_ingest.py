@@ -0,0 +1,174 @@
+import uuid
+from copy import deepcopy
+
+import orjson
+import pytest
+
+from stac_fastapi.core.exceptions import NdjsonLineTooLong
+from stac_fastapi.core.utilities import (
+    build_bulk_summary,
+    iter_ndjson_lines,
+    merge_bulk_summaries,
+)
+
+from ..conftest import refresh_indices
+
+NDJSON = "application/x-ndjson"
+
+
+async def _aiter(chunks):
+    for chunk in chunks:
+        yield chunk
+
+
+def _ndjson(items) -> bytes:
+    return b"".join(
+        (item if isinstance(item, bytes) else orjson.dumps(item)) + b"\n"
+        for item in items
+    )
+
+
+@pytest.mark.asyncio
+async def test_iter_ndjson_lines_handles_split_lines():
+    chunks = [b'{"a": 1}\n{"b"', b": 2}\n\n", b'{"c": 3}']
+
+    lines = [entry async for entry in iter_ndjson_lines(_aiter(chunks), 100)]
+
+    assert lines == [(1, b'{"a": 1}'), (2, b'{"b": 2}'), (4, b'{"c": 3}')]
+
+
+@pytest.mark.asyncio
+async def test_iter_ndjson_lines_rejects_long_line():
+    chunks = [b'{"a": 1}\n', b"x" * 50, b"x" * 60]
+
+    with pytest.raises(NdjsonLineTooLong, match="Line 2 exceeds") as excinfo:
+        [entry async for entry in iter_ndjson_lines(_aiter(chunks), 100)]
+    assert excinfo.value.line_number == 2
+
+
+def test_merge_bulk_summaries():
+    first = build_bulk_summary([1, 2, 3], [1, 2], [1], 1)
+    second = build_bulk_summary([1, 2], [1, 2], [1, 2], 0, [{"conflict": 1}])
+
+    merged = merge_bulk_summaries([first, second])
+
+    assert merged == {
+        "input_count": 5,
+        "processed_count": 4,
+        "valid_count": 3,
+        "skipped_total": 3,
+        "validation_error_count": 1,
+        "conflict_count": 1,
+        "database_error_count": 0,
+        "unchanged_count": 0,
+    }
+
+
+@pytest.mark.asyncio
+async def test_ndjson_ingest_summary(app_client, ctx, txn_client, monkeypatch):
+    monkeypatch.setenv("NDJSON_INGEST_CHUNK_SIZE", "2")
+    items = []
+    for _ in range(5):
+        item = deepcopy(ctx.item)
+        item["id"] = str(uuid.uuid4())
+        items.append(item)
+    body = _ndjson([*items, b"{not json", {"type": "Collection", "id": "x"}])
+
+    resp = await app_client.post(
+        f"/collections/{ctx.collection['id']}/items/stream",
+        content=body,
+        headers={"Content-Type": NDJSON},
+    )
+
+    assert resp.status_code == 201
+    data = resp.json()
+    assert data["chunks"] == 4
+    assert data["summary"]["input_count"] == 7
+    assert data["summary"]["valid_count"] == 5
+    assert data["parse_errors"] == {
+        "Invalid JSON": ["line 6"],
+        "Unsupported item type. Expected 'Feature'.": ["line 7"],
+    }
+
+    await refresh_indices(txn_client)
+    for item in items:
+        resp = await app_client.get(
+            f"/collections/{ctx.collection['id']}/items/{item['id']}"
+        )
+        assert resp.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_ndjson_ingest_oversized_line_reports_ingested_items(
+    app_client, ctx, txn_client, monkeypatch
+):
+    monkeypatch.setenv("NDJSON_INGEST_CHUNK_SIZE", "2")
+    monkeypatch.setenv("NDJSON_INGEST_MAX_LINE_BYTES", "100000")
+    items = []
+    for _ in range(3):
+        item = deepcopy(ctx.item)
+        item["id"] = str(uuid.uuid4())
+        items.append(item)
+    body = _ndjson([*items, b"x" * 100001, ctx.item])
+
+    resp = await app_client.post(
+        f"/collections/{ctx.collection['id']}/items/stream",
+        content=body,
+        headers={"Content-Type": NDJSON},
+    )
+
+    assert resp.status_code == 413
+    detail = resp.json()["detail"]
+    assert detail["aborted_at_line"] == 4
+    assert "Line 4 exceeds" in detail["error"]
+    # The lines before the oversized one are ingested, including a partial chunk
+    assert detail["chunks"] == 2
+    assert detail["summary"]["valid_count"] == 3
+
+    await refresh_indices(txn_client)
+    for item in items:
+        resp = await app_client.get(
+            f"/collections/{ctx.collection['id']}/items/{item['id']}"
+        )
+        assert resp.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_ndjson_ingest_incremental_reports_conflicts(app_client, ctx):
+    new_item = deepcopy(ctx.item)
+    new_item["id"] = str(uuid.uuid4())
+    # ctx.item already exists in the collection
+    body = _ndjson([ctx.item, new_item])
+
+    resp = await app_client.post(
+        f"/collections/{ctx.collection['id']}/items/stream",
+        content=body,
+        headers={"Content-Type": NDJSON, "Accept": NDJSON},
+    )
+
+    assert resp.status_code == 201
+    assert resp.headers["content-type"].startswith(NDJSON)
+    lines = [orjson.loads(line) for line in resp.text.splitlines()]
+    assert lines[0]["added"] == 1
+    assert ctx.item["id"] in lines[0]["conflict_errors"]
+    assert lines[-1]["done"] is True
+    assert lines[-1]["summary"]["conflict_count"] == 1
+
+
+@pytest.mark.asyncio
+async def test_ndjson_ingest_rejects_other_content_types(app_client, ctx):
+    resp = await app_client.post(
+        f"/collections/{ctx.collection['id']}/items/stream",
+        json=ctx.item,
+    )
+    assert resp.status_code == 415
+
+
+@pytest.mark.asyncio
+async def test_ndjson_ingest_unknown_collection(app_client, ctx):
+    resp = await app_client.post(
+        "/collections/does-not-exist/items/stream",
+        content=_ndjson([ctx.item]),
+        headers={"Content-Type": NDJSON},
+    )
+    assert resp.status_code == 404
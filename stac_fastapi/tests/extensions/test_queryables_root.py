@@ -8,6 +8,7 @@ from httpx import AsyncClient
 
 import stac_fastapi.sfeos_helpers.filter.client as filter_client_module
 from stac_fastapi.core.extensions.filter import DEFAULT_QUERYABLES
+from stac_fastapi.core.queryables import queryables_schema_version
 
 
 @pytest.mark.asyncio
@@ -142,6 +143,11 @@ async def test_root_queryables_union_served_from_cache(
     monkeypatch.setattr(
         filter_client_module, "_GLOBAL_QUERYABLES_LAST_UPDATED", time.time()
     )
+    monkeypatch.setattr(
+        filter_client_module,
+        "_GLOBAL_QUERYABLES_VERSION",
+        await queryables_schema_version.get(),
+    )
 
     resp = await app_client.get("/queryables")
     assert resp.status_code == 200
@@ -175,3 +181,43 @@ async def test_root_queryables_union_cache_refreshed_after_ttl(
     assert resp.status_code == 200
     # The stale sentinel should NOT be returned because the TTL has expired
     assert "stale_field" not in resp.json().get("properties", {})
+
+
+@pytest.mark.asyncio
+async def test_root_queryables_union_cache_invalidated_by_collection_writes(
+    app_client: AsyncClient,
+    load_test_data: Callable[[str], Dict],
+    monkeypatch: pytest.MonkeyPatch,
+):
+    """Test that creating a collection rebuilds the cached union within the TTL."""
+    monkeypatch.setenv("ROOT_QUERYABLES_UNION", "true")
+    monkeypatch.setenv("QUERYABLES_CACHE_TTL", "3600")
+
+    stale_sentinel = {
+        "type": "object",
+        "properties": {"stale_field": {"type": "string"}},
+        "additionalProperties": False,
+    }
+    monkeypatch.setattr(
+        filter_client_module, "_GLOBAL_QUERYABLES_CACHE", stale_sentinel
+    )
+    monkeypatch.setattr(
+        filter_client_module, "_GLOBAL_QUERYABLES_LAST_UPDATED", time.time()
+    )
+    monkeypatch.setattr(
+        filter_client_module,
+        "_GLOBAL_QUERYABLES_VERSION",
+        await queryables_schema_version.get(),
+    )
+
+    collection = load_test_data("test_collection.json")
+    collection["id"] = f"union-invalidation-{uuid.uuid4()}"
+    r = await app_client.post("/collections", json=collection)
+    r.raise_for_status()
+
+    resp = await app_client.get("/queryables")
+    assert resp.status_code == 200
+    assert "stale_field" not in resp.json().get("properties", {})
+
+    r = await app_client.delete(f"/collections/{collection['id']}")
+    r.raise_for_status()
@@ -19,6 +19,7 @@ from scripts.item_queue_worker import ItemQueueWorker  # noqa: E402
 from stac_fastapi.core.redis_utils import (  # noqa: E402
     AsyncRedisQueueManager,
     connect_redis,
+    failed_item_ids,
 )
 
 from ..conftest import DatabaseLogic, create_collection  # noqa: E402
@@ -64,6 +65,7 @@ async def queue_manager():
             "QUEUE_KEY_PREFIX": prefix,
             "QUEUE_BATCH_SIZE": 10,
             "QUEUE_FLUSH_INTERVAL": 30,
+            "QUEUE_DLQ_PAYLOAD_TTL": 3600,
             "WORKER_POLL_INTERVAL": 1.0,
             "WORKER_MAX_THREADS": 4,
             "BACKEND": "opensearch",
@@ -106,17 +108,15 @@ def _broken_item(collection_id, item_id=None):
 
 
 def test_extract_empty():
-    assert ItemQueueWorker._extract_failed_item_ids([]) == set()
+    assert failed_item_ids([]) == set()
 
 
 def test_extract_delete_op():
-    assert ItemQueueWorker._extract_failed_item_ids([{"delete": {"_id": "x|c"}}]) == {
-        "x"
-    }
+    assert failed_item_ids([{"delete": {"_id": "x|c"}}]) == {"x"}
 
 
 def test_extract_missing_id():
-    assert ItemQueueWorker._extract_failed_item_ids([{"index": {}}]) == set()
+    assert failed_item_ids([{"index": {}}]) == set()
 
 
 @pytest.mark.asyncio
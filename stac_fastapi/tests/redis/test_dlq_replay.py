@@ -0,0 +1,195 @@
+import sys
+import time
+import uuid
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+import pytest_asyncio
+
+_repo_root = Path(__file__).resolve()
+while _repo_root != _repo_root.parent and not (_repo_root / "scripts").is_dir():
+    _repo_root = _repo_root.parent
+if str(_repo_root) not in sys.path:
+    sys.path.insert(0, str(_repo_root))
+
+from scripts.replay_dlq import DLQReplayer, RateLimiter  # noqa: E402
+from stac_fastapi.core.redis_utils import (  # noqa: E402
+    AsyncRedisQueueManager,
+    connect_redis,
+)
+
+
+def _item(collection_id, item_id):
+    return {
+        "id": item_id,
+        "collection": collection_id,
+        "properties": {"datetime": "2020-02-12T12:30:22Z"},
+    }
+
+
+@pytest_asyncio.fixture
+async def queue_manager():
+    redis = await connect_redis()
+    if redis is None:
+        pytest.skip("Redis not configured")
+
+    manager = AsyncRedisQueueManager(redis)
+    prefix = f"test_replay_{uuid.uuid4().hex[:8]}"
+    manager.queue_settings = type(
+        "S",
+        (),
+        {
+            "QUEUE_KEY_PREFIX": prefix,
+            "QUEUE_BATCH_SIZE": 10,
+            "QUEUE_FLUSH_INTERVAL": 30,
+            "QUEUE_DLQ_PAYLOAD_TTL": 3600,
+            "WORKER_POLL_INTERVAL": 1.0,
+            "WORKER_MAX_THREADS": 4,
+            "BACKEND": "opensearch",
+            "LOG_LEVEL": "DEBUG",
+        },
+    )()
+
+    yield manager
+
+    cursor = 0
+    while True:
+        cursor, keys = await redis.scan(cursor, match=f"{prefix}:*", count=100)
+        if keys:
+            await redis.delete(*keys)
+        if cursor == 0:
+            break
+    await redis.aclose()
+
+
+async def _fail_items(queue_manager, collection_id, count, reason="DB failures"):
+    """Queue items and move them to the DLQ the way the worker does."""
+    items = [_item(collection_id, f"{collection_id}-{i}") for i in range(count)]
+    await queue_manager.queue_items(collection_id, items)
+    ids = [item["id"] for item in items]
+    await queue_manager.save_failed_items(collection_id, ids, reason=reason)
+    await queue_manager.mark_items_processed(collection_id, ids)
+    return items
+
+
+@pytest.mark.asyncio
+async def test_save_failed_items_keeps_compressed_payload(queue_manager):
+    items = await _fail_items(queue_manager, "col-a", 2, reason="invalid items")
+
+    records = await queue_manager.get_failed_records("col-a", ["col-a-0", "col-a-1"])
+    assert records["col-a-0"]["item"] == items[0]
+    assert records["col-a-1"]["reason"] == "invalid items"
+
+    key = queue_manager._get_failed_payload_key("col-a", "col-a-0")
+    ttl = await queue_manager.redis.ttl(key)
+    assert 0 < ttl <= 3600
+    raw = await queue_manager.redis.get(key)
+    assert "col-a-0" not in raw
+
+
+@pytest.mark.asyncio
+async def test_save_failed_items_without_payload_retention(queue_manager):
+    queue_manager.queue_settings.QUEUE_DLQ_PAYLOAD_TTL = 0
+    await _fail_items(queue_manager, "col-a", 1)
+
+    assert await queue_manager.get_failed_count("col-a") == 1
+    assert await queue_manager.get_failed_records("col-a", ["col-a-0"]) == {}
+
+
+@pytest.mark.asyncio
+async def test_remove_failed_items_cleans_up(queue_manager):
+    await _fail_items(queue_manager, "col-a", 2)
+
+    assert await queue_manager.remove_failed_items("col-a", ["col-a-0"]) == 1
+    assert await queue_manager.get_failed_records("col-a", ["col-a-0"]) == {}
+    assert "col-a" in await queue_manager.get_failed_collections()
+
+    assert await queue_manager.remove_failed_items("col-a", ["col-a-1"]) == 0
+    assert "col-a" not in await queue_manager.get_failed_collections()
+
+
+@pytest.mark.asyncio
+async def test_replay_requeue(queue_manager):
+    await _fail_items(queue_manager, "col-a", 25)
+    await _fail_items(queue_manager, "col-b", 5)
+
+    replayer = DLQReplayer(queue_manager, mode="requeue", batch_size=10)
+    summary = await replayer.run()
+
+    assert summary["total"] == 30
+    assert summary["replayed"] == 30
+    assert await queue_manager.get_queue_length("col-a") == 25
+    assert await queue_manager.get_queue_length("col-b") == 5
+    assert await queue_manager.get_failed_collections() == []
+
+
+@pytest.mark.asyncio
+async def test_replay_index_keeps_failures_in_dlq(queue_manager):
+    await _fail_items(queue_manager, "col-a", 3)
+
+    db = MagicMock()
+    db.bulk_async = AsyncMock(
+        return_value=(2, [{"index": {"_id": "col-a-1|col-a", "status": 400}}])
+    )
+    replayer = DLQReplayer(queue_manager, db=db, mode="index")
+    summary = await replayer.run(["col-a"])
+
+    assert summary["replayed"] == 2
+    assert summary["failed"] == 1
+    db.bulk_async.assert_awaited_once()
+    assert db.bulk_async.await_args.kwargs["op_type"] == "index"
+    assert await queue_manager.redis.smembers(
+        queue_manager._get_failed_set_key("col-a")
+    ) == {"col-a-1"}
+    assert await queue_manager.get_failed_records("col-a", ["col-a-1"])
+    assert not await queue_manager.redis.exists(
+        f"{queue_manager.queue_settings.QUEUE_KEY_PREFIX}:lock:col-a"
+    )
+
+
+@pytest.mark.asyncio
+async def test_replay_missing_payloads(queue_manager):
+    await queue_manager.save_failed_items("col-a", ["expired-1", "expired-2"])
+
+    summary = await DLQReplayer(queue_manager).run(["col-a"])
+    assert summary["missing"] == 2
+    assert await queue_manager.get_failed_count("col-a") == 2
+
+    summary = await DLQReplayer(queue_manager, drop_missing=True).run(["col-a"])
+    assert summary["missing"] == 2
+    assert await queue_manager.get_failed_count("col-a") == 0
+
+
+@pytest.mark.asyncio
+async def test_replay_dry_run_changes_nothing(queue_manager):
+    await _fail_items(queue_manager, "col-a", 4)
+
+    summary = await DLQReplayer(queue_manager, dry_run=True).run()
+
+    assert summary["replayed"] == 4
+    assert await queue_manager.get_failed_count("col-a") == 4
+    assert await queue_manager.get_queue_length("col-a") == 0
+
+
+def test_replay_index_requires_db():
+    with pytest.raises(ValueError):
+        DLQReplayer(MagicMock(), mode="index")
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_throttles():
+    limiter = RateLimiter(rate=100, burst=10)
+    start = time.monotonic()
+    for _ in range(3):
+        await limiter.acquire(100)
+    # Bucket starts full (100 tokens), the next 200 items need ~2 seconds
+    assert time.monotonic() - start >= 1.9
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_disabled():
+    limiter = RateLimiter(rate=None)
+    start = time.monotonic()
+    await limiter.acquire(1_000_000)
+    assert time.monotonic() - start < 0.1
@@ -0,0 +1,258 @@
+import asyncio
+import json
+import os
+import sys
+import uuid
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+import pytest_asyncio
+
+_repo_root = Path(__file__).resolve()
+while _repo_root != _repo_root.parent and not (_repo_root / "scripts").is_dir():
+    _repo_root = _repo_root.parent
+if str(_repo_root) not in sys.path:
+    sys.path.insert(0, str(_repo_root))
+
+from scripts.item_queue_worker import ItemQueueWorker  # noqa: E402
+from stac_fastapi.core.redis_utils import (  # noqa: E402
+    AsyncRedisQueueManager,
+    connect_redis,
+    failed_item_ids_by_collection,
+)
+from stac_fastapi.sfeos_helpers.database import mk_item_id  # noqa: E402
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data")
+
+
+def _valid_item(collection_id, item_id=None):
+    with open(os.path.join(DATA_DIR, "test_item.json")) as f:
+        item = json.load(f)
+    item["id"] = item_id or str(uuid.uuid4())
+    item["collection"] = collection_id
+    return item
+
+
+def _mock_db():
+    """DatabaseLogic stand-in whose inserter targets one index per collection."""
+
+    async def prepare_bulk_actions(collection_id, items, op_type="create"):
+        return [
+            {
+                "_op_type": op_type,
+                "_index": f"items_{collection_id}",
+                "_id": mk_item_id(item["id"], item["collection"]),
+                "_source": item,
+            }
+            for item in items
+        ]
+
+    db = MagicMock()
+    db.async_index_inserter.prepare_bulk_actions = AsyncMock(
+        side_effect=prepare_bulk_actions
+    )
+    db.bulk_async_actions = AsyncMock(return_value=(0, []))
+    db.split_unchanged_items = AsyncMock(side_effect=lambda cid, items: (items, []))
+    return db
+
+
+def _make_worker(queue_manager, db, max_bytes=10 * 1024 * 1024):
+    worker = ItemQueueWorker.__new__(ItemQueueWorker)
+    worker.settings = queue_manager.queue_settings
+    worker.settings.QUEUE_MERGE_MAX_BYTES = max_bytes
+    worker.queue_manager = queue_manager
+    worker.db = db
+    worker._states = {}
+    worker._lock = asyncio.Lock()
+    worker._semaphore = asyncio.Semaphore(4)
+    worker.running = True
+    return worker
+
+
+@pytest_asyncio.fixture
+async def queue_manager():
+    redis = await connect_redis()
+    if redis is None:
+        pytest.skip("Redis not configured")
+
+    manager = AsyncRedisQueueManager(redis)
+    prefix = f"test_merge_{uuid.uuid4().hex[:8]}"
+    manager.queue_settings = type(
+        "S",
+        (),
+        {
+            "QUEUE_KEY_PREFIX": prefix,
+            "QUEUE_BATCH_SIZE": 10,
+            "QUEUE_FLUSH_INTERVAL": 30,
+            "QUEUE_DLQ_PAYLOAD_TTL": 3600,
+            "WORKER_POLL_INTERVAL": 1.0,
+            "WORKER_MAX_THREADS": 4,
+            "QUEUE_MERGE_COLLECTIONS": True,
+            "QUEUE_MERGE_MAX_BYTES": 10 * 1024 * 1024,
+            "BACKEND": "opensearch",
+            "LOG_LEVEL": "DEBUG",
+        },
+    )()
+
+    yield manager
+
+    cursor = 0
+    while True:
+        cursor, keys = await redis.scan(cursor, match=f"{prefix}:*", count=100)
+        if keys:
+            await redis.delete(*keys)
+        if cursor == 0:
+            break
+    await redis.aclose()
+
+
+def test_group_failed_ids_by_collection():
+    errors = [
+        {"index": {"_id": "a|col-1", "status": 400}},
+        {"create": {"_id": "b|col-2", "status": 400}},
+        {"index": {"_id": "c|col-1", "status": 400}},
+        {"index": {}},
+    ]
+    assert failed_item_ids_by_collection(errors) == {
+        "col-1": {"a", "c"},
+        "col-2": {"b"},
+    }
+
+
+def test_group_failed_ids_by_collection_empty():
+    assert failed_item_ids_by_collection([]) == {}
+
+
+@pytest.mark.asyncio
+async def test_get_queue_lengths(queue_manager):
+    await queue_manager.queue_items("col-a", [_valid_item("col-a") for _ in range(3)])
+    await queue_manager.queue_items("col-b", [_valid_item("col-b")])
+
+    lengths = await queue_manager.get_queue_lengths(["col-a", "col-b", "col-c"])
+    assert lengths == {"col-a": 3, "col-b": 1, "col-c": 0}
+
+
+@pytest.mark.asyncio
+async def test_merged_flush_single_bulk_request(queue_manager):
+    for col in ("col-a", "col-b", "col-c"):
+        await queue_manager.queue_items(col, [_valid_item(col) for _ in range(2)])
+
+    db = _mock_db()
+    db.bulk_async_actions.return_value = (6, [])
+    worker = _make_worker(queue_manager, db)
+
+    await worker._flush_merged(["col-a", "col-b", "col-c"])
+
+    db.bulk_async_actions.assert_awaited_once()
+    actions = db.bulk_async_actions.await_args.args[0]
+    assert {a["_index"] for a in actions} == {
+        "items_col-a",
+        "items_col-b",
+        "items_col-c",
+    }
+    for col in ("col-a", "col-b", "col-c"):
+        assert await queue_manager.get_queue_length(col) == 0
+        assert not worker._get_state(col).processing
+
+
+@pytest.mark.asyncio
+async def test_merged_flush_routes_failures_per_collection(queue_manager):
+    items_a = [_valid_item("col-a", f"a-{i}") for i in range(2)]
+    items_b = [_valid_item("col-b", f"b-{i}") for i in range(2)]
+    await queue_manager.queue_items("col-a", items_a)
+    await queue_manager.queue_items("col-b", items_b)
+
+    db = _mock_db()
+    db.bulk_async_actions.return_value = (
+        3,
+        [{"index": {"_id": mk_item_id("b-1", "col-b"), "status": 400}}],
+    )
+    worker = _make_worker(queue_manager, db)
+
+    await worker._flush_merged(["col-a", "col-b"])
+
+    assert await queue_manager.get_queue_length("col-a") == 0
+    assert await queue_manager.get_queue_length("col-b") == 0
+    assert await queue_manager.redis.smembers(
+        queue_manager._get_failed_set_key("col-b")
+    ) == {"b-1"}
+    assert not await queue_manager.redis.exists(
+        queue_manager._get_failed_set_key("col-a")
+    )
+
+
+@pytest.mark.asyncio
+async def test_merged_flush_splits_on_byte_budget(queue_manager):
+    for col in ("col-a", "col-b", "col-c"):
+        await queue_manager.queue_items(col, [_valid_item(col)])
+
+    db = _mock_db()
+    db.bulk_async_actions.return_value = (1, [])
+    # Budget fits a single item, so every collection gets its own request
+    worker = _make_worker(queue_manager, db, max_bytes=100)
+
+    await worker._flush_merged(["col-a", "col-b", "col-c"])
+
+    assert db.bulk_async_actions.await_count == 3
+    for call in db.bulk_async_actions.await_args_list:
+        assert call.kwargs["max_chunk_bytes"] == 100
+
+
+@pytest.mark.asyncio
+async def test_merged_flush_bulk_exception_keeps_items(queue_manager):
+    await queue_manager.queue_items("col-a", [_valid_item("col-a")])
+    await queue_manager.queue_items("col-b", [_valid_item("col-b")])
+
+    db = _mock_db()
+    db.bulk_async_actions.side_effect = Exception("cluster unavailable")
+    worker = _make_worker(queue_manager, db)
+
+    await worker._flush_merged(["col-a", "col-b"])
+
+    assert await queue_manager.get_queue_length("col-a") == 1
+    assert await queue_manager.get_queue_length("col-b") == 1
+    assert not await queue_manager.redis.exists(
+        worker._get_collection_lock_key("col-a")
+    )
+
+
+@pytest.mark.asyncio
+async def test_merged_flush_skips_locked_collection(queue_manager):
+    await queue_manager.queue_items("col-a", [_valid_item("col-a")])
+    await queue_manager.queue_items("col-b", [_valid_item("col-b")])
+
+    db = _mock_db()
+    db.bulk_async_actions.return_value = (1, [])
+    worker = _make_worker(queue_manager, db)
+
+    other_lock = queue_manager.redis.lock(
+        worker._get_collection_lock_key("col-b"), timeout=30
+    )
+    assert await other_lock.acquire(blocking=False)
+    try:
+        await worker._flush_merged(["col-a", "col-b"])
+    finally:
+        await other_lock.release()
+
+    assert await queue_manager.get_queue_length("col-a") == 0
+    assert await queue_manager.get_queue_length("col-b") == 1
+
+
+@pytest.mark.asyncio
+async def test_dispatch_merged_separates_full_batches(queue_manager):
+    await queue_manager.queue_items("big", [_valid_item("big") for _ in range(10)])
+    await queue_manager.queue_items("small-1", [_valid_item("small-1")])
+    await queue_manager.queue_items("small-2", [_valid_item("small-2")])
+
+    worker = _make_worker(queue_manager, _mock_db())
+    worker._flush_collection = AsyncMock()
+    worker._flush_merged = AsyncMock()
+
+    active_tasks: dict = {}
+    await worker._dispatch_merged(["big", "small-1", "small-2"], active_tasks)
+    await asyncio.gather(*set(active_tasks.values()))
+
+    worker._flush_collection.assert_awaited_once_with("big")
+    worker._flush_merged.assert_awaited_once_with(["small-1", "small-2"])
+    assert active_tasks["small-1"] is active_tasks["small-2"]
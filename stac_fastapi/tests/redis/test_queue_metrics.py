@@ -0,0 +1,190 @@
+import asyncio
+import sys
+import time
+import uuid
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+import pytest_asyncio
+
+_repo_root = Path(__file__).resolve()
+while _repo_root != _repo_root.parent and not (_repo_root / "scripts").is_dir():
+    _repo_root = _repo_root.parent
+if str(_repo_root) not in sys.path:
+    sys.path.insert(0, str(_repo_root))
+
+from scripts.item_queue_worker import ItemQueueWorker  # noqa: E402
+from stac_fastapi.core.redis_utils import (  # noqa: E402
+    AsyncRedisQueueManager,
+    connect_redis,
+)
+
+metrics_module = pytest.importorskip("stac_fastapi.sfeos_helpers.metrics")
+QueueWorkerMetrics = metrics_module.QueueWorkerMetrics
+
+
+def _item(collection_id, item_id=None):
+    return {
+        "id": item_id or str(uuid.uuid4()),
+        "collection": collection_id,
+        "properties": {"datetime": "2020-02-12T12:30:22Z"},
+    }
+
+
+def _sample(metrics, name, labels=None):
+    return metrics.registry.get_sample_value(name, labels or {})
+
+
+@pytest_asyncio.fixture
+async def queue_manager():
+    redis = await connect_redis()
+    if redis is None:
+        pytest.skip("Redis not configured")
+
+    manager = AsyncRedisQueueManager(redis)
+    prefix = f"test_metrics_{uuid.uuid4().hex[:8]}"
+    manager.queue_settings = type(
+        "S",
+        (),
+        {
+            "QUEUE_KEY_PREFIX": prefix,
+            "QUEUE_BATCH_SIZE": 10,
+            "QUEUE_FLUSH_INTERVAL": 30,
+            "QUEUE_DLQ_PAYLOAD_TTL": 3600,
+            "WORKER_POLL_INTERVAL": 1.0,
+            "WORKER_MAX_THREADS": 4,
+            "BACKEND": "opensearch",
+            "LOG_LEVEL": "DEBUG",
+        },
+    )()
+
+    yield manager
+
+    cursor = 0
+    while True:
+        cursor, keys = await redis.scan(cursor, match=f"{prefix}:*", count=100)
+        if keys:
+            await redis.delete(*keys)
+        if cursor == 0:
+            break
+    await redis.aclose()
+
+
+def test_update_queue_state_sets_gauges():
+    metrics = QueueWorkerMetrics()
+    now = time.time()
+    metrics.update_queue_state(
+        {
+            "col-a": {"depth": 5, "oldest_enqueued_at": now - 42, "failed": 2},
+            "col-b": {"depth": 0, "oldest_enqueued_at": None, "failed": 7},
+        },
+        now=now,
+    )
+
+    assert _sample(metrics, "item_queue_depth", {"collection": "col-a"}) == 5
+    assert _sample(
+        metrics, "item_queue_oldest_item_age_seconds", {"collection": "col-a"}
+    ) == pytest.approx(42)
+    assert _sample(metrics, "item_queue_dlq_items", {"collection": "col-b"}) == 7
+    assert _sample(metrics, "item_queue_state_refresh_timestamp_seconds") == now
+
+
+def test_update_queue_state_drops_drained_collections():
+    metrics = QueueWorkerMetrics()
+    metrics.update_queue_state(
+        {"col-a": {"depth": 1, "oldest_enqueued_at": None, "failed": 0}}
+    )
+    metrics.update_queue_state({})
+
+    assert _sample(metrics, "item_queue_depth", {"collection": "col-a"}) is None
+
+
+def test_metrics_use_isolated_registries():
+    first = QueueWorkerMetrics()
+    second = QueueWorkerMetrics()
+    first.bulk_items.labels("indexed").inc(3)
+
+    assert _sample(first, "item_queue_bulk_items_total", {"outcome": "indexed"}) == 3
+    assert (
+        _sample(second, "item_queue_bulk_items_total", {"outcome": "indexed"}) is None
+    )
+
+
+@pytest.mark.asyncio
+async def test_get_queue_stats(queue_manager):
+    before = time.time()
+    await queue_manager.queue_items("col-a", [_item("col-a") for _ in range(3)])
+    await queue_manager.save_failed_items("col-b", ["x", "y"])
+
+    stats = await queue_manager.get_queue_stats()
+
+    assert stats["col-a"]["depth"] == 3
+    assert stats["col-a"]["oldest_enqueued_at"] >= before - 1
+    assert stats["col-a"]["failed"] == 0
+    assert stats["col-b"] == {"depth": 0, "oldest_enqueued_at": None, "failed": 2}
+
+
+@pytest.mark.asyncio
+async def test_requeue_keeps_first_enqueue_time(queue_manager):
+    item = _item("col-a", "item-1")
+    await queue_manager.queue_items("col-a", item)
+    enqueued_key = queue_manager._get_enqueued_key("col-a")
+    first = await queue_manager.redis.zscore(enqueued_key, "item-1")
+
+    await asyncio.sleep(0.01)
+    await queue_manager.queue_items("col-a", item)
+
+    assert await queue_manager.redis.zscore(enqueued_key, "item-1") == first
+
+
+@pytest.mark.asyncio
+async def test_mark_processed_clears_enqueue_times(queue_manager):
+    await queue_manager.queue_items("col-a", [_item("col-a", "a"), _item("col-a", "b")])
+    enqueued_key = queue_manager._get_enqueued_key("col-a")
+
+    await queue_manager.mark_items_processed("col-a", ["a"])
+    assert await queue_manager.redis.zrange(enqueued_key, 0, -1) == ["b"]
+
+    await queue_manager.mark_items_processed("col-a", ["b"])
+    assert await queue_manager.redis.exists(enqueued_key) == 0
+
+
+@pytest.mark.asyncio
+async def test_flush_records_worker_metrics(queue_manager):
+    col = "col-metrics"
+    await queue_manager.queue_items(col, [_item(col, f"i-{n}") for n in range(3)])
+
+    worker = ItemQueueWorker.__new__(ItemQueueWorker)
+    worker.settings = queue_manager.queue_settings
+    worker.queue_manager = queue_manager
+    worker.db = MagicMock()
+    worker.db.bulk_async = AsyncMock(
+        return_value=(2, [{"index": {"_id": f"i-2|{col}", "status": 400}}])
+    )
+    worker.db.split_unchanged_items = AsyncMock(
+        side_effect=lambda cid, items: (items, [])
+    )
+    worker._states = {}
+    worker._lock = asyncio.Lock()
+    worker._semaphore = asyncio.Semaphore(4)
+    worker.running = True
+    worker.metrics = QueueWorkerMetrics()
+
+    await worker._flush_collection(col)
+
+    metrics = worker.metrics
+    assert _sample(metrics, "item_queue_bulk_items_total", {"outcome": "indexed"}) == 2
+    assert _sample(metrics, "item_queue_bulk_items_total", {"outcome": "failed"}) == 1
+    assert (
+        _sample(
+            metrics,
+            "item_queue_dlq_items_added_total",
+            {"collection": col, "reason": "DB failures"},
+        )
+        == 1
+    )
+    assert (
+        _sample(metrics, "item_queue_batch_duration_seconds_count", {"mode": "single"})
+        == 1
+    )
@@ -2,7 +2,15 @@ import pytest
 from redis.exceptions import ConnectionError as RedisConnectionError
 
 import stac_fastapi.core.redis_utils as redis_utils
-from stac_fastapi.core.redis_utils import connect_redis, get_prev_link, save_prev_link
+from stac_fastapi.core.redis_utils import (
+    AsyncRedisQueueManager,
+    close_redis,
+    connect_redis,
+    get_prev_link,
+    get_redis,
+    save_and_get_prev_link,
+    save_prev_link,
+)
 
 
 @pytest.mark.asyncio
@@ -138,3 +146,84 @@ async def test_redis_retry_raises_after_exhaustion(monkeypatch):
 
     with pytest.raises(RedisConnectionError):
         await always_fail()
+
+
+class FakePipeline:
+    def __init__(self, store, executed):
+        self.store = store
+        self.executed = executed
+        self.commands = []
+
+    def setex(self, key, ttl, value):
+        self.commands.append(("setex", key, value))
+
+    def get(self, key):
+        self.commands.append(("get", key))
+
+    async def execute(self):
+        self.executed.append([c[0] for c in self.commands])
+        results = []
+        for command in self.commands:
+            if command[0] == "setex":
+                self.store[command[1]] = command[2]
+                results.append(True)
+            else:
+                results.append(self.store.get(command[1]))
+        return results
+
+
+class FakeRedis:
+    def __init__(self):
+        self.store = {}
+        self.executed = []
+        self.closed = False
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self.store, self.executed)
+
+    async def aclose(self):
+        self.closed = True
+
+
+@pytest.mark.asyncio
+async def test_prev_links_are_saved_and_read_in_one_round_trip():
+    redis = FakeRedis()
+    first_url = "http://mywebsite.com/search"
+
+    assert await save_and_get_prev_link(redis, first_url, None, "t1") is None
+    second_url = f"{first_url}?token=t1"
+    prev_link = await save_and_get_prev_link(
+        redis, second_url, "t1", "t2", current_method="POST", current_body={"a": 1}
+    )
+
+    assert prev_link == {"href": first_url, "method": "GET"}
+    assert redis.executed == [["setex"], ["setex", "get"]]
+    third_url = f"{first_url}?token=t2"
+    assert await save_and_get_prev_link(redis, third_url, "t2", None) == {
+        "href": second_url,
+        "method": "POST",
+        "body": {"a": 1},
+    }
+
+
+@pytest.mark.asyncio
+async def test_shared_redis_client_is_created_once(monkeypatch):
+    created = []
+
+    async def fake_connect():
+        created.append(FakeRedis())
+        return created[-1]
+
+    monkeypatch.setattr(redis_utils, "connect_redis", fake_connect)
+    await close_redis()
+
+    first = await get_redis()
+    second = await get_redis()
+    queue_manager = await AsyncRedisQueueManager.create()
+    await queue_manager.close()
+
+    assert first is second is queue_manager.redis
+    assert len(created) == 1
+    assert first.closed is False
+    await close_redis()
+    assert first.closed is True
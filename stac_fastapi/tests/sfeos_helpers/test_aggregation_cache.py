@@ -0,0 +1,88 @@
+"""Tests for the aggregation result cache."""
+
+import asyncio
+
+import pytest
+
+from stac_fastapi.core.write_generations import WriteGenerations, bumps_write_generation
+from stac_fastapi.sfeos_helpers.aggregation import (
+    AggregationCache,
+    aggregation_cache_key,
+)
+
+
+class Counter:
+    def __init__(self):
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        return {"aggregations": {"total_count": {"value": self.calls}}}
+
+
+def test_cache_key_ignores_list_order_and_unset_fields():
+    first = aggregation_cache_key(
+        {"collections": ["b", "a"], "aggregations": ["x", "y"], "bbox": None},
+        interval="month",
+    )
+    second = aggregation_cache_key(
+        {"aggregations": ["y", "x"], "collections": ["a", "b"]}, interval="month"
+    )
+
+    assert first == second
+    assert first != aggregation_cache_key(
+        {"aggregations": ["y", "x"], "collections": ["a", "b"]}, interval="year"
+    )
+
+
+@pytest.mark.asyncio
+async def test_writes_invalidate_their_collection_and_the_catalog():
+    generations = WriteGenerations()
+    cache = AggregationCache(ttl=60, generations=generations)
+    col_a, col_b, catalog = Counter(), Counter(), Counter()
+
+    for _ in range(2):
+        await cache.get_or_compute("a", ["a"], col_a)
+        await cache.get_or_compute("b", ["b"], col_b)
+        await cache.get_or_compute("all", None, catalog)
+    await generations.bump(["a"])
+    await cache.get_or_compute("a", ["a"], col_a)
+    await cache.get_or_compute("b", ["b"], col_b)
+    await cache.get_or_compute("all", None, catalog)
+
+    assert (col_a.calls, col_b.calls, catalog.calls) == (2, 1, 2)
+
+
+@pytest.mark.asyncio
+async def test_outdated_entries_are_served_while_refreshed():
+    generations = WriteGenerations()
+    cache = AggregationCache(ttl=60, max_staleness=60, generations=generations)
+    compute = Counter()
+
+    await cache.get_or_compute("key", ["a"], compute)
+    await generations.bump(["a"])
+    stale = await cache.get_or_compute("key", ["a"], compute)
+    await asyncio.gather(*cache._refreshing.values())
+    fresh = await cache.get_or_compute("key", ["a"], compute)
+
+    assert stale["aggregations"]["total_count"]["value"] == 1
+    assert fresh["aggregations"]["total_count"]["value"] == 2
+    assert compute.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_decorated_writes_bump_the_collection_generation(monkeypatch):
+    generations = WriteGenerations()
+    monkeypatch.setattr(
+        "stac_fastapi.core.write_generations.write_generations", generations
+    )
+
+    @bumps_write_generation
+    async def delete_item(item_id, collection_id, **kwargs):
+        return None
+
+    before = await generations.get(["col"])
+    await delete_item("item", collection_id="col")
+
+    assert await generations.get(["col"]) != before
+    assert await generations.get(["other"]) == (0,)
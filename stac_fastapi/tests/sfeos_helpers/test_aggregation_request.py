@@ -0,0 +1,206 @@
+"""Tests for hit-free aggregation requests."""
+
+from copy import deepcopy
+
+import pytest
+
+from stac_fastapi.sfeos_helpers.aggregation.format import frequency_agg
+from stac_fastapi.sfeos_helpers.database import (
+    add_total_count_shared,
+    aggregation_search_params_shared,
+    build_aggregation_body_shared,
+    composite_aggregations_shared,
+    decode_aggregation_token,
+    page_composite_aggregations_shared,
+    sample_aggregations_shared,
+    scale_sampled_aggregations_shared,
+)
+from stac_fastapi.sfeos_helpers.database.aggregation import (
+    get_aggregation_sample_probability,
+)
+from stac_fastapi.sfeos_helpers.mappings import AGGREGATION_MAPPING
+
+
+def _requested(*names):
+    return {name: deepcopy(AGGREGATION_MAPPING[name]) for name in names}
+
+
+def test_body_has_no_hits_and_counts_from_hits_total():
+    query = {"term": {"collection": "col"}}
+
+    body = build_aggregation_body_shared(
+        query, _requested("total_count", "platform_frequency")
+    )
+
+    assert body["size"] == 0
+    assert body["track_total_hits"] is True
+    assert body["query"] == query
+    assert list(body["aggregations"]) == ["platform_frequency"]
+
+
+def test_custom_total_count_aggregation_is_kept():
+    custom = {"total_count": {"cardinality": {"field": "properties.platform"}}}
+
+    body = build_aggregation_body_shared(None, custom)
+
+    assert body["aggregations"] == custom
+    assert "query" not in body
+
+
+def test_total_count_is_added_from_hits_total():
+    response = {"hits": {"total": {"value": 42, "relation": "eq"}, "hits": []}}
+
+    result = add_total_count_shared(response, _requested("total_count"))
+
+    assert result["aggregations"]["total_count"] == {"value": 42}
+    assert (
+        "total_count"
+        not in add_total_count_shared({"hits": {"total": {"value": 1}}}, {})[
+            "aggregations"
+        ]
+    )
+
+
+def test_preference_is_stable_per_request(monkeypatch):
+    monkeypatch.setenv("AGGREGATION_SHARD_PREFERENCE", "true")
+    body = build_aggregation_body_shared(None, _requested("datetime_frequency"))
+    other = build_aggregation_body_shared(
+        {"term": {"collection": "col"}}, _requested("datetime_frequency")
+    )
+
+    params = aggregation_search_params_shared("items_col", body)
+
+    assert params["request_cache"] is True
+    assert params == aggregation_search_params_shared("items_col", deepcopy(body))
+    assert (
+        params["preference"]
+        != aggregation_search_params_shared("items_col", other)["preference"]
+    )
+    assert not params["preference"].startswith("_")
+
+    monkeypatch.setenv("AGGREGATION_SHARD_PREFERENCE", "false")
+    assert "preference" not in aggregation_search_params_shared("items_col", body)
+
+
+def test_only_frequency_aggregations_are_sampled():
+    body = build_aggregation_body_shared(
+        None, _requested("datetime_min", "platform_frequency")
+    )
+
+    sampled = sample_aggregations_shared(
+        body, {"sampler": {"shard_size": 100}}, random_score=True
+    )
+
+    assert set(sampled["aggregations"]) == {"datetime_min", "sample"}
+    assert sampled["aggregations"]["sample"]["aggs"] == _requested("platform_frequency")
+    assert sampled["query"]["function_score"]["query"] == {"match_all": {}}
+
+
+def test_sampled_counts_are_scaled_and_flagged():
+    response = {
+        "hits": {"total": {"value": 1000}},
+        "aggregations": {
+            "datetime_min": {"value": 1},
+            "sample": {
+                "doc_count": 100,
+                "platform_frequency": {
+                    "sum_other_doc_count": 3,
+                    "buckets": [{"key": "s2a", "doc_count": 60}],
+                },
+            },
+        },
+    }
+
+    aggs = scale_sampled_aggregations_shared(response)["aggregations"]
+    formatted = frequency_agg(aggs, "platform_frequency", "string")
+
+    assert set(aggs) == {"datetime_min", "platform_frequency"}
+    assert formatted["buckets"][0]["frequency"] == 600
+    assert formatted["overflow"] == 30
+    assert formatted["estimated"] is True
+
+
+def test_random_sampler_counts_are_only_flagged():
+    # random_sampler scales the bucket counts, but not its own doc_count
+    response = {
+        "hits": {"total": {"value": 1000}},
+        "aggregations": {
+            "sample": {
+                "doc_count": 100,
+                "platform_frequency": {
+                    "sum_other_doc_count": 30,
+                    "buckets": [{"key": "s2a", "doc_count": 600}],
+                },
+            },
+        },
+    }
+
+    aggs = scale_sampled_aggregations_shared(response, rescale=False)["aggregations"]
+    formatted = frequency_agg(aggs, "platform_frequency", "string")
+
+    assert formatted["buckets"][0]["frequency"] == 600
+    assert formatted["overflow"] == 30
+    assert formatted["estimated"] is True
+
+
+@pytest.mark.parametrize(
+    "value, expected", [("0.2", 0.2), ("0.7", 0.5), ("1", 1.0), ("0", 0.1)]
+)
+def test_sample_probability_is_one_random_sampler_accepts(monkeypatch, value, expected):
+    monkeypatch.setenv("AGGREGATION_SAMPLE_PROBABILITY", value)
+
+    assert get_aggregation_sample_probability() == expected
+
+
+def test_terms_aggregations_are_paged_with_composite():
+    after = {"platform_frequency": {"platform_frequency": "s2a"}}
+    aggregations, paged = composite_aggregations_shared(
+        _requested("platform_frequency", "collection_frequency", "datetime_min"),
+        2,
+        {**after, "collection_frequency": None},
+    )
+
+    assert paged == ["platform_frequency", "collection_frequency"]
+    assert set(aggregations) == {"platform_frequency", "datetime_min"}
+    assert aggregations["platform_frequency"]["composite"] == {
+        "size": 2,
+        "sources": [
+            {"platform_frequency": {"terms": {"field": "properties.platform"}}}
+        ],
+        "after": after["platform_frequency"],
+    }
+
+
+def test_next_token_continues_unfinished_aggregations():
+    response = {
+        "aggregations": {
+            "platform_frequency": {
+                "after_key": {"platform_frequency": "s2b"},
+                "buckets": [
+                    {"key": {"platform_frequency": "s2a"}, "doc_count": 3},
+                    {"key": {"platform_frequency": "s2b"}, "doc_count": 1},
+                ],
+            },
+            "grid_code_frequency": {
+                "after_key": {"grid_code_frequency": "A"},
+                "buckets": [{"key": {"grid_code_frequency": "A"}, "doc_count": 1}],
+            },
+        }
+    }
+
+    paged = page_composite_aggregations_shared(
+        response,
+        ["platform_frequency", "grid_code_frequency", "collection_frequency"],
+        2,
+    )
+    formatted = frequency_agg(paged["aggregations"], "platform_frequency", "string")
+
+    assert decode_aggregation_token(paged["next_token"]) == {
+        "platform_frequency": {"platform_frequency": "s2b"},
+        "grid_code_frequency": None,
+        "collection_frequency": None,
+    }
+    assert [bucket["key"] for bucket in formatted["buckets"]] == ["s2a", "s2b"]
+    assert paged["aggregations"]["collection_frequency"] == {"buckets": []}
+    with pytest.raises(ValueError):
+        decode_aggregation_token("not-a-token")
@@ -0,0 +1,61 @@
+"""Tests for deleting items by id with a single bulk request."""
+
+import pytest
+
+from stac_fastapi.sfeos_helpers.database import delete_items_by_id_shared, mk_item_id
+
+
+class FakeClient:
+    """Resolves stored documents to their concrete index for an `ids` query."""
+
+    def __init__(self, stored):
+        self.stored = stored
+
+    async def search(self, index, body, **kwargs):
+        hits = [
+            {"_id": doc_id, "_index": self.stored[doc_id], "_source": {}}
+            for doc_id in body["query"]["ids"]["values"]
+            if doc_id in self.stored
+        ]
+        return {"hits": {"hits": hits}}
+
+
+@pytest.mark.asyncio
+async def test_delete_by_id_targets_concrete_indexes_and_reports_missing():
+    client = FakeClient(
+        {
+            mk_item_id("a", "col"): "items_datetime_col_2020",
+            mk_item_id("b", "col"): "items_datetime_col_2021",
+            mk_item_id("c", "col"): "items_datetime_col_2021",
+        }
+    )
+    sent = []
+
+    async def bulk_helper(client, actions, refresh, raise_on_error):
+        sent.extend(actions)
+        # "c" was deleted by someone else in between
+        return 2, [{"delete": {"_id": mk_item_id("c", "col"), "status": 404}}]
+
+    report = await delete_items_by_id_shared(
+        client, "col", ["a", "b", "c", "missing", "a"], bulk_helper, refresh="true"
+    )
+
+    assert sorted((a["_id"], a["_index"]) for a in sent) == [
+        (mk_item_id("a", "col"), "items_datetime_col_2020"),
+        (mk_item_id("b", "col"), "items_datetime_col_2021"),
+        (mk_item_id("c", "col"), "items_datetime_col_2021"),
+    ]
+    assert all(action["_op_type"] == "delete" for action in sent)
+    assert report == {"deleted": 2, "not_found": ["missing", "c"], "errors": []}
+
+
+@pytest.mark.asyncio
+async def test_delete_by_id_skips_bulk_request_when_nothing_exists():
+    async def bulk_helper(*args, **kwargs):
+        raise AssertionError("no bulk request expected")
+
+    report = await delete_items_by_id_shared(
+        FakeClient({}), "col", ["missing"], bulk_helper
+    )
+
+    assert report == {"deleted": 0, "not_found": ["missing"], "errors": []}
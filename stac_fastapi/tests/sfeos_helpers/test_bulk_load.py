@@ -0,0 +1,187 @@
+"""Tests for bulk-load sessions against an in-memory client."""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from stac_fastapi.sfeos_helpers.database import (
+    finish_bulk_load_session_shared,
+    get_bulk_load_session_shared,
+    index_alias_by_collection_id,
+    revert_stale_bulk_load_sessions_shared,
+    start_bulk_load_session_shared,
+)
+
+
+class FakeIndices:
+    def __init__(self, client):
+        self.client = client
+        self.refreshed = []
+        self.forcemerged = []
+
+    async def create(self, index, body, **kwargs):
+        self.client.created.add(index)
+
+    async def get_settings(self, index, **kwargs):
+        return {
+            name: {"settings": dict(data["settings"])}
+            for name, data in self.client.item_indexes.items()
+            if index in data["aliases"]
+        }
+
+    async def put_settings(self, index, body):
+        for name in index.split(","):
+            settings = self.client.item_indexes[name]["settings"]
+            for key, value in body["index"].items():
+                if value is None:
+                    settings.pop(f"index.{key}", None)
+                else:
+                    settings[f"index.{key}"] = value
+
+    async def refresh(self, index):
+        self.refreshed.append(index)
+
+    async def get_alias(self, index):
+        return {
+            name: {
+                "aliases": {a: {} for a in self.client.item_indexes[name]["aliases"]}
+            }
+            for name in index.split(",")
+        }
+
+    async def forcemerge(self, index, **kwargs):
+        self.forcemerged.append(index)
+        return {"task": f"node:{len(self.forcemerged)}"}
+
+
+class FakeCluster:
+    async def health(self, index, wait_for_status, timeout):
+        return {"status": "green", "timed_out": False}
+
+
+class FakeClient:
+    """Implements the subset of the async client used by bulk-load sessions."""
+
+    def __init__(self, item_indexes):
+        self.item_indexes = item_indexes
+        self.sessions = {}
+        self.created = set()
+        self.indices = FakeIndices(self)
+        self.cluster = FakeCluster()
+
+    async def index(self, index, id, body, refresh):
+        self.sessions[id] = body
+
+    async def delete(self, index, id, refresh):
+        del self.sessions[id]
+
+    async def search(self, index, body):
+        query = body["query"]
+        if "ids" in query:
+            hits = [
+                s for key, s in self.sessions.items() if key in query["ids"]["values"]
+            ]
+        else:
+            limit = datetime.fromisoformat(query["range"]["expires_at"]["lt"])
+            hits = [
+                s
+                for s in self.sessions.values()
+                if datetime.fromisoformat(s["expires_at"]) < limit
+            ]
+        return {"hits": {"hits": [{"_source": s} for s in hits]}}
+
+
+def _client():
+    alias = index_alias_by_collection_id("test-collection")
+    return FakeClient(
+        {
+            "items_test-collection_1": {
+                "aliases": {alias, f"{alias}_2020-01-01-2020-06-30"},
+                "settings": {"index.number_of_replicas": "1"},
+            },
+            "items_test-collection_2": {
+                "aliases": {alias, f"{alias}_2020-07-01"},
+                "settings": {
+                    "index.number_of_replicas": "2",
+                    "index.refresh_interval": "5s",
+                },
+            },
+        }
+    )
+
+
+@pytest.mark.asyncio
+async def test_start_session_retunes_indexes_and_saves_originals():
+    client = _client()
+
+    session = await start_bulk_load_session_shared(client, "test-collection", ttl=60)
+
+    for data in client.item_indexes.values():
+        assert data["settings"]["index.refresh_interval"] == "-1"
+        assert data["settings"]["index.number_of_replicas"] == "0"
+    assert session["indexes"]["items_test-collection_1"] == {
+        "refresh_interval": None,
+        "number_of_replicas": "1",
+    }
+    assert await get_bulk_load_session_shared(client, "test-collection") == session
+
+
+@pytest.mark.asyncio
+async def test_renewing_session_keeps_originals_and_tunes_new_indexes():
+    client = _client()
+    first = await start_bulk_load_session_shared(client, "test-collection", ttl=60)
+    first_expiry = first["expires_at"]
+    client.item_indexes["items_test-collection_3"] = {
+        "aliases": {index_alias_by_collection_id("test-collection")},
+        "settings": {"index.number_of_replicas": "1"},
+    }
+
+    renewed = await start_bulk_load_session_shared(client, "test-collection", ttl=600)
+
+    assert renewed["indexes"]["items_test-collection_2"] == {
+        "refresh_interval": "5s",
+        "number_of_replicas": "2",
+    }
+    assert "items_test-collection_3" in renewed["indexes"]
+    assert renewed["expires_at"] > first_expiry
+    settings = client.item_indexes["items_test-collection_3"]["settings"]
+    assert settings["index.refresh_interval"] == "-1"
+
+
+@pytest.mark.asyncio
+async def test_finish_session_restores_settings_and_forcemerges_closed_indexes():
+    client = _client()
+    await start_bulk_load_session_shared(client, "test-collection", ttl=60)
+
+    report = await finish_bulk_load_session_shared(
+        client, "test-collection", forcemerge=True
+    )
+
+    assert client.item_indexes["items_test-collection_1"]["settings"] == {
+        "index.number_of_replicas": "1"
+    }
+    assert client.item_indexes["items_test-collection_2"]["settings"] == {
+        "index.number_of_replicas": "2",
+        "index.refresh_interval": "5s",
+    }
+    assert client.indices.forcemerged == ["items_test-collection_1"]
+    assert report["health"] == {"status": "green", "timed_out": False}
+    assert client.sessions == {}
+    assert await finish_bulk_load_session_shared(client, "test-collection") is None
+
+
+@pytest.mark.asyncio
+async def test_revert_stale_sessions_only_reverts_expired_leases():
+    client = _client()
+    await start_bulk_load_session_shared(client, "test-collection", ttl=60)
+
+    assert await revert_stale_bulk_load_sessions_shared(client) == []
+    assert "test-collection" in client.sessions
+
+    expired = datetime.now(timezone.utc) - timedelta(seconds=1)
+    client.sessions["test-collection"]["expires_at"] = expired.isoformat()
+
+    assert await revert_stale_bulk_load_sessions_shared(client) == ["test-collection"]
+    assert client.sessions == {}
+    settings = client.item_indexes["items_test-collection_1"]["settings"]
+    assert settings == {"index.number_of_replicas": "1"}
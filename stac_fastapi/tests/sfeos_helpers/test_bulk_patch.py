@@ -0,0 +1,123 @@
+"""Tests for applying one patch to many items."""
+
+import pytest
+from fastapi import HTTPException
+from pydantic import TypeAdapter
+
+from stac_fastapi.extensions.transaction.request import (
+    PartialItem,
+    PatchAddReplaceTest,
+    PatchMoveCopy,
+)
+from stac_fastapi.sfeos_helpers.database import (
+    bulk_patch_to_script,
+    mk_item_id,
+    patch_items_by_id_shared,
+)
+
+
+class FakeClient:
+    """Resolves stored documents to their concrete index for an `ids` query."""
+
+    def __init__(self, stored):
+        self.stored = stored
+
+    async def search(self, index, body, **kwargs):
+        hits = [
+            {"_id": doc_id, "_index": self.stored[doc_id], "_source": {}}
+            for doc_id in body["query"]["ids"]["values"]
+            if doc_id in self.stored
+        ]
+        return {"hits": {"hits": hits}}
+
+
+def test_script_is_parameterized_and_drops_content_hash():
+    validated = []
+    operations = [
+        PatchAddReplaceTest(
+            op="add", path="/properties/processing:version", value="2.0"
+        )
+    ]
+
+    script = bulk_patch_to_script(operations, validated.append)
+    other = bulk_patch_to_script(
+        [
+            PatchAddReplaceTest(
+                op="add", path="/properties/processing:version", value="3.0"
+            )
+        ],
+        validated.append,
+    )
+
+    assert script["source"] == other["source"]
+    assert "2.0" not in script["source"]
+    assert script["params"]["op0_value"] == "2.0"
+    assert "processing:version" not in script["source"]
+    assert script["source"].endswith("ctx._source.remove('content_hash');")
+    assert validated == ["properties/processing:version"] * 2
+
+
+def test_merge_patch_creates_missing_objects():
+    patch = TypeAdapter(PartialItem).validate_python(
+        {"properties": {"processing:version": "2.0"}}
+    )
+
+    script = bulk_patch_to_script(patch, lambda path: None)
+
+    assert "ctx._source[params.op0_0] = [:]" in script["source"]
+    assert script["params"]["op0_0"] == "properties"
+
+
+@pytest.mark.parametrize(
+    "operation",
+    [
+        PatchAddReplaceTest(op="replace", path="/collection", value="other"),
+        PatchMoveCopy(op="move", path="/properties/old_id", **{"from": "/id"}),
+    ],
+)
+def test_patches_moving_documents_are_rejected(operation):
+    with pytest.raises(HTTPException) as exc:
+        bulk_patch_to_script([operation], lambda path: None)
+    assert exc.value.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_patch_by_id_sends_one_script_and_reports_failures():
+    client = FakeClient(
+        {
+            mk_item_id("a", "col"): "items_datetime_col_2020",
+            mk_item_id("b", "col"): "items_datetime_col_2021",
+        }
+    )
+    script = {"source": "ctx._source.x = params.x;", "params": {"x": 1}}
+    sent = []
+
+    async def bulk_helper(client, actions, refresh, raise_on_error):
+        sent.extend(actions)
+        failure = {
+            "update": {
+                "_id": mk_item_id("b", "col"),
+                "status": 400,
+                "error": {"type": "painless_explain_error"},
+            }
+        }
+        return 1, [failure]
+
+    report = await patch_items_by_id_shared(
+        client, "col", ["a", "b", "missing"], script, bulk_helper
+    )
+
+    assert {action["_index"] for action in sent} == {
+        "items_datetime_col_2020",
+        "items_datetime_col_2021",
+    }
+    assert all(
+        action["_op_type"] == "update" and action["script"] is script for action in sent
+    )
+    assert report == {
+        "updated": 1,
+        "not_found": ["missing"],
+        "errors": [
+            {"id": "b", "status": 400, "error": {"type": "painless_explain_error"}}
+        ],
+    }
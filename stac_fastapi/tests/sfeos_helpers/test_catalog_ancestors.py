@@ -0,0 +1,140 @@
+"""Tests for the materialized ancestors of catalogs and collections."""
+
+import pytest
+
+from stac_fastapi.sfeos_helpers.database import (
+    backfill_ancestor_ids_shared,
+    resolve_ancestor_ids,
+    update_ancestor_ids_shared,
+)
+
+
+class FakeClient:
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.bodies = []
+
+    async def search(self, index, body, **kwargs):
+        self.bodies.append(body)
+        return {"hits": {"hits": [{"_source": doc} for doc in self.responses.pop(0)]}}
+
+
+class FakeBulk:
+    def __init__(self):
+        self.actions = []
+
+    async def __call__(self, client, actions, **kwargs):
+        self.actions.extend(actions)
+        return len(actions), []
+
+
+def test_ancestors_include_every_path():
+    ancestors = resolve_ancestor_ids(
+        {"sub": ["a", "b"], "leaf": ["sub"], "col": ["leaf", "c"]},
+        {"a": [], "b": ["root"], "c": []},
+    )
+
+    assert ancestors == {
+        "sub": ["a", "b", "root"],
+        "leaf": ["a", "b", "root", "sub"],
+        "col": ["a", "b", "c", "leaf", "root", "sub"],
+    }
+
+
+def test_missing_parents_and_cycles():
+    assert resolve_ancestor_ids({"col": ["deleted"]}, {}) == {"col": []}
+    assert resolve_ancestor_ids({"x": ["y"], "y": ["x"]}, {}) == {
+        "x": ["x", "y"],
+        "y": ["x", "y"],
+    }
+
+
+@pytest.mark.asyncio
+async def test_only_changed_descendants_are_rewritten():
+    # "sub" was unlinked from "old" and is now only below "new"
+    client = FakeClient(
+        [
+            {"id": "sub", "parent_ids": ["new"], "ancestor_ids": ["old"]},
+            {"id": "col", "parent_ids": ["sub"], "ancestor_ids": ["old", "sub"]},
+            {
+                "id": "other",
+                "parent_ids": ["sub", "new"],
+                "ancestor_ids": ["new", "sub"],
+            },
+        ],
+        [{"id": "new", "parent_ids": [], "ancestor_ids": []}],
+    )
+    bulk = FakeBulk()
+
+    updated = await update_ancestor_ids_shared(client, bulk, ["sub"])
+
+    assert updated == 2
+    assert {action["_id"]: action["doc"] for action in bulk.actions} == {
+        "sub": {"ancestor_ids": ["new"]},
+        "col": {"ancestor_ids": ["new", "sub"]},
+    }
+    assert client.bodies[0]["query"]["bool"]["should"][1] == {
+        "terms": {"ancestor_ids": ["sub"]}
+    }
+    assert client.bodies[1]["query"] == {"ids": {"values": ["new"]}}
+
+
+class FakeIndices:
+    def __init__(self):
+        self.meta = {"other": "kept"}
+        self.mapped = []
+
+    async def get_mapping(self, index):
+        return {index: {"mappings": {"_meta": dict(self.meta)}}}
+
+    async def put_mapping(self, index, body):
+        if "_meta" in body:
+            self.meta = body["_meta"]
+        self.mapped.append(body)
+
+
+class FakeCollectionsIndex:
+    """Collections index where `exists` does not match empty arrays."""
+
+    def __init__(self, *docs):
+        self.docs = {doc["id"]: dict(doc) for doc in docs}
+        self.indices = FakeIndices()
+        self.counts = 0
+
+    async def count(self, index, body):
+        self.counts += 1
+        return {
+            "count": sum(
+                1
+                for doc in self.docs.values()
+                if doc.get("parent_ids") and not doc.get("ancestor_ids")
+            )
+        }
+
+    async def search(self, index, body, **kwargs):
+        ids = body["query"].get("ids", {}).get("values")
+        docs = [
+            doc for doc_id, doc in self.docs.items() if ids is None or doc_id in ids
+        ]
+        return {"hits": {"hits": [{"_source": doc} for doc in docs]}}
+
+    async def bulk(self, client, actions, **kwargs):
+        for action in actions:
+            self.docs[action["_id"]].update(action["doc"])
+        return len(actions), []
+
+
+@pytest.mark.asyncio
+async def test_backfill_runs_once_when_parents_were_deleted():
+    # "col" is still linked to the deleted catalog "gone"
+    client = FakeCollectionsIndex(
+        {"id": "cat", "parent_ids": []},
+        {"id": "col", "parent_ids": ["gone"]},
+    )
+
+    assert await backfill_ancestor_ids_shared(client, client.bulk) == 2
+    assert client.docs["col"]["ancestor_ids"] == []
+    assert client.indices.meta == {"other": "kept", "ancestor_ids_backfilled": True}
+
+    assert await backfill_ancestor_ids_shared(client, client.bulk) == 0
+    assert client.counts == 1
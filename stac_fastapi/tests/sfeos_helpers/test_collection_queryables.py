@@ -0,0 +1,104 @@
+"""Tests for building the queryables of all collections in a single pass."""
+
+import pytest
+
+import stac_fastapi.sfeos_helpers.filter.client as filter_client_module
+from stac_fastapi.core.queryables import merge_queryables
+from stac_fastapi.sfeos_helpers.database import get_all_collection_queryables_shared
+from stac_fastapi.sfeos_helpers.filter import EsAsyncBaseFiltersClient
+
+
+def _mapping(**properties):
+    return {"mappings": {"properties": {"properties": {"properties": properties}}}}
+
+
+class FakeIndices:
+    async def get_mapping(self, index, **kwargs):
+        return {
+            "items_a_1": _mapping(cloud={"type": "float"}),
+            "items_a_2": _mapping(platform={"type": "keyword"}),
+            "items_b_1": _mapping(**{"eo:bands": {"type": "keyword"}}),
+            "items_orphan_1": _mapping(orphan={"type": "keyword"}),
+        }
+
+    async def get_alias(self, index, **kwargs):
+        return {
+            "items_a_1": {"aliases": {"items_a": {}, "items_a_start": {}}},
+            "items_a_2": {"aliases": {"items_a": {}}},
+            "items_b_1": {"aliases": {"items_b": {}}},
+            "items_orphan_1": {"aliases": {"items_orphan": {}}},
+        }
+
+
+class FakeClient:
+    def __init__(self, buckets):
+        self.indices = FakeIndices()
+        self.buckets = buckets
+        self.msearches = []
+
+    async def msearch(self, body):
+        self.msearches.append(body)
+        return {
+            "responses": [
+                {
+                    "aggregations": {
+                        field: {"buckets": [{"key": v} for v in self.buckets]}
+                        for field in search["aggs"]
+                    }
+                }
+                for search in body[1::2]
+            ]
+        }
+
+
+@pytest.fixture
+def filters_client():
+    return EsAsyncBaseFiltersClient(database=None, settings=None)
+
+
+@pytest.mark.asyncio
+async def test_queryables_are_split_by_alias(filters_client, monkeypatch):
+    monkeypatch.setattr(
+        filter_client_module, "ALL_QUERYABLES", {"platform": {"$enum": True}}
+    )
+    client = FakeClient(["landsat", "sentinel"])
+
+    queryables = await get_all_collection_queryables_shared(
+        client, ["a", "b", "missing"], filters_client.queryables_from_mapping
+    )
+
+    assert len(queryables) == 2
+    a, b = (q["properties"] for q in queryables)
+    assert {"cloud", "platform"} <= a.keys() and "eo:bands" not in a
+    assert "eo:bands" in b and "orphan" not in b
+    assert a["platform"]["enum"] == ["landsat", "sentinel"]
+    # Only the alias with enum fields is searched, in a single msearch
+    assert client.msearches == [
+        [
+            {"index": "items_a"},
+            {
+                "size": 0,
+                "aggs": {
+                    "properties.platform": {
+                        "terms": {"field": "properties.platform", "size": 101}
+                    }
+                },
+            },
+        ]
+    ]
+    merged = merge_queryables(queryables)["properties"]
+    assert {"cloud", "platform", "eo:bands"} <= merged.keys()
+
+
+@pytest.mark.asyncio
+async def test_enum_fields_over_the_limit_are_skipped(filters_client, monkeypatch):
+    monkeypatch.setattr(
+        filter_client_module, "ALL_QUERYABLES", {"platform": {"$enum": True}}
+    )
+    client = FakeClient(range(101))
+
+    queryables = await get_all_collection_queryables_shared(
+        client, ["a"], filters_client.queryables_from_mapping
+    )
+
+    assert "enum" not in queryables[0]["properties"]["platform"]
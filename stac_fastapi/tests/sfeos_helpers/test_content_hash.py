@@ -0,0 +1,88 @@
+"""Tests for content hashes used to skip unchanged items on ingest."""
+
+from copy import deepcopy
+
+import pytest
+
+from stac_fastapi.core.serializers import ItemSerializer
+from stac_fastapi.core.utilities import compute_item_content_hash
+from stac_fastapi.sfeos_helpers.database import find_unchanged_items_shared, mk_item_id
+
+ITEM = {
+    "type": "Feature",
+    "id": "item-1",
+    "collection": "test-collection",
+    "geometry": {"type": "Point", "coordinates": [1.0, 2.0]},
+    "properties": {"datetime": "2020-01-01T00:00:00Z", "platform": "a"},
+    "links": [],
+    "assets": {},
+}
+
+
+class FakeClient:
+    """Returns stored hashes for an `ids` query."""
+
+    def __init__(self, stored):
+        self.stored = stored
+        self.requests = []
+
+    async def search(self, index, body, **kwargs):
+        self.requests.append(body)
+        hits = [
+            {
+                "_id": doc_id,
+                "_index": "items_test-collection_1",
+                "_source": {"content_hash": self.stored[doc_id]},
+            }
+            for doc_id in body["query"]["ids"]["values"]
+            if doc_id in self.stored
+        ]
+        return {"hits": {"hits": hits}}
+
+
+def test_content_hash_ignores_key_order_and_server_timestamps():
+    item = deepcopy(ITEM)
+    reordered = dict(reversed(list(deepcopy(ITEM).items())))
+    reordered["properties"]["created"] = "2024-01-01T00:00:00Z"
+    reordered["properties"]["updated"] = "2024-06-01T00:00:00Z"
+
+    assert compute_item_content_hash(item) == compute_item_content_hash(reordered)
+
+    item["properties"]["platform"] = "b"
+    assert compute_item_content_hash(item) != compute_item_content_hash(reordered)
+
+
+def test_stac_to_db_sets_content_hash_when_enabled(monkeypatch):
+    assert "content_hash" not in ItemSerializer.stac_to_db(deepcopy(ITEM), "http://x/")
+
+    monkeypatch.setenv("ENABLE_CONTENT_HASH", "true")
+    first = ItemSerializer.stac_to_db(deepcopy(ITEM), "http://x/")
+    second = ItemSerializer.stac_to_db(deepcopy(ITEM), "http://x/")
+
+    assert first["content_hash"] == second["content_hash"]
+    assert "content_hash" not in ItemSerializer.db_to_stac(first, "http://x/")
+
+
+@pytest.mark.asyncio
+async def test_find_unchanged_items_compares_stored_hashes():
+    items = []
+    for index in range(3):
+        item = deepcopy(ITEM)
+        item["id"] = f"item-{index}"
+        item["content_hash"] = compute_item_content_hash(item)
+        items.append(item)
+    items.append({**deepcopy(ITEM), "id": "no-hash"})
+    client = FakeClient(
+        {
+            mk_item_id("item-0", "test-collection"): items[0]["content_hash"],
+            mk_item_id("item-1", "test-collection"): "stale",
+        }
+    )
+
+    unchanged = await find_unchanged_items_shared(
+        client, "test-collection", items, batch_size=2
+    )
+
+    assert unchanged == {"item-0"}
+    # Items without a hash are never looked up
+    assert [len(r["query"]["ids"]["values"]) for r in client.requests] == [2, 1]
@@ -0,0 +1,126 @@
+"""Tests for concurrent chunked bulk writes (parallel_bulk_shared)."""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from stac_fastapi.sfeos_helpers.database import (
+    mk_item_id,
+    parallel_bulk_shared,
+    separate_bulk_conflict_errors,
+)
+
+
+async def _actions(count, index="items_test"):
+    for i in range(count):
+        yield {
+            "_op_type": "create",
+            "_index": index if i % 2 == 0 else f"{index}-2",
+            "_id": mk_item_id(f"item-{i}", "test"),
+            "_source": {"id": f"item-{i}"},
+        }
+
+
+class FakeBulk:
+    """async_bulk stand-in that records concurrency and fails chosen ids."""
+
+    def __init__(self, conflict_ids=(), failing_ids=(), delay=0.01):
+        self.conflict_ids = set(conflict_ids)
+        self.failing_ids = set(failing_ids)
+        self.delay = delay
+        self.calls = []
+        self.in_flight = 0
+        self.max_seen = 0
+
+    async def __call__(self, client, actions, **kwargs):
+        self.calls.append((list(actions), kwargs))
+        self.in_flight += 1
+        self.max_seen = max(self.max_seen, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.in_flight -= 1
+        errors = []
+        for action in actions:
+            if action["_id"] in self.conflict_ids:
+                errors.append({"create": {"_id": action["_id"], "status": 409}})
+            elif action["_id"] in self.failing_ids:
+                errors.append({"create": {"_id": action["_id"], "status": 400}})
+        return len(actions) - len(errors), errors
+
+
+def _client():
+    client = MagicMock()
+    client.indices.refresh = AsyncMock()
+    return client
+
+
+@pytest.mark.asyncio
+async def test_parallel_bulk_limits_in_flight_chunks():
+    bulk = FakeBulk()
+    success, errors = await parallel_bulk_shared(
+        _client(), _actions(100), bulk, max_in_flight=3, chunk_size=10
+    )
+
+    assert success == 100
+    assert errors == []
+    assert len(bulk.calls) == 10
+    assert bulk.max_seen == 3
+    for chunk, kwargs in bulk.calls:
+        assert kwargs["chunk_size"] == len(chunk)
+        assert kwargs["raise_on_error"] is False
+
+
+@pytest.mark.asyncio
+async def test_parallel_bulk_aggregates_errors_in_chunk_order():
+    conflict = mk_item_id("item-3", "test")
+    failure = mk_item_id("item-17", "test")
+    bulk = FakeBulk(conflict_ids=[conflict], failing_ids=[failure])
+
+    success, errors = await parallel_bulk_shared(
+        _client(), _actions(20), bulk, max_in_flight=4, chunk_size=5
+    )
+
+    assert success == 18
+    assert [next(iter(e.values()))["_id"] for e in errors] == [conflict, failure]
+    conflicts, others = separate_bulk_conflict_errors(errors)
+    assert len(conflicts) == 1
+    assert len(others) == 1
+
+
+@pytest.mark.asyncio
+async def test_parallel_bulk_refreshes_touched_indexes_once():
+    client = _client()
+    bulk = FakeBulk(delay=0)
+
+    await parallel_bulk_shared(
+        client, _actions(6), bulk, max_in_flight=2, chunk_size=2, refresh="true"
+    )
+
+    assert all(kwargs["refresh"] == "false" for _, kwargs in bulk.calls)
+    client.indices.refresh.assert_awaited_once_with(index="items_test,items_test-2")
+
+
+@pytest.mark.asyncio
+async def test_parallel_bulk_passes_wait_for_to_every_chunk():
+    client = _client()
+    bulk = FakeBulk(delay=0)
+
+    await parallel_bulk_shared(
+        client, _actions(4), bulk, max_in_flight=2, chunk_size=2, refresh="wait_for"
+    )
+
+    assert all(kwargs["refresh"] == "wait_for" for _, kwargs in bulk.calls)
+    client.indices.refresh.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_parallel_bulk_propagates_request_exceptions():
+    async def failing_bulk(client, actions, **kwargs):
+        raise ConnectionError("cluster unavailable")
+
+    with pytest.raises(ConnectionError):
+        await parallel_bulk_shared(
+            _client(), _actions(10), failing_bulk, max_in_flight=2, chunk_size=2
+        )
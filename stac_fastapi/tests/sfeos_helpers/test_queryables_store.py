@@ -0,0 +1,206 @@
+"""Tests for the materialized per-collection queryables."""
+
+import pytest
+
+from stac_fastapi.sfeos_helpers.database import (
+    delete_stored_queryables_shared,
+    find_outdated_queryables_shared,
+    refresh_queryables_shared,
+    store_collection_queryables_shared,
+)
+from stac_fastapi.sfeos_helpers.filter import EsAsyncBaseFiltersClient
+from stac_fastapi.sfeos_helpers.mappings import ITEM_INDICES
+
+
+def _mapping(**properties):
+    return {"mappings": {"properties": {"properties": {"properties": properties}}}}
+
+
+class FakeIndices:
+    def __init__(self, mappings, aliases):
+        self.mappings = mappings
+        self.aliases = aliases
+        self.requested = []
+
+    def _matching(self, index):
+        self.requested.append(index)
+        return [
+            name
+            for name, aliases in self.aliases.items()
+            if index == ITEM_INDICES or index in aliases
+        ]
+
+    async def get_mapping(self, index, **kwargs):
+        return {name: self.mappings[name] for name in self._matching(index)}
+
+    async def get_alias(self, index, **kwargs):
+        return {
+            name: {"aliases": {alias: {} for alias in self.aliases[name]}}
+            for name in self._matching(index)
+        }
+
+
+class FakeCluster:
+    def __init__(self, versions, aliases):
+        self.versions = versions
+        self.aliases = aliases
+
+    async def state(self, **kwargs):
+        return {
+            "metadata": {
+                "indices": {
+                    index: {"mapping_version": version, "aliases": self.aliases[index]}
+                    for index, version in self.versions.items()
+                }
+            }
+        }
+
+
+class FakeClient:
+    """Serves the item indexes of collections "a" and "b" and a stored document store."""
+
+    def __init__(self, versions, stored=None):
+        aliases = {"items_a_1": ["items_a"], "items_b_1": ["items_b"]}
+        self.indices = FakeIndices(
+            {
+                "items_a_1": _mapping(cloud={"type": "float"}),
+                "items_b_1": _mapping(platform={"type": "keyword"}),
+            },
+            aliases,
+        )
+        self.cluster = FakeCluster(versions, aliases)
+        self.stored = dict(stored or {})
+
+    async def msearch(self, body):
+        return {
+            "responses": [
+                {
+                    "aggregations": {
+                        field: {"buckets": [{"key": "sentinel-2a"}]}
+                        for field in search["aggs"]
+                    }
+                }
+                for search in body[1::2]
+            ]
+        }
+
+    async def mget(self, index, body):
+        doc_id = body["ids"][0]
+        if doc_id in self.stored:
+            return {"docs": [{"found": True, "_source": self.stored[doc_id]}]}
+        return {"docs": [{"found": False}]}
+
+    async def search(self, index, body):
+        excluded = body["query"]["bool"]["must_not"]["ids"]["values"]
+        return {
+            "hits": {
+                "hits": [
+                    {"_source": doc}
+                    for doc_id, doc in sorted(self.stored.items())
+                    if doc_id not in excluded
+                ]
+            }
+        }
+
+    async def index(self, index, id, body, **kwargs):
+        self.stored[id] = body
+
+    async def delete(self, index, id, **kwargs):
+        self.stored.pop(id)
+
+    async def delete_by_query(self, index, body, **kwargs):
+        ids = body["query"]["ids"]["values"]
+        deleted = [doc_id for doc_id in ids if self.stored.pop(doc_id, None)]
+        return {"deleted": len(deleted)}
+
+
+async def fake_bulk(client, actions, **kwargs):
+    errors = []
+    for action in actions:
+        if action.get("_op_type") == "delete":
+            if client.stored.pop(action["_id"], None) is None:
+                errors.append({"delete": {"_id": action["_id"], "status": 404}})
+        else:
+            client.stored[action["_id"]] = action["_source"]
+    return len(actions) - len(errors), errors
+
+
+@pytest.mark.asyncio
+async def test_documents_and_merged_document_are_stored():
+    client = FakeClient({"items_a_1": 3, "items_b_1": 1}, stored={"gone": {}})
+    filters_client = EsAsyncBaseFiltersClient(database=None, settings=None)
+
+    documents = await refresh_queryables_shared(
+        client,
+        fake_bulk,
+        ["a", "b", "c", "gone"],
+        filters_client.queryables_from_mapping,
+        merge=True,
+    )
+
+    assert sorted(documents) == ["a", "b"]
+    assert sorted(client.stored) == ["*", "a", "b"]
+    assert client.stored["a"]["mapping_versions"] == {"items_a_1": 3}
+    assert client.stored["a"]["mapping"]["cloud"] == ["properties.cloud"]
+    assert "cloud" in client.stored["a"]["queryables"]
+    assert client.stored["b"]["enum_fields"] == ["properties.platform"]
+    assert client.stored["b"]["queryables"]["platform"]["enum"] == ["sentinel-2a"]
+    merged = client.stored["*"]
+    assert {"cloud", "platform"} <= merged["queryables"].keys()
+    assert merged["mapping"]["platform"] == ["properties.platform"]
+
+
+@pytest.mark.asyncio
+async def test_grown_mappings_and_written_enum_collections_are_outdated():
+    stored = {
+        "a": {
+            "collection": "a",
+            "mapping_versions": {"items_a_1": 3},
+            "enum_fields": ["properties.platform"],
+        },
+        "b": {"collection": "b", "mapping_versions": {"items_b_1": 1}},
+        "gone": {"collection": "gone", "mapping_versions": {}},
+    }
+    client = FakeClient({"items_a_1": 3, "items_b_1": 2}, stored=stored)
+
+    assert await find_outdated_queryables_shared(client, ["a", "b", "c"]) == (
+        ["b"],
+        ["gone"],
+    )
+    assert await find_outdated_queryables_shared(client, ["a", "b"], written=["a"]) == (
+        ["a", "b"],
+        ["gone"],
+    )
+
+
+@pytest.mark.asyncio
+async def test_missing_document_is_built_from_its_collection_only():
+    client = FakeClient({"items_a_1": 3, "items_b_1": 1}, stored={"*": {}})
+    filters_client = EsAsyncBaseFiltersClient(database=None, settings=None)
+
+    document = await store_collection_queryables_shared(
+        client, "b", filters_client.queryables_from_mapping
+    )
+
+    assert client.indices.requested == ["items_b", "items_b"]
+    assert document["queryables"]["platform"]["enum"] == ["sentinel-2a"]
+    assert client.stored["b"] == document
+    # The merged document is left alone, the next check rebuilds both
+    assert client.stored["*"] == {}
+    assert await find_outdated_queryables_shared(client, ["b"]) == (["b"], [])
+    assert (
+        await store_collection_queryables_shared(
+            client, "c", filters_client.queryables_from_mapping
+        )
+        is None
+    )
+
+
+@pytest.mark.asyncio
+async def test_deleted_collection_drops_its_document_and_the_merged_one():
+    client = FakeClient({}, stored={"*": {}, "a": {}, "b": {}})
+
+    await delete_stored_queryables_shared(client, fake_bulk, "a")
+    await delete_stored_queryables_shared(client, fake_bulk, "a")
+
+    assert sorted(client.stored) == ["b"]
@@ -0,0 +1,364 @@
+"""Tests for resumable reindex tasks against an in-memory client."""
+
+import copy
+
+import pytest
+
+from stac_fastapi.sfeos_helpers.database import (
+    ReindexTaskClaimLost,
+    ReindexTaskRunner,
+    find_resumable_reindex_tasks_shared,
+    get_reindex_task_shared,
+    index_alias_by_collection_id,
+    index_by_collection_id,
+    is_write_block_error,
+    new_delete_by_query_task,
+    new_reindex_task,
+    new_update_by_query_task,
+    plan_collection_id_change_shared,
+    reindex_task_collection_ids,
+)
+
+
+class ApiError(Exception):
+    def __init__(self, status_code):
+        super().__init__(status_code)
+        self.status_code = status_code
+
+
+class FakeIndices:
+    def __init__(self, aliases):
+        self.aliases = aliases
+        self.alias_updates = []
+        self.deleted = []
+        self.settings = []
+
+    async def create(self, index, body, **kwargs):
+        pass
+
+    async def get_alias(self, index, **kwargs):
+        return {
+            name: {"aliases": {a: {} for a in aliases}}
+            for name, aliases in self.aliases.items()
+            if index in aliases
+        }
+
+    async def update_aliases(self, body):
+        self.alias_updates.append(body["actions"])
+
+    async def delete(self, index, **kwargs):
+        self.deleted.extend(index)
+
+    async def put_settings(self, index, body, **kwargs):
+        self.settings.append((list(index), body))
+
+
+class FakeTasks:
+    def __init__(self, client):
+        self.client = client
+        self.lost = set()
+
+    async def get(self, task_id):
+        if task_id in self.lost:
+            self.lost.discard(task_id)
+            raise ApiError(404)
+        return self.client.task_results[task_id]
+
+
+class FakeClient:
+    """Implements the subset of the async client used by reindex tasks."""
+
+    def __init__(self, aliases=None):
+        self.docs = {}
+        self.seq_no = 0
+        self.reindexed = []
+        self.deleted_by_query = []
+        self.updated_by_query = []
+        self.deleted = []
+        self.task_results = {}
+        self.failing_sources = set()
+        self.indices = FakeIndices(aliases or {})
+        self.tasks = FakeTasks(self)
+
+    async def index(self, index, id, body, refresh, **kwargs):
+        current = self.docs.get(id)
+        if kwargs.get("op_type") == "create" and current is not None:
+            raise ApiError(409)
+        if "if_seq_no" in kwargs and (
+            current is None or current["_seq_no"] != kwargs["if_seq_no"]
+        ):
+            raise ApiError(409)
+        self.seq_no += 1
+        self.docs[id] = {
+            "_id": id,
+            "_source": copy.deepcopy(body),
+            "_seq_no": self.seq_no,
+        }
+        return {"_seq_no": self.seq_no, "_primary_term": 1}
+
+    async def update(self, index, id, body, refresh, **kwargs):
+        if id not in self.docs:
+            raise ApiError(404)
+        self.docs[id]["_source"].update(body["doc"])
+
+    async def search(self, index, body):
+        query = body["query"]
+        if "ids" in query:
+            hits = [self.docs[i] for i in query["ids"]["values"] if i in self.docs]
+        else:
+            hits = list(self.docs.values())
+        hits = copy.deepcopy(hits)
+        return {"hits": {"hits": [dict(hit, _primary_term=1) for hit in hits]}}
+
+    async def reindex(self, body, **kwargs):
+        source = body["source"]["index"]
+        task_id = f"node:{len(self.reindexed)}"
+        self.reindexed.append(body)
+        result = {"total": 1, "created": 1, "updated": 0, "version_conflicts": 0}
+        if source in self.failing_sources:
+            result["failures"] = [{"cause": "mapper_parsing_exception"}]
+        self.task_results[task_id] = {"completed": True, "response": result}
+        return {"task": task_id}
+
+    async def delete_by_query(self, index, body, **kwargs):
+        task_id = f"node:delete:{len(self.deleted_by_query)}"
+        self.deleted_by_query.append((index, body["query"], kwargs))
+        result = {"total": 2, "deleted": 2, "version_conflicts": 0}
+        self.task_results[task_id] = {"completed": True, "response": result}
+        return {"task": task_id}
+
+    async def update_by_query(self, index, body, **kwargs):
+        task_id = f"node:update:{index}"
+        self.updated_by_query.append((index, body, kwargs))
+        result = {"total": 3, "updated": 3, "version_conflicts": 0}
+        self.task_results[task_id] = {"completed": True, "response": result}
+        return {"task": task_id}
+
+    async def delete(self, index, id, refresh):
+        self.deleted.append((index, id))
+
+
+@pytest.mark.asyncio
+async def test_plan_collection_id_change_moves_indexes_and_aliases():
+    old_alias = index_alias_by_collection_id("old")
+    old_index = f"{index_by_collection_id('old')}-000001"
+    client = FakeClient({old_index: {old_alias}})
+
+    task = await plan_collection_id_change_shared(client, "old", "new", "collections")
+
+    new_index = f"{index_by_collection_id('new')}-000001"
+    assert [(s["source"], s["dest"]) for s in task["steps"]] == [(old_index, new_index)]
+    assert task["steps"][0]["script"]["params"]["new_suffix"] == "|new"
+    assert task["alias_actions"] == [
+        {"add": {"index": new_index, "alias": index_alias_by_collection_id("new")}},
+        {"remove_index": {"index": old_index}},
+    ]
+    assert task["delete_documents"] == [{"index": "collections", "id": "old"}]
+    assert task["rollback_documents"] == [{"index": "collections", "id": "new"}]
+    assert task["write_blocks"] == [old_index]
+    assert task["block_documents"] == [
+        {"index": "collections", "id": "old", "doc": {"moving_to": "new"}}
+    ]
+    assert reindex_task_collection_ids(task) == ["old", "new"]
+
+
+@pytest.mark.asyncio
+async def test_run_swaps_aliases_once_all_steps_completed():
+    client = FakeClient()
+    actions = [{"add": {"index": "b-000002", "alias": "b"}}]
+    task = new_reindex_task(
+        "reindex",
+        [
+            {"source": "a-000001", "dest": "a-000002"},
+            {"source": "b-000001", "dest": "b-000002"},
+        ],
+        alias_actions=actions,
+        delete_documents=[{"index": "collections", "id": "old"}],
+    )
+    runner = await ReindexTaskRunner.create(client, task, poll_interval=0)
+
+    result = await runner.run()
+
+    assert result["status"] == "completed"
+    assert [step["status"] for step in result["steps"]] == ["completed"] * 2
+    assert client.indices.alias_updates == [actions]
+    assert client.deleted == [("collections", "old")]
+    assert "alias_actions" not in result
+    stored = await get_reindex_task_shared(client, task["id"])
+    assert stored["aliases_swapped"] is True
+
+
+@pytest.mark.asyncio
+async def test_failed_step_leaves_aliases_untouched():
+    client = FakeClient()
+    client.failing_sources.add("b-000001")
+    task = new_reindex_task(
+        "reindex",
+        [
+            {"source": "a-000001", "dest": "a-000002"},
+            {"source": "b-000001", "dest": "b-000002"},
+        ],
+        alias_actions=[{"add": {"index": "a-000002", "alias": "a"}}],
+    )
+    runner = await ReindexTaskRunner.create(client, task, poll_interval=0)
+
+    result = await runner.run()
+
+    assert result["status"] == "failed"
+    assert result["steps"][1]["error"] == [{"cause": "mapper_parsing_exception"}]
+    assert client.indices.alias_updates == []
+    assert result["rolled_back"] is True
+    assert client.indices.deleted == ["a-000002", "b-000002"]
+
+
+@pytest.mark.asyncio
+async def test_failed_collection_id_change_deletes_the_new_collection():
+    old_index = f"{index_by_collection_id('old')}-000001"
+    client = FakeClient({old_index: [index_alias_by_collection_id("old")]})
+    client.failing_sources.add(old_index)
+    client.docs["old"] = {"_id": "old", "_source": {"id": "old"}, "_seq_no": 0}
+    task = await plan_collection_id_change_shared(client, "old", "new", "collections")
+    runner = await ReindexTaskRunner.create(client, task, poll_interval=0)
+
+    result = await runner.run()
+
+    assert result["status"] == "failed"
+    assert client.indices.deleted == [f"{index_by_collection_id('new')}-000001"]
+    assert client.deleted == [("collections", "new")]
+    assert "rollback_documents" not in result
+    assert client.indices.settings == [
+        ([old_index], {"index.blocks.write": True}),
+        ([old_index], {"index.blocks.write": False}),
+    ]
+    assert client.docs["old"]["_source"]["moving_to"] is None
+
+
+@pytest.mark.asyncio
+async def test_collection_id_change_blocks_writes_before_the_first_step():
+    old_index = f"{index_by_collection_id('old')}-000001"
+    client = FakeClient({old_index: [index_alias_by_collection_id("old")]})
+    client.docs["old"] = {"_id": "old", "_source": {"id": "old"}, "_seq_no": 0}
+    blocked_at_reindex = []
+    reindex = client.reindex
+
+    async def recording_reindex(body, **kwargs):
+        blocked_at_reindex.append(
+            (list(client.indices.settings), client.docs["old"]["_source"].copy())
+        )
+        return await reindex(body, **kwargs)
+
+    client.reindex = recording_reindex
+    task = await plan_collection_id_change_shared(client, "old", "new", "collections")
+    runner = await ReindexTaskRunner.create(client, task, poll_interval=0)
+
+    result = await runner.run()
+
+    assert result["status"] == "completed"
+    assert "write_blocks" not in result
+    assert blocked_at_reindex == [
+        (
+            [([old_index], {"index.blocks.write": True})],
+            {"id": "old", "moving_to": "new"},
+        )
+    ]
+
+
+def test_is_write_block_error_detects_blocked_bulk_items():
+    blocked = {
+        "index": {
+            "_id": "item|old",
+            "status": 403,
+            "error": {
+                "type": "cluster_block_exception",
+                "reason": "index [items_old] blocked by: [FORBIDDEN/8/index write];",
+            },
+        }
+    }
+    conflict = {
+        "create": {
+            "_id": "item|old",
+            "status": 409,
+            "error": {"type": "version_conflict_engine_exception"},
+        }
+    }
+
+    assert is_write_block_error(blocked)
+    assert not is_write_block_error(conflict)
+    assert not is_write_block_error(ApiError(403))
+
+
+@pytest.mark.asyncio
+async def test_claim_resumes_abandoned_task_once():
+    client = FakeClient()
+    task = new_reindex_task("reindex", [{"source": "a-000001", "dest": "a-000002"}])
+    await ReindexTaskRunner.create(client, task)
+
+    assert await find_resumable_reindex_tasks_shared(client, lease=-1) == [task["id"]]
+    first = await ReindexTaskRunner.claim(client, task["id"], poll_interval=0)
+    second = await ReindexTaskRunner.claim(client, task["id"], poll_interval=0)
+    assert second is not None
+
+    # The first claim was superseded by the second one
+    with pytest.raises(ReindexTaskClaimLost):
+        await first.run()
+    assert (await second.run())["status"] == "completed"
+    assert await ReindexTaskRunner.claim(client, task["id"]) is None
+
+
+@pytest.mark.asyncio
+async def test_lost_cluster_task_is_resubmitted():
+    client = FakeClient()
+    task = new_reindex_task("reindex", [{"source": "a-000001", "dest": "a-000002"}])
+    runner = await ReindexTaskRunner.create(client, task, poll_interval=0)
+    client.tasks.lost.add("node:0")
+
+    result = await runner.run()
+
+    assert len(client.reindexed) == 2
+    assert result["steps"][0]["task"] == "node:1"
+    assert result["status"] == "completed"
+
+
+@pytest.mark.asyncio
+async def test_delete_by_query_task_runs_one_throttled_step_per_index():
+    client = FakeClient()
+    query = {"range": {"properties.datetime": {"lt": "2020-01-01"}}}
+    task = new_delete_by_query_task(
+        "col", ["items_col", "items_datetime_col_2019"], query, requests_per_second=50
+    )
+    runner = await ReindexTaskRunner.create(client, task, poll_interval=0)
+
+    result = await runner.run()
+
+    assert result["status"] == "completed"
+    assert result["params"] == {"collection_id": "col"}
+    assert reindex_task_collection_ids(result) == ["col"]
+    assert [index for index, _, _ in client.deleted_by_query] == [
+        "items_col",
+        "items_datetime_col_2019",
+    ]
+    _, sent_query, kwargs = client.deleted_by_query[0]
+    assert sent_query == query
+    assert kwargs["requests_per_second"] == 50
+    assert kwargs["slices"] == "auto"
+    assert kwargs["conflicts"] == "proceed"
+    assert result["steps"][0]["progress"]["deleted"] == 2
+    assert client.reindexed == []
+
+
+@pytest.mark.asyncio
+async def test_update_by_query_task_sends_script_and_refresh_policy():
+    client = FakeClient()
+    query = {"term": {"collection": "col"}}
+    script = {"source": "ctx._source.x = params.x;", "params": {"x": 1}}
+    task = new_update_by_query_task("col", ["items_col"], query, script, refresh=False)
+    runner = await ReindexTaskRunner.create(client, task, poll_interval=0)
+
+    result = await runner.run()
+
+    assert result["status"] == "completed"
+    assert result["type"] == "bulk_patch"
+    index, body, kwargs = client.updated_by_query[0]
+    assert body == {"query": query, "script": script}
+    assert kwargs["refresh"] is False
+    assert result["steps"][0]["progress"]["updated"] == 3
@@ -0,0 +1,287 @@
+"""Tests for the rollup summaries answering aggregations."""
+
+import asyncio
+
+import pytest
+
+from stac_fastapi.core.write_generations import WriteGenerations
+from stac_fastapi.sfeos_helpers.database import (
+    RollupWriteMarker,
+    aggregate_rollups_shared,
+    fresh_rollup_collections_shared,
+    refresh_rollups_shared,
+    rollup_day_range,
+    rollup_request_supported,
+)
+from stac_fastapi.sfeos_helpers.mappings import AGGREGATION_MAPPING
+
+
+class FakeClient:
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.bodies = []
+
+    async def search(self, index, body, **kwargs):
+        self.bodies.append(body)
+        return self.responses.pop(0)
+
+
+def _sum(value):
+    return {"value": value}
+
+
+def _rollup_response(undated=0):
+    def keys(*pairs):
+        return {"buckets": [{"key": key, "count": _sum(count)} for key, count in pairs]}
+
+    return {
+        "aggregations": {
+            "undated": {"doc_count": undated},
+            "selected": {
+                "count": _sum(7.0),
+                "datetime_min": {"value": 1, "value_as_string": "2020-01-01"},
+                "datetime_max": {"value": 2, "value_as_string": "2020-01-03"},
+                "datetime_frequency": {
+                    "buckets": [
+                        {"key": 1, "key_as_string": "2020-01-01", "count": _sum(4.0)},
+                        {"key": 2, "key_as_string": "2020-01-02", "count": _sum(0.0)},
+                        {"key": 3, "key_as_string": "2020-01-03", "count": _sum(3.0)},
+                    ]
+                },
+                "collection_frequency": {
+                    "buckets": [{"key": "col", "count": _sum(7.0)}]
+                },
+                "buckets": {
+                    "by_agg": {
+                        "buckets": [
+                            {
+                                "key": "platform_frequency",
+                                "by_key": keys(("s2b", 3.0), ("s2a", 3.0), ("l8", 1.0)),
+                            },
+                            {
+                                "key": "cloud_cover_frequency",
+                                "by_key": keys(("5.0-15.0", 7.0)),
+                            },
+                            {
+                                "key": "sun_elevation_frequency",
+                                "by_key": keys(("10.0", 2.0), ("25.0", 5.0)),
+                            },
+                            {
+                                "key": "centroid_geotile_grid_frequency",
+                                "by_key": keys(("4/8/5", 2.0), ("4/9/4", 5.0)),
+                            },
+                        ]
+                    }
+                },
+            },
+        }
+    }
+
+
+@pytest.mark.parametrize(
+    "interval, expected",
+    [
+        (None, (None, None)),
+        ("2020-01-01T00:00:00Z/..", ("2020-01-01", None)),
+        ("../2020-01-31T23:59:59.999Z", (None, "2020-01-31")),
+        (
+            "2020-01-01T00:00:00Z/2020-01-31T23:59:59.999999Z",
+            ("2020-01-01", "2020-01-31"),
+        ),
+        ("2020-01-01T12:00:00Z/..", None),
+        ("2020-01-01T00:00:00Z/2020-01-31T23:59:59Z", None),
+        ("2020-01-01T00:00:00Z", None),
+    ],
+)
+def test_only_whole_day_intervals_use_rollups(interval, expected):
+    assert rollup_day_range(interval) == expected
+
+
+def test_request_support_depends_on_aggregations_and_granularity():
+    supported = ["total_count", "platform_frequency", "datetime_frequency"]
+
+    assert rollup_request_supported(supported, AGGREGATION_MAPPING, "month", 0)
+    assert not rollup_request_supported(supported, AGGREGATION_MAPPING, "hour", 0)
+    assert not rollup_request_supported(
+        ["geometry_geohash_grid_frequency"], AGGREGATION_MAPPING, "month", 0
+    )
+    assert not rollup_request_supported(
+        ["centroid_geotile_grid_frequency"], AGGREGATION_MAPPING, "month", 12
+    )
+    custom = {
+        **AGGREGATION_MAPPING,
+        "platform_frequency": {"terms": {"field": "properties.platform", "size": 5}},
+    }
+    assert not rollup_request_supported(supported, custom, "month", 0)
+
+
+@pytest.mark.asyncio
+async def test_rollups_are_converted_to_item_aggregations():
+    client = FakeClient(_rollup_response())
+
+    response = await aggregate_rollups_shared(
+        client,
+        ["col"],
+        [
+            "total_count",
+            "datetime_frequency",
+            "platform_frequency",
+            "cloud_cover_frequency",
+            "sun_elevation_frequency",
+            "centroid_geotile_grid_frequency",
+        ],
+        (None, None),
+        "day",
+        3,
+    )
+    aggs = response["aggregations"]
+
+    assert aggs["total_count"] == {"value": 7}
+    assert [b["doc_count"] for b in aggs["datetime_frequency"]["buckets"]] == [4, 0, 3]
+    assert aggs["platform_frequency"]["buckets"][0] == {"key": "s2a", "doc_count": 3}
+    assert aggs["platform_frequency"]["sum_other_doc_count"] == 0
+    assert [
+        (b["key"], b["doc_count"]) for b in aggs["cloud_cover_frequency"]["buckets"]
+    ] == [("*-5.0", 0), ("5.0-15.0", 7), ("15.0-40.0", 0), ("40.0-*", 0)]
+    assert [
+        (b["key"], b["doc_count"]) for b in aggs["sun_elevation_frequency"]["buckets"]
+    ] == [(10.0, 2), (15.0, 0), (20.0, 0), (25.0, 5)]
+    assert aggs["centroid_geotile_grid_frequency"]["buckets"] == [
+        {"key": "3/4/2", "doc_count": 7}
+    ]
+
+
+@pytest.mark.asyncio
+async def test_undated_items_prevent_datetime_filtered_answers():
+    client = FakeClient(_rollup_response(undated=1))
+
+    response = await aggregate_rollups_shared(
+        client, ["col"], ["total_count"], ("2020-01-01", None), "day", 0
+    )
+
+    assert response is None
+    assert client.bodies[0]["aggs"]["selected"]["filter"] == {
+        "range": {"day": {"gte": "2020-01-01"}}
+    }
+
+
+@pytest.mark.asyncio
+async def test_outdated_or_missing_rollups_are_not_used():
+    def meta(collection, write_seq, built_seq):
+        return {
+            "_source": {
+                "collection": collection,
+                "write_seq": write_seq,
+                "built_seq": built_seq,
+            }
+        }
+
+    collections = {"hits": {"hits": [{"_id": "a"}, {"_id": "b"}]}}
+    fresh = {"hits": {"hits": [meta("a", 2, 2), meta("b", 0, 0)]}}
+    outdated = {"hits": {"hits": [meta("a", 3, 2), meta("b", 0, 0)]}}
+
+    assert await fresh_rollup_collections_shared(
+        FakeClient(collections, fresh), None
+    ) == ["a", "b"]
+    assert await fresh_rollup_collections_shared(FakeClient(outdated), ["a"]) is None
+    assert await fresh_rollup_collections_shared(FakeClient(fresh), ["a", "c"]) is None
+
+
+@pytest.mark.asyncio
+async def test_write_listeners_receive_written_collections():
+    generations = WriteGenerations()
+    written = []
+
+    async def listener(collection_ids):
+        written.append(collection_ids)
+
+    generations.add_listener(listener)
+    generations.add_listener(listener)
+    await generations.bump(["a", "a", "b"])
+    generations.remove_listener(listener)
+    await generations.bump(["c"])
+
+    assert written == [["a", "b"]]
+
+
+class FakeMetaClient:
+    """Records the calls made on the rollups `meta` documents."""
+
+    def __init__(self, write_seq=0):
+        self.write_seq = write_seq
+        self.calls = []
+        self.fail = False
+        self.release = asyncio.Event()
+        self.release.set()
+        self.indices = self
+
+    async def create(self, index, body, **kwargs):
+        pass
+
+    async def refresh(self, index, **kwargs):
+        self.calls.append(("refresh", index))
+
+    async def get(self, index, id):
+        self.calls.append(("get", id))
+        return {"_source": {"write_seq": self.write_seq}}
+
+    async def search(self, index, body, **kwargs):
+        self.calls.append(("search", index))
+        return {"hits": {"total": {"value": 0}, "hits": []}}
+
+    async def delete_by_query(self, index, body, **kwargs):
+        pass
+
+    async def update(self, index, id, body, **kwargs):
+        await self.release.wait()
+        if self.fail:
+            raise ConnectionError("rollups index unavailable")
+        self.calls.append(("update", id))
+        if "write_seq" in body["script"]["source"]:
+            self.write_seq += 1
+
+
+@pytest.mark.asyncio
+async def test_refresh_reads_write_seq_then_makes_items_searchable():
+    client = FakeMetaClient(write_seq=7)
+
+    await refresh_rollups_shared(client, "a", bulk_helper=None)
+
+    assert client.calls[:3] == [
+        ("get", "a|_meta"),
+        ("refresh", "items_a"),
+        ("search", "items_a"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_marks_share_increments():
+    client = FakeMetaClient()
+    marker = RollupWriteMarker(client)
+    client.release.clear()
+
+    marks = [asyncio.create_task(marker.mark(["a"])) for _ in range(10)]
+    await asyncio.sleep(0.01)
+    client.release.set()
+    await asyncio.gather(*marks)
+
+    # The first increment was in flight, the second covers the other writes
+    assert client.write_seq == 2
+
+
+@pytest.mark.asyncio
+async def test_failed_marks_keep_rollups_outdated_until_retried():
+    client = FakeMetaClient()
+    marker = RollupWriteMarker(client)
+    client.fail = True
+
+    await marker.mark(["a"])
+
+    assert marker.pending == {"a"}
+    assert await fresh_rollup_collections_shared(client, ["a"], marker.pending) is None
+
+    client.fail = False
+    await marker.retry_pending()
+
+    assert marker.pending == set()
+    assert client.write_seq == 1
@@ -0,0 +1,113 @@
+"""Tests for stored, parameterized patch scripts."""
+
+import pytest
+
+from stac_fastapi.extensions.transaction.request import PatchAddReplaceTest, PatchRemove
+from stac_fastapi.sfeos_helpers.database import StoredScripts, stored_script_id
+from stac_fastapi.sfeos_helpers.database.utils import operations_to_script
+
+
+class FakeError(Exception):
+    def __init__(self, status_code, message):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class FakeClient:
+    def __init__(self, fail=None):
+        self.scripts = {}
+        self.fail = fail
+
+    async def put_script(self, id, body):
+        if self.fail:
+            raise self.fail
+        self.scripts[id] = body["script"]["source"]
+
+
+def test_script_source_only_depends_on_operation_shape():
+    first = operations_to_script(
+        [
+            PatchAddReplaceTest(op="replace", path="/properties/gsd", value=10),
+            PatchRemove(op="remove", path="/assets/thumbnail"),
+        ]
+    )
+    second = operations_to_script(
+        [
+            PatchAddReplaceTest(op="replace", path="/properties/eo:bands", value=[]),
+            PatchRemove(op="remove", path="/assets/overview"),
+        ]
+    )
+
+    assert first["source"] == second["source"]
+    assert first["params"]["op0_k"] == "gsd"
+    assert second["params"]["op1_k"] == "overview"
+
+
+@pytest.mark.asyncio
+async def test_scripts_are_stored_once_per_shape():
+    client = FakeClient()
+    stored = StoredScripts(client, enabled=True, max_scripts=10)
+    script = operations_to_script(
+        [PatchAddReplaceTest(op="add", path="/properties/gsd", value=10)]
+    )
+    other = operations_to_script(
+        [PatchAddReplaceTest(op="add", path="/properties/platform", value="s2")]
+    )
+
+    first = await stored.resolve(script)
+    second = await stored.resolve(other)
+
+    assert first == {
+        "id": stored_script_id(script["source"]),
+        "params": script["params"],
+    }
+    assert second["id"] == first["id"]
+    assert second["params"]["op0_value"] == "s2"
+    assert list(client.scripts) == [first["id"]]
+
+
+@pytest.mark.asyncio
+async def test_common_shapes_are_registered_at_startup():
+    client = FakeClient()
+    stored = StoredScripts(client, enabled=True, max_scripts=10)
+
+    ids = await stored.register_common()
+    script = operations_to_script(
+        [PatchAddReplaceTest(op="add", path="/properties/gsd", value=10)],
+        create_nest=True,
+        drop_content_hash=True,
+    )
+
+    assert set(ids) == set(client.scripts)
+    assert stored_script_id(script["source"]) in ids
+
+
+@pytest.mark.asyncio
+async def test_scripts_are_sent_inline_when_storing_fails_or_limit_is_reached():
+    script = operations_to_script([PatchRemove(op="remove", path="/properties/gsd")])
+
+    rejected = StoredScripts(
+        FakeClient(fail=FakeError(400, "cannot execute [stored] scripts")),
+        enabled=True,
+        max_scripts=10,
+    )
+    assert await rejected.resolve(script) is script
+    assert rejected.enabled is False
+
+    full = StoredScripts(FakeClient(), enabled=True, max_scripts=0)
+    assert await full.resolve(script) is script
+
+
+@pytest.mark.asyncio
+async def test_transient_store_errors_only_send_that_script_inline():
+    script = operations_to_script([PatchRemove(op="remove", path="/properties/gsd")])
+    client = FakeClient(fail=FakeError(503, "timed out"))
+    stored = StoredScripts(client, enabled=True, max_scripts=10)
+
+    assert await stored.resolve(script) is script
+    assert stored.enabled is True
+
+    client.fail = None
+    resolved = await stored.resolve(script)
+
+    assert resolved["id"] == stored_script_id(script["source"])
@@ -0,0 +1,89 @@
+"""Tests for the vector tiles drawn from geotile grid aggregations."""
+
+import pytest
+
+from stac_fastapi.sfeos_helpers.aggregation import encode_geotile_tile
+from stac_fastapi.sfeos_helpers.database import build_geotile_tile_body_shared
+from stac_fastapi.sfeos_helpers.database.aggregation import tile_bounds
+
+
+def _read_varint(data, pos):
+    result = shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        shift += 7
+        if not byte & 0x80:
+            return result, pos
+
+
+def _fields(data):
+    """Decode a protobuf message into (field number, value) pairs."""
+    pos, fields = 0, []
+    while pos < len(data):
+        tag, pos = _read_varint(data, pos)
+        if tag & 7 == 0:
+            value, pos = _read_varint(data, pos)
+        else:
+            length, pos = _read_varint(data, pos)
+            value, pos = data[pos : pos + length], pos + length
+        fields.append((tag >> 3, value))
+    return fields
+
+
+def _packed(data):
+    values, pos = [], 0
+    while pos < len(data):
+        value, pos = _read_varint(data, pos)
+        values.append(value)
+    return values
+
+
+def test_tile_bounds_of_the_world_and_a_quadrant():
+    west, south, east, north = tile_bounds(0, 0, 0)
+    assert (west, east) == (-180, 180)
+    assert north == pytest.approx(85.0511, abs=1e-4)
+    assert south == pytest.approx(-85.0511, abs=1e-4)
+    assert tile_bounds(1, 1, 0)[:3] == (0, 0, 180)
+
+
+def test_grid_body_is_limited_to_the_tile():
+    query = {"term": {"collection": "col"}}
+
+    body = build_geotile_tile_body_shared(query, "properties.proj:centroid", 3, 1, 2, 6)
+
+    grid = body["aggregations"]["tile"]["geotile_grid"]
+    assert grid["precision"] == 9
+    assert grid["size"] == 4096
+    assert body["size"] == 0
+    assert body["query"]["bool"]["filter"][1] == query
+    assert "geo_bounding_box" in body["query"]["bool"]["filter"][0]
+
+
+def test_cells_are_encoded_as_polygons_with_counts():
+    buckets = [
+        {"key": "2/2/2", "doc_count": 5},
+        {"key": "2/3/3", "doc_count": 1},
+        # Outside tile 1/1/1, e.g. an item on the tile border
+        {"key": "2/1/2", "doc_count": 4},
+    ]
+
+    tile = encode_geotile_tile(buckets, 1, 1, 1, extent=4096)
+
+    [(layer_field, layer)] = _fields(tile)
+    layer_fields = _fields(layer)
+    features = [_fields(value) for number, value in layer_fields if number == 2]
+    keys = [value for number, value in layer_fields if number == 3]
+    values = [_fields(value)[0] for number, value in layer_fields if number == 4]
+    assert layer_field == 3
+    assert (1, b"items") in layer_fields and (5, 4096) in layer_fields
+    assert keys == [b"count", b"key"]
+    assert len(features) == 2
+    first = dict(features[0])
+    tags = _packed(first[2])
+    assert values[tags[1]] == (5, 5) and values[tags[3]] == (1, b"2/2/2")
+    # MoveTo(0, 0), LineTo (2048, 0) (0, 2048) (-2048, 0), ClosePath
+    assert first[3] == 3
+    assert _packed(first[4]) == [9, 0, 0, 26, 4096, 0, 0, 4096, 4095, 0, 15]
+    assert encode_geotile_tile([{"key": "2/0/0", "doc_count": 1}], 1, 1, 1) == b""
@@ -0,0 +1,176 @@
+"""Tests for planning bulk upserts into datetime indexes."""
+
+from unittest.mock import AsyncMock
+
+import pytest
+
+from stac_fastapi.sfeos_helpers.database import bulk_item_actions_shared
+from stac_fastapi.sfeos_helpers.search_engine import DatetimeIndexInserter
+from stac_fastapi.sfeos_helpers.search_engine.index_operations import IndexOperations
+
+OLD_INDEX = "items_test-collection_aaa"
+NEW_INDEX = "items_test-collection_bbb"
+NEW_ALIAS = "items_datetime_test-collection_2021-01-01"
+
+
+class FakeIndices:
+    async def get_alias(self, index):
+        return {NEW_INDEX: {"aliases": {index: {}}}}
+
+
+class FakeClient:
+    """Returns the stored datetimes for an `ids` query."""
+
+    def __init__(self, stored):
+        self.stored = stored
+        self.searches = 0
+        self.indices = FakeIndices()
+
+    async def search(self, index, body, **kwargs):
+        self.searches += 1
+        hits = [
+            {
+                "_id": doc_id,
+                "_index": OLD_INDEX,
+                "_source": {"properties": {"datetime": self.stored[doc_id]}},
+            }
+            for doc_id in body["query"]["ids"]["values"]
+            if doc_id in self.stored
+        ]
+        return {"hits": {"hits": hits}}
+
+
+def _item(item_id, datetime):
+    return {
+        "id": item_id,
+        "collection": "test-collection",
+        "properties": {"datetime": datetime},
+    }
+
+
+@pytest.fixture
+def inserter(monkeypatch):
+    monkeypatch.setenv("USE_DATETIME", "true")
+
+    def make(stored):
+        inserter = DatetimeIndexInserter(FakeClient(stored), IndexOperations())
+        inserter._get_target_index_internal = AsyncMock(return_value=NEW_ALIAS)
+        return inserter
+
+    return make
+
+
+@pytest.mark.asyncio
+async def test_upsert_routes_unchanged_moved_and_new_items(inserter):
+    planner = inserter(
+        {
+            "same|test-collection": "2020-06-01T00:00:00Z",
+            "moved|test-collection": "2020-06-01T00:00:00Z",
+        }
+    )
+    items = [
+        _item("same", "2020-06-01T00:00:00Z"),
+        _item("moved", "2021-02-01T00:00:00Z"),
+        _item("new", "2021-03-01T00:00:00Z"),
+    ]
+
+    actions = await planner.prepare_bulk_actions(
+        "test-collection", items, op_type="index"
+    )
+
+    assert [(a["_op_type"], a["_index"], a["_id"]) for a in actions] == [
+        ("index", OLD_INDEX, "same|test-collection"),
+        ("delete", OLD_INDEX, "moved|test-collection"),
+        ("index", NEW_ALIAS, "moved|test-collection"),
+        ("index", NEW_ALIAS, "new|test-collection"),
+    ]
+    assert planner.client.searches == 1
+    # Only the first resolved item checks the index size
+    sizes = [
+        call.kwargs["check_size"]
+        for call in planner._get_target_index_internal.call_args_list
+    ]
+    assert sizes == [True, False]
+
+
+@pytest.mark.asyncio
+async def test_moved_item_within_same_index_is_not_deleted(inserter):
+    planner = inserter({"moved|test-collection": "2020-06-01T00:00:00Z"})
+    planner.client.indices.get_alias = AsyncMock(
+        return_value={OLD_INDEX: {"aliases": {}}}
+    )
+
+    actions = await planner.prepare_bulk_actions(
+        "test-collection", [_item("moved", "2020-06-02T00:00:00Z")], op_type="index"
+    )
+
+    assert [(a["_op_type"], a["_index"]) for a in actions] == [("index", NEW_ALIAS)]
+
+
+@pytest.mark.asyncio
+async def test_create_does_not_look_up_existing_items(inserter):
+    planner = inserter({"a|test-collection": "2020-06-01T00:00:00Z"})
+
+    actions = await planner.prepare_bulk_actions(
+        "test-collection", [_item("a", "2020-06-01T00:00:00Z")]
+    )
+
+    assert planner.client.searches == 0
+    assert [(a["_op_type"], a["_index"]) for a in actions] == [("create", NEW_ALIAS)]
+
+
+def _fake_bulk(statuses):
+    """Answer each action with the status of its (op type, id), 201 by default."""
+
+    async def bulk(client, actions, **kwargs):
+        assert kwargs["raise_on_error"] is False
+        success, errors = 0, []
+        for action in actions:
+            status = statuses.get((action["_op_type"], action["_id"]), 201)
+            if 200 <= status < 300:
+                success += 1
+            else:
+                errors.append(
+                    {action["_op_type"]: {"_id": action["_id"], "status": status}}
+                )
+        return success, errors
+
+    return bulk
+
+
+def _moved_item_actions():
+    return [
+        {"_op_type": "delete", "_index": OLD_INDEX, "_id": "moved|test-collection"},
+        {"_op_type": "index", "_index": NEW_ALIAS, "_id": "moved|test-collection"},
+        {"_op_type": "index", "_index": NEW_ALIAS, "_id": "new|test-collection"},
+    ]
+
+
+@pytest.mark.asyncio
+async def test_moved_item_deletes_are_not_counted_as_items():
+    success, errors = await bulk_item_actions_shared(
+        None, _moved_item_actions(), _fake_bulk({}), refresh="false"
+    )
+
+    assert (success, errors) == (2, [])
+
+
+@pytest.mark.asyncio
+async def test_moved_item_already_deleted_is_not_an_error():
+    actions = _moved_item_actions()
+    bulk = _fake_bulk({("delete", "moved|test-collection"): 404})
+
+    # The 404 of the delete is dropped, the index action still counts
+    assert await bulk_item_actions_shared(None, actions, bulk) == (2, [])
+
+    # Any other failure of an index action is still reported
+    actions[2]["_id"] = "broken|test-collection"
+    bulk = _fake_bulk(
+        {
+            ("delete", "moved|test-collection"): 404,
+            ("index", "broken|test-collection"): 400,
+        }
+    )
+    success, errors = await bulk_item_actions_shared(None, actions, bulk)
+    assert success == 1
+    assert errors == [{"index": {"_id": "broken|test-collection", "status": 400}}]